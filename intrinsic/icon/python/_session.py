@@ -20,7 +20,7 @@ import datetime
 import itertools
 import queue
 import threading
-from typing import Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Deque, Iterable, List, Optional, Sequence, Tuple, Union
 
 from absl import logging
 from google.protobuf import message as _message
@@ -40,6 +40,9 @@ ActionOrActionWithCondition = Union[
     _actions.Action, Tuple[_actions.Action, _reactions.Condition]
 ]
 
+# Default maximum number of requests that a Pipeline keeps in flight.
+DEFAULT_MAX_IN_FLIGHT = 16
+
 
 def _get_action_and_condition(
     element: ActionOrActionWithCondition,
@@ -57,6 +60,18 @@ def _format_rpc_status(status: status_pb2.Status) -> str:
   )
 
 
+def _start_actions_request(
+    action_ids: Sequence[int], stop_active_actions: bool
+) -> service_pb2.OpenSessionRequest:
+  """Returns a request that starts the given actions."""
+  return service_pb2.OpenSessionRequest(
+      start_actions_request=service_pb2.OpenSessionRequest.StartActionsRequestData(
+          action_instance_ids=action_ids,
+          stop_active_actions=stop_active_actions,
+      )
+  )
+
+
 class Session:
   """Internal Session object for scoping control of a set of robot parts."""
 
@@ -95,6 +110,11 @@ class Session:
       request.log_context.CopyFrom(context)
 
     self._latest_reaction_id = 0
+    # Requests whose responses have not been read yet, in the order in which
+    # they were sent. The server answers requests in order.
+    self._pending: Deque[RequestFuture] = collections.deque()
+    # Failed requests whose results have not been requested, see end().
+    self._unchecked_failures: List[RequestFuture] = []
 
     self._request_stream.write(request)
     # Get the next response from the stream. If there are any issues, such
@@ -145,9 +165,14 @@ class Session:
     return self
 
   def __exit__(self, exc_type, exc_value, traceback):
-    """Allows usage in a with-statement context."""
-    del exc_type, exc_value, traceback  # Unused.
-    self.end()
+    """Allows usage in a with-statement context.
+
+    If the with-statement raised, errors of unchecked pipelined requests are
+    only logged, so that they do not replace the exception of the
+    with-statement.
+    """
+    del exc_value, traceback  # Unused.
+    self._end(raise_unchecked_errors=exc_type is None)
 
   def _next_reaction_id(self) -> int:
     """Advances a counter which is used for this session's reaction IDs.
@@ -202,6 +227,25 @@ class Session:
     Raises:
       grpc.RPCError: Raises received exception from watcher thread if any
         occurred.
+      errors.Session.ActionError: A pipelined request failed and its result was
+        never requested. Raised once the session has ended. If several such
+        requests failed, all of their errors are logged and the first one is
+        raised.
+      grpc.RpcError: Like errors.Session.ActionError, if the server aborted a
+        pipelined request or the response stream failed.
+
+    Returns:
+      Whether the attempt was successful.
+    """
+    return self._end(raise_unchecked_errors=True)
+
+  def _end(self, raise_unchecked_errors: bool) -> bool:
+    """Ends the session, see end().
+
+    Args:
+      raise_unchecked_errors: Whether to raise the first error of the pipelined
+        requests whose results were never requested. The errors are logged in
+        any case.
 
     Returns:
       Whether the attempt was successful.
@@ -213,6 +257,19 @@ class Session:
       if not stream.end():
         return False
 
+    # Read the responses to pipelined requests before closing the request
+    # stream, which drops requests that have not been sent yet.
+    while self._pending:
+      self._receive_next()
+    # Pipelined requests may have failed without anyone looking at their
+    # results. Report their errors instead of dropping them silently.
+    unchecked_errors = [future.error() for future in self._unchecked_failures]
+    self._unchecked_failures = []
+    for error in unchecked_errors:
+      logging.error(
+          'Unchecked request of session %d failed: %s', self._session_id, error
+      )
+
     # Tell the server that we are done with this session by signalling there's
     # no write requests left.
     self._request_stream.end()
@@ -238,6 +295,8 @@ class Session:
 
     self._ended = True
     logging.info('Ended session with id: %d', self._session_id)
+    if unchecked_errors and raise_unchecked_errors:
+      raise unchecked_errors[0]
     return self._ended
 
   def _raise_failed_response(
@@ -255,13 +314,106 @@ class Session:
       grpc.RpcError: The server returned an aborted error, and the session will
         be ended automatically.
     """
-    error_msg = error_msg_format.format(_format_rpc_status(status))
+    error = self._failed_response_error(status, error_msg_format)
     # Raise an exception to end the flow if the server decides to abort.
     if status.code == grpc.StatusCode.ABORTED.value[0]:
-      self.end()
-      logging.error(error_msg)
-      raise grpc.RpcError(error_msg)
-    raise errors.Session.ActionError(error_msg)
+      # The aborted request is the error to report, errors of other requests
+      # are only logged.
+      self._end(raise_unchecked_errors=False)
+      logging.error(str(error))
+    raise error
+
+  def _failed_response_error(
+      self, status: status_pb2.Status, error_msg_format: str
+  ) -> Exception:
+    """Returns the error that _raise_failed_response raises for `status`."""
+    error_msg = error_msg_format.format(_format_rpc_status(status))
+    if status.code == grpc.StatusCode.ABORTED.value[0]:
+      return grpc.RpcError(error_msg)
+    return errors.Session.ActionError(error_msg)
+
+  def _check_not_ended(self, error_msg: str) -> None:
+    """Raises an ActionError with `error_msg` if the session has ended."""
+    if self._ended:
+      raise errors.Session.ActionError(
+          f'{error_msg} session {self._session_id}'
+      )
+
+  def _send(
+      self, request: service_pb2.OpenSessionRequest, error_msg_format: str
+  ) -> 'RequestFuture':
+    """Sends a request without waiting for its response.
+
+    Args:
+      request: The request to send.
+      error_msg_format: The message format for errors of the request, see
+        _raise_failed_response.
+
+    Returns:
+      A future for the response to the request.
+    """
+    future = RequestFuture(self, error_msg_format)
+    self._request_stream.write(request)
+    self._pending.append(future)
+    return future
+
+  def _receive_next(self) -> None:
+    """Reads the response to the oldest pending request.
+
+    If the response stream fails, all pending requests fail with its error.
+    """
+    try:
+      response = next(self._response_stream)
+    except (grpc.RpcError, StopIteration) as e:
+      if isinstance(e, StopIteration):
+        e = grpc.RpcError('Session response stream ended unexpectedly')
+      while self._pending:
+        future = self._pending.popleft()
+        future.set_error(e)
+        self._unchecked_failures.append(future)
+      return
+    future = self._pending.popleft()
+    future.set_status(response.status)
+    if response.status.code != grpc.StatusCode.OK.value[0]:
+      self._unchecked_failures.append(future)
+
+  def _in_flight(self) -> int:
+    """Returns the number of requests whose responses have not been read."""
+    return len(self._pending)
+
+  def _add_actions_request(
+      self,
+      actions: Iterable[_actions.Action],
+      reactions: Iterable[_reactions.Reaction] = (),
+  ) -> service_pb2.OpenSessionRequest:
+    """Returns a request that adds actions and free-standing reactions."""
+    request = service_pb2.OpenSessionRequest()
+    for action in actions:
+      request.add_actions_and_reactions.action_instances.append(action.proto)
+      self._add_reactions_to_proto(
+          action.id, request.add_actions_and_reactions, action.reactions
+      )
+    reactions = list(reactions)
+    if reactions:
+      self._add_reactions_to_proto(
+          None, request.add_actions_and_reactions, reactions
+      )
+    return request
+
+  def _add_reactions_request(
+      self,
+      action: Optional[_actions.Action],
+      reactions: Iterable[_reactions.Reaction],
+  ) -> service_pb2.OpenSessionRequest:
+    """Returns a request that adds reactions to an action (or free-standing)."""
+    request = service_pb2.OpenSessionRequest()
+    action_id = None
+    if action is not None:
+      action_id = action.id
+    self._add_reactions_to_proto(
+        action_id, request.add_actions_and_reactions, reactions
+    )
+    return request
 
   def _add_reactions_to_proto(
       self,
@@ -382,25 +534,35 @@ class Session:
       grpc.RpcError: An error occurred whilst adding the Actions. If the server
         returned an aborted error then the session will be ended automatically.
     """
-    if self._ended:
-      raise errors.Session.ActionError(
-          f'Cannot add actions to already ended session {self._session_id}'
-      )
+    self.prepare(actions)
 
-    request = service_pb2.OpenSessionRequest()
-    for action in actions:
-      request.add_actions_and_reactions.action_instances.append(action.proto)
-      self._add_reactions_to_proto(
-          action.id, request.add_actions_and_reactions, action.reactions
-      )
+  def prepare(
+      self,
+      actions: Iterable[_actions.Action],
+      reactions: Iterable[_reactions.Reaction] = (),
+  ) -> None:
+    """Adds Actions and free-standing Reactions to the session in one request.
 
-    self._request_stream.write(request)
-    response = next(self._response_stream)
+    The reactions of the actions (see Action.reactions) are added as well. This
+    takes a single round trip to the server, regardless of how many actions and
+    reactions are added.
 
-    if response.status.code != grpc.StatusCode.OK.value[0]:
-      self._raise_failed_response(
-          response.status, 'Adding actions failed with {}'
-      )
+    Args:
+      actions: The Actions to add to the session.
+      reactions: Free-standing Reactions to add to the session, see
+        add_freestanding_reactions.
+
+    Raises:
+      errors.Session.ActionError: A non-session ending failure occurred, or
+        session has already ended.
+      grpc.RpcError: An error occurred whilst adding the Actions. If the server
+        returned an aborted error then the session will be ended automatically.
+    """
+    self._check_not_ended('Cannot add actions to already ended')
+    self._send(
+        self._add_actions_request(actions, reactions),
+        'Adding actions failed with {}',
+    ).result()
 
   def add_action_sequence(
       self,
@@ -480,13 +642,7 @@ class Session:
         ],
     )
 
-    self._request_stream.write(request)
-    response = next(self._response_stream)
-
-    if response.status.code != grpc.StatusCode.OK.value[0]:
-      self._raise_failed_response(
-          response.status, 'Adding actions failed with {}'
-      )
+    self._send(request, 'Adding actions failed with {}').result()
 
     return done_flag
 
@@ -506,27 +662,11 @@ class Session:
         freestanding reaction is added.
       reactions: Iterable of reactions which are added to the action.
     """
-    if self._ended:
-      raise errors.Session.ActionError(
-          f'Cannot add reactions to already ended session {self._session_id}'
-      )
-
-    request = service_pb2.OpenSessionRequest()
-
-    action_id = None
-    if action is not None:
-      action_id = action.id
-    self._add_reactions_to_proto(
-        action_id, request.add_actions_and_reactions, reactions
-    )
-
-    self._request_stream.write(request)
-    response = next(self._response_stream)
-
-    if response.status.code != grpc.StatusCode.OK.value[0]:
-      self._raise_failed_response(
-          response.status, 'Adding actions failed with {}'
-      )
+    self._check_not_ended('Cannot add reactions to already ended')
+    self._send(
+        self._add_reactions_request(action, reactions),
+        'Adding actions failed with {}',
+    ).result()
 
   def add_transition(
       self,
@@ -660,26 +800,11 @@ class Session:
       grpc.RpcError: An error occurred whilst starting the Action. If the server
         returned an aborted error then the session will be ended automatically.
     """
-    if self._ended:
-      raise errors.Session.ActionError(
-          f'Cannot start action in already ended session {self._session_id}'
-      )
-    start_actions_request = (
-        service_pb2.OpenSessionRequest.StartActionsRequestData(
-            action_instance_ids=action_ids,
-            stop_active_actions=stop_active_actions,
-        )
-    )
-    request = service_pb2.OpenSessionRequest(
-        start_actions_request=start_actions_request
-    )
-    self._request_stream.write(request)
-    response = next(self._response_stream)
-
-    if response.status.code != grpc.StatusCode.OK.value[0]:
-      self._raise_failed_response(
-          response.status, 'Starting an action failed with {}'
-      )
+    self._check_not_ended('Cannot start action in already ended')
+    self._send(
+        _start_actions_request(action_ids, stop_active_actions),
+        'Starting an action failed with {}',
+    ).result()
 
   def start_action_and_wait(
       self,
@@ -711,6 +836,33 @@ class Session:
     self.start_action(action.id, stop_active_actions=True)
     return wait_for.wait(timeout_s)
 
+  def pipeline(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> 'Pipeline':
+    """Returns a Pipeline which sends requests without waiting for responses.
+
+    Building a session with the blocking methods costs one round trip to the
+    server per request. A Pipeline keeps up to `max_in_flight` requests in
+    flight instead:
+
+      with session.pipeline() as pipeline:
+        for action in actions:
+          pipeline.add_action(action)
+        pipeline.start_action(actions[0].id)
+
+    Leaving the with-statement waits for all responses and raises the first
+    error, if any.
+
+    Args:
+      max_in_flight: The maximum number of requests whose responses have not
+        been read.
+
+    Returns:
+      A new Pipeline for this session.
+
+    Raises:
+      ValueError: If max_in_flight is not positive.
+    """
+    return Pipeline(self, max_in_flight)
+
   def open_stream(self, action_id: int, field_name: str) -> 'Stream':
     """Opens a stream for streaming data to the given action.
 
@@ -808,6 +960,185 @@ class Session:
     return self._reaction_responses_error
 
 
+class RequestFuture:
+  """The pending result of a request sent to a session.
+
+  The responses of a session are read in order, so waiting for the result of a
+  request also reads the responses to all requests sent before it.
+  """
+
+  def __init__(self, session: Session, error_msg_format: str):
+    self._session = session
+    self._error_msg_format = error_msg_format
+    self._status: Optional[status_pb2.Status] = None
+    self._error: Optional[Exception] = None
+
+  def done(self) -> bool:
+    """Returns whether the response to the request has been read."""
+    return self._status is not None or self._error is not None
+
+  def result(self) -> None:
+    """Waits for the response to the request.
+
+    Raises:
+      errors.Session.ActionError: The request failed.
+      grpc.RpcError: An error occurred whilst communicating with the server. If
+        the server returned an aborted error then the session will be ended
+        automatically.
+    """
+    # pylint: disable=protected-access
+    while not self.done():
+      self._session._receive_next()
+    if self in self._session._unchecked_failures:
+      self._session._unchecked_failures.remove(self)
+    if self._error is not None:
+      raise self._error
+    if self._status.code != grpc.StatusCode.OK.value[0]:
+      self._session._raise_failed_response(self._status, self._error_msg_format)
+    # pylint: enable=protected-access
+
+  def error(self) -> Optional[Exception]:
+    """Returns the error of the request without waiting for its response.
+
+    Returns:
+      The error that result() raises, or None if the request succeeded or its
+      response has not been read yet.
+    """
+    if self._error is not None:
+      return self._error
+    if self._status is None or self._status.code == grpc.StatusCode.OK.value[0]:
+      return None
+    return self._session._failed_response_error(  # pylint: disable=protected-access
+        self._status, self._error_msg_format
+    )
+
+  def set_status(self, status: status_pb2.Status) -> None:
+    """Sets the status of the response. Called by the session."""
+    self._status = status
+
+  def set_error(self, error: Exception) -> None:
+    """Fails the request with `error`. Called by the session."""
+    self._error = error
+
+
+class Pipeline:
+  """Sends requests to a session without waiting for their responses.
+
+  Requests are sent in order and the server answers them in order, so e.g. an
+  action can be started right after the request that adds it. Each method
+  returns a RequestFuture for the response to its request. Requests are only
+  checked once their results are requested, e.g. by flush().
+
+  A Pipeline should not be directly instantiated, but retrieved via
+  Session.pipeline().
+  """
+
+  def __init__(self, session: Session, max_in_flight: int):
+    """Creates a new Pipeline for the given session.
+
+    Args:
+      session: The session to send requests to.
+      max_in_flight: The maximum number of requests whose responses have not
+        been read.
+
+    Raises:
+      ValueError: If max_in_flight is not positive.
+    """
+    if max_in_flight < 1:
+      raise ValueError(
+          f'max_in_flight must be at least 1, got {max_in_flight}.'
+      )
+    self._session = session
+    self._max_in_flight = max_in_flight
+    self._futures: List[RequestFuture] = []
+
+  def __enter__(self) -> 'Pipeline':
+    """Allows usage in a with-statement context."""
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    """Waits for all responses unless the with-statement raised."""
+    del exc_value, traceback  # Unused.
+    if exc_type is None:
+      self.flush()
+
+  def _send(
+      self, request: service_pb2.OpenSessionRequest, error_msg_format: str
+  ) -> RequestFuture:
+    """Sends a request once fewer than max_in_flight requests are pending."""
+    # pylint: disable=protected-access
+    while self._session._in_flight() >= self._max_in_flight:
+      self._session._receive_next()
+    future = self._session._send(request, error_msg_format)
+    # pylint: enable=protected-access
+    self._futures.append(future)
+    return future
+
+  def add_action(self, action: _actions.Action) -> RequestFuture:
+    """Adds a new Action to the session, see Session.add_action."""
+    return self.add_actions([action])
+
+  def add_actions(self, actions: Iterable[_actions.Action]) -> RequestFuture:
+    """Adds multiple Actions to the session, see Session.add_actions."""
+    return self.prepare(actions)
+
+  def prepare(
+      self,
+      actions: Iterable[_actions.Action],
+      reactions: Iterable[_reactions.Reaction] = (),
+  ) -> RequestFuture:
+    """Adds Actions and free-standing Reactions, see Session.prepare."""
+    # pylint: disable=protected-access
+    self._session._check_not_ended('Cannot add actions to already ended')
+    return self._send(
+        self._session._add_actions_request(actions, reactions),
+        'Adding actions failed with {}',
+    )
+
+  def add_reactions(
+      self,
+      action: Optional[_actions.Action],
+      reactions: Iterable[_reactions.Reaction],
+  ) -> RequestFuture:
+    """Adds reactions to the session, see Session.add_reactions."""
+    # pylint: disable=protected-access
+    self._session._check_not_ended('Cannot add reactions to already ended')
+    return self._send(
+        self._session._add_reactions_request(action, reactions),
+        'Adding actions failed with {}',
+    )
+
+  def start_action(
+      self, action_id: int, stop_active_actions: bool = True
+  ) -> RequestFuture:
+    """Starts the given action, see Session.start_action."""
+    return self.start_parallel_actions([action_id], stop_active_actions)
+
+  def start_parallel_actions(
+      self, action_ids: Sequence[int], stop_active_actions: bool = True
+  ) -> RequestFuture:
+    """Starts the given actions, see Session.start_parallel_actions."""
+    # pylint: disable=protected-access
+    self._session._check_not_ended('Cannot start action in already ended')
+    return self._send(
+        _start_actions_request(action_ids, stop_active_actions),
+        'Starting an action failed with {}',
+    )
+
+  def flush(self) -> None:
+    """Waits for the responses to all requests sent through this pipeline.
+
+    Raises:
+      errors.Session.ActionError: A request failed.
+      grpc.RpcError: An error occurred whilst communicating with the server. If
+        the server returned an aborted error then the session will be ended
+        automatically.
+    """
+    futures, self._futures = self._futures, []
+    for future in futures:
+      future.result()
+
+
 class Stream:
   """Streams allow users to stream data into actions.
 
@@ -11,6 +11,7 @@ from absl.testing import absltest
 from google.protobuf import any_pb2
 from google.protobuf import empty_pb2
 from google.protobuf import timestamp_pb2
+from google.rpc import status_pb2
 import grpc
 from intrinsic.icon.proto import service_pb2
 from intrinsic.icon.proto import streaming_output_pb2
@@ -1130,6 +1131,245 @@ class SessionTest(absltest.TestCase):
     )
 
 
+def _response(code=grpc.StatusCode.OK):
+  return service_pb2.OpenSessionResponse(
+      status=status_pb2.Status(code=code.value[0])
+  )
+
+
+class PipelineTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._stub = mock.MagicMock()
+    self._response_stream = mock.MagicMock()
+    self._stub.OpenSession.return_value = self._response_stream
+    self._stub.WatchReactions.return_value = iter(
+        [service_pb2.WatchReactionsResponse()]
+    )
+    self.enter_context(mock.patch.object(threading, 'Thread', autospec=True))
+
+    initial_response = service_pb2.OpenSessionResponse()
+    initial_response.initial_session_data.session_id = 1
+    self._response_stream.__next__.return_value = initial_response
+    self._session = _session.Session(self._stub, ['foo'])
+    self._request_stream = self.enter_context(
+        mock.patch.object(self._session, '_request_stream', autospec=True)
+    )
+
+  def _set_responses(self, *responses):
+    """Returns the number of requests written whenever a response is read."""
+    writes_per_read = []
+
+    def next_response():
+      writes_per_read.append(self._request_stream.write.call_count)
+      return responses[len(writes_per_read) - 1]
+
+    self._response_stream.__next__.side_effect = next_response
+    return writes_per_read
+
+  def test_requests_are_sent_before_responses_are_read(self):
+    writes_per_read = self._set_responses(*[_response()] * 3)
+    actions = [_actions.Action(i, 'bar', 'foo', None, []) for i in range(2)]
+
+    with self._session.pipeline() as pipeline:
+      futures = [pipeline.add_action(action) for action in actions]
+      futures.append(pipeline.start_action(actions[0].id))
+      self.assertFalse(any(future.done() for future in futures))
+
+    self.assertTrue(all(future.done() for future in futures))
+    self.assertEqual(writes_per_read, [3, 3, 3])
+
+  def test_max_in_flight(self):
+    writes_per_read = self._set_responses(*[_response()] * 5)
+
+    with self._session.pipeline(max_in_flight=2) as pipeline:
+      for i in range(5):
+        pipeline.add_action(_actions.Action(i, 'bar', 'foo', None, []))
+
+    self.assertEqual(writes_per_read, [2, 3, 4, 5, 5])
+
+  def test_invalid_max_in_flight(self):
+    with self.assertRaises(ValueError):
+      self._session.pipeline(max_in_flight=0)
+
+  def test_flush_raises_error_of_failed_request(self):
+    self._set_responses(
+        _response(), _response(grpc.StatusCode.INVALID_ARGUMENT), _response()
+    )
+    pipeline = self._session.pipeline()
+    futures = [
+        pipeline.add_action(_actions.Action(i, 'bar', 'foo', None, []))
+        for i in range(3)
+    ]
+
+    with self.assertRaisesRegex(
+        errors.Session.ActionError,
+        'Adding actions failed with grpc.StatusCode.INVALID_ARGUMENT',
+    ):
+      pipeline.flush()
+    futures[0].result()
+    futures[2].result()
+
+  def test_response_stream_error_fails_pending_requests(self):
+    self._response_stream.__next__.reset_mock()
+    self._response_stream.__next__.side_effect = grpc.RpcError('uh oh')
+    pipeline = self._session.pipeline()
+    futures = [
+        pipeline.add_action(_actions.Action(i, 'bar', 'foo', None, []))
+        for i in range(2)
+    ]
+
+    for future in futures:
+      with self.assertRaisesRegex(grpc.RpcError, 'uh oh'):
+        future.result()
+    self._response_stream.__next__.assert_called_once()
+
+  def test_blocking_call_reads_pending_responses_in_order(self):
+    writes_per_read = self._set_responses(_response(), _response())
+    pipeline = self._session.pipeline()
+    future = pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+
+    self._session.start_action(0)
+
+    self.assertTrue(future.done())
+    self.assertEqual(writes_per_read, [2, 2])
+
+  def test_end_reads_pending_responses(self):
+    self._set_responses(_response())
+    pipeline = self._session.pipeline()
+    future = pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+
+    self.assertTrue(self._session.end())
+    self.assertTrue(future.done())
+
+  def test_end_raises_error_of_unchecked_request(self):
+    self._set_responses(
+        _response(), _response(grpc.StatusCode.INVALID_ARGUMENT)
+    )
+    pipeline = self._session.pipeline()
+    for i in range(2):
+      pipeline.add_action(_actions.Action(i, 'bar', 'foo', None, []))
+
+    with self.assertRaisesRegex(
+        errors.Session.ActionError,
+        'Adding actions failed with grpc.StatusCode.INVALID_ARGUMENT',
+    ):
+      self._session.end()
+    self.assertTrue(self._session._ended)
+    self.assertFalse(self._session.end())
+
+  def test_end_logs_errors_of_all_unchecked_requests(self):
+    self._set_responses(
+        _response(grpc.StatusCode.INVALID_ARGUMENT),
+        _response(grpc.StatusCode.FAILED_PRECONDITION),
+    )
+    pipeline = self._session.pipeline()
+    for i in range(2):
+      pipeline.add_action(_actions.Action(i, 'bar', 'foo', None, []))
+    mock_error = self.enter_context(
+        mock.patch.object(_session.logging, 'error', autospec=True)
+    )
+
+    with self.assertRaisesRegex(errors.Session.ActionError, 'INVALID_ARGUMENT'):
+      self._session.end()
+    logged_errors = [str(call.args[2]) for call in mock_error.call_args_list]
+    self.assertLen(logged_errors, 2)
+    self.assertIn('INVALID_ARGUMENT', logged_errors[0])
+    self.assertIn('FAILED_PRECONDITION', logged_errors[1])
+
+  def test_exit_raises_error_of_unchecked_request(self):
+    self._set_responses(_response(grpc.StatusCode.INVALID_ARGUMENT))
+
+    with self.assertRaisesRegex(errors.Session.ActionError, 'INVALID_ARGUMENT'):
+      with self._session:
+        self._session.pipeline().add_action(
+            _actions.Action(0, 'bar', 'foo', None, [])
+        )
+    self.assertTrue(self._session._ended)
+
+  def test_exit_keeps_exception_of_with_statement(self):
+    self._set_responses(_response(grpc.StatusCode.INVALID_ARGUMENT))
+
+    with self.assertRaisesRegex(ValueError, 'uh oh'):
+      with self._session:
+        with self._session.pipeline() as pipeline:
+          pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+          raise ValueError('uh oh')
+    self.assertTrue(self._session._ended)
+
+  def test_aborted_request_is_raised_over_unchecked_requests(self):
+    self._set_responses(
+        _response(grpc.StatusCode.INVALID_ARGUMENT),
+        _response(grpc.StatusCode.ABORTED),
+    )
+    pipeline = self._session.pipeline()
+    pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+    future = pipeline.add_action(_actions.Action(1, 'bar', 'foo', None, []))
+
+    with self.assertRaisesRegex(grpc.RpcError, 'ABORTED'):
+      future.result()
+    self.assertTrue(self._session._ended)
+
+  def test_end_does_not_raise_errors_of_checked_requests(self):
+    self._set_responses(_response(grpc.StatusCode.INVALID_ARGUMENT))
+    pipeline = self._session.pipeline()
+    pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+    with self.assertRaises(errors.Session.ActionError):
+      pipeline.flush()
+
+    self.assertTrue(self._session.end())
+
+  def test_end_raises_response_stream_error_of_unchecked_request(self):
+    self._response_stream.__next__.reset_mock()
+    self._response_stream.__next__.side_effect = grpc.RpcError('uh oh')
+    pipeline = self._session.pipeline()
+    pipeline.add_action(_actions.Action(0, 'bar', 'foo', None, []))
+
+    with self.assertRaisesRegex(grpc.RpcError, 'uh oh'):
+      self._session.end()
+
+  def test_pipeline_already_ended(self):
+    self._session._ended = True
+
+    with self.assertRaisesRegex(
+        errors.Session.ActionError,
+        'Cannot add actions to already ended session 1',
+    ):
+      self._session.pipeline().add_action(
+          _actions.Action(0, 'bar', 'foo', None, [])
+      )
+    self._request_stream.write.assert_not_called()
+
+  def test_prepare_sends_single_request(self):
+    self._set_responses(_response())
+    actions = [_actions.Action(i, 'bar', 'foo', None, []) for i in range(3)]
+    freestanding_reaction = _reactions.Reaction(
+        _reactions.Condition.is_true('some_condition_var'), []
+    )
+
+    self._session.prepare(actions, [freestanding_reaction])
+
+    self._request_stream.write.assert_called_once()
+    request = self._request_stream.write.call_args.args[0]
+    self.assertLen(request.add_actions_and_reactions.action_instances, 3)
+    self.assertEqual(
+        request.add_actions_and_reactions.reactions,
+        [
+            types_pb2.Reaction(
+                reaction_instance_id=1,
+                condition=types_pb2.Condition(
+                    comparison=types_pb2.Comparison(
+                        state_variable_name='some_condition_var',
+                        operation=types_pb2.Comparison.OpEnum.EQUAL,
+                        bool_value=True,
+                    )
+                ),
+            )
+        ],
+    )
+
+
 class StreamTest(absltest.TestCase):
 
   def setUp(self):
@@ -45,6 +45,8 @@ StateVariablePath = state_variable_path.StateVariablePath
 # to be directly created.
 Session = _session.Session
 Stream = _session.Stream
+Pipeline = _session.Pipeline
+RequestFuture = _session.RequestFuture
 __pdoc__ = {}
 __pdoc__["Session.__init__"] = None
 
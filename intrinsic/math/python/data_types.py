@@ -7,8 +7,11 @@ from typing import Any, Optional, Sequence
 from intrinsic.icon.proto import cart_space_pb2
 from intrinsic.math.python import math_types
 from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
 from intrinsic.math.python import quaternion
+from intrinsic.math.python import quaternion_array
 from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
 from intrinsic.math.python import vector_util
 import numpy as np
 
@@ -16,6 +19,9 @@ VECTOR_TYPE = math_types.VectorType
 Rotation3 = rotation3.Rotation3
 Pose3 = pose3.Pose3
 Quaternion = quaternion.Quaternion
+Pose3Array = pose3_array.Pose3Array
+Rotation3Array = rotation3_array.Rotation3Array
+QuaternionArray = quaternion_array.QuaternionArray
 
 
 class Twist:
@@ -0,0 +1,132 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Micro-benchmarks for the core Pose3, Rotation3 and Quaternion operations.
+
+Prints the time per operation in nanoseconds for each benchmark, e.g.
+
+  bazel run -c opt //intrinsic/math/python:math_benchmark -- \
+      --benchmark_filter=pose3
+"""
+
+import re
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from absl import app
+from absl import flags
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import quaternion
+from intrinsic.math.python import rotation3
+import numpy as np
+
+_BENCHMARK_FILTER = flags.DEFINE_string(
+    'benchmark_filter',
+    '.*',
+    'Regular expression that selects the benchmarks to run by name.',
+)
+_MIN_TIME = flags.DEFINE_float(
+    'min_time',
+    0.2,
+    'Minimum time in seconds that each benchmark is run for a single repeat.',
+)
+_REPEATS = flags.DEFINE_integer(
+    'repeats',
+    5,
+    'Number of repeats per benchmark.  The fastest repeat is reported.',
+)
+
+# Number of poses used by the batched benchmarks.
+_BATCH_SIZE = 1000
+
+
+def _benchmarks() -> List[Tuple[str, Callable[[], object]]]:
+  """Returns (name, function) pairs of all benchmarks."""
+  rng = np.random.default_rng(seed=0)
+  rotation_a = rotation3.Rotation3.random(rng=rng)
+  rotation_b = rotation3.Rotation3.random(rng=rng)
+  pose_a = pose3.Pose3(rotation_a, rng.uniform(-1.0, 1.0, size=3))
+  pose_b = pose3.Pose3(rotation_b, rng.uniform(-1.0, 1.0, size=3))
+  quaternion_a = rotation_a.quaternion
+  quaternion_b = rotation_b.quaternion
+  point = rng.uniform(-1.0, 1.0, size=3)
+  poses = [
+      pose3.Pose3(
+          rotation3.Rotation3.random(rng=rng), rng.uniform(-1.0, 1.0, size=3)
+      )
+      for _ in range(_BATCH_SIZE)
+  ]
+  batch = pose3_array.Pose3Array.from_poses(poses)
+  points = rng.uniform(-1.0, 1.0, size=(_BATCH_SIZE, 3))
+  vec7 = pose_a.vec7
+  return [
+      ('quaternion/multiply', lambda: quaternion_a * quaternion_b),
+      ('quaternion/conjugate', quaternion_a.conjugate),
+      ('quaternion/normalize', quaternion_a.normalize),
+      ('rotation3/multiply', lambda: rotation_a * rotation_b),
+      ('rotation3/inverse', rotation_a.inverse),
+      ('rotation3/rotate_point', lambda: rotation_a.rotate_point(point)),
+      ('rotation3/matrix3x3', rotation_a.matrix3x3),
+      ('pose3/init', lambda: pose3.Pose3(rotation_a, point)),
+      ('pose3/from_vec7', lambda: pose3.Pose3.from_vec7(vec7)),
+      ('pose3/multiply', lambda: pose_a * pose_b),
+      ('pose3/inverse', pose_a.inverse),
+      ('pose3/multiply_by_inverse', lambda: pose_a.multiply_by_inverse(pose_b)),
+      ('pose3/transform_point', lambda: pose_a.transform_point(point)),
+      ('pose3/matrix4x4', pose_a.matrix4x4),
+      (
+          'pose3/multiply_loop_%d' % _BATCH_SIZE,
+          lambda: [pose_a * pose for pose in poses],
+      ),
+      ('pose3_array/multiply_%d' % _BATCH_SIZE, lambda: pose_a * batch),
+      (
+          'pose3_array/transform_points_%d' % _BATCH_SIZE,
+          lambda: batch.transform_points(points),
+      ),
+  ]
+
+
+def run_benchmarks(
+    name_filter: str = '.*', min_time: float = 0.2, repeats: int = 5
+) -> Dict[str, float]:
+  """Runs the benchmarks whose names match name_filter.
+
+  Args:
+    name_filter: Regular expression that selects benchmarks by name.
+    min_time: Minimum time in seconds that a single repeat runs for.
+    repeats: Number of repeats; the fastest repeat is reported.
+
+  Returns:
+    Map from benchmark name to nanoseconds per operation.
+  """
+  pattern = re.compile(name_filter)
+  results = {}
+  for name, function in _benchmarks():
+    if not pattern.search(name):
+      continue
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+      number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeats, number=number))
+    results[name] = best / number * 1e9
+  return results
+
+
+def main(argv):
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  results = run_benchmarks(
+      name_filter=_BENCHMARK_FILTER.value,
+      min_time=_MIN_TIME.value,
+      repeats=_REPEATS.value,
+  )
+  width = max((len(name) for name in results), default=0)
+  print('%-*s %14s' % (width, 'Benchmark', 'ns/op'))
+  for name, ns_per_op in results.items():
+    print('%-*s %14.1f' % (width, name, ns_per_op))
+
+
+if __name__ == '__main__':
+  app.run(main)
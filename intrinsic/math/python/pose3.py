@@ -65,6 +65,8 @@ class Pose3(object):
     from_vec7
   """
 
+  __slots__ = ('_rotation', '_translation')
+
   def __init__(
       self,
       rotation: Optional[rotation3.Rotation3] = None,
@@ -89,6 +91,27 @@ class Pose3(object):
           translation, err_msg=TRANSLATION_INVALID_MESSAGE
       ).copy()
 
+  @classmethod
+  def _from_trusted(
+      cls, rotation: rotation3.Rotation3, translation: np.ndarray
+  ) -> 'Pose3':
+    """Wraps a valid rotation and a finite float64 translation of shape (3,).
+
+    Skips the validation and copies of __init__.  Only used for the results of
+    operations on poses that have already been validated.
+
+    Args:
+      rotation: 3D rotation component of pose.
+      translation: Translation vector, owned by the new pose.
+
+    Returns:
+      A pose that takes ownership of its components.
+    """
+    result = cls.__new__(cls)
+    result._rotation = rotation
+    result._translation = translation
+    return result
+
   # --------------------------------------------------------------------------
   # Properties
   # --------------------------------------------------------------------------
@@ -151,7 +174,7 @@ class Pose3(object):
     Raises:
       ValueError: Raised by rotate_point if the point is not a finite 3D vector.
     """
-    return self.rotation.rotate_point(point) + self.translation
+    return self._rotation.rotate_point(point) + self._translation
 
   def inverse(self) -> 'Pose3':
     """Calculates the inverse of this transform.
@@ -171,9 +194,9 @@ class Pose3(object):
     Returns:
       A pose representing the inverse.
     """
-    rotation_inverse = self.rotation.inverse()
-    translation_inverse = -(rotation_inverse.rotate_point(self.translation))
-    return Pose3(rotation=rotation_inverse, translation=translation_inverse)
+    rotation_inverse = self._rotation.inverse()
+    translation_inverse = -rotation_inverse.rotate_point(self._translation)
+    return Pose3._from_trusted(rotation_inverse, translation_inverse)
 
   def multiply(self, other: 'Pose3') -> 'Pose3':
     """Calculates the product (or composition) of the two transforms.
@@ -198,10 +221,9 @@ class Pose3(object):
     Returns:
       Product of the two poses as a Pose3.
     """
-
-    result_translation = self.transform_point(other.translation)
-    result_rotation = self.rotation * other.rotation
-    return Pose3(rotation=result_rotation, translation=result_translation)
+    result_translation = self.transform_point(other._translation)
+    result_rotation = self._rotation * other._rotation
+    return Pose3._from_trusted(result_rotation, result_translation)
 
   def multiply_by_inverse(self, other: 'Pose3') -> 'Pose3':
     """Calculates the product of the inverse of this transform with the other.
@@ -225,12 +247,12 @@ class Pose3(object):
     Returns:
       Product of the inverse of this transform with the other as a Pose3.
     """
-    rotation_inverse = self.rotation.inverse()
+    rotation_inverse = self._rotation.inverse()
     result_translation = rotation_inverse.rotate_point(
-        other.translation - self.translation
+        other._translation - self._translation
     )
-    result_rotation = rotation_inverse * other.rotation
-    return Pose3(rotation=result_rotation, translation=result_translation)
+    result_rotation = rotation_inverse * other._rotation
+    return Pose3._from_trusted(result_rotation, result_translation)
 
   def almost_equal(
       self,
@@ -276,6 +298,9 @@ class Pose3(object):
 
   def __mul__(self, other: 'Pose3') -> 'Pose3':
     """Returns the product: self * other."""
+    if not isinstance(other, Pose3):
+      # Lets batched types such as Pose3Array implement __rmul__.
+      return NotImplemented
     return self.multiply(other)
 
   def __eq__(self, other: 'Pose3') -> bool:
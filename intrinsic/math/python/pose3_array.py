@@ -0,0 +1,401 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Pose3Array class (python3).
+
+This library implements an array of N 6 degree-of-freedom (6DoF) rigid poses.
+The poses are stored in a single (N, 7) numpy array of [tx, ty, tz, qx, qy, qz,
+qw] rows and all operations are vectorized over the array. Compared to a list
+of Pose3 objects this avoids per-pose Python objects and numpy calls, e.g., when
+post-processing trajectories or scoring many grasp candidates.
+
+The naming conventions of Pose3 apply element-wise:
+
+  world_pose_objects = world_pose_local * local_pose_objects
+  points_world = world_pose_locals.transform_points(points_local)
+"""
+
+from typing import Iterator, Optional, Sequence, Text, Union
+
+from intrinsic.math.python import math_types
+from intrinsic.math.python import pose3
+from intrinsic.math.python import quaternion_array
+from intrinsic.math.python import rotation3_array
+from intrinsic.math.python import vector_util
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+TRANSLATION_INVALID_MESSAGE = 'Translation vectors in Pose3Array.'
+MATRICES_INVALID_MESSAGE = 'Matrices should be (N, 4, 4) homogeneous transforms'
+
+PoseOrArrayType = Union['Pose3Array', pose3.Pose3]
+
+
+def _as_vec7_array(poses: PoseOrArrayType) -> np.ndarray:
+  """Returns the vec7 values of a pose or array as an (N, 7) array."""
+  if isinstance(poses, Pose3Array):
+    return poses._vec7  # pylint: disable=protected-access
+  return poses.vec7[np.newaxis, :]
+
+
+def compose_vec7(a_t_b: np.ndarray, b_t_c: np.ndarray) -> np.ndarray:
+  """Returns a_t_c for two (N, 7) arrays of poses in vec7 form."""
+  return np.concatenate(
+      [
+          a_t_b[:, :3]
+          + quaternion_array.rotate_points_xyzw(a_t_b[:, 3:], b_t_c[:, :3]),
+          quaternion_array.multiply_xyzw(a_t_b[:, 3:], b_t_c[:, 3:]),
+      ],
+      axis=1,
+  )
+
+
+def invert_vec7(a_t_b: np.ndarray) -> np.ndarray:
+  """Returns b_t_a for an (N, 7) array of poses in vec7 form."""
+  conjugate = a_t_b[:, 3:] * np.array([-1, -1, -1, 1], dtype=np.float64)
+  return np.concatenate(
+      [
+          -quaternion_array.rotate_points_xyzw(conjugate, a_t_b[:, :3]),
+          conjugate,
+      ],
+      axis=1,
+  )
+
+
+class Pose3Array(object):
+  """An array of N rigid poses, each a rotation and a translation.
+
+  This is the vectorized counterpart of Pose3. Indexing with an integer returns
+  a Pose3, indexing with a slice, a boolean mask or an index array returns a
+  Pose3Array.
+
+  Binary operations are element-wise. A Pose3 or an array of length 1 is
+  broadcast against arrays of any length, so 'world_pose_local * poses' and
+  'poses * tool_pose' work as expected.
+
+  Properties:
+    rotation: Rotations as a Rotation3Array.
+    quaternion: Rotations as a QuaternionArray.
+    translation: Translations as an (N, 3) numpy array.
+    vec7: (N, 7) array of [tx, ty, tz, qx, qy, qz, qw] rows.
+
+  Factory functions:
+    identity
+    from_vec7
+    from_matrix4x4
+    from_poses
+  """
+
+  def __init__(
+      self,
+      rotation: Optional[rotation3_array.Rotation3Array] = None,
+      translation: Optional[math_types.VectorType] = None,
+  ):
+    """Constructs new poses.
+
+    At least one of rotation and translation must be given. The other one
+    defaults to identity rotations or zero translations, respectively.
+
+    Args:
+      rotation: Rotation components of the poses.
+      translation: Translation components of the poses as an (N, 3) array.
+
+    Raises:
+      ValueError: If neither rotation nor translation is given or if their
+        lengths do not match.
+    """
+    if translation is not None:
+      translation = vector_util.as_finite_vectors(
+          translation, dimension=3, err_msg=TRANSLATION_INVALID_MESSAGE
+      )
+    if rotation is None:
+      if translation is None:
+        raise ValueError(
+            'Pose3Array requires a rotation or a translation, use'
+            ' Pose3Array.identity() for identity poses.'
+        )
+      rotation = rotation3_array.Rotation3Array.identity(translation.shape[0])
+    if translation is None:
+      translation = np.zeros((len(rotation), 3), dtype=np.float64)
+    if translation.shape[0] != len(rotation):
+      raise ValueError(
+          '%s: %d rotations vs. %d translations'
+          % (
+              quaternion_array.LENGTH_MISMATCH_MESSAGE,
+              len(rotation),
+              translation.shape[0],
+          )
+      )
+    self._vec7 = np.concatenate([translation, rotation.quaternion.xyzw], axis=1)
+
+  @classmethod
+  def _from_trusted(cls, vec7: np.ndarray) -> 'Pose3Array':
+    """Wraps an (N, 7) array with unit quaternions owned by the new object."""
+    result = cls.__new__(cls)
+    result._vec7 = vec7
+    return result
+
+  # --------------------------------------------------------------------------
+  # Properties
+  # --------------------------------------------------------------------------
+
+  @property
+  def rotation(self) -> rotation3_array.Rotation3Array:
+    """Returns the rotation components of the poses."""
+    return rotation3_array.Rotation3Array.from_xyzw(self._vec7[:, 3:])
+
+  @property
+  def quaternion(self) -> quaternion_array.QuaternionArray:
+    """Returns the rotation components of the poses as unit quaternions."""
+    return quaternion_array.QuaternionArray(self._vec7[:, 3:])
+
+  @property
+  def translation(self) -> np.ndarray:
+    """Returns the translation components as an (N, 3) numpy array."""
+    return self._vec7[:, :3].copy()
+
+  @property
+  def vec7(self) -> np.ndarray:
+    """Returns the (N, 7) array of [tx, ty, tz, qx, qy, qz, qw] rows."""
+    return self._vec7.copy()
+
+  # --------------------------------------------------------------------------
+  # Sequence protocol
+  # --------------------------------------------------------------------------
+
+  def __len__(self) -> int:
+    return self._vec7.shape[0]
+
+  def __getitem__(
+      self, index: Union[int, slice, Sequence[int], np.ndarray]
+  ) -> Union[pose3.Pose3, 'Pose3Array']:
+    if isinstance(index, (int, np.integer)):
+      return pose3.Pose3.from_vec7(self._vec7[index])
+    return Pose3Array._from_trusted(self._vec7[index].reshape(-1, 7))
+
+  def __iter__(self) -> Iterator[pose3.Pose3]:
+    for vec7 in self._vec7:
+      yield pose3.Pose3.from_vec7(vec7)
+
+  def to_poses(self) -> Sequence[pose3.Pose3]:
+    """Returns the poses as a list of Pose3 objects."""
+    return list(self)
+
+  # --------------------------------------------------------------------------
+  # Utility functions
+  # --------------------------------------------------------------------------
+
+  def transform_points(self, points: math_types.VectorType) -> np.ndarray:
+    """Transforms points by the poses.
+
+    Args:
+      points: An (N, 3) array with one point per pose, or a single point of
+        shape (3,) which is transformed by every pose. If this array has length
+        1, it transforms every point.
+
+    Returns:
+      The transformed points as an (N, 3) array.
+
+    Raises:
+      ValueError: If the points are not finite or the lengths do not match.
+    """
+    points = vector_util.as_finite_vectors(points, dimension=3)
+    quaternion_array.check_broadcastable(len(self), points.shape[0])
+    return self._vec7[:, :3] + quaternion_array.rotate_points_xyzw(
+        self._vec7[:, 3:], points
+    )
+
+  def transform_point(self, point: math_types.VectorType) -> np.ndarray:
+    """Transforms a single 3D point by every pose, see transform_points()."""
+    return self.transform_points(vector_util.as_vector3(point))
+
+  def inverse(self) -> 'Pose3Array':
+    """Returns the inverses of the poses."""
+    return Pose3Array._from_trusted(invert_vec7(self._vec7))
+
+  def multiply(self, other: PoseOrArrayType) -> 'Pose3Array':
+    """Returns the element-wise compositions (self * other).
+
+    Args:
+      other: Right hand operand as a Pose3Array or a Pose3.
+
+    Returns:
+      The products of the poses as a Pose3Array.
+
+    Raises:
+      ValueError: If the lengths of the arrays do not match.
+    """
+    other_vec7 = _as_vec7_array(other)
+    quaternion_array.check_broadcastable(len(self), other_vec7.shape[0])
+    return Pose3Array._from_trusted(compose_vec7(self._vec7, other_vec7))
+
+  def multiply_by_inverse(self, other: PoseOrArrayType) -> 'Pose3Array':
+    """Returns the element-wise products (self^-1 * other)."""
+    other_vec7 = _as_vec7_array(other)
+    quaternion_array.check_broadcastable(len(self), other_vec7.shape[0])
+    conjugate = self._vec7[:, 3:] * np.array([-1, -1, -1, 1], dtype=np.float64)
+    return Pose3Array._from_trusted(
+        np.concatenate(
+            [
+                quaternion_array.rotate_points_xyzw(
+                    conjugate, other_vec7[:, :3] - self._vec7[:, :3]
+                ),
+                quaternion_array.multiply_xyzw(conjugate, other_vec7[:, 3:]),
+            ],
+            axis=1,
+        )
+    )
+
+  def almost_equal(
+      self,
+      other: PoseOrArrayType,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> bool:
+    """Returns True if all poses are equivalent within tolerances."""
+    return bool(np.all(self.is_close(other, rtol=rtol, atol=atol)))
+
+  def is_close(
+      self,
+      other: PoseOrArrayType,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> np.ndarray:
+    """Returns an (N,) bool array which is True for equivalent poses."""
+    other_vec7 = _as_vec7_array(other)
+    quaternion_array.check_broadcastable(len(self), other_vec7.shape[0])
+    translation_close = np.all(
+        np.isclose(self._vec7[:, :3], other_vec7[:, :3], rtol=rtol, atol=atol),
+        axis=1,
+    )
+    rotation_close = rotation3_array.quaternions_close(
+        self._vec7[:, 3:], other_vec7[:, 3:], rtol=rtol, atol=atol
+    )
+    return translation_close & rotation_close
+
+  def matrix4x4(self) -> np.ndarray:
+    """Returns the poses as an (N, 4, 4) array of homogeneous matrices."""
+    matrices = np.zeros((len(self), 4, 4), dtype=np.float64)
+    matrices[:, :3, :3] = self.rotation.matrix3x3()
+    matrices[:, :3, 3] = self._vec7[:, :3]
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+  # --------------------------------------------------------------------------
+  # Operators
+  # --------------------------------------------------------------------------
+
+  def __mul__(self, other: PoseOrArrayType) -> 'Pose3Array':
+    """Returns the element-wise products: self * other."""
+    if isinstance(other, (Pose3Array, pose3.Pose3)):
+      return self.multiply(other)
+    return NotImplemented
+
+  def __rmul__(self, other: pose3.Pose3) -> 'Pose3Array':
+    """Returns the element-wise products: other * self."""
+    if isinstance(other, pose3.Pose3):
+      return Pose3Array._from_trusted(
+          compose_vec7(_as_vec7_array(other), self._vec7)
+      )
+    return NotImplemented
+
+  def __eq__(self, other: 'Pose3Array') -> bool:
+    """Returns true iff the poses are precisely equivalent."""
+    if not isinstance(other, type(self)):
+      return NotImplemented
+    return np.array_equal(self._vec7, other._vec7)
+
+  def __ne__(self, other: 'Pose3Array') -> bool:
+    return not self == other
+
+  __hash__ = None  # This class is not hashable.
+
+  # --------------------------------------------------------------------------
+  # Factory functions
+  # --------------------------------------------------------------------------
+
+  @classmethod
+  def identity(cls, length: int) -> 'Pose3Array':
+    """Returns an array of identity poses."""
+    vec7 = np.zeros((length, 7), dtype=np.float64)
+    vec7[:, 6] = 1.0
+    return cls._from_trusted(vec7)
+
+  @classmethod
+  def from_vec7(
+      cls, vec7_values: math_types.VectorType, normalize: bool = False
+  ) -> 'Pose3Array':
+    """Constructs poses from an (N, 7) array of [tx, ty, tz, qx, qy, qz, qw].
+
+    Args:
+      vec7_values: The (N, 7) array of vec7 rows.
+      normalize: Indicates whether to normalize the quaternions.
+
+    Returns:
+      The poses as a Pose3Array.
+    """
+    vec7 = vector_util.as_finite_vectors(vec7_values, dimension=7)
+    return cls(
+        rotation=rotation3_array.Rotation3Array.from_xyzw(
+            vec7[:, 3:], normalize=normalize
+        ),
+        translation=vec7[:, :3],
+    )
+
+  @classmethod
+  def from_matrix4x4(
+      cls,
+      matrix4x4: np.ndarray,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+      err_msg: Text = '',
+  ) -> 'Pose3Array':
+    """Constructs poses from an (N, 4, 4) array of homogeneous matrices.
+
+    Args:
+      matrix4x4: The 4x4 matrix transformations.
+      rtol: relative error tolerance, passed through to np.allclose.
+      atol: absolute error tolerance, passed through to np.allclose.
+      err_msg: Error message that is added to exception in case of failure.
+
+    Raises:
+      ValueError: If input has wrong shape or is not a rigid transform.
+    """
+    matrix4x4 = np.asarray(matrix4x4, dtype=np.float64)
+    if (
+        matrix4x4.ndim != 3
+        or matrix4x4.shape[1:] != (4, 4)
+        or not np.all(matrix4x4[:, 3, :] == [0, 0, 0, 1])
+    ):
+      raise ValueError(
+          '%s: %s Actual shape: %s\n%s'
+          % (
+              MATRICES_INVALID_MESSAGE,
+              pose3.HOMOGENEOUS_MATRIX_FORM,
+              matrix4x4.shape,
+              err_msg,
+          )
+      )
+    return cls(
+        rotation=rotation3_array.Rotation3Array.from_matrix(
+            matrix4x4, rtol=rtol, atol=atol, err_msg=err_msg
+        ),
+        translation=matrix4x4[:, :3, 3],
+    )
+
+  @classmethod
+  def from_poses(cls, poses: Sequence[pose3.Pose3]) -> 'Pose3Array':
+    """Returns an array of the given poses."""
+    if not poses:
+      return cls.identity(0)
+    return cls._from_trusted(np.stack([pose.vec7 for pose in poses]))
+
+  # --------------------------------------------------------------------------
+  # String representations
+  # --------------------------------------------------------------------------
+
+  def __str__(self) -> Text:
+    return 'Pose3Array(%s)' % self._vec7
+
+  def __repr__(self) -> Text:
+    return 'Pose3Array.from_vec7(%r)' % self._vec7.tolist()
@@ -0,0 +1,136 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.pose3_array."""
+
+from absl.testing import absltest
+from intrinsic.math.python import math_test
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+
+def _random_poses(
+    length: int, rng: np.random.Generator
+) -> pose3_array.Pose3Array:
+  return pose3_array.Pose3Array(
+      rotation=rotation3_array.Rotation3Array.random(length, rng=rng),
+      translation=rng.uniform(-1.0, 1.0, size=(length, 3)),
+  )
+
+
+class Pose3ArrayTest(math_test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(seed=0)
+    self._a = _random_poses(50, rng)
+    self._b = _random_poses(50, rng)
+    self._points = rng.uniform(-1.0, 1.0, size=(50, 3))
+
+  def test_init(self):
+    translation_only = pose3_array.Pose3Array(translation=[[1, 2, 3]])
+    self.assertTrue(
+        translation_only[0].almost_equal(pose3.Pose3(translation=[1, 2, 3]))
+    )
+    rotation_only = pose3_array.Pose3Array(rotation=self._a.rotation)
+    self.assert_all_equal(rotation_only.translation, np.zeros((50, 3)))
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array()
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array(
+          rotation=self._a.rotation, translation=np.zeros((3, 3))
+      )
+
+  def test_properties(self):
+    self.assertEqual(self._a.vec7.shape, (50, 7))
+    self.assertEqual(self._a.translation.shape, (50, 3))
+    self.assertLen(self._a.quaternion, 50)
+    for i, pose in enumerate(self._a):
+      self.assert_all_equal(pose.vec7, self._a.vec7[i])
+
+  def test_from_poses_round_trip(self):
+    poses = self._a.to_poses()
+    self.assertIsInstance(poses[0], pose3.Pose3)
+    self.assertEqual(pose3_array.Pose3Array.from_poses(poses), self._a)
+    self.assertEmpty(pose3_array.Pose3Array.from_poses([]))
+
+  def test_multiply_matches_scalar_pose(self):
+    product = self._a * self._b
+    for i in range(len(self._a)):
+      self.assertTrue(product[i].almost_equal(self._a[i] * self._b[i]))
+
+  def test_multiply_broadcasts_scalar_pose(self):
+    pose = self._b[0]
+    right = self._a * pose
+    left = pose * self._a
+    self.assertIsInstance(left, pose3_array.Pose3Array)
+    for i in range(len(self._a)):
+      self.assertTrue(right[i].almost_equal(self._a[i] * pose))
+      self.assertTrue(left[i].almost_equal(pose * self._a[i]))
+
+  def test_inverse_and_multiply_by_inverse(self):
+    inverse = self._a.inverse()
+    relative = self._a.multiply_by_inverse(self._b)
+    for i in range(len(self._a)):
+      self.assertTrue(inverse[i].almost_equal(self._a[i].inverse()))
+      self.assertTrue(
+          relative[i].almost_equal(self._a[i].multiply_by_inverse(self._b[i]))
+      )
+    self.assertTrue((self._a * inverse).almost_equal(pose3.Pose3()))
+
+  def test_compose_and_invert_vec7(self):
+    self.assert_all_close(
+        pose3_array.compose_vec7(self._a.vec7, self._b.vec7),
+        (self._a * self._b).vec7,
+    )
+    self.assert_all_close(
+        pose3_array.invert_vec7(self._a.vec7), self._a.inverse().vec7
+    )
+
+  def test_transform_points_matches_scalar_pose(self):
+    transformed = self._a.transform_points(self._points)
+    for pose, point, expected in zip(self._a, self._points, transformed):
+      self.assert_all_close(pose.transform_point(point), expected)
+    single = self._a.transform_point([1, 2, 3])
+    self.assert_all_close(single[4], self._a[4].transform_point([1, 2, 3]))
+
+  def test_matrix4x4_round_trip(self):
+    matrices = self._a.matrix4x4()
+    self.assertEqual(matrices.shape, (50, 4, 4))
+    for pose, matrix in zip(self._a, matrices):
+      self.assert_all_close(pose.matrix4x4(), matrix)
+    self.assertTrue(
+        pose3_array.Pose3Array.from_matrix4x4(matrices).almost_equal(self._a)
+    )
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array.from_matrix4x4(np.zeros((2, 4, 4)))
+
+  def test_from_vec7(self):
+    vec7 = self._a.vec7
+    vec7[:, 3:] *= 2.0
+    self.assertTrue(
+        pose3_array.Pose3Array.from_vec7(vec7, normalize=True).almost_equal(
+            self._a
+        )
+    )
+
+  def test_is_close(self):
+    offset = np.zeros((50, 3))
+    offset[:25, 0] = 1.0
+    shifted = pose3_array.Pose3Array(
+        rotation=self._a.rotation, translation=self._a.translation + offset
+    )
+    self.assert_all_equal(self._a.is_close(shifted), [False] * 25 + [True] * 25)
+
+  def test_identity(self):
+    identity = pose3_array.Pose3Array.identity(3)
+    self.assertTrue(identity.almost_equal(pose3.Pose3()))
+    self.assertTrue(
+        identity.rotation.almost_equal(rotation3.Rotation3.identity())
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
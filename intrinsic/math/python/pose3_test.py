@@ -337,6 +337,28 @@ class Pose3Test(parameterized.TestCase, math_test.TestCase):
           pose_normalized.transform_point(v),
       )
 
+  def test_results_do_not_share_state(self):
+    pose = pose3.Pose3.from_vec7((1, 2, 3, 0, 0, 0, 1))
+    product = pose * pose
+    product.translation[0] = 100
+    self.assert_all_equal(product.translation, [2, 4, 6])
+    self.assert_all_equal(pose.translation, [1, 2, 3])
+    inverse = pose.inverse()
+    self.assert_all_equal(inverse.translation, [-1, -2, -3])
+    self.assert_all_equal(pose.translation, [1, 2, 3])
+
+  def test_slots(self):
+    pose = pose3.Pose3()
+    self.assertFalse(hasattr(pose, '__dict__'))
+    with self.assertRaises(AttributeError):
+      pose.name = 'pose'
+
+  def test_transform_point_non_finite(self):
+    with self.assertRaisesRegex(
+        ValueError, vector_util.VECTOR_INFINITE_VALUES_MESSAGE
+    ):
+      pose3.Pose3().transform_point([0, np.nan, 0])
+
 
 if __name__ == '__main__':
   np.random.seed(0)
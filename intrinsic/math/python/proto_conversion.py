@@ -2,7 +2,9 @@
 
 """Converters from intrinsic math protos to commonly used in-memory representations."""
 
+import itertools
 import sys
+from typing import Iterable, List
 
 from intrinsic.math.proto import array_pb2
 from intrinsic.math.proto import matrix_pb2
@@ -11,11 +13,25 @@ from intrinsic.math.proto import pose_pb2
 from intrinsic.math.proto import quaternion_pb2
 from intrinsic.math.proto import vector3_pb2
 from intrinsic.math.python import data_types
+from intrinsic.math.python import math_types
 import numpy as np
 
 
 def ndarray_from_proto(array_proto: array_pb2.Array) -> np.ndarray:
-  """Converts Array proto to np.ndarray."""
+  """Converts Array proto to np.ndarray.
+
+  The data is not copied: the result is a read-only view of the bytes of the
+  proto. Call `.copy()` on the result to get a writeable array.
+
+  Args:
+    array_proto: The array as proto.
+
+  Returns:
+    The array as np.ndarray.
+
+  Raises:
+    ValueError: If the scalar type or byte order of the proto is invalid.
+  """
   if (
       array_proto.byte_order == array_pb2.Array.NO_BYTE_ORDER
       and array_proto.type not in _NO_BYTE_ORDER_SCALAR_TYPES
@@ -114,6 +130,67 @@ def ndarray_to_matrix_proto(matrix: np.ndarray) -> matrix_pb2.Matrixd:
   )
 
 
+def ndarray_from_matrix_protos(
+    protos: Iterable[matrix_pb2.Matrixd],
+) -> np.ndarray:
+  """Converts a sequence of equally sized matrix_pb2.Matrixd to (N, rows, cols).
+
+  Args:
+    protos: The matrices as protos, e.g. a repeated field.
+
+  Raises:
+    ValueError: If the matrices do not all have the same size or if the number
+      of values in a proto does not match its size.
+  Returns:
+    The matrices as np.ndarray of shape (N, rows, cols). If there are no
+    matrices, the shape is (0, 0, 0).
+  """
+  protos = list(protos)
+  if not protos:
+    return np.zeros((0, 0, 0))
+  rows, cols = protos[0].rows, protos[0].cols
+  for index, proto in enumerate(protos):
+    if proto.rows != rows or proto.cols != cols:
+      raise ValueError(
+          f'matrix {index} is {proto.rows}x{proto.cols}, expected'
+          f' {rows}x{cols}.'
+      )
+    if len(proto.values) != rows * cols:
+      raise ValueError(
+          f'matrix {index} is not {rows}x{cols}, it has'
+          f' {len(proto.values)} values.'
+      )
+  values = np.fromiter(
+      itertools.chain.from_iterable(proto.values for proto in protos),
+      dtype=np.float64,
+      count=len(protos) * rows * cols,
+  )
+  # The values of every matrix are stored in column-major order.
+  return values.reshape(len(protos), cols, rows).transpose(0, 2, 1)
+
+
+def ndarray_to_matrix_protos(matrices: np.ndarray) -> List[matrix_pb2.Matrixd]:
+  """Converts an np.ndarray of shape (N, rows, cols) to matrix_pb2.Matrixd.
+
+  Args:
+    matrices: The matrices as numpy array.
+
+  Raises:
+    ValueError: If the input is not a 3D array.
+  Returns:
+    A list of N matrix_pb2.Matrixd.
+  """
+  if len(matrices.shape) != 3:
+    raise ValueError(f'expected a 3D array, got shape {matrices.shape}.')
+  _, rows, cols = matrices.shape
+  # Transposing every matrix makes the row-major flattening column-major.
+  values = matrices.transpose(0, 2, 1).reshape(len(matrices), -1).tolist()
+  return [
+      matrix_pb2.Matrixd(rows=rows, cols=cols, values=matrix_values)
+      for matrix_values in values
+  ]
+
+
 def ndarray_from_point_proto(point_proto: point_pb2.Point) -> np.ndarray:
   """Convert a point_pb2.Point to a size 3 np.ndarray."""
   return np.array([point_proto.x, point_proto.y, point_proto.z])
@@ -140,6 +217,47 @@ def ndarray_to_point_proto(point: np.ndarray) -> point_pb2.Point:
   return point_pb2.Point(x=point[0], y=point[1], z=point[2])
 
 
+def ndarray_from_point_protos(
+    point_protos: Iterable[point_pb2.Point],
+) -> np.ndarray:
+  """Converts a sequence of point_pb2.Point, e.g. a repeated field, to (N, 3).
+
+  Args:
+    point_protos: The points as protos.
+
+  Returns:
+    The points as np.ndarray of shape (N, 3).
+  """
+  values = np.fromiter(
+      itertools.chain.from_iterable(
+          (point.x, point.y, point.z) for point in point_protos
+      ),
+      dtype=np.float64,
+  )
+  return values.reshape(-1, 3)
+
+
+def ndarray_to_point_protos(points: np.ndarray) -> List[point_pb2.Point]:
+  """Converts an np.ndarray of shape (N, 3) to a list of point_pb2.Point.
+
+  The result can be added to a repeated field with `extend()`.
+
+  Args:
+    points: An np.ndarray of shape (N, 3).
+
+  Returns:
+    A list of N point_pb2.Point.
+
+  Raises:
+    ValueError if the input array does not have shape (N, 3).
+  """
+  if points.ndim != 2 or points.shape[1] != 3:
+    raise ValueError(
+        f'Received points of shape {points.shape} but expected (N, 3).'
+    )
+  return [point_pb2.Point(x=x, y=y, z=z) for x, y, z in points.tolist()]
+
+
 def quaternion_from_proto(
     quaternion_proto: quaternion_pb2.Quaternion,
 ) -> data_types.Quaternion:
@@ -187,6 +305,88 @@ def pose_to_proto(pose: data_types.Pose3) -> pose_pb2.Pose:
   return msg
 
 
+def pose_array_from_protos(
+    pose_protos: Iterable[pose_pb2.Pose],
+) -> data_types.Pose3Array:
+  """Converts a sequence of pose protos, e.g. a repeated field, to poses.
+
+  This is the batched equivalent of pose_from_proto.
+
+  Args:
+    pose_protos: The poses as protos.
+
+  Returns:
+    The poses as Pose3Array.
+
+  Raises:
+    ValueError: If any of the quaternions is not normalized.
+  """
+  values = np.fromiter(
+      itertools.chain.from_iterable(
+          (
+              pose.position.x,
+              pose.position.y,
+              pose.position.z,
+              pose.orientation.x,
+              pose.orientation.y,
+              pose.orientation.z,
+              pose.orientation.w,
+          )
+          for pose in pose_protos
+      ),
+      dtype=np.float64,
+  )
+  vec7 = values.reshape(-1, 7)
+  # We expect the quaternions in the input protos to be normalized. Pose3Array
+  # does not require this so we check this explicitly.
+  not_normalized = np.flatnonzero(~_is_normalized(vec7[:, 3:]))
+  if not_normalized.size:
+    raise ValueError(
+        f'Quaternion is not normalized in poses {not_normalized.tolist()}:'
+        f' {vec7[not_normalized, 3:]}'
+    )
+  return data_types.Pose3Array.from_vec7(vec7)
+
+
+def pose_array_to_protos(poses: data_types.Pose3Array) -> List[pose_pb2.Pose]:
+  """Converts poses to a list of pose protos.
+
+  This is the batched equivalent of pose_to_proto. The result can be added to a
+  repeated field with `extend()`.
+
+  Args:
+    poses: The poses to convert.
+
+  Returns:
+    A list of pose protos.
+  """
+  vec7 = poses.vec7
+  # Only normalize quaternions that are not already normalized, as in
+  # pose_to_proto.
+  not_normalized = ~_is_normalized(vec7[:, 3:])
+  if np.any(not_normalized):
+    quaternions = vec7[not_normalized, 3:]
+    vec7[not_normalized, 3:] = quaternions / np.linalg.norm(
+        quaternions, axis=1, keepdims=True
+    )
+  return [
+      pose_pb2.Pose(
+          position=point_pb2.Point(x=tx, y=ty, z=tz),
+          orientation=quaternion_pb2.Quaternion(x=qx, y=qy, z=qz, w=qw),
+      )
+      for tx, ty, tz, qx, qy, qz, qw in vec7.tolist()
+  ]
+
+
+def _is_normalized(xyzw: np.ndarray) -> np.ndarray:
+  """Vectorized Quaternion.is_normalized for an (N, 4) array."""
+  norm_squared = np.einsum('ij,ij->i', xyzw, xyzw)
+  return (
+      np.abs(1 - norm_squared)
+      <= math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE * 2
+  )
+
+
 # Maps between Array.ScalarType and the corresponding numpy dtype.
 _SCALAR_TYPE_TO_DTYPE = {
     array_pb2.Array.ScalarType.BOOL_SCALAR_TYPE: np.dtype('bool'),
@@ -274,6 +274,103 @@ class ProtoConversionTest(parameterized.TestCase):
           np.arange(0, 6).reshape((3, 2, 1))
       )
 
+  def test_ndarray_from_proto_is_zero_copy(self):
+    proto = proto_conversion.ndarray_to_proto(np.arange(6.0).reshape(2, 3))
+    array = proto_conversion.ndarray_from_proto(proto)
+    self.assertFalse(array.flags.writeable)
+    self.assertFalse(array.flags.owndata)
+
+  def test_ndarray_to_from_point_protos(self):
+    points = _rng.rand(5, 3)
+    protos = proto_conversion.ndarray_to_point_protos(points)
+    self.assertLen(protos, 5)
+    self.assertEqual(
+        protos[2], proto_conversion.ndarray_to_point_proto(points[2])
+    )
+    np.testing.assert_array_equal(
+        proto_conversion.ndarray_from_point_protos(protos), points
+    )
+
+  def test_ndarray_from_point_protos_empty(self):
+    self.assertEqual(
+        proto_conversion.ndarray_from_point_protos([]).shape, (0, 3)
+    )
+
+  def test_ndarray_to_point_protos_fails_for_wrong_shape(self):
+    with self.assertRaisesRegex(ValueError, r'expected \(N, 3\)'):
+      proto_conversion.ndarray_to_point_protos(np.zeros(3))
+
+  def test_ndarray_to_from_matrix_protos(self):
+    matrices = _rng.rand(4, 3, 2)
+    protos = proto_conversion.ndarray_to_matrix_protos(matrices)
+    for matrix, proto in zip(matrices, protos):
+      self.assertEqual(proto, proto_conversion.ndarray_to_matrix_proto(matrix))
+    np.testing.assert_array_equal(
+        proto_conversion.ndarray_from_matrix_protos(protos), matrices
+    )
+
+  def test_ndarray_from_matrix_protos_fails_for_different_sizes(self):
+    with self.assertRaisesRegex(ValueError, 'matrix 1 is 1x2, expected 2x1.'):
+      proto_conversion.ndarray_from_matrix_protos([
+          matrix_pb2.Matrixd(rows=2, cols=1, values=[0.0, 1.0]),
+          matrix_pb2.Matrixd(rows=1, cols=2, values=[0.0, 1.0]),
+      ])
+    with self.assertRaisesRegex(
+        ValueError, 'matrix 0 is not 2x1, it has 1 values.'
+    ):
+      proto_conversion.ndarray_from_matrix_protos(
+          [matrix_pb2.Matrixd(rows=2, cols=1, values=[0.0])]
+      )
+
+  def test_pose_array_to_from_protos(self):
+    poses = [
+        data_types.Pose3(
+            translation=_rng.randn(3), rotation=data_types.Rotation3.random()
+        )
+        for _ in range(10)
+    ]
+    pose_array = data_types.Pose3Array.from_poses(poses)
+    protos = proto_conversion.pose_array_to_protos(pose_array)
+    self.assertEqual(
+        protos, [proto_conversion.pose_to_proto(pose) for pose in poses]
+    )
+    self.assertEqual(
+        proto_conversion.pose_array_from_protos(protos), pose_array
+    )
+
+  def test_pose_array_to_protos_not_normalized(self):
+    pose_array = data_types.Pose3Array.from_vec7(
+        [[1, 2, 3, 0, 0, 0, 1.1], [1, 2, 3, 0.5, -0.5, 0.5, -0.5]]
+    )
+    self.assertEqual(
+        proto_conversion.pose_array_to_protos(pose_array),
+        [
+            pose_pb2.Pose(
+                position=point_pb2.Point(x=1, y=2, z=3),
+                orientation=quaternion_pb2.Quaternion(x=0, y=0, z=0, w=1),
+            ),
+            pose_pb2.Pose(
+                position=point_pb2.Point(x=1, y=2, z=3),
+                orientation=quaternion_pb2.Quaternion(
+                    x=0.5, y=-0.5, z=0.5, w=-0.5
+                ),
+            ),
+        ],
+    )
+
+  def test_pose_array_from_protos_fails_for_non_unit_quaternions(self):
+    protos = [
+        pose_pb2.Pose(orientation=quaternion_pb2.Quaternion(w=1.0)),
+        pose_pb2.Pose(
+            orientation=quaternion_pb2.Quaternion(x=0.4, y=0.5, z=0.6, w=0.7)
+        ),
+    ]
+    with self.assertRaisesRegex(ValueError, r'not normalized in poses \[1\]'):
+      proto_conversion.pose_array_from_protos(protos)
+
+  def test_pose_array_from_protos_empty(self):
+    self.assertEmpty(proto_conversion.pose_array_from_protos([]))
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -32,6 +32,70 @@ _QUATERNION_CONJUGATE_SCALE_FACTORS = np.array(
 )
 
 
+def multiply_xyzw(
+    xyzw_a: math_types.Vector4Type, xyzw_b: math_types.Vector4Type
+) -> np.ndarray:
+  """Returns the components of the quaternion product a * b.
+
+  Works on raw [x, y, z, w] components with scalar arithmetic, which is much
+  faster than numpy vector operations for four-component values.  The inputs
+  are not validated.
+
+  Args:
+    xyzw_a: Components of the left hand operand.
+    xyzw_b: Components of the right hand operand.
+
+  Returns:
+    Components of the product as a float64 numpy array.
+  """
+  ax, ay, az, aw = xyzw_a
+  bx, by, bz, bw = xyzw_b
+  return np.array(
+      (
+          aw * bx + bw * ax + ay * bz - az * by,
+          aw * by + bw * ay + az * bx - ax * bz,
+          aw * bz + bw * az + ax * by - ay * bx,
+          aw * bw - ax * bx - ay * by - az * bz,
+      ),
+      dtype=np.float64,
+  )
+
+
+def rotate_point_xyzw(
+    xyzw: math_types.Vector4Type, point: math_types.Vector3Type
+) -> np.ndarray:
+  """Returns the point rotated by the non-zero quaternion: q * p * q^-1.
+
+  Uses the closed form of the sandwich product,
+
+    q p q^-1 = ((w^2 - u.u) p + 2 (u.p) u + 2 w (u x p)) / |q|^2,
+
+  where u is the imaginary part of q, so that no intermediate quaternions are
+  constructed.  The inputs are not validated.
+
+  Args:
+    xyzw: Components of the rotation quaternion.
+    point: Point to be rotated.
+
+  Returns:
+    The rotated point as a float64 numpy array.
+  """
+  qx, qy, qz, qw = xyzw
+  px, py, pz = point[0], point[1], point[2]
+  norm_squared = qx * qx + qy * qy + qz * qz + qw * qw
+  scale = qw * qw - (qx * qx + qy * qy + qz * qz)
+  dot = 2.0 * (qx * px + qy * py + qz * pz)
+  w2 = 2.0 * qw
+  return np.array(
+      (
+          (scale * px + dot * qx + w2 * (qy * pz - qz * py)) / norm_squared,
+          (scale * py + dot * qy + w2 * (qz * px - qx * pz)) / norm_squared,
+          (scale * pz + dot * qz + w2 * (qx * py - qy * px)) / norm_squared,
+      ),
+      dtype=np.float64,
+  )
+
+
 class Quaternion(object):
   """A quaternion represented as an array of four values [x,y,z,w].
 
@@ -59,6 +123,8 @@ class Quaternion(object):
     random_unit: Returns a random Quaternion with magnitude one.
   """
 
+  __slots__ = ('_xyzw',)
+
   def __init__(
       self,
       xyzw: Optional[math_types.VectorType] = None,
@@ -94,6 +160,23 @@ class Quaternion(object):
         err_msg='Quaternion.__init__',
     ).copy()
 
+  @classmethod
+  def _from_trusted(cls, xyzw: np.ndarray) -> 'Quaternion':
+    """Wraps a finite float64 array of shape (4,) owned by the new object.
+
+    Skips the validation of __init__.  Only used for results of operations on
+    quaternions that have already been validated.
+
+    Args:
+      xyzw: Quaternion components.
+
+    Returns:
+      A quaternion that takes ownership of xyzw.
+    """
+    result = cls.__new__(cls)
+    result._xyzw = xyzw
+    return result
+
   # --------------------------------------------------------------------------
   # Properties
   # --------------------------------------------------------------------------
@@ -144,7 +227,9 @@ class Quaternion(object):
     Returns:
       The complex conjugate of the quaternion.
     """
-    return Quaternion(xyzw=self._xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS)
+    return Quaternion._from_trusted(
+        self._xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS
+    )
 
   def is_normalized(
       self, norm_epsilon: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE
@@ -190,17 +275,10 @@ class Quaternion(object):
     Returns:
       The quaternion product: self * other_quaternion.
     """
-    xyzw = np.zeros(4, dtype=np.float64)
-    xyzw[3] = self._xyzw[3] * other_quaternion.xyzw[3] - np.dot(
-        self._xyzw[:3], other_quaternion.xyzw[:3]
+    # The product of finite quaternions is finite, so it skips validation.
+    return Quaternion._from_trusted(
+        multiply_xyzw(self._xyzw.tolist(), other_quaternion._xyzw.tolist())
     )
-    xyzw[:3] = (
-        self._xyzw[3] * other_quaternion.xyzw[:3]
-        + other_quaternion.xyzw[3] * self._xyzw[:3]
-        + np.cross(self._xyzw[:3], other_quaternion.xyzw[:3])
-    )
-
-    return Quaternion(xyzw=xyzw)
 
   def divide(self, other: QuaternionOrScalarType) -> 'Quaternion':
     """Returns the quaternion quotient (self * other.inverse()).
@@ -268,15 +346,18 @@ class Quaternion(object):
 
   def __neg__(self) -> 'Quaternion':
     """Returns the negative (additive inverse) of this quaternion."""
-    return Quaternion(xyzw=-(self._xyzw))
+    return Quaternion._from_trusted(-self._xyzw)
 
   def __mul__(self, other: QuaternionOrScalarType) -> 'Quaternion':
     """Returns the quaternion product of self * other."""
     if isinstance(other, Quaternion):
       return self.multiply(other)
-    else:
+    elif math_types.is_scalar(other):
       # If the operand is a scalar, scale the components.
       return Quaternion(self._xyzw * other)
+    else:
+      # Lets batched types such as QuaternionArray implement __rmul__.
+      return NotImplemented
 
   def __rmul__(self, scale_factor: float) -> 'Quaternion':
     """Returns the quaternion product of other * self."""
@@ -428,7 +509,7 @@ class Quaternion(object):
   @classmethod
   def one(cls) -> 'Quaternion':
     """Returns 1, the multiplicative identity quaternion."""
-    return cls(xyzw=vector_util.one_hot_vector(4, 3))
+    return cls._from_trusted(vector_util.one_hot_vector(4, 3))
 
   @classmethod
   def random_unit(
@@ -0,0 +1,357 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""QuaternionArray class (python3).
+
+This library implements an array of N quaternions stored in a single (N, 4)
+numpy array. All operations are vectorized over the array and broadcast an
+array of length 1 against an array of any length.
+"""
+
+from typing import Iterator, Optional, Sequence, Text, Union
+
+from intrinsic.math.python import math_types
+from intrinsic.math.python import quaternion as quaternion_class
+from intrinsic.math.python import vector_util
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+QUATERNION_ARRAY_INVALID_MESSAGE = (
+    'QuaternionArray components should have shape (N, 4)'
+)
+LENGTH_MISMATCH_MESSAGE = 'Arrays should have the same length or length 1'
+
+# ----------------------------------------------------------------------------
+# Numpy constant matrix for computing the conjugate.
+_QUATERNION_CONJUGATE_SCALE_FACTORS = np.array(
+    [-1, -1, -1, 1], dtype=np.float64
+)
+
+
+def check_broadcastable(length_a: int, length_b: int) -> None:
+  """Raises a ValueError if two arrays cannot be combined element-wise."""
+  if length_a != length_b and length_a != 1 and length_b != 1:
+    raise ValueError(
+        '%s: %d vs. %d' % (LENGTH_MISMATCH_MESSAGE, length_a, length_b)
+    )
+
+
+def multiply_xyzw(xyzw_a: np.ndarray, xyzw_b: np.ndarray) -> np.ndarray:
+  """Returns the Hamilton products of two (N, 4) arrays of xyzw quaternions."""
+  x1, y1, z1, w1 = (
+      xyzw_a[..., 0],
+      xyzw_a[..., 1],
+      xyzw_a[..., 2],
+      xyzw_a[..., 3],
+  )
+  x2, y2, z2, w2 = (
+      xyzw_b[..., 0],
+      xyzw_b[..., 1],
+      xyzw_b[..., 2],
+      xyzw_b[..., 3],
+  )
+  return np.stack(
+      [
+          w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+          w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+          w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+          w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+      ],
+      axis=-1,
+  )
+
+
+def rotate_points_xyzw(xyzw: np.ndarray, points: np.ndarray) -> np.ndarray:
+  """Rotates (N, 3) points by an (N, 4) array of unit xyzw quaternions.
+
+  Computes q * p * q^-1 without constructing quaternions for the points.
+
+  Args:
+    xyzw: Unit quaternions as an (N, 4) or (1, 4) array.
+    points: Points as an (N, 3) or (1, 3) array.
+
+  Returns:
+    The rotated points as an (N, 3) array.
+  """
+  axis = xyzw[..., :3]
+  uv = np.cross(axis, points)
+  return points + 2.0 * (xyzw[..., 3:4] * uv + np.cross(axis, uv))
+
+
+class QuaternionArray(object):
+  """An array of N quaternions represented as an (N, 4) array of [x,y,z,w].
+
+  This is the vectorized counterpart of Quaternion. Indexing with an integer
+  returns a Quaternion, indexing with a slice, a boolean mask or an index array
+  returns a QuaternionArray.
+
+  Properties:
+    xyzw: All coefficients as an (N, 4) numpy array.
+
+  Factory functions:
+    one: Returns N multiplicative identities.
+    random_unit: Returns N random quaternions with magnitude one.
+    from_quaternions: Stacks a sequence of Quaternion objects.
+  """
+
+  def __init__(self, xyzw: math_types.VectorType, normalize: bool = False):
+    """Initializes the quaternions with the xyzw component values.
+
+    Args:
+      xyzw: Quaternion components as an (N, 4) array. A single quaternion of
+        shape (4,) is treated as an array of length 1.
+      normalize: Indicates whether to normalize the quaternions.
+
+    Raises:
+      ValueError: If xyzw has wrong shape or if normalization fails.
+    """
+    self._xyzw = vector_util.as_finite_vectors(
+        xyzw,
+        dimension=4,
+        normalize=normalize,
+        err_msg=QUATERNION_ARRAY_INVALID_MESSAGE,
+    ).copy()
+
+  @classmethod
+  def _from_trusted(cls, xyzw: np.ndarray) -> 'QuaternionArray':
+    """Wraps an (N, 4) float64 array which is owned by the new object."""
+    result = cls.__new__(cls)
+    result._xyzw = xyzw
+    return result
+
+  # --------------------------------------------------------------------------
+  # Properties
+  # --------------------------------------------------------------------------
+
+  @property
+  def xyzw(self) -> np.ndarray:
+    """Returns the (N, 4) component values of the quaternions."""
+    return self._xyzw.copy()
+
+  # --------------------------------------------------------------------------
+  # Sequence protocol
+  # --------------------------------------------------------------------------
+
+  def __len__(self) -> int:
+    return self._xyzw.shape[0]
+
+  def __getitem__(
+      self, index: Union[int, slice, Sequence[int], np.ndarray]
+  ) -> Union[quaternion_class.Quaternion, 'QuaternionArray']:
+    if isinstance(index, (int, np.integer)):
+      return quaternion_class.Quaternion(xyzw=self._xyzw[index])
+    return QuaternionArray._from_trusted(self._xyzw[index].reshape(-1, 4))
+
+  def __iter__(self) -> Iterator[quaternion_class.Quaternion]:
+    for xyzw in self._xyzw:
+      yield quaternion_class.Quaternion(xyzw=xyzw)
+
+  def to_quaternions(self) -> Sequence[quaternion_class.Quaternion]:
+    """Returns the quaternions as a list of Quaternion objects."""
+    return list(self)
+
+  # --------------------------------------------------------------------------
+  # Utility functions
+  # --------------------------------------------------------------------------
+
+  def norm(self) -> np.ndarray:
+    """Returns the magnitudes of all quaternions as an (N,) array."""
+    return np.linalg.norm(self._xyzw, axis=1)
+
+  def conjugate(self) -> 'QuaternionArray':
+    """Returns the complex conjugates of the quaternions."""
+    return QuaternionArray._from_trusted(
+        self._xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS
+    )
+
+  def inverse(self) -> 'QuaternionArray':
+    """Returns the multiplicative inverses of the quaternions.
+
+    Raises:
+      ValueError: If any quaternion cannot be inverted, i.e. |q| == 0.
+    """
+    self.check_non_zero(err_msg='cannot be inverted')
+    return QuaternionArray._from_trusted(
+        self._xyzw
+        * _QUATERNION_CONJUGATE_SCALE_FACTORS
+        / np.sum(self._xyzw * self._xyzw, axis=1, keepdims=True)
+    )
+
+  def normalize(self, err_msg: Text = '') -> 'QuaternionArray':
+    """Returns a normalized copy of the quaternions.
+
+    Raises:
+      ValueError: If any quaternion cannot be normalized, i.e. |q| == 0.
+    """
+    self.check_non_zero(err_msg=err_msg)
+    return QuaternionArray._from_trusted(
+        self._xyzw / self.norm()[:, np.newaxis]
+    )
+
+  def multiply(
+      self,
+      other: Union['QuaternionArray', quaternion_class.Quaternion],
+  ) -> 'QuaternionArray':
+    """Returns the element-wise quaternion products (self * other).
+
+    Args:
+      other: Right hand side operand. A Quaternion or an array of length 1 is
+        multiplied with every element of this array.
+
+    Returns:
+      The quaternion products as a QuaternionArray.
+
+    Raises:
+      ValueError: If the lengths of the arrays do not match.
+    """
+    other_xyzw = _as_xyzw_array(other)
+    check_broadcastable(len(self), other_xyzw.shape[0])
+    return QuaternionArray._from_trusted(multiply_xyzw(self._xyzw, other_xyzw))
+
+  def almost_equal(
+      self,
+      other: Union['QuaternionArray', quaternion_class.Quaternion],
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> bool:
+    """Returns True if all quaternions are equal within tolerances."""
+    other_xyzw = _as_xyzw_array(other)
+    check_broadcastable(len(self), other_xyzw.shape[0])
+    return bool(np.allclose(self._xyzw, other_xyzw, rtol=rtol, atol=atol))
+
+  # --------------------------------------------------------------------------
+  # Operators
+  # --------------------------------------------------------------------------
+
+  def __eq__(self, other: 'QuaternionArray') -> bool:
+    """Returns True iff the quaternion arrays are identical."""
+    if not isinstance(other, type(self)):
+      return NotImplemented
+    return np.array_equal(self._xyzw, other._xyzw)
+
+  def __ne__(self, other: 'QuaternionArray') -> bool:
+    return not self == other
+
+  __hash__ = None  # This class is not hashable.
+
+  def __neg__(self) -> 'QuaternionArray':
+    return QuaternionArray._from_trusted(-self._xyzw)
+
+  def __mul__(
+      self, other: Union['QuaternionArray', quaternion_class.Quaternion]
+  ) -> 'QuaternionArray':
+    """Returns the element-wise quaternion products of self * other."""
+    if isinstance(other, (QuaternionArray, quaternion_class.Quaternion)):
+      return self.multiply(other)
+    return NotImplemented
+
+  def __rmul__(self, other: quaternion_class.Quaternion) -> 'QuaternionArray':
+    """Returns the element-wise quaternion products of other * self."""
+    if isinstance(other, quaternion_class.Quaternion):
+      return QuaternionArray._from_trusted(
+          multiply_xyzw(other.xyzw[np.newaxis, :], self._xyzw)
+      )
+    return NotImplemented
+
+  # --------------------------------------------------------------------------
+  # Checks
+  # --------------------------------------------------------------------------
+
+  def check_non_zero(
+      self,
+      norm_epsilon: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+      err_msg: Text = '',
+  ) -> None:
+    """Raises a ValueError exception if any quaternion is close to zero.
+
+    Args:
+      norm_epsilon: Error tolerance on magnitude.
+      err_msg: Message to be added to error in case of failure.
+
+    Raises:
+      ValueError: If |q| <= norm_epsilon for any quaternion q.
+    """
+    zero = np.flatnonzero(self.norm() <= norm_epsilon)
+    if zero.size:
+      raise ValueError(
+          '%s: indices %s <= %g  %s'
+          % (
+              quaternion_class.QUATERNION_ZERO_MESSAGE,
+              zero.tolist(),
+              norm_epsilon,
+              err_msg,
+          )
+      )
+
+  # --------------------------------------------------------------------------
+  # Factory functions
+  # --------------------------------------------------------------------------
+
+  @classmethod
+  def one(cls, length: int) -> 'QuaternionArray':
+    """Returns an array of multiplicative identity quaternions."""
+    xyzw = np.zeros((length, 4), dtype=np.float64)
+    xyzw[:, 3] = 1.0
+    return cls._from_trusted(xyzw)
+
+  @classmethod
+  def random_unit(
+      cls, length: int, rng: Optional[np.random.Generator] = None
+  ) -> 'QuaternionArray':
+    """Returns random unit quaternions uniformly distributed over SO(3).
+
+    Uses the same Shoemake algorithm as Quaternion.random_unit().
+
+    Args:
+      length: Number of quaternions.
+      rng: A random number generator.
+
+    Returns:
+      A QuaternionArray of unit quaternions.
+    """
+    if not rng:
+      rng = np.random.default_rng()
+    x0, x1, x2 = rng.uniform(low=0.0, high=1.0, size=(3, length))
+    theta1 = 2 * np.pi * x1
+    theta2 = 2 * np.pi * x2
+    r1 = np.sqrt(1 - x0)
+    r2 = np.sqrt(x0)
+    return cls._from_trusted(
+        np.stack(
+            [
+                np.sin(theta1) * r1,
+                np.cos(theta1) * r1,
+                np.sin(theta2) * r2,
+                np.cos(theta2) * r2,
+            ],
+            axis=1,
+        )
+    )
+
+  @classmethod
+  def from_quaternions(
+      cls, quaternions: Sequence[quaternion_class.Quaternion]
+  ) -> 'QuaternionArray':
+    """Returns an array of the given quaternions."""
+    if not quaternions:
+      return cls._from_trusted(np.zeros((0, 4), dtype=np.float64))
+    return cls._from_trusted(np.stack([q.xyzw for q in quaternions]))
+
+  # --------------------------------------------------------------------------
+  # String representations
+  # --------------------------------------------------------------------------
+
+  def __str__(self) -> Text:
+    return 'QuaternionArray(%s)' % self._xyzw
+
+  def __repr__(self) -> Text:
+    return 'QuaternionArray(%r)' % self._xyzw.tolist()
+
+
+def _as_xyzw_array(
+    quaternions: Union[QuaternionArray, quaternion_class.Quaternion],
+) -> np.ndarray:
+  """Returns the components of a quaternion or array as an (N, 4) array."""
+  if isinstance(quaternions, QuaternionArray):
+    return quaternions._xyzw  # pylint: disable=protected-access
+  return quaternions.xyzw[np.newaxis, :]
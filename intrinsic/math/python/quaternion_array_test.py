@@ -0,0 +1,99 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.quaternion_array."""
+
+from absl.testing import absltest
+from intrinsic.math.python import math_test
+from intrinsic.math.python import quaternion
+from intrinsic.math.python import quaternion_array
+import numpy as np
+
+
+class QuaternionArrayTest(math_test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(seed=0)
+    self._a = quaternion_array.QuaternionArray(rng.normal(size=(20, 4)))
+    self._b = quaternion_array.QuaternionArray(rng.normal(size=(20, 4)))
+
+  def test_init(self):
+    self.assertLen(self._a, 20)
+    self.assertEqual(
+        quaternion_array.QuaternionArray([0, 0, 0, 1]).xyzw.shape, (1, 4)
+    )
+    with self.assertRaises(ValueError):
+      quaternion_array.QuaternionArray(np.zeros((3, 3)))
+    with self.assertRaises(ValueError):
+      quaternion_array.QuaternionArray([[0, 0, np.inf, 1]])
+
+  def test_xyzw_is_a_copy(self):
+    xyzw = self._a.xyzw
+    xyzw[0] = 0.0
+    self.assertFalse(np.array_equal(self._a.xyzw, xyzw))
+
+  def test_indexing(self):
+    self.assertIsInstance(self._a[3], quaternion.Quaternion)
+    self.assert_all_equal(self._a[3].xyzw, self._a.xyzw[3])
+    self.assertLen(self._a[2:5], 3)
+    self.assertLen(self._a[self._a.norm() > 1.0], np.sum(self._a.norm() > 1))
+    self.assertLen(list(self._a), 20)
+
+  def test_multiply_matches_scalar_quaternion(self):
+    product = self._a * self._b
+    for a, b, ab in zip(self._a, self._b, product):
+      self.assert_all_close((a * b).xyzw, ab.xyzw)
+
+  def test_multiply_broadcasts_scalar_quaternion(self):
+    q = quaternion.Quaternion([1, 2, 3, 4])
+    right = self._a * q
+    left = q * self._a
+    for i, a in enumerate(self._a):
+      self.assert_all_close((a * q).xyzw, right[i].xyzw)
+      self.assert_all_close((q * a).xyzw, left[i].xyzw)
+
+  def test_multiply_with_mismatched_lengths_raises(self):
+    with self.assertRaises(ValueError):
+      self._a.multiply(self._a[:3])
+
+  def test_conjugate_inverse_and_normalize(self):
+    for a, conjugate, inverse, normalized in zip(
+        self._a,
+        self._a.conjugate(),
+        self._a.inverse(),
+        self._a.normalize(),
+    ):
+      self.assert_all_close(a.conjugate().xyzw, conjugate.xyzw)
+      self.assert_all_close(a.inverse().xyzw, inverse.xyzw)
+      self.assert_all_close(a.normalize().xyzw, normalized.xyzw)
+    self.assertTrue(
+        (self._a * self._a.inverse()).almost_equal(quaternion.Quaternion.one())
+    )
+
+  def test_zero_quaternion_cannot_be_inverted(self):
+    with self.assertRaises(ValueError):
+      quaternion_array.QuaternionArray([[0, 0, 0, 1], [0, 0, 0, 0]]).inverse()
+
+  def test_from_quaternions(self):
+    quaternions = self._a.to_quaternions()
+    self.assertEqual(
+        quaternion_array.QuaternionArray.from_quaternions(quaternions), self._a
+    )
+    self.assertEmpty(quaternion_array.QuaternionArray.from_quaternions([]))
+
+  def test_random_unit(self):
+    random = quaternion_array.QuaternionArray.random_unit(
+        100, rng=np.random.default_rng(seed=1)
+    )
+    self.assert_all_close(random.norm(), np.ones(100))
+
+  def test_one(self):
+    self.assertTrue(
+        quaternion_array.QuaternionArray.one(5).almost_equal(
+            quaternion.Quaternion.one()
+        )
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -20,6 +20,7 @@ import numpy as np
 ROTATION3_INIT_MESSAGE = 'Rotation3 initialization'
 INVALID_AXIS_MESSAGE = 'Invalid rotation axis vector.'
 INVALID_ANGULAR_VELOCITY_MESSAGE = 'Invalid angular velocity.'
+INVALID_POINT_MESSAGE = 'Invalid point to rotate.'
 INVALID_ROTATION_QUATERNION_MESSAGE = (
     'A quaternion representing a rotation should have magnitude 1.'
 )
@@ -88,6 +89,8 @@ class Rotation3(object):
     from_matrix: Extracts rotation from 3x3 rotation matrix.
   """
 
+  __slots__ = ('_quaternion',)
+
   def __init__(
       self,
       quat: quaternion_class.Quaternion = quaternion_class.Quaternion.one(),
@@ -122,6 +125,23 @@ class Rotation3(object):
         % (ROTATION3_INIT_MESSAGE, INVALID_ROTATION_QUATERNION_MESSAGE)
     )
 
+  @classmethod
+  def _from_trusted(cls, quat: quaternion_class.Quaternion) -> 'Rotation3':
+    """Wraps a quaternion that is known to be a valid rotation.
+
+    Skips the checks of __init__.  Only used for the results of operations on
+    rotations that have already been validated, e.g. inverses and products.
+
+    Args:
+      quat: Non-zero quaternion representing the rotation.
+
+    Returns:
+      A rotation that takes ownership of quat.
+    """
+    result = cls.__new__(cls)
+    result._quaternion = quat
+    return result
+
   # --------------------------------------------------------------------------
   # Properties
   # --------------------------------------------------------------------------
@@ -146,12 +166,23 @@ class Rotation3(object):
 
     Returns:
       A 3D vector in a numpy array.
+
+    Raises:
+      ValueError: If the point does not have finite components.
     """
-    q_point = quaternion_class.Quaternion(
-        xyzw=[point[0], point[1], point[2], 0.0]
+    xyz = (float(point[0]), float(point[1]), float(point[2]))
+    if not all(map(math.isfinite, xyz)):
+      raise ValueError(
+          '%s: %r\n%s'
+          % (
+              vector_util.VECTOR_INFINITE_VALUES_MESSAGE,
+              point,
+              INVALID_POINT_MESSAGE,
+          )
+      )
+    return quaternion_class.rotate_point_xyzw(
+        self._quaternion.xyzw.tolist(), xyz
     )
-    q_point_rotated = self._quaternion * q_point * self._quaternion.inverse()
-    return q_point_rotated.xyzw[:3].copy()
 
   def inverse(self) -> 'Rotation3':
     """Returns the inverse of the rotation.
@@ -169,7 +200,7 @@ class Rotation3(object):
     Returns:
       A rotation that is the inverse of this rotation.
     """
-    return Rotation3(self._quaternion.conjugate(), normalize=False)
+    return Rotation3._from_trusted(self._quaternion.conjugate())
 
   def almost_equal(
       self,
@@ -298,26 +329,14 @@ class Rotation3(object):
     Returns:
       3x3 rotation matrix as a numpy array.
     """
-    q = quaternion_class.Quaternion(
-        xyzw=self._quaternion.xyzw / np.linalg.norm(self._quaternion.xyzw)
-    )
+    x, y, z, w = self._quaternion.xyzw.tolist()
+    norm = math.sqrt(x * x + y * y + z * z + w * w)
+    x, y, z, w = x / norm, y / norm, z / norm, w / norm
     # There are two equivalent conversions for quaternion <==> rotation matrix.
     return 2 * np.array([
-        [
-            q.x * q.x + q.w * q.w,
-            q.x * q.y - q.z * q.w,
-            q.x * q.z + q.y * q.w,
-        ],
-        [
-            q.x * q.y + q.z * q.w,
-            q.y * q.y + q.w * q.w,
-            q.y * q.z - q.x * q.w,
-        ],
-        [
-            q.x * q.z - q.y * q.w,
-            q.y * q.z + q.x * q.w,
-            q.z * q.z + q.w * q.w,
-        ],
+        [x * x + w * w, x * y - z * w, x * z + y * w],
+        [x * y + z * w, y * y + w * w, y * z - x * w],
+        [x * z - y * w, y * z + x * w, z * z + w * w],
     ]) - np.identity(3)
 
   def euler_angles(self, radians: bool = False) -> np.ndarray:
@@ -407,7 +426,11 @@ class Rotation3(object):
     Returns:
       The composite rotation (self * other).
     """
-    return Rotation3(self._quaternion * other.quaternion, normalize=False)
+    if not isinstance(other, Rotation3):
+      # Lets batched types such as Rotation3Array implement __rmul__.
+      return NotImplemented
+    # The product of two non-zero quaternions is non-zero.
+    return Rotation3._from_trusted(self._quaternion * other.quaternion)
 
   def __div__(self, other: 'Rotation3') -> 'Rotation3':
     """Returns quotient of this / other (python2).
@@ -456,7 +479,7 @@ class Rotation3(object):
   @classmethod
   def identity(cls) -> 'Rotation3':
     """Returns the identity rotation."""
-    return cls(quat=quaternion_class.Quaternion.one(), normalize=False)
+    return cls._from_trusted(quaternion_class.Quaternion.one())
 
   @classmethod
   def from_xyzw(
@@ -0,0 +1,519 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Rotation3Array class (python3).
+
+This library implements an array of N 3D rotations about axes through the
+origin. The rotations are represented internally as an (N, 4) array of
+normalized quaternions and all operations are vectorized over the array.
+"""
+
+from typing import Iterator, Optional, Sequence, Text, Union
+
+from intrinsic.math.python import math_types
+from intrinsic.math.python import quaternion_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import vector_util
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+ROTATION3_ARRAY_INIT_MESSAGE = 'Rotation3Array initialization'
+MATRICES_WRONG_SHAPE_MESSAGE = 'Matrices should have shape (N, 3, 3)'
+
+# Axis returned when the rotation angle is too small for the axis to be
+# determined.
+_DEFAULT_ROTATION3_AXIS = (0, 0, 1)
+
+RotationOrArrayType = Union['Rotation3Array', rotation3.Rotation3]
+
+
+def _as_xyzw_array(rotations: RotationOrArrayType) -> np.ndarray:
+  """Returns the quaternions of a rotation or array as an (N, 4) array."""
+  if isinstance(rotations, Rotation3Array):
+    return rotations._xyzw  # pylint: disable=protected-access
+  return rotations.quaternion.xyzw[np.newaxis, :]
+
+
+def quaternions_close(
+    xyzw_a: np.ndarray,
+    xyzw_b: np.ndarray,
+    rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+    atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+) -> np.ndarray:
+  """Returns which rows of two (N, 4) arrays perform the same rotation.
+
+  A quaternion and its negative perform the same rotation. The quaternions are
+  normalized before they are compared.
+
+  Args:
+    xyzw_a: Non-zero quaternions as an (N, 4) or (1, 4) array.
+    xyzw_b: Non-zero quaternions as an (N, 4) or (1, 4) array.
+    rtol: relative error tolerance, passed through to np.isclose.
+    atol: absolute error tolerance, passed through to np.isclose.
+
+  Returns:
+    An (N,) bool array.
+  """
+  q1 = xyzw_a / np.linalg.norm(xyzw_a, axis=1, keepdims=True)
+  q2 = xyzw_b / np.linalg.norm(xyzw_b, axis=1, keepdims=True)
+  return np.all(np.isclose(q1, q2, rtol=rtol, atol=atol), axis=1) | np.all(
+      np.isclose(q1, -q2, rtol=rtol, atol=atol), axis=1
+  )
+
+
+class Rotation3Array(object):
+  """An array of N 3D rigid rotations about axes through the origin.
+
+  This is the vectorized counterpart of Rotation3. Indexing with an integer
+  returns a Rotation3, indexing with a slice, a boolean mask or an index array
+  returns a Rotation3Array.
+
+  Binary operations are element-wise. A Rotation3 or an array of length 1 is
+  broadcast against arrays of any length.
+
+  Properties:
+    quaternion: The quaternions that perform the rotations.
+
+  Factory functions:
+    identity
+    random
+    from_xyzw
+    from_rotations
+    from_axis_angle
+    from_matrix
+    from_euler_angles
+  """
+
+  def __init__(
+      self,
+      quat: quaternion_array.QuaternionArray,
+      normalize: bool = False,
+  ):
+    """Constructs Rotation3Array from quaternions.
+
+    If the normalize flag is False, the input quaternions should already be
+    normalized. As for Rotation3, exactly zero quaternions are replaced by the
+    identity.
+
+    Args:
+      quat: Non-zero quaternions representing the rotations.
+      normalize: Indicates whether to normalize the quaternions.
+
+    Raises:
+      ValueError: If any quaternion is zero after normalization or cannot be
+        normalized.
+    """
+    xyzw = quat.xyzw
+    xyzw[np.all(xyzw == 0, axis=1)] = [0, 0, 0, 1]
+    quat = quaternion_array.QuaternionArray(xyzw)
+    if normalize:
+      quat = quat.normalize(err_msg=ROTATION3_ARRAY_INIT_MESSAGE)
+    quat.check_non_zero(
+        err_msg='%s %s'
+        % (
+            ROTATION3_ARRAY_INIT_MESSAGE,
+            rotation3.INVALID_ROTATION_QUATERNION_MESSAGE,
+        )
+    )
+    self._xyzw = quat.xyzw
+
+  @classmethod
+  def _from_trusted(cls, xyzw: np.ndarray) -> 'Rotation3Array':
+    """Wraps an (N, 4) array of unit quaternions owned by the new object."""
+    result = cls.__new__(cls)
+    result._xyzw = xyzw
+    return result
+
+  # --------------------------------------------------------------------------
+  # Properties
+  # --------------------------------------------------------------------------
+
+  @property
+  def quaternion(self) -> quaternion_array.QuaternionArray:
+    """Returns the quaternions that represent the rotations."""
+    return quaternion_array.QuaternionArray(self._xyzw)
+
+  # --------------------------------------------------------------------------
+  # Sequence protocol
+  # --------------------------------------------------------------------------
+
+  def __len__(self) -> int:
+    return self._xyzw.shape[0]
+
+  def __getitem__(
+      self, index: Union[int, slice, Sequence[int], np.ndarray]
+  ) -> Union[rotation3.Rotation3, 'Rotation3Array']:
+    if isinstance(index, (int, np.integer)):
+      return rotation3.Rotation3.from_xyzw(self._xyzw[index])
+    return Rotation3Array._from_trusted(self._xyzw[index].reshape(-1, 4))
+
+  def __iter__(self) -> Iterator[rotation3.Rotation3]:
+    for xyzw in self._xyzw:
+      yield rotation3.Rotation3.from_xyzw(xyzw)
+
+  def to_rotations(self) -> Sequence[rotation3.Rotation3]:
+    """Returns the rotations as a list of Rotation3 objects."""
+    return list(self)
+
+  # --------------------------------------------------------------------------
+  # Utility functions
+  # --------------------------------------------------------------------------
+
+  def rotate_points(self, points: math_types.VectorType) -> np.ndarray:
+    """Rotates points by the rotations.
+
+    Args:
+      points: An (N, 3) array with one point per rotation, or a single point of
+        shape (3,) which is rotated by every rotation. If this array has length
+        1, it rotates every point.
+
+    Returns:
+      The rotated points as an (N, 3) array.
+
+    Raises:
+      ValueError: If the points are not finite or the lengths do not match.
+    """
+    points = vector_util.as_finite_vectors(points, dimension=3)
+    quaternion_array.check_broadcastable(len(self), points.shape[0])
+    return quaternion_array.rotate_points_xyzw(self._xyzw, points)
+
+  def inverse(self) -> 'Rotation3Array':
+    """Returns the inverses of the rotations."""
+    return Rotation3Array._from_trusted(
+        self._xyzw * np.array([-1, -1, -1, 1], dtype=np.float64)
+    )
+
+  def multiply(self, other: RotationOrArrayType) -> 'Rotation3Array':
+    """Returns the element-wise compositions (self * other)."""
+    other_xyzw = _as_xyzw_array(other)
+    quaternion_array.check_broadcastable(len(self), other_xyzw.shape[0])
+    return Rotation3Array._from_trusted(
+        quaternion_array.multiply_xyzw(self._xyzw, other_xyzw)
+    )
+
+  def almost_equal(
+      self,
+      other: RotationOrArrayType,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> bool:
+    """Returns True if all rotations are equivalent within tolerances.
+
+    A quaternion and its negative perform the same rotation.
+
+    Args:
+      other: Rotations to compare against self.
+      rtol: relative error tolerance, passed through to np.isclose.
+      atol: absolute error tolerance, passed through to np.isclose.
+
+    Returns:
+      True if all pairs of rotations are equivalent within tolerances.
+    """
+    return bool(np.all(self.is_close(other, rtol=rtol, atol=atol)))
+
+  def is_close(
+      self,
+      other: RotationOrArrayType,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> np.ndarray:
+    """Returns an (N,) bool array which is True for equivalent rotations."""
+    other_xyzw = _as_xyzw_array(other)
+    quaternion_array.check_broadcastable(len(self), other_xyzw.shape[0])
+    return quaternions_close(self._xyzw, other_xyzw, rtol=rtol, atol=atol)
+
+  def _axis_and_half_angle_values(self, default_axis: math_types.Vector3Type):
+    """Returns axes and sine and cosine values of the half angles."""
+    xyzw = np.where(self._xyzw[:, 3:4] < 0, -self._xyzw, self._xyzw)
+    sin_half_angle = np.linalg.norm(xyzw[:, :3], axis=1)
+    cos_half_angle = xyzw[:, 3]
+    resolvable = sin_half_angle > math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE
+    axis = np.where(
+        resolvable[:, np.newaxis],
+        xyzw[:, :3] / np.where(resolvable, sin_half_angle, 1.0)[:, np.newaxis],
+        vector_util.as_unit_vector3(default_axis),
+    )
+    return axis, sin_half_angle, cos_half_angle
+
+  def axis(
+      self, default_axis: math_types.Vector3Type = _DEFAULT_ROTATION3_AXIS
+  ) -> np.ndarray:
+    """Returns the axes of rotation as an (N, 3) array of unit vectors.
+
+    For rotations that are too small to resolve the axis, the default axis is
+    returned instead.
+
+    Args:
+      default_axis: Axis returned if the angle is too small.
+    """
+    axis, _, _ = self._axis_and_half_angle_values(default_axis)
+    return axis
+
+  def angle(self) -> np.ndarray:
+    """Returns the angles of rotation in radians in [0, pi] as an (N,) array."""
+    _, sin_half_angle, cos_half_angle = self._axis_and_half_angle_values(
+        _DEFAULT_ROTATION3_AXIS
+    )
+    return 2 * np.arctan2(sin_half_angle, cos_half_angle)
+
+  def matrix3x3(self) -> np.ndarray:
+    """Returns the rotation matrices as an (N, 3, 3) array."""
+    q = self._xyzw / np.linalg.norm(self._xyzw, axis=1, keepdims=True)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    matrices = 2 * np.stack(
+        [
+            np.stack([x * x + w * w, x * y - z * w, x * z + y * w], axis=-1),
+            np.stack([x * y + z * w, y * y + w * w, y * z - x * w], axis=-1),
+            np.stack([x * z - y * w, y * z + x * w, z * z + w * w], axis=-1),
+        ],
+        axis=1,
+    )
+    return matrices - np.identity(3)
+
+  def euler_angles(self, radians: bool = False) -> np.ndarray:
+    """Returns the roll-pitch-yaw Euler angles of the rotations.
+
+    Uses the same convention as Rotation3.euler_angles().
+
+    Args:
+      radians: Indicates whether the result should be returns as radians or
+        degrees.
+
+    Returns:
+      An (N, 3) array of roll, pitch, and yaw in degrees or radians.
+    """
+    matrix = self.matrix3x3()
+    cos_pitch = np.linalg.norm(matrix[:, 2, 1:], axis=1)
+    pitch = np.arctan2(-matrix[:, 2, 0], cos_pitch)
+    gimbal_lock = cos_pitch < 1e-3
+    roll = np.where(
+        gimbal_lock, 0.0, np.arctan2(matrix[:, 2, 1], matrix[:, 2, 2])
+    )
+    yaw = np.where(
+        gimbal_lock,
+        np.arctan2(-matrix[:, 0, 1], matrix[:, 1, 1]),
+        np.arctan2(matrix[:, 1, 0], matrix[:, 0, 0]),
+    )
+    rpy_radians = np.stack([roll, pitch, yaw], axis=1)
+    if radians:
+      return rpy_radians
+    return np.degrees(rpy_radians)
+
+  # --------------------------------------------------------------------------
+  # Operators
+  # --------------------------------------------------------------------------
+
+  def __eq__(self, other: 'Rotation3Array') -> bool:
+    """Returns True iff the rotations are identical."""
+    if not isinstance(other, type(self)):
+      return NotImplemented
+    return np.array_equal(self._xyzw, other._xyzw)
+
+  def __ne__(self, other: 'Rotation3Array') -> bool:
+    return not self == other
+
+  __hash__ = None  # This class is not hashable.
+
+  def __mul__(self, other: RotationOrArrayType) -> 'Rotation3Array':
+    """Returns the element-wise compositions (self * other)."""
+    if isinstance(other, (Rotation3Array, rotation3.Rotation3)):
+      return self.multiply(other)
+    return NotImplemented
+
+  def __rmul__(self, other: rotation3.Rotation3) -> 'Rotation3Array':
+    """Returns the element-wise compositions (other * self)."""
+    if isinstance(other, rotation3.Rotation3):
+      return Rotation3Array._from_trusted(
+          quaternion_array.multiply_xyzw(_as_xyzw_array(other), self._xyzw)
+      )
+    return NotImplemented
+
+  # --------------------------------------------------------------------------
+  # Factory functions
+  # --------------------------------------------------------------------------
+
+  @classmethod
+  def identity(cls, length: int) -> 'Rotation3Array':
+    """Returns an array of identity rotations."""
+    return cls._from_trusted(quaternion_array.QuaternionArray.one(length).xyzw)
+
+  @classmethod
+  def random(
+      cls, length: int, rng: Optional[np.random.Generator] = None
+  ) -> 'Rotation3Array':
+    """Returns random rotations generated using a RNG."""
+    return cls._from_trusted(
+        quaternion_array.QuaternionArray.random_unit(length, rng=rng).xyzw
+    )
+
+  @classmethod
+  def from_xyzw(
+      cls, xyzw: math_types.VectorType, normalize: bool = False
+  ) -> 'Rotation3Array':
+    """Returns rotations with the given (N, 4) quaternion components."""
+    return cls(quaternion_array.QuaternionArray(xyzw), normalize=normalize)
+
+  @classmethod
+  def from_rotations(
+      cls, rotations: Sequence[rotation3.Rotation3]
+  ) -> 'Rotation3Array':
+    """Returns an array of the given rotations."""
+    return cls._from_trusted(
+        quaternion_array.QuaternionArray.from_quaternions(
+            [rotation.quaternion for rotation in rotations]
+        ).xyzw
+    )
+
+  @classmethod
+  def from_axis_angle(
+      cls,
+      axis: math_types.VectorType,
+      angle: math_types.VectorType,
+      err_msg: Text = '',
+  ) -> 'Rotation3Array':
+    """Returns rotations about the axes by the angles.
+
+    Args:
+      axis: Direction vectors of the axes as an (N, 3) array or a single axis.
+      angle: Angles of rotation in radians as an (N,) array or a scalar.
+      err_msg: Error message string added to exception in case of invalid input.
+
+    Returns:
+      The rotations defined by the axes and angles.
+
+    Raises:
+      ValueError: If any axis has magnitude zero or the lengths do not match.
+    """
+    axis = vector_util.as_finite_vectors(
+        axis,
+        dimension=3,
+        normalize=True,
+        err_msg='%s %s' % (err_msg, rotation3.INVALID_AXIS_MESSAGE),
+    )
+    half_angle = 0.5 * np.atleast_1d(np.asarray(angle, dtype=np.float64))
+    quaternion_array.check_broadcastable(axis.shape[0], half_angle.shape[0])
+    return cls._from_trusted(
+        np.concatenate(
+            [
+                axis * np.sin(half_angle)[:, np.newaxis],
+                np.broadcast_to(
+                    np.cos(half_angle)[:, np.newaxis],
+                    (max(axis.shape[0], half_angle.shape[0]), 1),
+                ),
+            ],
+            axis=1,
+        )
+    )
+
+  @classmethod
+  def from_matrix(
+      cls,
+      matrix: np.ndarray,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+      err_msg: Text = '',
+  ) -> 'Rotation3Array':
+    """Returns the rotations of an (N, 3, 3) array of rotation matrices.
+
+    Only the upper 3x3 submatrices are used if (N, 4, 4) matrices are given.
+
+    Args:
+      matrix: Rotation matrices, one per rotation.
+      rtol: relative error tolerance, passed through to np.allclose.
+      atol: absolute error tolerance, passed through to np.allclose.
+      err_msg: Error message string added to exception in case of invalid input.
+
+    Raises:
+      ValueError: If the input is not an array of rotation matrices.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 3 or matrix.shape[1] < 3 or matrix.shape[2] < 3:
+      raise ValueError(
+          '%s: %s\n%s' % (MATRICES_WRONG_SHAPE_MESSAGE, matrix.shape, err_msg)
+      )
+    m = matrix[:, :3, :3]
+    eye = np.matmul(m, np.transpose(m, (0, 2, 1)))
+    if not np.allclose(eye, np.identity(3), rtol=rtol, atol=atol):
+      raise ValueError(
+          '%s\n%s' % (rotation3.MATRIX_NOT_ORTHOGONAL_MESSAGE, err_msg)
+      )
+    # Computes all four candidates for the largest quaternion component and
+    # selects the numerically most stable one per matrix, like
+    # Rotation3.from_matrix().
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+    candidates = np.stack(
+        [
+            np.stack(
+                [1 + m00 - m11 - m22, m01 + m10, m20 + m02, m21 - m12], axis=-1
+            ),
+            np.stack(
+                [m01 + m10, 1 + m11 - m22 - m00, m12 + m21, m02 - m20], axis=-1
+            ),
+            np.stack(
+                [m20 + m02, m12 + m21, 1 + m22 - m00 - m11, m10 - m01], axis=-1
+            ),
+            np.stack(
+                [m21 - m12, m02 - m20, m10 - m01, 1 + m00 + m11 + m22], axis=-1
+            ),
+        ],
+        axis=1,
+    )
+    diagonal = np.stack(
+        [
+            1 + m00 - m11 - m22,
+            1 + m11 - m22 - m00,
+            1 + m22 - m00 - m11,
+            1 + m00 + m11 + m22,
+        ],
+        axis=1,
+    )
+    best = np.argmax(diagonal, axis=1)
+    rows = np.arange(m.shape[0])
+    xyzw = (
+        candidates[rows, best]
+        * (0.5 / np.sqrt(diagonal[rows, best]))[:, np.newaxis]
+    )
+    xyzw = np.where(xyzw[:, 3:4] < 0, -xyzw, xyzw)
+    return cls._from_trusted(xyzw)
+
+  @classmethod
+  def from_euler_angles(
+      cls,
+      rpy_degrees: Optional[math_types.VectorType] = None,
+      rpy_radians: Optional[math_types.VectorType] = None,
+  ) -> 'Rotation3Array':
+    """Returns rotations from (N, 3) arrays of Euler angles (roll, pitch, yaw).
+
+    Uses the same convention as Rotation3.from_euler_angles().
+
+    Args:
+      rpy_degrees: roll, pitch, and yaw in degrees.
+      rpy_radians: roll, pitch, and yaw in radians.
+
+    Raises:
+      ValueError: If the inputs are invalid.
+    """
+    if rpy_degrees is not None:
+      rpy_radians = np.radians(rpy_degrees)
+    if rpy_radians is None:
+      raise ValueError(
+          'Rotation3Array.from_euler_angles requires rpy_degrees or'
+          ' rpy_radians.'
+      )
+    rpy_radians = vector_util.as_finite_vectors(rpy_radians, dimension=3)
+    roll = cls.from_axis_angle((1, 0, 0), rpy_radians[:, 0])
+    pitch = cls.from_axis_angle((0, 1, 0), rpy_radians[:, 1])
+    yaw = cls.from_axis_angle((0, 0, 1), rpy_radians[:, 2])
+    return yaw * pitch * roll
+
+  # --------------------------------------------------------------------------
+  # String representations
+  # --------------------------------------------------------------------------
+
+  def __str__(self) -> Text:
+    return 'Rotation3Array(%s)' % quaternion_array.QuaternionArray(self._xyzw)
+
+  def __repr__(self) -> Text:
+    return 'Rotation3Array(%r)' % quaternion_array.QuaternionArray(self._xyzw)
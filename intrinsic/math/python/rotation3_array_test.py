@@ -0,0 +1,127 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.rotation3_array."""
+
+from absl.testing import absltest
+from intrinsic.math.python import math_test
+from intrinsic.math.python import quaternion_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+
+class Rotation3ArrayTest(math_test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(seed=0)
+    self._a = rotation3_array.Rotation3Array.random(50, rng=rng)
+    self._b = rotation3_array.Rotation3Array.random(50, rng=rng)
+    self._points = rng.uniform(-1.0, 1.0, size=(50, 3))
+
+  def test_init_replaces_zero_quaternions_by_identity(self):
+    rotations = rotation3_array.Rotation3Array(
+        quaternion_array.QuaternionArray([[0, 0, 0, 0], [0, 0, 0, 2]]),
+        normalize=True,
+    )
+
+    self.assertTrue(rotations.almost_equal(rotation3.Rotation3.identity()))
+
+  def test_indexing(self):
+    self.assertIsInstance(self._a[0], rotation3.Rotation3)
+    self.assertEqual(self._a[7], self._a.to_rotations()[7])
+    self.assertLen(self._a[::2], 25)
+
+  def test_rotate_points_matches_scalar_rotation(self):
+    rotated = self._a.rotate_points(self._points)
+    for rotation, point, expected in zip(self._a, self._points, rotated):
+      self.assert_all_close(rotation.rotate_point(point), expected)
+
+  def test_rotate_single_point(self):
+    rotated = self._a.rotate_points([1, 0, 0])
+    self.assertEqual(rotated.shape, (50, 3))
+    self.assert_all_close(rotated[3], self._a[3].rotate_point([1, 0, 0]))
+
+  def test_multiply_and_inverse_match_scalar_rotation(self):
+    product = self._a * self._b
+    inverse = self._a.inverse()
+    for i in range(len(self._a)):
+      self.assertTrue(product[i].almost_equal(self._a[i] * self._b[i]))
+      self.assertTrue(inverse[i].almost_equal(self._a[i].inverse()))
+    self.assertTrue(
+        (self._a * inverse).almost_equal(rotation3.Rotation3.identity())
+    )
+
+  def test_multiply_broadcasts_scalar_rotation(self):
+    rotation = self._b[0]
+    right = self._a * rotation
+    left = rotation * self._a
+    for i in range(len(self._a)):
+      self.assertTrue(right[i].almost_equal(self._a[i] * rotation))
+      self.assertTrue(left[i].almost_equal(rotation * self._a[i]))
+
+  def test_almost_equal_accepts_negated_quaternions(self):
+    negated = rotation3_array.Rotation3Array(-self._a.quaternion)
+    self.assertTrue(self._a.almost_equal(negated))
+    self.assertFalse(self._a.almost_equal(self._b))
+    self.assertFalse(np.all(self._a.is_close(self._b)))
+
+  def test_matrix_round_trip(self):
+    matrices = self._a.matrix3x3()
+    self.assertEqual(matrices.shape, (50, 3, 3))
+    for rotation, matrix in zip(self._a, matrices):
+      self.assert_all_close(rotation.matrix3x3(), matrix)
+    self.assertTrue(
+        rotation3_array.Rotation3Array.from_matrix(matrices).almost_equal(
+            self._a
+        )
+    )
+
+  def test_from_matrix_rejects_non_rotations(self):
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_matrix(np.ones((2, 3, 3)))
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_matrix(np.identity(3))
+
+  def test_euler_angles_round_trip(self):
+    rpy = self._a.euler_angles(radians=True)
+    for rotation, expected in zip(self._a, rpy):
+      self.assert_all_close(rotation.euler_angles(radians=True), expected)
+    self.assertTrue(
+        rotation3_array.Rotation3Array.from_euler_angles(
+            rpy_radians=rpy
+        ).almost_equal(self._a)
+    )
+    self.assertTrue(
+        rotation3_array.Rotation3Array.from_euler_angles(
+            rpy_degrees=np.degrees(rpy)
+        ).almost_equal(self._a)
+    )
+
+  def test_axis_angle_round_trip(self):
+    axis = self._a.axis()
+    angle = self._a.angle()
+    for i, rotation in enumerate(self._a):
+      self.assert_all_close(rotation.axis(), axis[i])
+      self.assertAlmostEqual(rotation.angle(), angle[i])
+    self.assertTrue(
+        rotation3_array.Rotation3Array.from_axis_angle(
+            axis, angle
+        ).almost_equal(self._a)
+    )
+
+  def test_axis_of_identity_is_default_axis(self):
+    identity = rotation3_array.Rotation3Array.identity(2)
+    self.assert_all_equal(identity.axis(), [[0, 0, 1], [0, 0, 1]])
+    self.assert_all_equal(identity.angle(), [0, 0])
+
+  def test_from_axis_angle_with_single_axis(self):
+    rotations = rotation3_array.Rotation3Array.from_axis_angle(
+        [0, 0, 1], [0.0, np.pi / 2]
+    )
+    self.assertLen(rotations, 2)
+    self.assert_all_close(rotations.rotate_points([1, 0, 0])[1], [0, 1, 0])
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -853,6 +853,19 @@ class Rotation3Test(parameterized.TestCase, math_test.TestCase):
         np.ones(2),
     )
 
+  def test_rotate_point_non_finite(self):
+    for point in ([np.inf, 0, 0], [0, 0, np.nan]):
+      self.assertRaisesRegex(
+          ValueError,
+          rotation3.INVALID_POINT_MESSAGE,
+          rotation3.Rotation3.identity().rotate_point,
+          point,
+      )
+
+  def test_slots(self):
+    self.assertFalse(hasattr(rotation3.Rotation3.identity(), '__dict__'))
+    self.assertFalse(hasattr(quaternion.Quaternion.one(), '__dict__'))
+
 
 if __name__ == '__main__':
   absltest.main()
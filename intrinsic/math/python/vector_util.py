@@ -144,6 +144,55 @@ def as_finite_vector(
   return vector
 
 
+def as_finite_vectors(
+    values: math_types.VectorType,
+    dimension: int,
+    normalize: bool = False,
+    dtype: Union[np.dtype, Type[np.number]] = np.float64,
+    err_msg: Text = '',
+) -> np.ndarray:
+  """Interprets the values as an (N, dimension) array of N vectors.
+
+  A single vector with <dimension> components is interpreted as an array of one
+  vector. All values must be finite.
+
+  Args:
+    values: Input vectors, one per row.
+    dimension: Number of components of every vector.
+    normalize: Indicates whether to normalize every vector.
+    dtype: Numeric type of array.
+    err_msg: Error message string appended to exception in case of failure.
+
+  Returns:
+    A numpy array with shape (N, dimension).
+
+  Raises:
+    ValueError: If the inputs do not have the correct shape, are not finite or
+      if normalize is True and any vector has near zero magnitude.
+  """
+  vectors = np.asarray(values, dtype=dtype)
+  if vectors.ndim == 1:
+    vectors = vectors.reshape(1, -1)
+  if vectors.ndim != 2 or vectors.shape[1] != dimension:
+    raise ValueError(
+        '%s: Expected shape (N, %d), but found %s\n%s'
+        % (VECTOR_COMPONENTS_MESSAGE, dimension, vectors.shape, err_msg)
+    )
+  if not np.all(np.isfinite(vectors)):
+    raise ValueError(
+        '%s: %r\n%s' % (VECTOR_INFINITE_VALUES_MESSAGE, vectors, err_msg)
+    )
+  if normalize:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    if np.any(norms <= math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE):
+      raise ValueError(
+          '%s: %r\n%s'
+          % ('Vector has nearly zero magnitude.', vectors, err_msg)
+      )
+    vectors = vectors / norms
+  return vectors
+
+
 def as_vector3(
     values: math_types.VectorType,
     dtype: Union[np.dtype, Type[np.number]] = np.float64,
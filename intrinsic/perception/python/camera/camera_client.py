@@ -100,6 +100,36 @@ class CameraClient:
     Raises:
       grpc.RpcError: A gRPC error occurred.
     """
+    request = self._capture_request(timeout, sensor_ids)
+    response = self._camera_stub.Capture(request)
+    return response.capture_result
+
+  def capture_async(
+      self,
+      timeout: Optional[datetime.timedelta] = None,
+      sensor_ids: Optional[List[int]] = None,
+  ) -> grpc.Future:
+    """Starts a capture from the requested sensors without waiting for it.
+
+    Several captures can be in flight at the same time, which hides the round
+    trip latency when capturing continuously.
+
+    Args:
+      timeout: Optional. See capture().
+      sensor_ids: Optional. See capture().
+
+    Returns:
+      A grpc.Future whose result is a camera_server_pb2.CaptureResponse.
+    """
+    request = self._capture_request(timeout, sensor_ids)
+    return self._camera_stub.Capture.future(request)
+
+  def _capture_request(
+      self,
+      timeout: Optional[datetime.timedelta],
+      sensor_ids: Optional[List[int]],
+  ) -> camera_server_pb2.CaptureRequest:
+    """Creates a capture request for the camera."""
     request = camera_server_pb2.CaptureRequest(
         camera_handle=self._camera_handle
     )
@@ -107,8 +137,7 @@ class CameraClient:
       request.timeout.FromTimedelta(timeout)
     if sensor_ids is not None:
       request.sensor_ids[:] = sensor_ids
-    response = self._camera_stub.Capture(request)
-    return response.capture_result
+    return request
 
   def read_camera_setting_properties(
       self,
@@ -15,7 +15,9 @@ from intrinsic.math.python import pose3
 from intrinsic.perception.proto import camera_config_pb2
 from intrinsic.perception.proto import camera_params_pb2
 from intrinsic.perception.python.camera import camera_client
+from intrinsic.perception.python.camera import capture_stream
 from intrinsic.perception.python.camera import data_classes
+from intrinsic.perception.service.proto import camera_server_pb2
 from intrinsic.resources.proto import resource_handle_pb2
 from intrinsic.skills.proto import equipment_pb2
 from intrinsic.skills.python import proto_utils
@@ -107,6 +109,11 @@ class Camera:
     capture_result = camera.multi_sensor_capture()
     for sensor_name, sensor_image in capture_result.sensor_images.items():
       pass  # access each sensor's image buffer using sensor_image.array
+
+    # or capture continuously
+    with camera.stream(max_fps=30) as stream:
+      for capture_result in stream:
+        pass  # process the latest capture result
     ```
     ...
   """
@@ -544,21 +551,7 @@ class Camera:
       grpc.RpcError: A gRPC error occurred.
     """
     try:
-      if sensor_names is not None:
-        if not self.factory_sensor_info:
-          raise ValueError(
-              "No factory sensor info found, cannot find sensor ids for"
-              f" {sensor_names}"
-          )
-        sensor_ids: List[int] = []
-        for sensor_name in sensor_names:
-          if sensor_name not in self.factory_sensor_info:
-            raise ValueError(f"Invalid sensor name: {sensor_name}")
-          sensor_id = self.factory_sensor_info[sensor_name].sensor_id
-          sensor_ids.append(sensor_id)
-      else:
-        sensor_ids = None
-
+      sensor_ids = self._sensor_ids(sensor_names)
       capture_result_proto = self._client.capture(
           timeout=timeout, sensor_ids=sensor_ids
       )
@@ -569,6 +562,85 @@ class Camera:
       logging.warning("Could not capture from camera.")
       raise e
 
+  def stream(
+      self,
+      sensor_names: Optional[List[str]] = None,
+      max_fps: Optional[float] = None,
+      queue_depth: int = 2,
+      timeout: Optional[datetime.timedelta] = None,
+      max_in_flight: int = 2,
+  ) -> capture_stream.CaptureStream[data_classes.CaptureResult]:
+    """Captures continuously from the camera.
+
+    Capture requests are pipelined on a background thread, and the resulting
+    CaptureResults are decoded there as well. If the consumer does not keep up,
+    the oldest buffered results are dropped. The camera's world pose is looked
+    up once when the stream starts.
+
+    Args:
+      sensor_names: An optional list of sensor names that will be transmitted in
+        every result, see multi_sensor_capture().
+      max_fps: Maximum capture rate in frames per second, or None to capture as
+        fast as the camera responds.
+      queue_depth: Maximum number of buffered CaptureResults.
+      timeout: An optional driver timeout per capture, see
+        multi_sensor_capture().
+      max_in_flight: Maximum number of concurrent capture requests.
+
+    Returns:
+      A CaptureStream which yields CaptureResults. It should be closed (or used
+      as a context manager) when no more results are needed.
+
+    Raises:
+      ValueError: The matching sensors could not be found or the stream limits
+        are invalid.
+    """
+    sensor_ids = self._sensor_ids(sensor_names)
+    sensor_id_to_name = self._sensor_id_to_name
+    world_t_camera = self.world_t_camera
+
+    def make_frame(
+        response: camera_server_pb2.CaptureResponse,
+    ) -> data_classes.CaptureResult:
+      capture_result = data_classes.CaptureResult(
+          response.capture_result, sensor_id_to_name, world_t_camera
+      )
+      # Decode all sensor images on the background thread.
+      capture_result.sensor_image_buffers  # pylint: disable=pointless-statement
+      return capture_result
+
+    return capture_stream.CaptureStream(
+        lambda: self._client.capture_async(
+            timeout=timeout, sensor_ids=sensor_ids
+        ),
+        make_frame,
+        max_fps=max_fps,
+        queue_depth=queue_depth,
+        max_in_flight=max_in_flight,
+    )
+
+  def _sensor_ids(
+      self, sensor_names: Optional[List[str]]
+  ) -> Optional[List[int]]:
+    """Returns the ids of the named sensors, or None for all sensors.
+
+    Raises:
+      ValueError: The matching sensors could not be found.
+    """
+    if sensor_names is None:
+      return None
+    if not self.factory_sensor_info:
+      raise ValueError(
+          "No factory sensor info found, cannot find sensor ids for"
+          f" {sensor_names}"
+      )
+    sensor_ids: List[int] = []
+    for sensor_name in sensor_names:
+      if sensor_name not in self.factory_sensor_info:
+        raise ValueError(f"Invalid sensor name: {sensor_name}")
+      sensor_ids.append(self.factory_sensor_info[sensor_name].sensor_id)
+    return sensor_ids
+
   def read_camera_setting_properties(
       self,
       name: str,
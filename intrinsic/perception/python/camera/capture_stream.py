@@ -0,0 +1,202 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Continuous capturing from a camera."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Any, Callable, Deque, Generic, Optional, TypeVar
+
+import grpc
+
+_FrameT = TypeVar("_FrameT")
+
+
+class CaptureStream(Generic[_FrameT]):
+  """Iterator over frames which are captured continuously in the background.
+
+  A background thread keeps up to `max_in_flight` capture requests in flight so
+  that the round trip latency of one request overlaps with the others. Frames
+  are converted (and, for camera captures, decoded) on the background thread
+  and kept in a ring buffer of `queue_depth` frames. If the consumer falls
+  behind, the oldest frames are dropped so that the stream never returns stale
+  frames from more than `queue_depth` captures ago.
+
+  The stream is an iterator and an async iterator. Iteration stops after
+  close() has been called. Errors of the capture requests are raised by the
+  iterator after all frames captured before the error have been returned.
+
+  Typical usage example:
+
+    with camera.stream(max_fps=30) as stream:
+      for capture_result in stream:
+        ...
+
+  Attributes:
+    dropped_frames: The number of frames which have been dropped because the
+      consumer did not keep up.
+  """
+
+  def __init__(
+      self,
+      capture: Callable[[], grpc.Future],
+      make_frame: Callable[[Any], _FrameT],
+      *,
+      max_fps: Optional[float] = None,
+      queue_depth: int = 2,
+      max_in_flight: int = 2,
+  ):
+    """Starts capturing.
+
+    Args:
+      capture: Starts a single capture and returns a future for its response.
+      make_frame: Converts the response of a capture into a frame. Called on
+        the background thread.
+      max_fps: Maximum number of capture requests per second, or None to
+        capture as fast as possible.
+      queue_depth: Maximum number of frames which are buffered.
+      max_in_flight: Maximum number of concurrent capture requests.
+
+    Raises:
+      ValueError: If any of the limits is invalid.
+    """
+    if max_fps is not None and max_fps <= 0:
+      raise ValueError(f"max_fps must be positive, got {max_fps}.")
+    if queue_depth < 1:
+      raise ValueError(f"queue_depth must be at least 1, got {queue_depth}.")
+    if max_in_flight < 1:
+      raise ValueError(
+          f"max_in_flight must be at least 1, got {max_in_flight}."
+      )
+
+    self._capture = capture
+    self._make_frame = make_frame
+    self._period = 1.0 / max_fps if max_fps is not None else 0.0
+    self._max_in_flight = max_in_flight
+
+    self._condition = threading.Condition()
+    self._frames: Deque[_FrameT] = collections.deque(maxlen=queue_depth)
+    self._in_flight: Deque[grpc.Future] = collections.deque()
+    self._error: Optional[Exception] = None
+    self._finished = False
+    self._stop = threading.Event()
+    self.dropped_frames = 0
+
+    self._thread = threading.Thread(
+        target=self._run, name="capture_stream", daemon=True
+    )
+    self._thread.start()
+
+  @property
+  def closed(self) -> bool:
+    """Whether close() has been called."""
+    return self._stop.is_set()
+
+  def close(self) -> None:
+    """Stops capturing, cancels pending requests and drops buffered frames."""
+    with self._condition:
+      self._stop.set()
+      for future in self._in_flight:
+        future.cancel()
+      self._frames.clear()
+      self._condition.notify_all()
+    if threading.current_thread() is not self._thread:
+      self._thread.join()
+
+  def __enter__(self) -> CaptureStream[_FrameT]:
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  def get(self, timeout: Optional[float] = None) -> Optional[_FrameT]:
+    """Returns the oldest buffered frame, waiting for one if necessary.
+
+    Args:
+      timeout: Maximum time in seconds to wait for a frame, or None to wait
+        until a frame is available or the stream ends.
+
+    Returns:
+      The frame, or None if the stream has ended or the timeout expired.
+
+    Raises:
+      grpc.RpcError: If a capture request failed.
+      ValueError: If a capture result could not be converted.
+    """
+    with self._condition:
+      self._condition.wait_for(
+          lambda: self._frames or self._finished, timeout=timeout
+      )
+      if self._frames:
+        return self._frames.popleft()
+      if self._error is not None:
+        error, self._error = self._error, None
+        raise error
+      return None
+
+  def __iter__(self) -> CaptureStream[_FrameT]:
+    return self
+
+  def __next__(self) -> _FrameT:
+    frame = self.get()
+    if frame is None:
+      raise StopIteration
+    return frame
+
+  def __aiter__(self) -> CaptureStream[_FrameT]:
+    return self
+
+  async def __anext__(self) -> _FrameT:
+    frame = await asyncio.get_running_loop().run_in_executor(None, self.get)
+    if frame is None:
+      raise StopAsyncIteration
+    return frame
+
+  def _run(self) -> None:
+    """Issues capture requests and buffers the resulting frames."""
+    next_request_time = time.monotonic()
+    try:
+      while not self._stop.is_set():
+        # Keep the pipeline full, subject to the request rate limit.
+        while len(self._in_flight) < self._max_in_flight:
+          delay = next_request_time - time.monotonic()
+          if delay > 0:
+            if self._in_flight:
+              break
+            if self._stop.wait(delay):
+              return
+          with self._condition:
+            if self._stop.is_set():
+              return
+            self._in_flight.append(self._capture())
+          next_request_time = (
+              max(next_request_time, time.monotonic()) + self._period
+          )
+
+        response = self._in_flight[0].result()
+        with self._condition:
+          self._in_flight.popleft()
+        frame = self._make_frame(response)
+        with self._condition:
+          if self._stop.is_set():
+            return
+          if len(self._frames) == self._frames.maxlen:
+            self.dropped_frames += 1
+          self._frames.append(frame)
+          self._condition.notify_all()
+    except grpc.FutureCancelledError:
+      pass  # Cancelled by close().
+    except Exception as e:  # pylint: disable=broad-except
+      with self._condition:
+        if not self._stop.is_set():
+          self._error = e
+    finally:
+      with self._condition:
+        for future in self._in_flight:
+          future.cancel()
+        self._in_flight.clear()
+        self._finished = True
+        self._condition.notify_all()
@@ -0,0 +1,133 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.perception.python.camera.capture_stream."""
+
+import asyncio
+import concurrent.futures
+import time
+
+from absl.testing import absltest
+import grpc
+from intrinsic.perception.proto import camera_config_pb2
+from intrinsic.perception.python.camera import cameras
+from intrinsic.perception.python.camera import capture_stream
+from intrinsic.perception.python.camera.testing import fake_camera_server
+from intrinsic.perception.service.proto import camera_server_pb2_grpc
+from intrinsic.resources.proto import resource_handle_pb2
+
+
+def _frame_number(capture_result) -> int:
+  return int(next(iter(capture_result.sensor_images.values())).array[0, 0])
+
+
+class CaptureStreamTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._fake = fake_camera_server.FakeCameraServer(["left", "right"])
+    self._server = grpc.server(concurrent.futures.ThreadPoolExecutor(8))
+    camera_server_pb2_grpc.add_CameraServerServicer_to_server(
+        self._fake, self._server
+    )
+    port = self._server.add_insecure_port("localhost:0")
+    self._server.start()
+    self.addCleanup(self._server.stop, None)
+
+    handle = resource_handle_pb2.ResourceHandle(name="camera")
+    handle.connection_info.grpc.address = f"localhost:{port}"
+    handle.resource_data["CameraConfig"].contents.Pack(
+        camera_config_pb2.CameraConfig(name="fake")
+    )
+    self._camera = cameras.Camera.create_from_resource_handle(handle)
+
+  def test_stream_returns_frames_in_order(self):
+    with self._camera.stream(queue_depth=100, max_in_flight=1) as stream:
+      frames = [_frame_number(next(stream)) for _ in range(10)]
+    self.assertEqual(frames, list(range(10)))
+    self.assertTrue(stream.closed)
+    self.assertIsNone(stream.get(timeout=0))
+
+  def test_stream_pipelines_captures(self):
+    self._fake.capture_latency = 0.05
+    start = time.monotonic()
+    with self._camera.stream(queue_depth=100, max_in_flight=4) as stream:
+      frames = [_frame_number(next(stream)) for _ in range(8)]
+    # The server may receive concurrent requests in any order.
+    self.assertCountEqual(frames, range(8))
+    self.assertLess(time.monotonic() - start, 8 * 0.05)
+
+  def test_stream_selects_sensors(self):
+    with self._camera.stream(sensor_names=["right"]) as stream:
+      capture_result = next(stream)
+    self.assertEqual(list(capture_result.sensor_images), ["right"])
+    self.assertEqual(capture_result.sensor_images["right"].shape, (4, 6))
+
+  def test_stream_invalid_sensor_name(self):
+    with self.assertRaisesRegex(ValueError, "Invalid sensor name"):
+      self._camera.stream(sensor_names=["center"])
+
+  def test_stream_limits_frame_rate(self):
+    start = time.monotonic()
+    with self._camera.stream(max_fps=50, queue_depth=100) as stream:
+      for _ in range(10):
+        next(stream)
+    self.assertGreaterEqual(time.monotonic() - start, 9 / 50)
+
+  def test_stream_drops_stale_frames(self):
+    # With a single capture in flight, frames arrive in capture order.
+    with self._camera.stream(queue_depth=2, max_in_flight=1) as stream:
+      while self._fake.capture_count < 10:
+        time.sleep(0.01)
+      first = _frame_number(next(stream))
+      second = _frame_number(next(stream))
+      self.assertGreater(stream.dropped_frames, 0)
+    self.assertGreater(first, 0)
+    self.assertGreater(second, first)
+
+  def test_stream_raises_capture_errors(self):
+    self._fake.fail_after = 3
+    with self._camera.stream(queue_depth=100, max_in_flight=1) as stream:
+      frames = []
+      with self.assertRaises(grpc.RpcError) as context:
+        for capture_result in stream:
+          frames.append(_frame_number(capture_result))
+    self.assertEqual(frames, [0, 1, 2])
+    self.assertEqual(context.exception.code(), grpc.StatusCode.UNAVAILABLE)
+
+  def test_close_stops_capturing(self):
+    self._fake.capture_latency = 0.01
+    stream = self._camera.stream(max_in_flight=2)
+    next(stream)
+    stream.close()
+    count = self._fake.capture_count
+    # Captures which are in flight when the stream is closed may still arrive.
+    time.sleep(0.05)
+    count_after_close = self._fake.capture_count
+    self.assertLessEqual(count_after_close, count + 2)
+    time.sleep(0.05)
+    self.assertEqual(self._fake.capture_count, count_after_close)
+    self.assertEqual(list(stream), [])
+
+  def test_async_iteration(self):
+    async def consume(stream):
+      frames = []
+      async for capture_result in stream:
+        frames.append(_frame_number(capture_result))
+        if len(frames) == 5:
+          stream.close()
+      return frames
+
+    stream = self._camera.stream(queue_depth=100, max_in_flight=1)
+    self.assertEqual(asyncio.run(consume(stream)), list(range(5)))
+
+  def test_invalid_limits(self):
+    with self.assertRaises(ValueError):
+      capture_stream.CaptureStream(lambda: None, lambda x: x, max_fps=0)
+    with self.assertRaises(ValueError):
+      capture_stream.CaptureStream(lambda: None, lambda x: x, queue_depth=0)
+    with self.assertRaises(ValueError):
+      capture_stream.CaptureStream(lambda: None, lambda x: x, max_in_flight=0)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -4,8 +4,9 @@
 
 from __future__ import annotations
 
+from collections import abc
 import datetime
-from typing import Dict, List, Mapping, Optional, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
 from intrinsic.math.python import pose3
 from intrinsic.math.python import proto_conversion as math_proto_conversion
@@ -219,11 +220,15 @@ class CameraConfig:
 
 
 class SensorImage:
-  """Convenience wrapper for SensorImage."""
+  """Convenience wrapper for SensorImage.
+
+  The image buffer is deserialized on first access of `array` or `shape` and
+  then cached.
+  """
 
   _proto: sensor_image_pb2.SensorImage
   _sensor_name: str
-  _sensor_image_buffer: np.ndarray
+  _sensor_image_buffer: Optional[np.ndarray]
   _world_t_camera: Optional[pose3.Pose3]
 
   config: SensorConfig
@@ -233,8 +238,17 @@ class SensorImage:
       sensor_image: sensor_image_pb2.SensorImage,
       sensor_name: str,
       world_t_camera: Optional[pose3.Pose3] = None,
+      sensor_image_buffer: Optional[np.ndarray] = None,
   ):
-    """Creates a SensorImage object."""
+    """Creates a SensorImage object.
+
+    Args:
+      sensor_image: The sensor image proto.
+      sensor_name: The name of the sensor.
+      world_t_camera: The world pose of the camera, if known.
+      sensor_image_buffer: The already deserialized image buffer of
+        sensor_image. Deserialized from the proto on first access if not given.
+    """
     if sensor_image is None:
       raise ValueError("Sensor image cannot be None.")
     if sensor_image.buffer is None:
@@ -243,15 +257,7 @@ class SensorImage:
     self._proto = sensor_image
     self._sensor_name = sensor_name
     self._world_t_camera = world_t_camera
-
-    try:
-      if not self._proto.buffer:
-        raise ValueError("No image buffer provided.")
-
-      buffer = image_utils.deserialize_image_buffer(self._proto.buffer)
-      self._sensor_image_buffer = buffer
-    except ValueError as e:
-      raise ValueError("Could not deserialize sensor image buffer.") from e
+    self._sensor_image_buffer = sensor_image_buffer
 
     self.config = SensorConfig(self._proto.sensor_config)
 
@@ -304,13 +310,80 @@ class SensorImage:
 
   @property
   def array(self) -> np.ndarray:
-    """Converts the sensor image to a numpy array."""
+    """Converts the sensor image to a numpy array.
+
+    Raises:
+      ValueError: If the image buffer could not be deserialized.
+    """
+    if self._sensor_image_buffer is None:
+      try:
+        self._sensor_image_buffer = image_utils.deserialize_image_buffer(
+            self._proto.buffer
+        )
+      except ValueError as e:
+        raise ValueError("Could not deserialize sensor image buffer.") from e
     return self._sensor_image_buffer
 
   @property
   def shape(self) -> Tuple[int, int, int]:
     """Returns the shape of the sensor image."""
-    return self._sensor_image_buffer.shape
+    return self.array.shape
+
+
+class _LazySensorImages(abc.Mapping):
+  """Read-only mapping from sensor name to SensorImage.
+
+  SensorImage objects are only created for the sensors that are accessed.
+  """
+
+  def __init__(
+      self,
+      sensor_images: Mapping[str, sensor_image_pb2.SensorImage],
+      world_t_camera: Optional[pose3.Pose3],
+  ):
+    self._protos = sensor_images
+    self._world_t_camera = world_t_camera
+    self._sensor_images: Dict[str, SensorImage] = {}
+
+  def __getitem__(self, sensor_name: str) -> SensorImage:
+    sensor_image = self._sensor_images.get(sensor_name)
+    if sensor_image is None:
+      sensor_image = SensorImage(
+          self._protos[sensor_name], sensor_name, self._world_t_camera
+      )
+      self._sensor_images[sensor_name] = sensor_image
+    return sensor_image
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._protos)
+
+  def decode_all(self) -> None:
+    """Creates and deserializes all sensor images not accessed so far.
+
+    Raises:
+      ValueError: If an image buffer could not be deserialized.
+    """
+    pending = [
+        sensor_name
+        for sensor_name in self._protos
+        if sensor_name not in self._sensor_images
+    ]
+    try:
+      buffers = image_utils.deserialize_image_buffers(
+          [self._protos[sensor_name].buffer for sensor_name in pending]
+      )
+    except ValueError as e:
+      raise ValueError("Could not deserialize sensor image buffer.") from e
+    for sensor_name, buffer in zip(pending, buffers):
+      self._sensor_images[sensor_name] = SensorImage(
+          self._protos[sensor_name],
+          sensor_name,
+          self._world_t_camera,
+          sensor_image_buffer=buffer,
+      )
+
+  def __len__(self) -> int:
+    return len(self._protos)
 
 
 class CaptureResult:
@@ -318,7 +391,7 @@ class CaptureResult:
 
   _proto: capture_result_pb2.CaptureResult
   _sensor_names: Optional[Mapping[int, str]]
-  _sensor_images: Dict[str, SensorImage]
+  _sensor_images: _LazySensorImages
 
   def __init__(
       self,
@@ -326,7 +399,16 @@ class CaptureResult:
       sensor_names: Optional[Mapping[int, str]] = None,
       world_t_camera: Optional[pose3.Pose3] = None,
   ):
-    """Creates a CaptureResult object."""
+    """Creates a CaptureResult object.
+
+    Sensor images are only deserialized when they are accessed.
+
+    Args:
+      capture_result: The capture result proto.
+      sensor_names: Optional mapping from sensor id to sensor name. Sensors
+        without a name are keyed by their id as a string.
+      world_t_camera: The world pose of the camera, if known.
+    """
     if capture_result is None:
       raise ValueError("Capture result cannot be None.")
     if not capture_result.sensor_images:
@@ -334,7 +416,6 @@ class CaptureResult:
 
     self._proto = capture_result
     self._sensor_names = sensor_names
-    self._sensor_images = {}
 
     # insert items ordered by sensor_id, since dictionaries preserve insertion
     # order
@@ -342,6 +423,7 @@ class CaptureResult:
         self._proto.sensor_images,
         key=lambda sensor_image: sensor_image.sensor_config.id,
     )
+    sensor_image_protos = {}
     for sensor_image in sensor_images_by_id:
       sensor_id = sensor_image.sensor_config.id
       sensor_name_or_id = (
@@ -349,9 +431,8 @@ class CaptureResult:
           if self._sensor_names is not None and sensor_id in self._sensor_names
           else str(sensor_id)
       )
-      self._sensor_images[sensor_name_or_id] = SensorImage(
-          sensor_image, sensor_name_or_id, world_t_camera
-      )
+      sensor_image_protos[sensor_name_or_id] = sensor_image
+    self._sensor_images = _LazySensorImages(sensor_image_protos, world_t_camera)
 
   @property
   def proto(self) -> capture_result_pb2.CaptureResult:
@@ -370,12 +451,23 @@ class CaptureResult:
 
   @property
   def sensor_images(self) -> Mapping[str, SensorImage]:
-    """Returns the sensor images from the capture result."""
+    """Returns the sensor images from the capture result.
+
+    The sensor images are created and deserialized on first access.
+    """
     return self._sensor_images
 
   @property
   def sensor_image_buffers(self) -> Mapping[str, np.ndarray]:
-    """Returns the sensor images from the capture result as numpy arrays."""
+    """Returns the sensor images from the capture result as numpy arrays.
+
+    Deserializes all sensor images that have not been accessed yet; compressed
+    images are decoded in parallel.
+
+    Raises:
+      ValueError: If an image buffer could not be deserialized.
+    """
+    self._sensor_images.decode_all()
     return {
         sensor_name: sensor_image.array
         for sensor_name, sensor_image in self._sensor_images.items()
@@ -0,0 +1,134 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.perception.python.camera.data_classes."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.perception.proto import capture_result_pb2
+from intrinsic.perception.proto import dimensions_pb2
+from intrinsic.perception.proto import image_buffer_pb2
+from intrinsic.perception.proto import sensor_config_pb2
+from intrinsic.perception.proto import sensor_image_pb2
+from intrinsic.perception.python import image_utils
+from intrinsic.perception.python.camera import data_classes
+import numpy as np
+
+_ROWS = 2
+_COLS = 3
+
+
+def _sensor_image(sensor_id: int, value: int) -> sensor_image_pb2.SensorImage:
+  return sensor_image_pb2.SensorImage(
+      sensor_config=sensor_config_pb2.SensorConfig(id=sensor_id),
+      buffer=image_buffer_pb2.ImageBuffer(
+          pixel_type=image_buffer_pb2.PIXEL_INTENSITY,
+          type=image_buffer_pb2.TYPE_8U,
+          num_channels=1,
+          dimensions=dimensions_pb2.Dimensions(rows=_ROWS, cols=_COLS),
+          data=bytes([value]) * (_ROWS * _COLS),
+      ),
+  )
+
+
+def _capture_result(
+    *sensor_images: sensor_image_pb2.SensorImage,
+) -> data_classes.CaptureResult:
+  return data_classes.CaptureResult(
+      capture_result_pb2.CaptureResult(sensor_images=sensor_images),
+      sensor_names={1: "left", 2: "right"},
+  )
+
+
+class CaptureResultTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    deserialize_image_buffer = mock.patch.object(
+        image_utils,
+        "deserialize_image_buffer",
+        autospec=True,
+        side_effect=image_utils.deserialize_image_buffer,
+    )
+    deserialize_image_buffers = mock.patch.object(
+        image_utils,
+        "deserialize_image_buffers",
+        autospec=True,
+        side_effect=image_utils.deserialize_image_buffers,
+    )
+    self._deserialize_image_buffer = deserialize_image_buffer.start()
+    self._deserialize_image_buffers = deserialize_image_buffers.start()
+    self.addCleanup(mock.patch.stopall)
+
+  def test_sensor_names(self):
+    result = _capture_result(_sensor_image(2, 20), _sensor_image(1, 10))
+
+    self.assertEqual(result.sensor_names, ["left", "right"])
+    self._deserialize_image_buffer.assert_not_called()
+
+  def test_only_accessed_sensor_is_decoded(self):
+    left = _sensor_image(1, 10)
+    result = _capture_result(left, _sensor_image(2, 20))
+
+    array = result.sensor_images["left"].array
+
+    np.testing.assert_array_equal(array, np.full((_ROWS, _COLS), 10))
+    self._deserialize_image_buffer.assert_called_once_with(left.buffer)
+    self._deserialize_image_buffers.assert_not_called()
+
+  def test_sensor_images_are_memoized(self):
+    result = _capture_result(_sensor_image(1, 10), _sensor_image(2, 20))
+
+    sensor_image = result.sensor_images["left"]
+    array = sensor_image.array
+
+    self.assertIs(result.sensor_images["left"], sensor_image)
+    self.assertIs(result.sensor_images["left"].array, array)
+    self.assertEqual(sensor_image.shape, (_ROWS, _COLS))
+    self._deserialize_image_buffer.assert_called_once()
+
+  def test_sensor_image_buffers_decodes_remaining_sensors_at_once(self):
+    right = _sensor_image(2, 20)
+    result = _capture_result(_sensor_image(1, 10), right)
+    left_array = result.sensor_images["left"].array
+
+    buffers = result.sensor_image_buffers
+
+    self.assertEqual(list(buffers), ["left", "right"])
+    self.assertIs(buffers["left"], left_array)
+    np.testing.assert_array_equal(buffers["right"], np.full((_ROWS, _COLS), 20))
+    self._deserialize_image_buffers.assert_called_once_with([right.buffer])
+    self._deserialize_image_buffer.assert_called_once()
+
+    # Decoded images are reused.
+    self.assertIs(result.sensor_images["right"].array, buffers["right"])
+    self.assertIs(result.sensor_image_buffers["right"], buffers["right"])
+
+  def test_invalid_buffer_raises_on_access(self):
+    invalid = _sensor_image(2, 20)
+    invalid.buffer.data = b"\x00"
+
+    result = _capture_result(_sensor_image(1, 10), invalid)
+    sensor_image = result.sensor_images["right"]
+
+    np.testing.assert_array_equal(
+        result.sensor_images["left"].array, np.full((_ROWS, _COLS), 10)
+    )
+    with self.assertRaisesRegex(ValueError, "deserialize"):
+      sensor_image.array  # pylint: disable=pointless-statement
+
+  def test_invalid_buffer_raises_in_sensor_image_buffers(self):
+    invalid = _sensor_image(2, 20)
+    invalid.buffer.data = b"\x00"
+    result = _capture_result(_sensor_image(1, 10), invalid)
+
+    with self.assertRaisesRegex(ValueError, "deserialize"):
+      result.sensor_image_buffers  # pylint: disable=pointless-statement
+
+  def test_empty_capture_result(self):
+    with self.assertRaises(ValueError):
+      data_classes.CaptureResult(capture_result_pb2.CaptureResult())
+
+
+if __name__ == "__main__":
+  absltest.main()
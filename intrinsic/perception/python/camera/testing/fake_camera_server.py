@@ -0,0 +1,120 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""In-process fake of the camera server for tests."""
+
+import threading
+import time
+from typing import List
+
+import grpc
+from intrinsic.perception.proto import camera_config_pb2
+from intrinsic.perception.proto import capture_result_pb2
+from intrinsic.perception.proto import dimensions_pb2
+from intrinsic.perception.proto import image_buffer_pb2
+from intrinsic.perception.proto import sensor_config_pb2
+from intrinsic.perception.proto import sensor_image_pb2
+from intrinsic.perception.service.proto import camera_server_pb2
+from intrinsic.perception.service.proto import camera_server_pb2_grpc
+
+_CAMERA_HANDLE = "fake_camera"
+
+
+class FakeCameraServer(camera_server_pb2_grpc.CameraServerServicer):
+  """Fake camera server which returns synthetic 8-bit images.
+
+  Every capture returns single channel images of `rows` x `cols` pixels for the
+  requested sensors (or all sensors). All pixels of a captured image are set to
+  the frame number (modulo 256), so tests can check the order of frames.
+
+  Attributes:
+    capture_latency: Time in seconds that each capture takes.
+    fail_after: If set, captures after this number of frames fail with
+      UNAVAILABLE.
+  """
+
+  def __init__(
+      self,
+      sensor_names: List[str],
+      rows: int = 4,
+      cols: int = 6,
+      capture_latency: float = 0.0,
+  ):
+    self._sensor_names = list(sensor_names)
+    self._rows = rows
+    self._cols = cols
+    self.capture_latency = capture_latency
+    self.fail_after = None
+    self._lock = threading.Lock()
+    self._capture_count = 0
+    self._camera_config = camera_config_pb2.CameraConfig()
+
+  @property
+  def sensor_ids(self) -> List[int]:
+    return list(range(1, len(self._sensor_names) + 1))
+
+  @property
+  def capture_count(self) -> int:
+    """The number of captures which have been started."""
+    with self._lock:
+      return self._capture_count
+
+  def CreateCamera(
+      self,
+      request: camera_server_pb2.CreateCameraRequest,
+      context: grpc.ServicerContext,
+  ) -> camera_server_pb2.CreateCameraResponse:
+    self._camera_config.CopyFrom(request.camera_config)
+    return camera_server_pb2.CreateCameraResponse(camera_handle=_CAMERA_HANDLE)
+
+  def DescribeCamera(
+      self,
+      request: camera_server_pb2.DescribeCameraRequest,
+      context: grpc.ServicerContext,
+  ) -> camera_server_pb2.DescribeCameraResponse:
+    return camera_server_pb2.DescribeCameraResponse(
+        camera_config=self._camera_config,
+        sensors=[
+            camera_server_pb2.SensorInformation(id=sensor_id, display_name=name)
+            for sensor_id, name in zip(self.sensor_ids, self._sensor_names)
+        ],
+    )
+
+  def Capture(
+      self,
+      request: camera_server_pb2.CaptureRequest,
+      context: grpc.ServicerContext,
+  ) -> camera_server_pb2.CaptureResponse:
+    if request.camera_handle != _CAMERA_HANDLE:
+      context.abort(grpc.StatusCode.NOT_FOUND, "Unknown camera handle.")
+    with self._lock:
+      frame = self._capture_count
+      self._capture_count += 1
+    if self.fail_after is not None and frame >= self.fail_after:
+      context.abort(grpc.StatusCode.UNAVAILABLE, "Camera disconnected.")
+    if self.capture_latency:
+      time.sleep(self.capture_latency)
+
+    sensor_ids = list(request.sensor_ids) or self.sensor_ids
+    return camera_server_pb2.CaptureResponse(
+        capture_result=capture_result_pb2.CaptureResult(
+            sensor_images=[
+                self._sensor_image(sensor_id, frame) for sensor_id in sensor_ids
+            ]
+        )
+    )
+
+  def _sensor_image(
+      self, sensor_id: int, frame: int
+  ) -> sensor_image_pb2.SensorImage:
+    return sensor_image_pb2.SensorImage(
+        sensor_config=sensor_config_pb2.SensorConfig(id=sensor_id),
+        buffer=image_buffer_pb2.ImageBuffer(
+            pixel_type=image_buffer_pb2.PIXEL_INTENSITY,
+            type=image_buffer_pb2.TYPE_8U,
+            num_channels=1,
+            dimensions=dimensions_pb2.Dimensions(
+                rows=self._rows, cols=self._cols
+            ),
+            data=bytes([frame % 256]) * (self._rows * self._cols),
+        ),
+    )
@@ -2,37 +2,68 @@
 
 """Miscellaneous image helper methods."""
 
+from concurrent import futures
 import io
-from typing import Optional, Tuple, Type, Union
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple, Type, Union
 
 from intrinsic.perception.proto import image_buffer_pb2
 import numpy as np
 from PIL import Image
 
+# Maps image_buffer_pb2.DataType to the corresponding numpy data type.
+_DATA_TYPE_TO_DTYPE = {
+    image_buffer_pb2.DataType.TYPE_8U: np.uint8,
+    image_buffer_pb2.DataType.TYPE_16U: np.uint16,
+    image_buffer_pb2.DataType.TYPE_32U: np.uint32,
+    image_buffer_pb2.DataType.TYPE_8S: np.int8,
+    image_buffer_pb2.DataType.TYPE_16S: np.int16,
+    image_buffer_pb2.DataType.TYPE_32S: np.int32,
+    image_buffer_pb2.DataType.TYPE_32F: np.float32,
+    image_buffer_pb2.DataType.TYPE_64F: np.float64,
+}
+
+# Maps image_buffer_pb2.Encoding to the corresponding PIL format. Uncompressed
+# buffers map to None.
+_ENCODING_TO_FORMAT = {
+    image_buffer_pb2.ENCODING_UNSPECIFIED: None,
+    image_buffer_pb2.ENCODING_JPEG: "JPEG",
+    image_buffer_pb2.ENCODING_PNG: "PNG",
+    image_buffer_pb2.ENCODING_WEBP: "WEBP",
+}
+
+# Upper bound on the number of threads used to decode compressed images.
+_MAX_DECODE_WORKERS = 8
+
+_decode_executor: Optional[futures.ThreadPoolExecutor] = None
+_decode_executor_lock = threading.Lock()
+
+
+def _get_decode_executor() -> futures.ThreadPoolExecutor:
+  """Returns the shared thread pool used to decode compressed images.
+
+  PIL releases the GIL while decoding, so decoding several images on a thread
+  pool runs in parallel.
+  """
+  global _decode_executor
+  with _decode_executor_lock:
+    if _decode_executor is None:
+      _decode_executor = futures.ThreadPoolExecutor(
+          max_workers=min(_MAX_DECODE_WORKERS, os.cpu_count() or 1),
+          thread_name_prefix="image_decode",
+      )
+    return _decode_executor
+
 
 def _image_buffer_data_type(
     image_buffer: image_buffer_pb2.ImageBuffer,
 ) -> Union[np.dtype, Type[np.generic]]:
   """Returns the data type of the given image buffer."""
-  data_type = image_buffer.type
-  if data_type == image_buffer_pb2.DataType.TYPE_8U:
-    return np.uint8
-  elif data_type == image_buffer_pb2.DataType.TYPE_16U:
-    return np.uint16
-  elif data_type == image_buffer_pb2.DataType.TYPE_32U:
-    return np.uint32
-  elif data_type == image_buffer_pb2.DataType.TYPE_8S:
-    return np.int8
-  elif data_type == image_buffer_pb2.DataType.TYPE_16S:
-    return np.int16
-  elif data_type == image_buffer_pb2.DataType.TYPE_32S:
-    return np.int32
-  elif data_type == image_buffer_pb2.DataType.TYPE_32F:
-    return np.float32
-  elif data_type == image_buffer_pb2.DataType.TYPE_64F:
-    return np.float64
-  else:
-    raise ValueError(f"Data type not supported: {data_type}.")
+  try:
+    return _DATA_TYPE_TO_DTYPE[image_buffer.type]
+  except KeyError:
+    raise ValueError(f"Data type not supported: {image_buffer.type}.") from None
 
 
 def _image_buffer_encoding(
@@ -40,39 +71,29 @@ def _image_buffer_encoding(
 ) -> Optional[str]:
   """Returns the encoding of the given image buffer."""
   encoding = image_buffer.encoding
-  if encoding == image_buffer_pb2.ENCODING_UNSPECIFIED:
-    return None
-  elif encoding == image_buffer_pb2.ENCODING_JPEG:
-    return "JPEG"
-  elif encoding == image_buffer_pb2.ENCODING_PNG:
-    return "PNG"
-  elif encoding == image_buffer_pb2.ENCODING_WEBP:
-    return "WEBP"
-  else:
+  try:
+    return _ENCODING_TO_FORMAT[encoding]
+  except KeyError:
     raise ValueError(
         f"Encoding not supported: {image_buffer_pb2.Encoding.Name(encoding)}."
-    )
+    ) from None
 
 
-def _image_buffer_decoded(
+def _image_buffer_num_channels(
     image_buffer: image_buffer_pb2.ImageBuffer,
-) -> np.ndarray:
-  encoding = _image_buffer_encoding(image_buffer)
-  if encoding is None:
-    return np.frombuffer(
-        image_buffer.data, dtype=_image_buffer_data_type(image_buffer)
-    )
-  else:
-    return np.asarray(
-        Image.open(io.BytesIO(image_buffer.data), formats=[encoding])
-    )
+) -> int:
+  """Returns the number of channels of the given image buffer."""
+  if image_buffer.pixel_type == image_buffer_pb2.PixelType.PIXEL_POINT:
+    return 3
+  return image_buffer.num_channels
 
 
 def _image_buffer_shape(
     image_buffer: image_buffer_pb2.ImageBuffer,
 ) -> Union[Tuple[int, int], Tuple[int, int, int]]:
   """Returns the shape of the given image buffer."""
-  if image_buffer.num_channels == 1:
+  num_channels = _image_buffer_num_channels(image_buffer)
+  if num_channels == 1:
     return (
         image_buffer.dimensions.rows,
         image_buffer.dimensions.cols,
@@ -81,23 +102,57 @@ def _image_buffer_shape(
     return (
         image_buffer.dimensions.rows,
         image_buffer.dimensions.cols,
-        image_buffer.num_channels,
+        num_channels,
     )
 
 
-def _image_buffer_size(
-    image_buffer: image_buffer_pb2.ImageBuffer,
-) -> int:
-  """Returns the number of elements in the given image buffer."""
-  return (
-      image_buffer.dimensions.rows
-      * image_buffer.dimensions.cols
-      * image_buffer.num_channels
-  )
+def _check_size(buffer: np.ndarray, shape: Tuple[int, ...]) -> None:
+  """Raises a ValueError if the buffer does not fit the image shape."""
+  size = int(np.prod(shape))
+  if buffer.size != size:
+    raise ValueError("Invalid buffer size %d != %d" % (buffer.size, size))
+
+
+def _decode_compressed(
+    data: bytes, encoding: str, shape: Tuple[int, ...]
+) -> np.ndarray:
+  """Decodes a JPEG/PNG/WEBP image into a new array of the given shape."""
+  with Image.open(io.BytesIO(data), formats=[encoding]) as image:
+    buffer = np.asarray(image)
+  _check_size(buffer, shape)
+  return buffer.reshape(shape)
+
+
+def _deserialize(
+    image: image_buffer_pb2.ImageBuffer, out: Optional[np.ndarray]
+) -> np.ndarray:
+  """Implements deserialize_image_buffer."""
+  data = image.data
+  if not data:
+    raise ValueError("No image buffer data provided.")
+
+  encoding = _image_buffer_encoding(image)
+  shape = _image_buffer_shape(image)
+  if encoding is None:
+    buffer = np.frombuffer(data, dtype=_image_buffer_data_type(image))
+    _check_size(buffer, shape)
+    buffer = buffer.reshape(shape)
+  else:
+    buffer = _decode_compressed(data, encoding, shape)
+
+  if out is None:
+    return buffer
+  if out.shape != buffer.shape:
+    raise ValueError(
+        f"Output buffer has shape {out.shape}, expected {buffer.shape}."
+    )
+  np.copyto(out, buffer, casting="safe")
+  return out
 
 
 def deserialize_image_buffer(
     image: image_buffer_pb2.ImageBuffer,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
   """Deserializes image from proto format.
 
@@ -105,30 +160,67 @@ def deserialize_image_buffer(
   per-channel data type, and the number of pixels, and returns the decoded
   image.
 
+  Uncompressed buffers are not copied: the result is a read-only view of the
+  proto's data. Compressed buffers are decoded into a new array, unless an
+  output buffer is given.
+
   Args:
     image: The serialized image.
+    out: Optional preallocated array of size [height, width, num_channels] (or
+      [height, width] for single channel images) that the image is written to,
+      e.g. to reuse the same memory for a stream of images.
 
   Returns:
-    The unpacked image of size [height, width, num_channels].
+    The unpacked image of size [height, width, num_channels], or out if given.
 
   Raises:
     ValueError if the buffer size is invalid.
   """
-  if not image.data:
-    raise ValueError("No image buffer data provided.")
+  return _deserialize(image, out)
 
-  pixel_type = image.pixel_type
-  num_channels = image.num_channels
-  if pixel_type == image_buffer_pb2.PixelType.PIXEL_POINT:
-    num_channels = 3
 
-  image.num_channels = num_channels
+def deserialize_image_buffers(
+    images: Sequence[image_buffer_pb2.ImageBuffer],
+    out: Optional[Sequence[Optional[np.ndarray]]] = None,
+) -> List[np.ndarray]:
+  """Deserializes several images from proto format.
 
-  buffer = _image_buffer_decoded(image)
-  shape = _image_buffer_shape(image)
-  size = _image_buffer_size(image)
+  Same as calling deserialize_image_buffer() for every image, but decodes
+  compressed images in parallel on a shared thread pool.
 
-  if buffer.size != size:
-    raise ValueError("Invalid buffer size %d != %d" % (buffer.size, size))
+  Args:
+    images: The serialized images.
+    out: Optional preallocated arrays, one per image (or None), see
+      deserialize_image_buffer().
 
-  return buffer.reshape(shape)
+  Returns:
+    The unpacked images in the order of the input.
+
+  Raises:
+    ValueError if any of the buffers is invalid.
+  """
+  if out is None:
+    out = [None] * len(images)
+  elif len(out) != len(images):
+    raise ValueError(f"Got {len(out)} output buffers for {len(images)} images.")
+
+  compressed = [
+      index
+      for index, image in enumerate(images)
+      if _image_buffer_encoding(image) is not None
+  ]
+  if len(compressed) < 2:
+    return [_deserialize(image, buffer) for image, buffer in zip(images, out)]
+
+  executor = _get_decode_executor()
+  pending = {
+      index: executor.submit(_deserialize, images[index], out[index])
+      for index in compressed
+  }
+  results = []
+  for index, (image, buffer) in enumerate(zip(images, out)):
+    if index in pending:
+      results.append(pending[index].result())
+    else:
+      results.append(_deserialize(image, buffer))
+  return results
@@ -0,0 +1,215 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.perception.python.image_utils."""
+
+import io
+
+from absl.testing import absltest
+from intrinsic.perception.proto import image_buffer_pb2
+from intrinsic.perception.python import image_utils
+import numpy as np
+from PIL import Image
+
+
+def _raw_image_buffer(array: np.ndarray) -> image_buffer_pb2.ImageBuffer:
+  dtype_to_type = {
+      np.dtype(np.uint8): image_buffer_pb2.DataType.TYPE_8U,
+      np.dtype(np.uint16): image_buffer_pb2.DataType.TYPE_16U,
+      np.dtype(np.float32): image_buffer_pb2.DataType.TYPE_32F,
+  }
+  image = image_buffer_pb2.ImageBuffer(
+      num_channels=1 if array.ndim == 2 else array.shape[2],
+      type=dtype_to_type[array.dtype],
+      data=array.tobytes(),
+  )
+  image.dimensions.rows = array.shape[0]
+  image.dimensions.cols = array.shape[1]
+  return image
+
+
+def _compressed_image_buffer(
+    array: np.ndarray, encoding: image_buffer_pb2.Encoding
+) -> image_buffer_pb2.ImageBuffer:
+  image_format = {
+      image_buffer_pb2.ENCODING_PNG: "PNG",
+      image_buffer_pb2.ENCODING_JPEG: "JPEG",
+  }[encoding]
+  data = io.BytesIO()
+  Image.fromarray(array).save(data, format=image_format)
+  image = image_buffer_pb2.ImageBuffer(
+      encoding=encoding,
+      num_channels=1 if array.ndim == 2 else array.shape[2],
+      type=image_buffer_pb2.DataType.TYPE_8U,
+      data=data.getvalue(),
+  )
+  image.dimensions.rows = array.shape[0]
+  image.dimensions.cols = array.shape[1]
+  return image
+
+
+def _test_array(value: int, shape=(4, 6, 3)) -> np.ndarray:
+  return np.arange(np.prod(shape), dtype=np.uint8).reshape(shape) + value
+
+
+class DeserializeImageBufferTest(absltest.TestCase):
+
+  def test_raw(self):
+    array = _test_array(0)
+
+    image = image_utils.deserialize_image_buffer(_raw_image_buffer(array))
+
+    np.testing.assert_array_equal(image, array)
+
+  def test_raw_is_read_only_view(self):
+    image = image_utils.deserialize_image_buffer(
+        _raw_image_buffer(_test_array(0))
+    )
+
+    self.assertFalse(image.flags.writeable)
+    self.assertFalse(image.flags.owndata)
+
+  def test_raw_single_channel(self):
+    array = np.arange(24, dtype=np.uint16).reshape(4, 6)
+
+    image = image_utils.deserialize_image_buffer(_raw_image_buffer(array))
+
+    self.assertEqual(image.shape, (4, 6))
+    self.assertEqual(image.dtype, np.uint16)
+    np.testing.assert_array_equal(image, array)
+
+  def test_png(self):
+    array = _test_array(0)
+
+    image = image_utils.deserialize_image_buffer(
+        _compressed_image_buffer(array, image_buffer_pb2.ENCODING_PNG)
+    )
+
+    np.testing.assert_array_equal(image, array)
+
+  def test_jpeg(self):
+    array = np.full((8, 8), 128, dtype=np.uint8)
+
+    image = image_utils.deserialize_image_buffer(
+        _compressed_image_buffer(array, image_buffer_pb2.ENCODING_JPEG)
+    )
+
+    self.assertEqual(image.shape, (8, 8))
+    np.testing.assert_allclose(image, array, atol=2)
+
+  def test_invalid_buffer_size(self):
+    image = _raw_image_buffer(_test_array(0))
+    image.dimensions.rows += 1
+
+    with self.assertRaises(ValueError):
+      image_utils.deserialize_image_buffer(image)
+
+  def test_no_data(self):
+    image = _raw_image_buffer(_test_array(0))
+    image.data = b""
+
+    with self.assertRaises(ValueError):
+      image_utils.deserialize_image_buffer(image)
+
+  def test_point_image_does_not_modify_proto(self):
+    points = np.arange(36, dtype=np.float32).reshape(3, 4, 3)
+    image = _raw_image_buffer(points)
+    image.pixel_type = image_buffer_pb2.PixelType.PIXEL_POINT
+    image.num_channels = 0
+    expected_proto = image_buffer_pb2.ImageBuffer()
+    expected_proto.CopyFrom(image)
+
+    result = image_utils.deserialize_image_buffer(image)
+
+    np.testing.assert_array_equal(result, points)
+    self.assertEqual(image, expected_proto)
+
+  def test_out(self):
+    array = _test_array(0)
+    out = np.zeros_like(array)
+
+    for image in (
+        _raw_image_buffer(array),
+        _compressed_image_buffer(array, image_buffer_pb2.ENCODING_PNG),
+    ):
+      out.fill(0)
+      result = image_utils.deserialize_image_buffer(image, out=out)
+      self.assertIs(result, out)
+      np.testing.assert_array_equal(out, array)
+
+  def test_out_with_wider_dtype(self):
+    array = _test_array(0)
+    out = np.zeros(array.shape, dtype=np.float32)
+
+    image_utils.deserialize_image_buffer(_raw_image_buffer(array), out=out)
+
+    np.testing.assert_array_equal(out, array)
+
+  def test_out_with_wrong_shape(self):
+    array = _test_array(0)
+    out = np.zeros((4, 6), dtype=np.uint8)
+
+    with self.assertRaisesRegex(ValueError, "shape"):
+      image_utils.deserialize_image_buffer(_raw_image_buffer(array), out=out)
+
+  def test_out_with_narrower_dtype(self):
+    array = np.arange(24, dtype=np.uint16).reshape(4, 6)
+    out = np.zeros(array.shape, dtype=np.uint8)
+
+    with self.assertRaises(TypeError):
+      image_utils.deserialize_image_buffer(_raw_image_buffer(array), out=out)
+
+
+class DeserializeImageBuffersTest(absltest.TestCase):
+
+  def test_keeps_order_of_mixed_images(self):
+    arrays = [_test_array(value) for value in range(6)]
+    images = [
+        _compressed_image_buffer(arrays[0], image_buffer_pb2.ENCODING_PNG),
+        _raw_image_buffer(arrays[1]),
+        _compressed_image_buffer(arrays[2], image_buffer_pb2.ENCODING_PNG),
+        _compressed_image_buffer(arrays[3], image_buffer_pb2.ENCODING_PNG),
+        _raw_image_buffer(arrays[4]),
+        _compressed_image_buffer(arrays[5], image_buffer_pb2.ENCODING_PNG),
+    ]
+
+    results = image_utils.deserialize_image_buffers(images)
+
+    self.assertLen(results, len(arrays))
+    for result, array in zip(results, arrays):
+      np.testing.assert_array_equal(result, array)
+
+  def test_out(self):
+    arrays = [_test_array(value) for value in range(3)]
+    images = [
+        _compressed_image_buffer(arrays[0], image_buffer_pb2.ENCODING_PNG),
+        _compressed_image_buffer(arrays[1], image_buffer_pb2.ENCODING_PNG),
+        _raw_image_buffer(arrays[2]),
+    ]
+    out = [np.zeros_like(arrays[0]), None, np.zeros_like(arrays[2])]
+
+    results = image_utils.deserialize_image_buffers(images, out=out)
+
+    self.assertIs(results[0], out[0])
+    self.assertIs(results[2], out[2])
+    for result, array in zip(results, arrays):
+      np.testing.assert_array_equal(result, array)
+
+  def test_out_with_wrong_length(self):
+    images = [_raw_image_buffer(_test_array(0))]
+
+    with self.assertRaises(ValueError):
+      image_utils.deserialize_image_buffers(images, out=[None, None])
+
+  def test_raises_errors_of_compressed_images(self):
+    images = [
+        _compressed_image_buffer(_test_array(0), image_buffer_pb2.ENCODING_PNG),
+        _compressed_image_buffer(_test_array(1), image_buffer_pb2.ENCODING_PNG),
+    ]
+    images[1].dimensions.rows += 1
+
+    with self.assertRaises(ValueError):
+      image_utils.deserialize_image_buffers(images)
+
+
+if __name__ == "__main__":
+  absltest.main()
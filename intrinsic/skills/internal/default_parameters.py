@@ -68,8 +68,17 @@ def merge_unset(from_msg: message.Message, to_msg: message.Message):
         'message pool.'
     )
 
+  _merge_unset_fields(from_msg.ListFields(), to_msg)
+
+
+def _merge_unset_fields(
+    from_fields: typing.List[
+        typing.Tuple[descriptor.FieldDescriptor, typing.Any]
+    ],
+    to_msg: message.Message,
+):
+  """Implements merge_unset for the (field, value) pairs set in from_msg."""
   to_fields = to_msg.ListFields()
-  from_fields = from_msg.ListFields()
 
   to_field_set_oneofs = _one_ofs_set([field for field, _ in to_fields])
 
@@ -89,6 +98,91 @@ def merge_unset(from_msg: message.Message, to_msg: message.Message):
   _set_fields(fields_set_in_from_but_not_to, to_msg)
 
 
+class DefaultParametersMerger:
+  """Applies a skill's default parameters to the skill's parameters.
+
+  The message class and the decoded defaults are computed once, so that
+  applying the defaults to the parameters of a request only needs to unpack the
+  parameters and merge in the unset fields.
+  """
+
+  def __init__(
+      self,
+      msg_descriptor: descriptor.Descriptor,
+      default_value_any: typing.Optional[any_pb2.Any] = None,
+  ):
+    """Initializes the instance.
+
+    Args:
+      msg_descriptor: The type information for the expected parameter and
+        default message type.
+      default_value_any: The defaults to apply to the parameters, if any.
+
+    Raises:
+      status.StatusNotOk if the defaults are of an unexpected type.
+    """
+    self._descriptor = msg_descriptor
+    self._message_class = message_factory.GetMessageClass(
+        descriptor=msg_descriptor
+    )
+
+    self._defaults = None
+    self._default_fields = []
+    if default_value_any is not None:
+      self._defaults = self._message_class()
+      if not default_value_any.Unpack(self._defaults):
+        error_bindings.raise_status(
+            status.StatusCode.INVALID_ARGUMENT,
+            'Unexpected default type. Expected: {}. Got: {}'.format(
+                msg_descriptor.full_name, default_value_any.TypeName()
+            ),
+        )
+      self._default_fields = self._defaults.ListFields()
+
+  @property
+  def message_class(self) -> typing.Type[message.Message]:
+    """The generated class of the parameter message."""
+    return self._message_class
+
+  def merge(self, parameters: message.Message):
+    """Merges the defaults into the unset fields of parameters.
+
+    Equivalent to merge_unset(defaults, parameters).
+
+    Args:
+      parameters: The parameters to modify. Must be of the message class.
+    """
+    if not self._default_fields:
+      return
+    if not parameters.ListFields():
+      parameters.MergeFrom(self._defaults)
+      return
+    _merge_unset_fields(self._default_fields, parameters)
+
+  def parse(self, parameters_any: any_pb2.Any) -> message.Message:
+    """Unpacks the parameters and applies the defaults to them.
+
+    Args:
+      parameters_any: The packed parameters.
+
+    Returns:
+      The parameters with the defaults applied.
+
+    Raises:
+      status.StatusNotOk if the parameters are of an unexpected type.
+    """
+    parameters = self._message_class()
+    if not parameters_any.Unpack(parameters):
+      error_bindings.raise_status(
+          status.StatusCode.INVALID_ARGUMENT,
+          'Unexpected parameter type. Expected: {}. Got: {}'.format(
+              self._descriptor.full_name, parameters_any.TypeName()
+          ),
+      )
+    self.merge(parameters)
+    return parameters
+
+
 def apply_defaults_to_parameters(
     msg_descriptor: descriptor.Descriptor,
     default_value_any: any_pb2.Any,
@@ -106,25 +200,5 @@ def apply_defaults_to_parameters(
   Raises:
     status.StatusNotOk if the parameters or defaults are of an unexpected type.
   """
-  cls = message_factory.GetMessageClass(descriptor=msg_descriptor)
-
-  defaults = cls()
-  if not default_value_any.Unpack(defaults):
-    error_bindings.raise_status(
-        status.StatusCode.INVALID_ARGUMENT,
-        'Unexpected default type. Expected: {}. Got: {}'.format(
-            msg_descriptor.full_name, default_value_any.TypeName()
-        ),
-    )
-
-  parameters = cls()
-  if not parameters_any.Unpack(parameters):
-    error_bindings.raise_status(
-        status.StatusCode.INVALID_ARGUMENT,
-        'Unexpected parameter type. Expected: {}. Got: {}'.format(
-            msg_descriptor.full_name, parameters_any.TypeName()
-        ),
-    )
-
-  merge_unset(defaults, parameters)
-  parameters_any.Pack(parameters)
+  merger = DefaultParametersMerger(msg_descriptor, default_value_any)
+  parameters_any.Pack(merger.parse(parameters_any))
@@ -0,0 +1,103 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""A SkillRepository that creates its underlying repository on first use."""
+
+import threading
+from typing import Callable, List, Optional
+
+from absl import logging
+from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_repository as repo
+from intrinsic.skills.python import skill_interface as skl
+from intrinsic.util.decorators import overrides
+
+
+class LazySkillRepository(repo.SkillRepository):
+  """Defers loading the skills of a repository until they are needed.
+
+  Loading a skill usually means importing its Python modules, which can take
+  much longer than starting the skill service. This repository knows the
+  aliases of its skills up front, so that the skill service can start serving
+  before the skills are loaded. The underlying repository is created by `load`
+  on the first call that needs a skill, or by load_in_background().
+  """
+
+  def __init__(
+      self,
+      skill_aliases: List[str],
+      load: Callable[[], repo.SkillRepository],
+  ):
+    """Initializes the instance.
+
+    Args:
+      skill_aliases: The aliases of the skills that `load` provides.
+      load: Creates the underlying repository.
+    """
+    self._skill_aliases = list(skill_aliases)
+    self._load = load
+    self._lock = threading.Lock()
+    self._repository: Optional[repo.SkillRepository] = None
+    self._thread: Optional[threading.Thread] = None
+
+  @property
+  def loaded(self) -> bool:
+    """Whether the underlying repository has been created."""
+    return self._repository is not None
+
+  def load_in_background(self) -> None:
+    """Starts creating the underlying repository on a background thread."""
+    with self._lock:
+      if self._thread is not None or self._repository is not None:
+        return
+      self._thread = threading.Thread(
+          target=self._load_or_log, name='skill_loader', daemon=True
+      )
+    self._thread.start()
+
+  @overrides(repo.SkillRepository)
+  def get_skill(self, skill_alias: str) -> skl.Skill:
+    self._validate_skill_alias(skill_alias)
+    return self._get_repository().get_skill(skill_alias)
+
+  @overrides(repo.SkillRepository)
+  def get_skill_execute(self, skill_alias: str) -> skl.SkillExecuteInterface:
+    self._validate_skill_alias(skill_alias)
+    return self._get_repository().get_skill_execute(skill_alias)
+
+  @overrides(repo.SkillRepository)
+  def get_skill_project(self, skill_alias: str) -> skl.SkillProjectInterface:
+    self._validate_skill_alias(skill_alias)
+    return self._get_repository().get_skill_project(skill_alias)
+
+  @overrides(repo.SkillRepository)
+  def get_skill_runtime_data(self, skill_alias: str) -> rd.SkillRuntimeData:
+    self._validate_skill_alias(skill_alias)
+    return self._get_repository().get_skill_runtime_data(skill_alias)
+
+  @overrides(repo.SkillRepository)
+  def get_skill_aliases(self) -> List[str]:
+    """Returns the aliases of the skills, without loading them."""
+    return list(self._skill_aliases)
+
+  def _load_or_log(self) -> None:
+    try:
+      self._get_repository()
+    except Exception:  # pylint: disable=broad-except
+      # Requests for the skills retry loading and report the error.
+      logging.exception('Failed to load skills %s.', self._skill_aliases)
+
+  def _get_repository(self) -> repo.SkillRepository:
+    repository = self._repository
+    if repository is not None:
+      return repository
+    with self._lock:
+      if self._repository is None:
+        self._repository = self._load()
+      return self._repository
+
+  def _validate_skill_alias(self, skill_alias: str) -> None:
+    if skill_alias not in self._skill_aliases:
+      raise repo.InvalidSkillAliasError(
+          f'The skill alias [{skill_alias}] does not match any of the'
+          f' registered skills: {self._skill_aliases}'
+      )
@@ -2,18 +2,76 @@
 
 """Library to run skill services from the skill image builder."""
 
+import datetime
+
 from absl import app
 from absl import flags
+from intrinsic.assets import id_utils
+from intrinsic.skills.internal import lazy_skill_repository
 from intrinsic.skills.internal import module_utils
 from intrinsic.skills.internal import runtime_data as rd
 from intrinsic.skills.internal import single_skill_factory
 from intrinsic.skills.internal import skill_init
+from intrinsic.skills.internal import skill_repository as skill_repo
+from intrinsic.skills.proto import skill_service_config_pb2
 from intrinsic.skills.python import skill_interface as skl
 
 _THREADS = flags.DEFINE_integer(
     "threads", 8, "Number of server threads to run."
 )
 _PORT = flags.DEFINE_integer("port", 8002, "Port to serve gRPC on.")
+_MAX_CONCURRENT_OPERATIONS = flags.DEFINE_integer(
+    "max_concurrent_operations",
+    100,
+    "Maximum number of skill operations that run at the same time.",
+)
+_MAX_QUEUED_OPERATIONS = flags.DEFINE_integer(
+    "max_queued_operations",
+    100,
+    (
+        "Maximum number of skill operations that wait to be run. Further"
+        " operations are rejected with RESOURCE_EXHAUSTED."
+    ),
+)
+_MAX_CONCURRENT_OPERATIONS_PER_SKILL = flags.DEFINE_integer(
+    "max_concurrent_operations_per_skill",
+    None,
+    "Maximum number of operations of the skill that run at the same time.",
+)
+_ASYNCIO = flags.DEFINE_bool(
+    "asyncio",
+    False,
+    (
+        "Serve on an asyncio (grpc.aio) server, on which waiting for skill"
+        " operations does not occupy server threads."
+    ),
+)
+_FAST_START = flags.DEFINE_bool(
+    "fast_start",
+    False,
+    (
+        "Start serving before the skill modules are imported and before the"
+        " dependent services are connected. Both happen in the background, and"
+        " requests which need them wait until they are ready."
+    ),
+)
+_FINISHED_OPERATION_TTL_SECS = flags.DEFINE_float(
+    "finished_operation_ttl_secs",
+    None,
+    (
+        "Time in seconds for which finished skill operations are kept. If"
+        " unset, they are kept until they are evicted by new operations."
+    ),
+)
+_SYNC_WORLD_CLIENTS = flags.DEFINE_bool(
+    "sync_world_clients",
+    False,
+    (
+        "Keep a local copy of each world in the world clients which are shared"
+        " by skill requests. The copy is refreshed when the world changes,"
+        " which saves listing the world in every request."
+    ),
+)
 _SKILL_SERVICE_CONFIG_FILENAME = flags.DEFINE_string(
     "skill_service_config_filename",
     "",
@@ -57,16 +115,20 @@ _ = flags.DEFINE_integer(
 _ = flags.DEFINE_bool("opencensus_tracing", True, "Dummy flag, do not use")
 
 
-def main(argv):
-  del argv  # unused
+def _load_skill_repository(
+    service_config: skill_service_config_pb2.SkillServiceConfig,
+) -> skill_repo.SkillRepository:
+  """Imports the skill modules and returns a repository for their skill.
 
-  if not _SKILL_SERVICE_CONFIG_FILENAME.value:
-    raise SystemExit("--skill_service_config_filename not set")
+  Args:
+    service_config: The configuration of the skill service.
 
-  service_config = skill_init.get_skill_service_config(
-      _SKILL_SERVICE_CONFIG_FILENAME.value
-  )
+  Returns:
+    A repository which serves the single skill of the modules.
 
+  Raises:
+    ValueError: If the modules do not contain exactly one skill.
+  """
   skill_class_list = module_utils.get_subclasses_in_modules(
       module_names=service_config.python_config.module_names[:],
       module_baseclass=skl.Skill,
@@ -74,7 +136,7 @@ def main(argv):
 
   num_skills = len(skill_class_list)
   if num_skills != 1:
-    raise SystemExit(f"Expected to find only 1 class, found {num_skills}")
+    raise ValueError(f"Expected to find only 1 class, found {num_skills}")
 
   skill = skill_class_list[0]
   runtime_data = rd.get_runtime_data_from(
@@ -82,10 +144,37 @@ def main(argv):
       # This is assigned by skill_image_builder when building the skill.
       parameter_descriptor=skill._parameter_descriptor,  # pylint: disable=protected-access
   )
-  skill_repository = single_skill_factory.SingleSkillFactory(
+  return single_skill_factory.SingleSkillFactory(
       skill_runtime_data=runtime_data, create_skill=skill
   )
 
+
+def main(argv):
+  del argv  # unused
+
+  startup_timings = skill_init.StartupTimings()
+
+  if not _SKILL_SERVICE_CONFIG_FILENAME.value:
+    raise SystemExit("--skill_service_config_filename not set")
+
+  with startup_timings.phase("read_config"):
+    service_config = skill_init.get_skill_service_config(
+        _SKILL_SERVICE_CONFIG_FILENAME.value
+    )
+
+  if _FAST_START.value:
+    skill_repository = lazy_skill_repository.LazySkillRepository(
+        skill_aliases=[id_utils.name_from(service_config.skill_description.id)],
+        load=lambda: _load_skill_repository(service_config),
+    )
+    skill_repository.load_in_background()
+  else:
+    with startup_timings.phase("import_skill_modules"):
+      try:
+        skill_repository = _load_skill_repository(service_config)
+      except ValueError as e:
+        raise SystemExit(str(e)) from e
+
   skill_init.skill_init(
       skill_repository=skill_repository,
       skill_service_config=service_config,
@@ -95,6 +184,18 @@ def main(argv):
       motion_planner_service_address=_MOTION_PLANNER_SERVICE_ADDRESS.value,
       geometry_service_address=_GEOMETRY_SERVICE_ADDRESS.value,
       connection_timeout=_GRPC_CONNECT_TIMEOUT.value,
+      max_concurrent_operations=_MAX_CONCURRENT_OPERATIONS.value,
+      max_queued_operations=_MAX_QUEUED_OPERATIONS.value,
+      max_concurrent_operations_per_skill=_MAX_CONCURRENT_OPERATIONS_PER_SKILL.value,
+      finished_operation_ttl=(
+          datetime.timedelta(seconds=_FINISHED_OPERATION_TTL_SECS.value)
+          if _FINISHED_OPERATION_TTL_SECS.value is not None
+          else None
+      ),
+      use_asyncio=_ASYNCIO.value,
+      fast_start=_FAST_START.value,
+      startup_timings=startup_timings,
+      sync_world_clients=_SYNC_WORLD_CLIENTS.value,
   )
 
 
@@ -0,0 +1,171 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Connections to the services that skills depend on."""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from absl import logging
+import grpc
+from intrinsic.geometry.service import geometry_service_pb2_grpc
+from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
+from intrinsic.world.proto import object_world_service_pb2_grpc
+
+
+class ServiceConnections:
+  """Channels and stubs for the world, motion planner and geometry services.
+
+  The channels are created without waiting for them to connect, so the stubs
+  can be handed out right away. connect() waits for all channels to become
+  ready at the same time, so the total connection time is that of the slowest
+  service instead of the sum over all services. connect_in_background() does
+  the same on a background thread; wait_until_ready() then blocks callers which
+  need the services until they are connected.
+  """
+
+  def __init__(
+      self,
+      world_service_address: str,
+      motion_planner_service_address: str,
+      geometry_service_address: str,
+  ):
+    """Creates the channels and stubs.
+
+    Args:
+      world_service_address: The address of the world service.
+      motion_planner_service_address: The address of the motion planner
+        service.
+      geometry_service_address: The address of the geometry service.
+    """
+    self._channels: Dict[str, grpc.Channel] = {
+        'world': grpc.insecure_channel(world_service_address),
+        'motion_planner': grpc.insecure_channel(motion_planner_service_address),
+        'geometry': grpc.insecure_channel(geometry_service_address),
+    }
+    self._object_world_service = (
+        object_world_service_pb2_grpc.ObjectWorldServiceStub(
+            self._channels['world']
+        )
+    )
+    self._motion_planner_service = (
+        motion_planner_service_pb2_grpc.MotionPlannerServiceStub(
+            self._channels['motion_planner']
+        )
+    )
+    self._geometry_service = geometry_service_pb2_grpc.GeometryServiceStub(
+        self._channels['geometry']
+    )
+
+    self._lock = threading.Lock()
+    self._ready = threading.Event()
+    self._connect_seconds: Dict[str, float] = {}
+    self._thread: Optional[threading.Thread] = None
+
+  @property
+  def object_world_service(
+      self,
+  ) -> object_world_service_pb2_grpc.ObjectWorldServiceStub:
+    return self._object_world_service
+
+  @property
+  def motion_planner_service(
+      self,
+  ) -> motion_planner_service_pb2_grpc.MotionPlannerServiceStub:
+    return self._motion_planner_service
+
+  @property
+  def geometry_service(self) -> geometry_service_pb2_grpc.GeometryServiceStub:
+    return self._geometry_service
+
+  @property
+  def ready(self) -> bool:
+    """Whether all services are connected."""
+    return self._ready.is_set()
+
+  @property
+  def connect_seconds(self) -> Dict[str, float]:
+    """Time it took to connect to each service that is connected, by name."""
+    with self._lock:
+      return dict(self._connect_seconds)
+
+  def connect(self, timeout: Optional[float] = None) -> None:
+    """Waits until all services are connected.
+
+    Args:
+      timeout: The maximum time in seconds to wait for all services, or None to
+        wait indefinitely.
+
+    Raises:
+      grpc.FutureTimeoutError: If a service is not connected within the
+        timeout.
+    """
+    start = time.monotonic()
+    ready_futures = {}
+    for name, channel in self._channels.items():
+      ready_future = grpc.channel_ready_future(channel)
+      ready_future.add_done_callback(
+          lambda unused_future, name=name: self._on_connected(name, start)
+      )
+      ready_futures[name] = ready_future
+
+    for name, ready_future in ready_futures.items():
+      remaining = None
+      if timeout is not None:
+        remaining = max(0.0, start + timeout - time.monotonic())
+      try:
+        ready_future.result(timeout=remaining)
+      except grpc.FutureTimeoutError:
+        logging.error(
+            'Could not connect to the %s service within %s seconds.',
+            name,
+            timeout,
+        )
+        raise
+    self._ready.set()
+
+  def connect_in_background(self, timeout: Optional[float] = None) -> None:
+    """Connects to all services on a background thread.
+
+    If the services are not connected within the timeout, an error is logged
+    and the background thread keeps waiting for them.
+
+    Args:
+      timeout: The time in seconds after which slow connections are reported.
+    """
+    with self._lock:
+      if self._thread is not None:
+        return
+      self._thread = threading.Thread(
+          target=self._connect_until_ready,
+          args=(timeout,),
+          name='service_connections',
+          daemon=True,
+      )
+    self._thread.start()
+
+  def wait_until_ready(self, timeout: Optional[float] = None) -> None:
+    """Blocks until all services are connected.
+
+    Args:
+      timeout: The maximum time in seconds to wait, or None to wait
+        indefinitely.
+
+    Raises:
+      TimeoutError: If the services are not connected within the timeout.
+    """
+    if not self._ready.wait(timeout):
+      raise TimeoutError(
+          f'Dependent services are not connected after {timeout} seconds.'
+      )
+
+  def _connect_until_ready(self, timeout: Optional[float]) -> None:
+    try:
+      self.connect(timeout)
+    except grpc.FutureTimeoutError:
+      self.connect(None)
+    logging.info('Connected to dependent services: %s', self.connect_seconds)
+
+  def _on_connected(self, name: str, start: float) -> None:
+    with self._lock:
+      self._connect_seconds.setdefault(name, time.monotonic() - start)
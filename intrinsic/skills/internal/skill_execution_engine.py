@@ -0,0 +1,266 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Server-wide execution engine for skill operations."""
+
+from __future__ import annotations
+
+import collections
+from concurrent import futures
+import dataclasses
+import threading
+import time
+from typing import Callable, Deque, Dict, Optional
+
+from absl import logging
+
+# Default maximum number of skill operations that run at the same time.
+DEFAULT_MAX_WORKERS = 100
+
+# Default maximum number of skill operations that wait for a worker.
+DEFAULT_MAX_QUEUE_SIZE = 100
+
+
+@dataclasses.dataclass(frozen=True)
+class LatencyStats:
+  """Summary of observed latencies.
+
+  Attributes:
+    count: The number of observations.
+    total_seconds: The sum of all observed latencies.
+    max_seconds: The largest observed latency.
+  """
+
+  count: int = 0
+  total_seconds: float = 0.0
+  max_seconds: float = 0.0
+
+  @property
+  def mean_seconds(self) -> float:
+    return self.total_seconds / self.count if self.count else 0.0
+
+  def add(self, seconds: float) -> LatencyStats:
+    return LatencyStats(
+        count=self.count + 1,
+        total_seconds=self.total_seconds + seconds,
+        max_seconds=max(self.max_seconds, seconds),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class EngineMetrics:
+  """A snapshot of the state of a SkillExecutionEngine.
+
+  Attributes:
+    max_workers: The maximum number of operations that run at the same time.
+    max_queue_size: The maximum number of operations that wait for a worker.
+    running: The number of operations that are currently running.
+    queue_depth: The number of admitted operations that have not started yet.
+    rejected: The number of operations that were rejected because the queue was
+      full.
+    completed: The number of operations that have finished.
+    queue_latency: Time between admission and start of the operations.
+    execution_latency: Time between start and end of the operations.
+  """
+
+  max_workers: int
+  max_queue_size: int
+  running: int
+  queue_depth: int
+  rejected: int
+  completed: int
+  queue_latency: LatencyStats
+  execution_latency: LatencyStats
+
+
+@dataclasses.dataclass
+class _Task:
+  skill_id: str
+  fn: Callable[[], None]
+  submitted_at: float
+
+
+class SkillExecutionEngine:
+  """Runs skill operations on a bounded, shared pool of worker threads.
+
+  All operations of a skill service share a single thread pool, so threads are
+  reused across operations instead of being created per operation. Operations
+  which cannot start immediately, because all workers are busy or the skill has
+  reached its concurrency limit, wait in a bounded queue. Operations submitted
+  while the queue is full are rejected with QueueFullError, which the skill
+  service reports as RESOURCE_EXHAUSTED.
+  """
+
+  class QueueFullError(RuntimeError):
+    """An operation was rejected because the engine's queue is full."""
+
+  def __init__(
+      self,
+      max_workers: int = DEFAULT_MAX_WORKERS,
+      max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+      max_concurrent_per_skill: Optional[int] = None,
+  ):
+    """Initializes the instance.
+
+    Args:
+      max_workers: The maximum number of operations that run at the same time.
+      max_queue_size: The maximum number of operations that wait for a worker.
+      max_concurrent_per_skill: The maximum number of operations of a single
+        skill that run at the same time, or None for no per-skill limit.
+
+    Raises:
+      ValueError: If any of the limits is invalid.
+    """
+    if max_workers < 1:
+      raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+    if max_queue_size < 0:
+      raise ValueError(
+          f'max_queue_size must not be negative, got {max_queue_size}.'
+      )
+    if max_concurrent_per_skill is not None and max_concurrent_per_skill < 1:
+      raise ValueError(
+          'max_concurrent_per_skill must be at least 1, got'
+          f' {max_concurrent_per_skill}.'
+      )
+
+    self._max_workers = max_workers
+    self._max_queue_size = max_queue_size
+    self._max_concurrent_per_skill = max_concurrent_per_skill
+
+    self._pool = futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='skill_operation'
+    )
+    self._lock = threading.Lock()
+    # Operations that wait for their skill's concurrency limit, by skill id.
+    self._blocked: Dict[str, Deque[_Task]] = {}
+    # Number of dispatched (queued in the pool or running) operations per
+    # skill id.
+    self._dispatched: Dict[str, int] = collections.defaultdict(int)
+    self._num_blocked = 0
+    self._shut_down = False
+    self._queue_depth = 0
+    self._running = 0
+    self._rejected = 0
+    self._completed = 0
+    self._queue_latency = LatencyStats()
+    self._execution_latency = LatencyStats()
+
+  def submit(self, skill_id: str, fn: Callable[[], None]) -> None:
+    """Submits an operation for execution.
+
+    Args:
+      skill_id: The id of the skill the operation belongs to.
+      fn: Runs the operation. Must not raise.
+
+    Raises:
+      QueueFullError: If the operation cannot start immediately and the queue
+        is full.
+      RuntimeError: If the engine has been shut down.
+    """
+    task = _Task(skill_id=skill_id, fn=fn, submitted_at=time.monotonic())
+    with self._lock:
+      if self._shut_down:
+        raise RuntimeError('Cannot submit operations after shutdown.')
+      blocked = (
+          self._max_concurrent_per_skill is not None
+          and self._dispatched[skill_id] >= self._max_concurrent_per_skill
+      )
+      # Only dispatched operations occupy (or are about to occupy) a worker.
+      # Operations blocked by their skill's limit wait outside of the pool.
+      num_dispatched = self._running + self._queue_depth - self._num_blocked
+      num_waiting = self._num_blocked + max(
+          0, num_dispatched - self._max_workers
+      )
+      must_wait = blocked or num_dispatched >= self._max_workers
+      if must_wait and num_waiting >= self._max_queue_size:
+        self._rejected += 1
+        raise self.QueueFullError(
+            f'Cannot start an operation of skill {skill_id}: {self._running}'
+            f' operations are running and {self._queue_depth} are queued.'
+        )
+      self._queue_depth += 1
+
+      if blocked:
+        self._blocked.setdefault(skill_id, collections.deque()).append(task)
+        self._num_blocked += 1
+        return
+      self._dispatched[skill_id] += 1
+      self._pool.submit(self._run, task)
+
+  def metrics(self) -> EngineMetrics:
+    """Returns a snapshot of the engine's metrics."""
+    with self._lock:
+      return EngineMetrics(
+          max_workers=self._max_workers,
+          max_queue_size=self._max_queue_size,
+          running=self._running,
+          queue_depth=self._queue_depth,
+          rejected=self._rejected,
+          completed=self._completed,
+          queue_latency=self._queue_latency,
+          execution_latency=self._execution_latency,
+      )
+
+  def shutdown(self, wait: bool = True) -> None:
+    """Shuts down the worker threads.
+
+    Operations which are blocked by their skill's limit at this point still run
+    once the limit allows it, on the worker of the skill's finishing operation.
+
+    Args:
+      wait: Whether to wait for running and queued operations to finish.
+    """
+    with self._lock:
+      self._shut_down = True
+    self._pool.shutdown(wait=wait)
+
+  def _run(self, task: _Task) -> None:
+    """Runs a dispatched operation on a worker thread."""
+    next_task = task
+    while next_task is not None:
+      next_task = self._run_task(next_task)
+
+  def _run_task(self, task: _Task) -> Optional[_Task]:
+    """Runs an operation and dispatches the next blocked one of its skill.
+
+    Args:
+      task: The operation to run.
+
+    Returns:
+      The next blocked operation of the skill if the engine has been shut down
+      and it must run on the current worker, or None.
+    """
+    started_at = time.monotonic()
+    with self._lock:
+      self._queue_depth -= 1
+      self._running += 1
+      self._queue_latency = self._queue_latency.add(
+          started_at - task.submitted_at
+      )
+
+    try:
+      task.fn()
+    except Exception:  # pylint: disable=broad-except
+      logging.exception('Skill operation of %s raised an error.', task.skill_id)
+    finally:
+      next_task = None
+      with self._lock:
+        self._running -= 1
+        self._completed += 1
+        self._execution_latency = self._execution_latency.add(
+            time.monotonic() - started_at
+        )
+        blocked = self._blocked.get(task.skill_id)
+        if blocked:
+          next_task = blocked.popleft()
+          self._num_blocked -= 1
+          if not blocked:
+            del self._blocked[task.skill_id]
+          # The pool does not accept new work after shutdown.
+          if not self._shut_down:
+            self._pool.submit(self._run, next_task)
+            next_task = None
+        else:
+          self._dispatched[task.skill_id] -= 1
+          if not self._dispatched[task.skill_id]:
+            del self._dispatched[task.skill_id]
+    return next_task
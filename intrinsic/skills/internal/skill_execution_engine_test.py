@@ -0,0 +1,269 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for skill_execution_engine."""
+
+import threading
+import time
+from typing import Callable
+
+from absl.testing import absltest
+from intrinsic.skills.internal import skill_execution_engine
+
+_TIMEOUT_SECONDS = 10
+
+
+class _BlockingOperation:
+  """An operation which runs until it is released."""
+
+  def __init__(self):
+    self.started = threading.Event()
+    self._release = threading.Event()
+
+  def __call__(self) -> None:
+    self.started.set()
+    self._release.wait(_TIMEOUT_SECONDS)
+
+  def release(self) -> None:
+    self._release.set()
+
+
+class SkillExecutionEngineTest(absltest.TestCase):
+
+  def _create_engine(
+      self, **kwargs
+  ) -> skill_execution_engine.SkillExecutionEngine:
+    engine = skill_execution_engine.SkillExecutionEngine(**kwargs)
+    self.addCleanup(engine.shutdown)
+    return engine
+
+  def _wait_for(self, condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + _TIMEOUT_SECONDS
+    while not condition():
+      if time.monotonic() > deadline:
+        self.fail('Condition not met in time.')
+      time.sleep(0.001)
+
+  def test_invalid_limits(self):
+    with self.assertRaises(ValueError):
+      skill_execution_engine.SkillExecutionEngine(max_workers=0)
+    with self.assertRaises(ValueError):
+      skill_execution_engine.SkillExecutionEngine(max_queue_size=-1)
+    with self.assertRaises(ValueError):
+      skill_execution_engine.SkillExecutionEngine(max_concurrent_per_skill=0)
+
+  def test_runs_operations(self):
+    engine = self._create_engine(max_workers=2)
+    done = [threading.Event() for _ in range(5)]
+
+    for event in done:
+      engine.submit('skill', event.set)
+
+    for event in done:
+      self.assertTrue(event.wait(_TIMEOUT_SECONDS))
+    self._wait_for(lambda: engine.metrics().completed == 5)
+
+  def test_queues_operations_while_workers_are_busy(self):
+    engine = self._create_engine(max_workers=1, max_queue_size=1)
+    first = _BlockingOperation()
+    second = _BlockingOperation()
+
+    engine.submit('skill', first)
+    self.assertTrue(first.started.wait(_TIMEOUT_SECONDS))
+    engine.submit('skill', second)
+
+    metrics = engine.metrics()
+    self.assertEqual(metrics.running, 1)
+    self.assertEqual(metrics.queue_depth, 1)
+    self.assertFalse(second.started.is_set())
+
+    first.release()
+    self.assertTrue(second.started.wait(_TIMEOUT_SECONDS))
+    second.release()
+    self._wait_for(lambda: engine.metrics().completed == 2)
+
+  def test_rejects_operations_while_queue_is_full(self):
+    engine = self._create_engine(max_workers=1, max_queue_size=1)
+    first = _BlockingOperation()
+    second = _BlockingOperation()
+    engine.submit('skill', first)
+    self.assertTrue(first.started.wait(_TIMEOUT_SECONDS))
+    engine.submit('skill', second)
+
+    with self.assertRaises(
+        skill_execution_engine.SkillExecutionEngine.QueueFullError
+    ):
+      engine.submit('skill', lambda: None)
+
+    metrics = engine.metrics()
+    self.assertEqual(metrics.rejected, 1)
+    self.assertEqual(metrics.running, 1)
+    self.assertEqual(metrics.queue_depth, 1)
+
+    # Operations are admitted again once the queue has room.
+    first.release()
+    second.release()
+    self._wait_for(lambda: engine.metrics().completed == 2)
+    done = threading.Event()
+    engine.submit('skill', done.set)
+    self.assertTrue(done.wait(_TIMEOUT_SECONDS))
+
+  def test_rejects_operations_without_queue(self):
+    engine = self._create_engine(max_workers=1, max_queue_size=0)
+    operation = _BlockingOperation()
+    engine.submit('skill', operation)
+    self.assertTrue(operation.started.wait(_TIMEOUT_SECONDS))
+
+    with self.assertRaises(
+        skill_execution_engine.SkillExecutionEngine.QueueFullError
+    ):
+      engine.submit('skill', lambda: None)
+
+    operation.release()
+
+  def test_limits_concurrent_operations_per_skill(self):
+    engine = self._create_engine(
+        max_workers=4, max_queue_size=4, max_concurrent_per_skill=1
+    )
+    first = _BlockingOperation()
+    second = _BlockingOperation()
+    other_skill = _BlockingOperation()
+
+    engine.submit('skill', first)
+    engine.submit('skill', second)
+    engine.submit('other_skill', other_skill)
+
+    # Other skills are not blocked by the limit of a skill.
+    self.assertTrue(first.started.wait(_TIMEOUT_SECONDS))
+    self.assertTrue(other_skill.started.wait(_TIMEOUT_SECONDS))
+    self.assertFalse(second.started.wait(0.05))
+    metrics = engine.metrics()
+    self.assertEqual(metrics.running, 2)
+    self.assertEqual(metrics.queue_depth, 1)
+
+    first.release()
+    self.assertTrue(second.started.wait(_TIMEOUT_SECONDS))
+    second.release()
+    other_skill.release()
+    self._wait_for(lambda: engine.metrics().completed == 3)
+
+  def test_operations_blocked_by_skill_limit_count_towards_queue(self):
+    engine = self._create_engine(
+        max_workers=4, max_queue_size=1, max_concurrent_per_skill=1
+    )
+    first = _BlockingOperation()
+    engine.submit('skill', first)
+    engine.submit('skill', lambda: None)
+
+    with self.assertRaises(
+        skill_execution_engine.SkillExecutionEngine.QueueFullError
+    ):
+      engine.submit('skill', lambda: None)
+
+    first.release()
+    self._wait_for(lambda: engine.metrics().completed == 2)
+
+  def test_operations_blocked_by_skill_limit_do_not_occupy_workers(self):
+    engine = self._create_engine(
+        max_workers=2, max_queue_size=1, max_concurrent_per_skill=1
+    )
+    first = _BlockingOperation()
+    other_skill = _BlockingOperation()
+    engine.submit('skill', first)
+    engine.submit('skill', lambda: None)
+
+    # The blocked operation does not take the second worker.
+    engine.submit('other_skill', other_skill)
+
+    self.assertTrue(other_skill.started.wait(_TIMEOUT_SECONDS))
+    first.release()
+    other_skill.release()
+    self._wait_for(lambda: engine.metrics().completed == 3)
+
+  def test_shutdown_runs_operations_blocked_by_skill_limit(self):
+    engine = skill_execution_engine.SkillExecutionEngine(
+        max_workers=2, max_concurrent_per_skill=1
+    )
+    first = _BlockingOperation()
+    done = [threading.Event() for _ in range(2)]
+    engine.submit('skill', first)
+    for event in done:
+      engine.submit('skill', event.set)
+    self.assertTrue(first.started.wait(_TIMEOUT_SECONDS))
+
+    engine.shutdown(wait=False)
+    with self.assertRaises(RuntimeError):
+      engine.submit('skill', lambda: None)
+    first.release()
+
+    for event in done:
+      self.assertTrue(event.wait(_TIMEOUT_SECONDS))
+    self._wait_for(lambda: engine.metrics().completed == 3)
+    engine.shutdown()
+
+  def test_failing_operation_does_not_stop_engine(self):
+    engine = self._create_engine(max_workers=1, max_concurrent_per_skill=1)
+
+    def fail():
+      raise RuntimeError('Failed.')
+
+    done = threading.Event()
+    engine.submit('skill', fail)
+    engine.submit('skill', done.set)
+
+    self.assertTrue(done.wait(_TIMEOUT_SECONDS))
+    self._wait_for(lambda: engine.metrics().completed == 2)
+
+  def test_metrics(self):
+    engine = self._create_engine(max_workers=1, max_queue_size=3)
+    self.assertEqual(
+        engine.metrics(),
+        skill_execution_engine.EngineMetrics(
+            max_workers=1,
+            max_queue_size=3,
+            running=0,
+            queue_depth=0,
+            rejected=0,
+            completed=0,
+            queue_latency=skill_execution_engine.LatencyStats(),
+            execution_latency=skill_execution_engine.LatencyStats(),
+        ),
+    )
+
+    first = _BlockingOperation()
+    engine.submit('skill', first)
+    engine.submit('skill', lambda: None)
+    self.assertTrue(first.started.wait(_TIMEOUT_SECONDS))
+    time.sleep(0.02)
+    first.release()
+    self._wait_for(lambda: engine.metrics().completed == 2)
+
+    metrics = engine.metrics()
+    self.assertEqual(metrics.running, 0)
+    self.assertEqual(metrics.queue_depth, 0)
+    self.assertEqual(metrics.queue_latency.count, 2)
+    self.assertEqual(metrics.execution_latency.count, 2)
+    # The second operation waited for the first one.
+    self.assertGreaterEqual(metrics.queue_latency.max_seconds, 0.02)
+    self.assertGreaterEqual(metrics.execution_latency.max_seconds, 0.02)
+    self.assertLessEqual(
+        metrics.execution_latency.mean_seconds,
+        metrics.execution_latency.max_seconds,
+    )
+
+
+class LatencyStatsTest(absltest.TestCase):
+
+  def test_add(self):
+    stats = skill_execution_engine.LatencyStats().add(1.0).add(3.0)
+
+    self.assertEqual(stats.count, 2)
+    self.assertEqual(stats.total_seconds, 4.0)
+    self.assertEqual(stats.max_seconds, 3.0)
+    self.assertEqual(stats.mean_seconds, 2.0)
+
+  def test_mean_of_empty_stats(self):
+    self.assertEqual(skill_execution_engine.LatencyStats().mean_seconds, 0.0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -2,45 +2,59 @@
 
 """skill_init provides initialization functions for setting up skill service."""
 
+import asyncio
 from concurrent import futures
+import contextlib
+import datetime
+import functools
 import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
 
 from absl import logging
 import grpc
-from intrinsic.geometry.service import geometry_service_pb2_grpc
-from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
+from intrinsic.skills.internal import service_connections
+from intrinsic.skills.internal import skill_execution_engine
 from intrinsic.skills.internal import skill_repository as skill_repo
 from intrinsic.skills.internal import skill_service_impl
+from intrinsic.skills.internal import world_client_pool
 from intrinsic.skills.proto import skill_service_config_pb2
 from intrinsic.skills.proto import skill_service_pb2_grpc
-from intrinsic.world.proto import object_world_service_pb2_grpc
 
 
-def _create_object_world_service_stub(
-    address: str, connection_timeout: int
-) -> object_world_service_pb2_grpc.ObjectWorldServiceStub:
-  channel = grpc.insecure_channel(address)
-  # Blocks for the duration of the timeout until the channel is ready.
-  grpc.channel_ready_future(channel).result(connection_timeout)
-  return object_world_service_pb2_grpc.ObjectWorldServiceStub(channel)
+class StartupTimings:
+  """Records how long the phases of the skill service startup take.
 
+  Phases are recorded in the order in which they run. log() reports them
+  together with the total time since the instance was created.
+  """
 
-def _create_motion_planner_service_stub(
-    address: str, connection_timeout: int
-) -> motion_planner_service_pb2_grpc.MotionPlannerServiceStub:
-  channel = grpc.insecure_channel(address)
-  # Blocks for the duration of the timeout until the channel is ready.
-  grpc.channel_ready_future(channel).result(timeout=connection_timeout)
-  return motion_planner_service_pb2_grpc.MotionPlannerServiceStub(channel)
+  def __init__(self):
+    self._start = time.monotonic()
+    self._phases: Dict[str, float] = {}
 
+  @property
+  def phases(self) -> Dict[str, float]:
+    """Duration in seconds of each recorded phase, by name."""
+    return dict(self._phases)
 
-def _create_geometry_service_stub(
-    address: str, connection_timeout: int
-) -> geometry_service_pb2_grpc.GeometryServiceStub:
-  channel = grpc.insecure_channel(address)
-  # Blocks for the duration of the timeout until the channel is ready.
-  grpc.channel_ready_future(channel).result(timeout=connection_timeout)
-  return geometry_service_pb2_grpc.GeometryServiceStub(channel)
+  @contextlib.contextmanager
+  def phase(self, name: str) -> Iterator[None]:
+    """Records the time spent in the managed block as phase `name`."""
+    start = time.monotonic()
+    try:
+      yield
+    finally:
+      self._phases[name] = time.monotonic() - start
+
+  def log(self) -> None:
+    """Logs the phase durations and the total startup time."""
+    logging.info(
+        "Skill service started in %.3fs (%s)",
+        time.monotonic() - self._start,
+        ", ".join(
+            f"{name}: {seconds:.3f}s" for name, seconds in self._phases.items()
+        ),
+    )
 
 
 def get_skill_service_config(
@@ -79,6 +93,14 @@ def skill_init(
     motion_planner_service_address: str,
     geometry_service_address: str,
     connection_timeout: int,
+    max_concurrent_operations: int = skill_execution_engine.DEFAULT_MAX_WORKERS,
+    max_queued_operations: int = skill_execution_engine.DEFAULT_MAX_QUEUE_SIZE,
+    max_concurrent_operations_per_skill: Optional[int] = None,
+    finished_operation_ttl: Optional[datetime.timedelta] = None,
+    use_asyncio: bool = False,
+    fast_start: bool = False,
+    startup_timings: Optional[StartupTimings] = None,
+    sync_world_clients: bool = False,
 ):
   """Starts the skill services on a gRPC server at port `skill_service_port`.
 
@@ -87,9 +109,14 @@ def skill_init(
     * SkillExecutorServicer
     * SkillInformationServicer
 
-  Establishes connections to common clients of skills.
-  The `connection_timeout` applies to the establishment of each connection, not
-  the cumulative connection time.
+  Establishes connections to common clients of skills. The connections are
+  established concurrently, so the `connection_timeout` applies to each
+  connection as well as to the cumulative connection time.
+
+  With `fast_start`, the server starts serving without waiting for the
+  connections: they are established in the background, and requests which need
+  them wait until they are ready (for at most `connection_timeout`). Requests
+  which do not need them, like GetSkillInfo, are served right away.
 
   The skills services are configured using the proto data contained in the
   service_config.
@@ -106,23 +133,117 @@ def skill_init(
     motion_planner_service_address: The address of the motion planner service
     geometry_service_address: The address of the geometry service
     connection_timeout: The connection timeout
+    max_concurrent_operations: The maximum number of skill operations that run
+      at the same time
+    max_queued_operations: The maximum number of skill operations that wait to
+      be run; further operations are rejected with RESOURCE_EXHAUSTED
+    max_concurrent_operations_per_skill: The maximum number of operations of a
+      single skill that run at the same time, or None for no limit
+    finished_operation_ttl: How long finished skill operations are kept, or
+      None to keep them until they are evicted by new operations
+    use_asyncio: Whether to serve on a grpc.aio server. Waiting for operations
+      then does not occupy any of the `num_threads` threads
+    fast_start: Whether to start serving before the connections to the
+      dependent services are established
+    startup_timings: Records the durations of the startup phases, which are
+      logged once the server is serving. May already contain phases recorded
+      by the caller
+    sync_world_clients: Whether the world clients which are shared by skill
+      requests keep a local copy of their world, which is refreshed when the
+      world changes (see WorldClientPool)
 
   Raises:
     RuntimeError: if skill service fails to use skill_service_port
+    grpc.FutureTimeoutError: if a dependent service cannot be connected within
+      `connection_timeout` (only without `fast_start`)
   """
-  server = grpc.server(
-      futures.ThreadPoolExecutor(max_workers=num_threads),
-      options=(("grpc.so_reuseport", 0),),
-  )  # pytype: disable=wrong-keyword-args
+  if startup_timings is None:
+    startup_timings = StartupTimings()
 
-  object_world_service = _create_object_world_service_stub(
-      world_service_address, connection_timeout
-  )
-  motion_planner_service = _create_motion_planner_service_stub(
-      motion_planner_service_address, connection_timeout
+  connections = service_connections.ServiceConnections(
+      world_service_address=world_service_address,
+      motion_planner_service_address=motion_planner_service_address,
+      geometry_service_address=geometry_service_address,
   )
-  geometry_service = _create_geometry_service_stub(
-      geometry_service_address, connection_timeout
+  wait_until_ready = None
+  if fast_start:
+    connections.connect_in_background(connection_timeout)
+    wait_until_ready = functools.partial(
+        connections.wait_until_ready, connection_timeout
+    )
+  else:
+    with startup_timings.phase("connect_services"):
+      connections.connect(connection_timeout)
+
+  with startup_timings.phase("create_servicers"):
+    servicers = _create_servicers(
+        skill_repository=skill_repository,
+        skill_service_config=skill_service_config,
+        connections=connections,
+        wait_until_ready=wait_until_ready,
+        max_concurrent_operations=max_concurrent_operations,
+        max_queued_operations=max_queued_operations,
+        max_concurrent_operations_per_skill=max_concurrent_operations_per_skill,
+        finished_operation_ttl=finished_operation_ttl,
+        sync_world_clients=sync_world_clients,
+    )
+  projector_servicer, executor_servicer, skill_info_servicer = servicers
+  execution_engine = executor_servicer.execution_engine
+
+  try:
+    if use_asyncio:
+      asyncio.run(
+          _serve_async(
+              projector_servicer,
+              executor_servicer,
+              skill_info_servicer,
+              skill_service_port,
+              startup_timings,
+          )
+      )
+    else:
+      _serve(
+          projector_servicer,
+          executor_servicer,
+          skill_info_servicer,
+          skill_service_port,
+          num_threads,
+          startup_timings,
+      )
+  except KeyboardInterrupt:
+    pass
+  finally:
+    execution_engine.shutdown(wait=False)
+
+
+def _create_servicers(
+    skill_repository: skill_repo.SkillRepository,
+    skill_service_config: skill_service_config_pb2.SkillServiceConfig,
+    connections: service_connections.ServiceConnections,
+    wait_until_ready: Optional[Callable[[], None]],
+    max_concurrent_operations: int,
+    max_queued_operations: int,
+    max_concurrent_operations_per_skill: Optional[int],
+    finished_operation_ttl: Optional[datetime.timedelta],
+    sync_world_clients: bool,
+) -> Tuple[
+    skill_service_impl.SkillProjectorServicer,
+    skill_service_impl.SkillExecutorServicer,
+    Optional[skill_service_impl.SkillInformationServicer],
+]:
+  """Creates the projector, executor and (optional) information servicers."""
+  object_world_service = connections.object_world_service
+  motion_planner_service = connections.motion_planner_service
+  geometry_service = connections.geometry_service
+
+  # World clients are shared by all services, so that they are reused across
+  # requests.
+  world_clients = world_client_pool.WorldClientPool(
+      object_world_service=object_world_service,
+      motion_planner_service=motion_planner_service,
+      geometry_service=geometry_service,
+      wait_until_ready=wait_until_ready,
+      sync_with_world=sync_world_clients,
   )
 
   # Initialize the projector service.
@@ -131,24 +252,29 @@ def skill_init(
       object_world_service=object_world_service,
       motion_planner_service=motion_planner_service,
       geometry_service=geometry_service,
-  )
-  skill_service_pb2_grpc.add_ProjectorServicer_to_server(
-      projector_servicer, server
+      world_clients=world_clients,
   )
 
-  # Initialize the executor service.
+  # Initialize the executor service. All skill operations run on a single,
+  # bounded execution engine.
+  execution_engine = skill_execution_engine.SkillExecutionEngine(
+      max_workers=max_concurrent_operations,
+      max_queue_size=max_queued_operations,
+      max_concurrent_per_skill=max_concurrent_operations_per_skill,
+  )
   executor_servicer = skill_service_impl.SkillExecutorServicer(
       skill_repository=skill_repository,
       object_world_service=object_world_service,
       motion_planner_service=motion_planner_service,
       geometry_service=geometry_service,
-  )
-  skill_service_pb2_grpc.add_ExecutorServicer_to_server(
-      executor_servicer, server
+      execution_engine=execution_engine,
+      finished_operation_ttl=finished_operation_ttl,
+      world_clients=world_clients,
   )
 
   # Initialize the skill information service if --skill_service_config_filename
   # given (which means we're running a modular skill server).
+  skill_info_servicer = None
   if skill_service_config.HasField("skill_description"):
     if (
         skill_service_config.skill_description.skill_name
@@ -167,29 +293,96 @@ def skill_init(
     skill_info_servicer = skill_service_impl.SkillInformationServicer(
         skill_service_config.skill_description
     )
-    skill_service_pb2_grpc.add_SkillInformationServicer_to_server(
-        skill_info_servicer, server
-    )
 
-  # Initialize server with insecure port.
-  endpoint = "[::]:{}".format(skill_service_port)
-  added_port = server.add_insecure_port(endpoint)
-  if added_port != skill_service_port:
-    raise RuntimeError(f"Failed to use port {skill_service_port}")
-  server.start()
+  return projector_servicer, executor_servicer, skill_info_servicer
+
 
+def _log_listening(endpoint: str) -> None:
   logging.info("""==========================================================
       """)
   logging.info("--------------------------------")
   logging.info("-- Skill service listening on %s", endpoint)
   logging.info("--------------------------------")
 
+
+def _serve(
+    projector_servicer: skill_service_impl.SkillProjectorServicer,
+    executor_servicer: skill_service_impl.SkillExecutorServicer,
+    skill_info_servicer: Optional[skill_service_impl.SkillInformationServicer],
+    skill_service_port: int,
+    num_threads: int,
+    startup_timings: StartupTimings,
+) -> None:
+  """Serves the skill services on a grpc.server until interrupted."""
+  server = grpc.server(
+      futures.ThreadPoolExecutor(max_workers=num_threads),
+      options=(("grpc.so_reuseport", 0),),
+  )  # pytype: disable=wrong-keyword-args
+
+  skill_service_pb2_grpc.add_ProjectorServicer_to_server(
+      projector_servicer, server
+  )
+  skill_service_pb2_grpc.add_ExecutorServicer_to_server(
+      executor_servicer, server
+  )
+  if skill_info_servicer is not None:
+    skill_service_pb2_grpc.add_SkillInformationServicer_to_server(
+        skill_info_servicer, server
+    )
+
+  # Initialize server with insecure port.
+  with startup_timings.phase("start_server"):
+    endpoint = "[::]:{}".format(skill_service_port)
+    added_port = server.add_insecure_port(endpoint)
+    if added_port != skill_service_port:
+      raise RuntimeError(f"Failed to use port {skill_service_port}")
+    server.start()
+  _log_listening(endpoint)
+  startup_timings.log()
+
   # Keep server running until an interrupt signal is received.
   try:
     while True:
       # Sleep for a day.
       time.sleep(60 * 60 * 24)
-  except KeyboardInterrupt:
-    pass
   finally:
     server.stop(None)
+
+
+async def _serve_async(
+    projector_servicer: skill_service_impl.SkillProjectorServicer,
+    executor_servicer: skill_service_impl.SkillExecutorServicer,
+    skill_info_servicer: Optional[skill_service_impl.SkillInformationServicer],
+    skill_service_port: int,
+    startup_timings: StartupTimings,
+) -> None:
+  """Serves the skill services on a grpc.aio server until it terminates."""
+  server = grpc.aio.server(options=(("grpc.so_reuseport", 0),))
+
+  skill_service_pb2_grpc.add_ProjectorServicer_to_server(
+      skill_service_impl.AsyncSkillProjectorServicer(projector_servicer),
+      server,
+  )
+  skill_service_pb2_grpc.add_ExecutorServicer_to_server(
+      skill_service_impl.AsyncSkillExecutorServicer(executor_servicer), server
+  )
+  if skill_info_servicer is not None:
+    skill_service_pb2_grpc.add_SkillInformationServicer_to_server(
+        skill_service_impl.AsyncSkillInformationServicer(skill_info_servicer),
+        server,
+    )
+
+  # Initialize server with insecure port.
+  with startup_timings.phase("start_server"):
+    endpoint = "[::]:{}".format(skill_service_port)
+    added_port = server.add_insecure_port(endpoint)
+    if added_port != skill_service_port:
+      raise RuntimeError(f"Failed to use port {skill_service_port}")
+    await server.start()
+  _log_listening(endpoint)
+  startup_timings.log()
+
+  try:
+    await server.wait_for_termination()
+  finally:
+    await server.stop(None)
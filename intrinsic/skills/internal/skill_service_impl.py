@@ -4,23 +4,24 @@
 
 from __future__ import annotations
 
-from concurrent import futures
+import asyncio
+import collections
+import datetime
+import inspect
 import threading
+import time
 import traceback
-from typing import Callable, Dict, NoReturn, Optional, cast
+from typing import Any, Callable, Dict, List, NoReturn, Optional, Tuple, TypeVar, cast
 
 from absl import logging
 from google.longrunning import operations_pb2
 from google.protobuf import any_pb2
-from google.protobuf import descriptor as proto_descriptor
 from google.protobuf import empty_pb2
 from google.protobuf import message as proto_message
-from google.protobuf import message_factory
 from google.rpc import status_pb2
 import grpc
 from intrinsic.assets import id_utils
 from intrinsic.geometry.service import geometry_service_pb2_grpc
-from intrinsic.motion_planning import motion_planner_client
 from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
 from intrinsic.skills.internal import default_parameters
 from intrinsic.skills.internal import error_utils
@@ -28,20 +29,20 @@ from intrinsic.skills.internal import execute_context_impl
 from intrinsic.skills.internal import get_footprint_context_impl
 from intrinsic.skills.internal import preview_context_impl
 from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_execution_engine
 from intrinsic.skills.internal import skill_repository as skill_repo
+from intrinsic.skills.internal import world_client_pool
 from intrinsic.skills.proto import error_pb2
 from intrinsic.skills.proto import footprint_pb2
 from intrinsic.skills.proto import prediction_pb2
 from intrinsic.skills.proto import skill_service_pb2
 from intrinsic.skills.proto import skill_service_pb2_grpc
 from intrinsic.skills.proto import skills_pb2
-from intrinsic.skills.python import proto_utils
 from intrinsic.skills.python import skill_canceller
 from intrinsic.skills.python import skill_interface as skl
 from intrinsic.skills.python import skill_logging_context
 from intrinsic.util.status import status_exception
 from intrinsic.world.proto import object_world_service_pb2_grpc
-from intrinsic.world.python import object_world_client
 from pybind11_abseil import status
 
 # Maximum number of operations to keep in a SkillOperations instance.
@@ -67,11 +68,28 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
       object_world_service: object_world_service_pb2_grpc.ObjectWorldServiceStub,
       motion_planner_service: motion_planner_service_pb2_grpc.MotionPlannerServiceStub,
       geometry_service: geometry_service_pb2_grpc.GeometryServiceStub,
+      world_clients: Optional[world_client_pool.WorldClientPool] = None,
   ):
+    """Initializes the instance.
+
+    Args:
+      skill_repository: The skill repository.
+      object_world_service: The object world service stub.
+      motion_planner_service: The motion planner service stub.
+      geometry_service: The geometry service stub.
+      world_clients: The pool of world clients to use. If None, a pool is
+        created for this servicer.
+    """
     self._skill_repository = skill_repository
-    self._object_world_service = object_world_service
-    self._motion_planner_service = motion_planner_service
-    self._geometry_service = geometry_service
+    self._world_clients = world_clients or world_client_pool.WorldClientPool(
+        object_world_service, motion_planner_service, geometry_service
+    )
+    self._setup_latency = _SetupLatency()
+
+  @property
+  def setup_latency(self) -> Dict[str, skill_execution_engine.LatencyStats]:
+    """Time spent setting up requests before calling the skill, by method."""
+    return self._setup_latency.snapshot()
 
   def GetFootprint(
       self,
@@ -91,11 +109,14 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
     Raises:
      grpc.RpcError:
       NOT_FOUND: If the skill is not found.
-      INVALID_ARGUMENT: If unable to apply the default parameters.
+      INVALID_ARGUMENT: If the parameters or the default parameters are of an
+          unexpected type.
       INTERNAL: If unable to get the skill's footprint.
       INVALID_ARGUMENT: When the required equipment does not match the
           requested.
+      UNAVAILABLE: If the world services are not connected in time.
     """
+    setup_start = time.monotonic()
     skill_name = id_utils.name_from(footprint_request.instance.id_version)
     try:
       skill_project_instance = self._skill_repository.get_skill_project(
@@ -113,59 +134,34 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
           ),
       )
 
-    # Apply default parameters if available.
     skill_runtime_data = self._skill_repository.get_skill_runtime_data(
         skill_name
     )
-    defaults = skill_runtime_data.parameter_data.default_value
-    if defaults is not None and footprint_request.HasField('parameters'):
-      try:
-        default_parameters.apply_defaults_to_parameters(
-            skill_runtime_data.parameter_data.descriptor,
-            defaults,
-            footprint_request.parameters,
-        )
-      except status.StatusNotOk as e:
-        _abort_with_status(
-            context=context,
-            code=e.status.code(),
-            message=str(e),
-            skill_error_info=error_pb2.SkillErrorInfo(
-                error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
-            ),
-        )
-
     try:
-      request = _proto_to_get_footprint_request(
-          footprint_request, skill_runtime_data
+      request = skl.GetFootprintRequest(
+          params=_get_parameters_merger(skill_runtime_data).parse(
+              footprint_request.parameters
+          ),
       )
-    except _CannotConstructRequestError as err:
+    except status.StatusNotOk as e:
       _abort_with_status(
           context=context,
-          code=status.StatusCode.INTERNAL,
-          message=(
-              'Could not construct get footprint request for skill'
-              f' {footprint_request.instance.id_version}: {err}.'
-          ),
+          code=e.status.code(),
+          message=str(e),
           skill_error_info=error_pb2.SkillErrorInfo(
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           ),
       )
 
-    object_world = object_world_client.ObjectWorldClient(
-        footprint_request.world_id,
-        self._object_world_service,
-        self._geometry_service,
-    )
-    motion_planner = motion_planner_client.MotionPlannerClient(
-        footprint_request.world_id, self._motion_planner_service
+    world_clients = _get_world_clients(
+        self._world_clients, footprint_request.world_id, context
     )
-
     footprint_context = get_footprint_context_impl.GetFootprintContextImpl(
-        motion_planner=motion_planner,
-        object_world=object_world,
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(footprint_request.instance.resource_handles),
     )
+    self._setup_latency.record('GetFootprint', setup_start)
 
     try:
       skill_footprint = skill_project_instance.get_footprint(
@@ -235,13 +231,48 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           motion_planner_service_pb2_grpc.MotionPlannerServiceStub
       ),
       geometry_service: geometry_service_pb2_grpc.GeometryServiceStub,
+      execution_engine: Optional[
+          skill_execution_engine.SkillExecutionEngine
+      ] = None,
+      finished_operation_ttl: Optional[datetime.timedelta] = None,
+      world_clients: Optional[world_client_pool.WorldClientPool] = None,
   ):
+    """Initializes the instance.
+
+    Args:
+      skill_repository: The skill repository.
+      object_world_service: The object world service stub.
+      motion_planner_service: The motion planner service stub.
+      geometry_service: The geometry service stub.
+      execution_engine: The engine that runs skill operations. If None, a
+        default engine is created for this servicer.
+      finished_operation_ttl: How long finished operations are kept, or None to
+        keep them until they are evicted to make room for new operations.
+      world_clients: The pool of world clients to use. If None, a pool is
+        created for this servicer.
+    """
     self._skill_repository = skill_repository
-    self._object_world_service = object_world_service
-    self._motion_planner_service = motion_planner_service
-    self._geometry_service = geometry_service
+    self._world_clients = world_clients or world_client_pool.WorldClientPool(
+        object_world_service, motion_planner_service, geometry_service
+    )
+    self._setup_latency = _SetupLatency()
+    self._execution_engine = (
+        execution_engine or skill_execution_engine.SkillExecutionEngine()
+    )
+
+    self._operations = _SkillOperations(
+        finished_operation_ttl=finished_operation_ttl
+    )
 
-    self._operations = _SkillOperations()
+  @property
+  def execution_engine(self) -> skill_execution_engine.SkillExecutionEngine:
+    """The engine that runs skill operations, e.g., for reading its metrics."""
+    return self._execution_engine
+
+  @property
+  def setup_latency(self) -> Dict[str, skill_execution_engine.LatencyStats]:
+    """Time spent setting up operations before starting them, by method."""
+    return self._setup_latency.snapshot()
 
   def StartExecute(
       self,
@@ -265,8 +296,17 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
             (i.e., the skill instance name) already exists.
         FAILED_PRECONDITION: If the operation cache is already full of
             unfinished operations.
+        RESOURCE_EXHAUSTED: If the skill service is already running and
+            queueing as many operations as it can.
+        UNAVAILABLE: If the world services are not connected in time.
     """
+    setup_start = time.monotonic()
     skill_name = id_utils.name_from(request.instance.id_version)
+    # Get the world clients first, so that no operation is left behind if they
+    # are not available.
+    world_clients = _get_world_clients(
+        self._world_clients, request.world_id, context
+    )
     operation = self._make_operation(
         name=request.instance.instance_name,
         skill_name=skill_name,
@@ -300,17 +340,13 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
     skill_context = execute_context_impl.ExecuteContextImpl(
         canceller=operation.canceller,
         logging_context=logging_context,
-        motion_planner=motion_planner_client.MotionPlannerClient(
-            request.world_id, self._motion_planner_service
-        ),
-        object_world=object_world_client.ObjectWorldClient(
-            request.world_id, self._object_world_service, self._geometry_service
-        ),
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(request.instance.resource_handles),
     )
 
     def execute() -> skill_service_pb2.ExecuteResult:
-      result = skill.execute(skill_request, skill_context)
+      result = _resolve_awaitable(skill.execute(skill_request, skill_context))
 
       # Verify that the skill returned the expected type.
       got_name = None if result is None else result.DESCRIPTOR.full_name
@@ -330,7 +366,10 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
       return skill_service_pb2.ExecuteResult(result=result_any)
 
-    operation.start(op=execute, op_name='execute')
+    self._setup_latency.record('StartExecute', setup_start)
+    self._start_operation(
+        operation, op=execute, op_name='execute', context=context
+    )
 
     return operation.operation
 
@@ -356,8 +395,17 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
             (i.e., the skill instance name) already exists.
         FAILED_PRECONDITION: If the operation cache is already full of
             unfinished operations.
+        RESOURCE_EXHAUSTED: If the skill service is already running and
+            queueing as many operations as it can.
+        UNAVAILABLE: If the world services are not connected in time.
     """
+    setup_start = time.monotonic()
     skill_name = id_utils.name_from(request.instance.id_version)
+    # Get the world clients first, so that no operation is left behind if they
+    # are not available.
+    world_clients = _get_world_clients(
+        self._world_clients, request.world_id, context
+    )
     operation = self._make_operation(
         name=request.instance.instance_name,
         skill_name=skill_name,
@@ -391,17 +439,13 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
     skill_context = preview_context_impl.PreviewContextImpl(
         canceller=operation.canceller,
         logging_context=logging_context,
-        motion_planner=motion_planner_client.MotionPlannerClient(
-            request.world_id, self._motion_planner_service
-        ),
-        object_world=object_world_client.ObjectWorldClient(
-            request.world_id, self._object_world_service, self._geometry_service
-        ),
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(request.instance.resource_handles),
     )
 
     def preview() -> skill_service_pb2.PreviewResult:
-      result = skill.preview(skill_request, skill_context)
+      result = _resolve_awaitable(skill.preview(skill_request, skill_context))
 
       # Verify that the skill returned the expected type.
       got_name = None if result is None else result.DESCRIPTOR.full_name
@@ -423,7 +467,10 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           result=result_any, expected_states=skill_context.world_updates
       )
 
-    operation.start(op=preview, op_name='preview')
+    self._setup_latency.record('StartPreview', setup_start)
+    self._start_operation(
+        operation, op=preview, op_name='preview', context=context
+    )
 
     return operation.operation
 
@@ -445,17 +492,7 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
       grpc.RpcError:
         NOT_FOUND: If the operation cannot be found.
     """
-    try:
-      operation = self._operations.get(get_request.name)
-    except self._operations.OperationNotFoundError as err:
-      _abort_with_status(
-          context=context,
-          code=status.StatusCode.NOT_FOUND,
-          message=str(err),
-          skill_error_info=error_pb2.SkillErrorInfo(
-              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
-          ),
-      )
+    operation = self._get_operation(get_request.name, context)
 
     return operation.operation
 
@@ -480,17 +517,7 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
         UNIMPLEMENTED: If the skill does not support cancellation.
         INTERNAL: If a skill cancellation callback raises an error.
     """
-    try:
-      operation = self._operations.get(cancel_request.name)
-    except self._operations.OperationNotFoundError as err:
-      _abort_with_status(
-          context=context,
-          code=status.StatusCode.NOT_FOUND,
-          message=str(err),
-          skill_error_info=error_pb2.SkillErrorInfo(
-              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
-          ),
-      )
+    operation = self._get_operation(cancel_request.name, context)
 
     try:
       operation.request_cancellation()
@@ -551,17 +578,7 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
       grpc.RpcError:
         NOT_FOUND: If the operation is not found.
     """
-    try:
-      operation = self._operations.get(wait_request.name)
-    except self._operations.OperationNotFoundError as err:
-      _abort_with_status(
-          context=context,
-          code=status.StatusCode.NOT_FOUND,
-          message=str(err),
-          skill_error_info=error_pb2.SkillErrorInfo(
-              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
-          ),
-      )
+    operation = self._get_operation(wait_request.name, context)
 
     return operation.wait(
         wait_request.timeout.ToNanoseconds() / 1e9
@@ -599,6 +616,22 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
     return empty_pb2.Empty()
 
+  def _get_operation(
+      self, name: str, context: grpc.ServicerContext
+  ) -> _SkillOperation:
+    """Gets an operation by name, aborting with NOT_FOUND if it is unknown."""
+    try:
+      return self._operations.get(name)
+    except self._operations.OperationNotFoundError as err:
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.NOT_FOUND,
+          message=str(err),
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+
   def _make_operation(
       self, name: str, skill_name: str, context: grpc.ServicerContext
   ) -> _SkillOperation:
@@ -615,7 +648,11 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           ),
       )
 
-    operation = _SkillOperation(name=name, runtime_data=runtime_data)
+    operation = _SkillOperation(
+        name=name,
+        runtime_data=runtime_data,
+        execution_engine=self._execution_engine,
+    )
 
     try:
       self._operations.add(operation)
@@ -638,6 +675,33 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
     return operation
 
+  def _start_operation(
+      self,
+      operation: _SkillOperation,
+      op: Callable[[], proto_message.Message],
+      op_name: str,
+      context: grpc.ServicerContext,
+  ) -> None:
+    """Starts an operation, removing it again if it cannot be admitted."""
+    try:
+      operation.start(op=op, op_name=op_name)
+    except skill_execution_engine.SkillExecutionEngine.QueueFullError as err:
+      self._operations.remove(operation.name)
+      logging.warning(
+          'Rejecting %s of %r: %s',
+          op_name,
+          operation.runtime_data.skill_id,
+          err,
+      )
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.RESOURCE_EXHAUSTED,
+          message=str(err),
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+
 
 class SkillInformationServicer(skill_service_pb2_grpc.SkillInformationServicer):
   """Implementation of the skill Information service."""
@@ -662,8 +726,242 @@ class SkillInformationServicer(skill_service_pb2_grpc.SkillInformationServicer):
     return result
 
 
+class AsyncSkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
+  """Projector servicer for grpc.aio servers.
+
+  Wraps a SkillProjectorServicer. Skill code runs on the event loop's default
+  executor, so that it does not block the event loop.
+  """
+
+  def __init__(self, servicer: SkillProjectorServicer):
+    self._servicer = servicer
+
+  async def GetFootprint(
+      self,
+      footprint_request: skill_service_pb2.GetFootprintRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> skill_service_pb2.GetFootprintResult:
+    """See SkillProjectorServicer.GetFootprint."""
+    return await _call_sync_handler(
+        self._servicer.GetFootprint,
+        footprint_request,
+        context,
+        in_executor=True,
+    )
+
+  async def Predict(
+      self,
+      predict_request: skill_service_pb2.PredictRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> skill_service_pb2.PredictResult:
+    """See SkillProjectorServicer.Predict."""
+    return await _call_sync_handler(
+        self._servicer.Predict, predict_request, context
+    )
+
+
+class AsyncSkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
+  """Executor servicer for grpc.aio servers.
+
+  Wraps a SkillExecutorServicer. Skill operations still run on the servicer's
+  execution engine, but GetOperation and WaitOperation are served on the event
+  loop: a WaitOperation call is only a pending future until its operation
+  finishes and does not occupy a thread, so a single skill service can serve
+  many concurrent waiters.
+  """
+
+  def __init__(self, servicer: SkillExecutorServicer):
+    self._servicer = servicer
+
+  async def StartExecute(
+      self,
+      request: skill_service_pb2.ExecuteRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> operations_pb2.Operation:
+    """See SkillExecutorServicer.StartExecute."""
+    # Setting up an operation may block, e.g., on connecting to the world.
+    return await _call_sync_handler(
+        self._servicer.StartExecute, request, context, in_executor=True
+    )
+
+  async def StartPreview(
+      self,
+      request: skill_service_pb2.PreviewRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> operations_pb2.Operation:
+    """See SkillExecutorServicer.StartPreview."""
+    # Setting up an operation may block, e.g., on connecting to the world.
+    return await _call_sync_handler(
+        self._servicer.StartPreview, request, context, in_executor=True
+    )
+
+  async def GetOperation(
+      self,
+      get_request: operations_pb2.GetOperationRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> operations_pb2.Operation:
+    """See SkillExecutorServicer.GetOperation."""
+    return await _call_sync_handler(
+        self._servicer.GetOperation, get_request, context
+    )
+
+  async def CancelOperation(
+      self,
+      cancel_request: operations_pb2.CancelOperationRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> empty_pb2.Empty:
+    """See SkillExecutorServicer.CancelOperation."""
+    # Cancellation may block on the skill's cancellation callback.
+    return await _call_sync_handler(
+        self._servicer.CancelOperation,
+        cancel_request,
+        context,
+        in_executor=True,
+    )
+
+  async def WaitOperation(
+      self,
+      wait_request: operations_pb2.WaitOperationRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> operations_pb2.Operation:
+    """See SkillExecutorServicer.WaitOperation."""
+
+    def get_operation(
+        request: operations_pb2.WaitOperationRequest,
+        sync_context: grpc.ServicerContext,
+    ) -> _SkillOperation:
+      return self._servicer._get_operation(request.name, sync_context)  # pylint: disable=protected-access
+
+    operation = await _call_sync_handler(get_operation, wait_request, context)
+
+    return await operation.wait_async(
+        wait_request.timeout.ToNanoseconds() / 1e9
+        if wait_request.HasField('timeout')
+        else None
+    )
+
+  async def ClearOperations(
+      self, clear_request: empty_pb2.Empty, context: grpc.aio.ServicerContext
+  ) -> empty_pb2.Empty:
+    """See SkillExecutorServicer.ClearOperations."""
+    return await _call_sync_handler(
+        self._servicer.ClearOperations, clear_request, context
+    )
+
+
+class AsyncSkillInformationServicer(
+    skill_service_pb2_grpc.SkillInformationServicer
+):
+  """Skill information servicer for grpc.aio servers."""
+
+  def __init__(self, servicer: SkillInformationServicer):
+    self._servicer = servicer
+
+  async def GetSkillInfo(
+      self, request: empty_pb2.Empty, context: grpc.aio.ServicerContext
+  ) -> skill_service_pb2.SkillInformationResult:
+    """See SkillInformationServicer.GetSkillInfo."""
+    return await _call_sync_handler(
+        self._servicer.GetSkillInfo, request, context
+    )
+
+
+class _AbortedError(Exception):
+  """A synchronous handler aborted the RPC with the given status."""
+
+  def __init__(self, rpc_status: grpc.Status):
+    super().__init__(rpc_status.details)
+    self.rpc_status = rpc_status
+
+
+class _SyncServicerContext:
+  """Adapts a grpc.aio.ServicerContext for the synchronous servicer methods.
+
+  On grpc.aio, aborting an RPC is a coroutine. The synchronous handlers abort
+  through this adapter, which raises _AbortedError instead, so that
+  _call_sync_handler can abort the RPC on the event loop.
+  """
+
+  def __init__(self, context: grpc.aio.ServicerContext):
+    self._context = context
+
+  def abort_with_status(self, rpc_status: grpc.Status) -> NoReturn:
+    raise _AbortedError(rpc_status)
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self._context, name)
+
+
+_ResponseT = TypeVar('_ResponseT')
+
+
+async def _call_sync_handler(
+    handler: Callable[[Any, grpc.ServicerContext], _ResponseT],
+    request: Any,
+    context: grpc.aio.ServicerContext,
+    in_executor: bool = False,
+) -> _ResponseT:
+  """Calls a synchronous servicer method from a grpc.aio servicer method.
+
+  Args:
+    handler: The synchronous servicer method.
+    request: The request.
+    context: The grpc.aio servicer context.
+    in_executor: Whether to call the handler on the event loop's default
+      executor. Must be set for handlers which may block.
+
+  Returns:
+    The handler's response.
+  """
+  sync_context = _SyncServicerContext(context)
+  try:
+    if in_executor:
+      return await asyncio.get_running_loop().run_in_executor(
+          None, handler, request, sync_context
+      )
+    return handler(request, sync_context)
+  except _AbortedError as err:
+    await context.abort_with_status(err.rpc_status)
+    # context.abort_with_status always raises.
+    raise AssertionError('This error should not have been raised.') from err
+
+
+class _SetupLatency:
+  """Records the time a servicer spends setting up requests, by method.
+
+  Setup covers everything a servicer does before handing a request to the skill
+  (looking up the skill, resolving parameters and building the context).
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._stats: Dict[str, skill_execution_engine.LatencyStats] = {}
+
+  def record(self, method: str, start: float) -> None:
+    """Records a setup of `method` that started at time.monotonic() `start`."""
+    elapsed = time.monotonic() - start
+    with self._lock:
+      self._stats[method] = self._stats.get(
+          method, skill_execution_engine.LatencyStats()
+      ).add(elapsed)
+    logging.debug('Setting up %s took %.3f ms.', method, elapsed * 1e3)
+
+  def snapshot(self) -> Dict[str, skill_execution_engine.LatencyStats]:
+    with self._lock:
+      return dict(self._stats)
+
+
 class _SkillOperations:
-  """A collection of skill operations."""
+  """A collection of skill operations.
+
+  Finished operations are indexed in the order in which they finished, so that
+  the oldest finished operation can be evicted in constant time when the
+  collection is full. Finished operations can also expire after a time to live.
+
+  Lookups by name do not acquire the collection's lock: the operations dict is
+  only ever mutated by single (atomic) dict operations under the lock, so
+  readers, e.g., GetOperation and WaitOperation, are never blocked by writers.
+  """
 
   class OperationError(Exception):
     """Base _SkillOperations error."""
@@ -680,9 +978,30 @@ class _SkillOperations:
   class OperationCacheFullError(OperationError, RuntimeError):
     """The skill operation cache is full of unfinished operations."""
 
-  def __init__(self):
+  def __init__(
+      self,
+      max_num_operations: int = MAX_NUM_OPERATIONS,
+      finished_operation_ttl: Optional[datetime.timedelta] = None,
+  ):
+    """Initializes the instance.
+
+    Args:
+      max_num_operations: The maximum number of operations in the collection.
+      finished_operation_ttl: How long finished operations are kept, or None to
+        keep them until they are evicted to make room for new operations.
+    """
+    self._max_num_operations = max_num_operations
+    self._ttl = (
+        finished_operation_ttl.total_seconds()
+        if finished_operation_ttl is not None
+        else None
+    )
     self._lock = threading.Lock()
     self._operations: Dict[str, _SkillOperation] = {}
+    # Names of finished operations, oldest first.
+    self._finished: collections.OrderedDict[str, None] = (
+        collections.OrderedDict()
+    )
 
   def add(self, operation: _SkillOperation) -> None:
     """Adds an operation to the collection.
@@ -697,31 +1016,28 @@ class _SkillOperations:
         operations.
     """
     with self._lock:
-      # First remove the oldest finished operation if we've reached our limit of
+      self._remove_expired_locked()
+
+      if operation.name in self._operations:
+        raise self.OperationAlreadyExistsError(
+            f'An operation already exists with name {operation.name!r}.'
+        )
+
+      # Remove the oldest finished operations if we've reached our limit of
       # tracked operations.
-      while len(self._operations) >= MAX_NUM_OPERATIONS:
-        old_operation_name = None
-        for name, old_operation in self._operations.items():
-          if old_operation.finished:
-            assert name is not None, 'Operation name was unexpectedly None.'
-            old_operation_name = name
-            break
-
-        if old_operation_name is None:
+      while len(self._operations) >= self._max_num_operations:
+        if not self._finished:
           raise self.OperationCacheFullError(
               f'Cannot add operation {operation.name!r}, since there are'
               f' already {len(self._operations)} unfinished operations.'
           )
-
+        old_operation_name, _ = self._finished.popitem(last=False)
         del self._operations[old_operation_name]
 
-      if operation.name in self._operations:
-        raise self.OperationAlreadyExistsError(
-            f'An operation already exists with name {operation.name!r}.'
-        )
-
       self._operations[operation.name] = operation
 
+    operation.add_finished_callback(self._on_finished)
+
   def get(self, name: str) -> _SkillOperation:
     """Gets an operation by name.
 
@@ -734,13 +1050,21 @@ class _SkillOperations:
     Raises:
       OperationNotFoundError: If no operation with the specified name exists.
     """
+    operation = self._operations.get(name)
+    if operation is None or self._expired(operation):
+      raise self.OperationNotFoundError(
+          f'No operation found with name {name!r}.'
+      )
+    return operation
+
+  def remove(self, name: str) -> None:
+    """Removes an operation from the collection, if it exists.
+
+    Args:
+      name: The operation name.
+    """
     with self._lock:
-      try:
-        return self._operations[name]
-      except KeyError as err:
-        raise self.OperationNotFoundError(
-            f'No operation found with name {name!r}.'
-        ) from err
+      self._remove_locked(name)
 
   def clear(self) -> None:
     """Clears all operations in the collection.
@@ -753,18 +1077,47 @@ class _SkillOperations:
       OperationNotFinishedError: If any operation is not yet finished.
     """
     with self._lock:
-      unfinished_operation_names = []
-      for operation in self._operations.values():
-        if not operation.finished:
-          unfinished_operation_names.append(operation.name)
-
-      if unfinished_operation_names:
+      if len(self._finished) != len(self._operations):
+        unfinished_operation_names = [
+            name for name in self._operations if name not in self._finished
+        ]
         names_list = ', '.join(unfinished_operation_names)
         raise self.OperationNotFinishedError(
             f'The following operations are not yet finished: {names_list}.'
         )
 
       self._operations = {}
+      self._finished.clear()
+
+  def _on_finished(self, operation: _SkillOperation) -> None:
+    """Indexes an operation of the collection as finished."""
+    with self._lock:
+      if self._operations.get(operation.name) is operation:
+        self._finished[operation.name] = None
+
+  def _expired(self, operation: _SkillOperation) -> bool:
+    """Returns whether the operation has outlived its time to live."""
+    finished_at = operation.finished_at
+    return (
+        self._ttl is not None
+        and finished_at is not None
+        and time.monotonic() - finished_at > self._ttl
+    )
+
+  def _remove_expired_locked(self) -> None:
+    """Removes all expired operations. Requires self._lock."""
+    if self._ttl is None:
+      return
+    while self._finished:
+      oldest_name = next(iter(self._finished))
+      if not self._expired(self._operations[oldest_name]):
+        break
+      self._remove_locked(oldest_name)
+
+  def _remove_locked(self, name: str) -> None:
+    """Removes an operation if it exists. Requires self._lock."""
+    self._operations.pop(name, None)
+    self._finished.pop(name, None)
 
 
 class _SkillOperation:
@@ -789,6 +1142,11 @@ class _SkillOperation:
   def finished(self) -> bool:
     return self._finished_event.is_set()
 
+  @property
+  def finished_at(self) -> Optional[float]:
+    """The time.monotonic() time at which the operation finished, if it has."""
+    return self._finished_at
+
   @property
   def name(self) -> str:
     return self.operation.name
@@ -802,12 +1160,18 @@ class _SkillOperation:
   def runtime_data(self) -> rd.SkillRuntimeData:
     return self._runtime_data
 
-  def __init__(self, name: str, runtime_data: rd.SkillRuntimeData) -> None:
+  def __init__(
+      self,
+      name: str,
+      runtime_data: rd.SkillRuntimeData,
+      execution_engine: skill_execution_engine.SkillExecutionEngine,
+  ) -> None:
     """Initializes the instance.
 
     Args:
       name: A unique name for the operation.
       runtime_data: The skill's runtime data.
+      execution_engine: The engine that runs the operation.
     """
     self._canceller = skill_canceller.SkillCancellationManager(
         ready_timeout=(
@@ -820,9 +1184,11 @@ class _SkillOperation:
     self._started = False
     self._cancelled = False
     self._finished_event = threading.Event()
+    self._finished_at: Optional[float] = None
+    self._finished_callbacks: List[Callable[[_SkillOperation], None]] = []
     self._lock = threading.RLock()
 
-    self._pool = futures.ThreadPoolExecutor()
+    self._execution_engine = execution_engine
 
   def start(
       self,
@@ -837,6 +1203,8 @@ class _SkillOperation:
 
     Raises:
       OperationAlreadyStartedError: If an operation has already started.
+      SkillExecutionEngine.QueueFullError: If the execution engine cannot
+        accept more operations.
     """
     with self._lock:
       if self._started:
@@ -845,7 +1213,37 @@ class _SkillOperation:
         )
       self._started = True
 
-    self._pool.submit(self._execute, op, op_name)
+    self._execution_engine.submit(
+        self._runtime_data.skill_id, lambda: self._execute(op, op_name)
+    )
+
+  def add_finished_callback(
+      self, callback: Callable[[_SkillOperation], None]
+  ) -> None:
+    """Adds a callback which is called with the operation when it finishes.
+
+    The callback is called immediately if the operation has already finished.
+
+    Args:
+      callback: The callback.
+    """
+    with self._lock:
+      if not self.finished:
+        self._finished_callbacks.append(callback)
+        return
+    callback(self)
+
+  def remove_finished_callback(
+      self, callback: Callable[[_SkillOperation], None]
+  ) -> None:
+    """Removes a callback added with add_finished_callback, if still pending.
+
+    Args:
+      callback: The callback.
+    """
+    with self._lock:
+      if callback in self._finished_callbacks:
+        self._finished_callbacks.remove(callback)
 
   def request_cancellation(self) -> None:
     """Requests cancellation of the operation.
@@ -891,6 +1289,43 @@ class _SkillOperation:
 
     return self.operation
 
+  async def wait_async(
+      self, timeout: Optional[float] = None
+  ) -> operations_pb2.Operation:
+    """Waits for the operation to finish without blocking a thread.
+
+    Args:
+      timeout: The maximum number of seconds to wait for the operation to
+        finish, or None for no timeout.
+
+    Returns:
+      The state of the Operation when it finished or the wait timed out.
+    """
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+
+    def set_finished() -> None:
+      if not finished.done():
+        finished.set_result(None)
+
+    def on_finished(unused_operation: _SkillOperation) -> None:
+      try:
+        loop.call_soon_threadsafe(set_finished)
+      except RuntimeError:
+        pass  # The event loop has been closed.
+
+    self.add_finished_callback(on_finished)
+    try:
+      await asyncio.wait_for(finished, timeout=timeout)
+    except asyncio.TimeoutError:
+      pass
+    finally:
+      # Waiters which time out or are cancelled must not pile up on operations
+      # which run for a long time.
+      self.remove_finished_callback(on_finished)
+
+    return self.operation
+
   def _execute(
       self, op: Callable[[], proto_message.Message], op_name: str
   ) -> None:
@@ -921,9 +1356,25 @@ class _SkillOperation:
     if result is not None:
       self.operation.response.Pack(result)
 
-    self.operation.done = True
+    with self._lock:
+      self._operation.done = True
+      self._finished_at = time.monotonic()
+      self._finished_event.set()
+      callbacks, self._finished_callbacks = self._finished_callbacks, []
+
+    for callback in callbacks:
+      callback(self)
 
-    self._finished_event.set()
+
+def _resolve_awaitable(result: Any) -> Any:
+  """Returns the result of a skill method, running it first if it is async.
+
+  Skills may implement their methods as coroutines (`async def execute`). These
+  are run to completion on a new event loop on the calling worker thread.
+  """
+  if inspect.iscoroutine(result):
+    return asyncio.run(result)
+  return result
 
 
 def _skill_error_to_code_and_action(
@@ -966,6 +1417,25 @@ def _handle_skill_error(
   )
 
 
+def _get_world_clients(
+    pool: world_client_pool.WorldClientPool,
+    world_id: str,
+    context: grpc.ServicerContext,
+) -> world_client_pool.WorldClients:
+  """Gets the clients for a world, aborting with UNAVAILABLE on timeout."""
+  try:
+    return pool.get(world_id)
+  except TimeoutError as err:
+    _abort_with_status(
+        context=context,
+        code=status.StatusCode.UNAVAILABLE,
+        message=str(err),
+        skill_error_info=error_pb2.SkillErrorInfo(
+            error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+        ),
+    )
+
+
 def _abort_with_status(
     context: grpc.ServicerContext,
     code: status.StatusCode,
@@ -996,84 +1466,48 @@ def _abort_with_status(
   raise AssertionError('This error should not have been raised.')
 
 
-def _proto_to_get_footprint_request(
-    proto: skill_service_pb2.GetFootprintRequest,
-    skill_runtime_data: rd.SkillRuntimeData,
-) -> skl.GetFootprintRequest:
-  """Converts a GetFootprintRequest proto to the request to send to the skill.
-
-  Args:
-    proto: The proto to convert.
-    skill_runtime_data: The runtime data for the skill.
-
-  Returns:
-    The request to send to the skill.
-
-  Raises:
-    _CannotConstructRequestError: If the request cannot be converted.
-  """
-  try:
-    params = _unpack_any_from_descriptor(
-        proto.parameters, skill_runtime_data.parameter_data.descriptor
-    )
-  except proto_utils.ProtoMismatchTypeError as err:
-    raise _CannotConstructRequestError(str(err)) from err
-
-  return skl.GetFootprintRequest(
-      params=params,
-  )
-
-
 def _resolve_params(
     params_any: any_pb2.Any, skill_runtime_data: rd.SkillRuntimeData
 ) -> proto_message.Message:
-  """Applies defaults and resolves a params Any into its target message type."""
-  defaults = skill_runtime_data.parameter_data.default_value
-  if defaults is not None:
-    try:
-      default_parameters.apply_defaults_to_parameters(
-          msg_descriptor=skill_runtime_data.parameter_data.descriptor,
-          default_value_any=defaults,
-          parameters_any=params_any,
-      )
-    except status.StatusNotOk as err:
-      raise _CannotConstructRequestError(str(err)) from err
+  """Resolves a params Any into its target message type and applies defaults.
 
+  Raises:
+    _CannotConstructRequestError: If the params or the defaults are of an
+      unexpected type.
+  """
   try:
-    return _unpack_any_from_descriptor(
-        params_any, skill_runtime_data.parameter_data.descriptor
-    )
-  except proto_utils.ProtoMismatchTypeError as err:
+    return _get_parameters_merger(skill_runtime_data).parse(params_any)
+  except status.StatusNotOk as err:
     raise _CannotConstructRequestError(str(err)) from err
 
 
-def _unpack_any_from_descriptor(
-    any_message: any_pb2.Any, descriptor: proto_descriptor.Descriptor
-) -> proto_message.Message:
-  """Unpacks a proto Any into a message, given the message's Descriptor.
-
-  Args:
-    any_message: a proto Any message.
-    descriptor: The descriptor of the target message type.
+def _get_parameters_merger(
+    skill_runtime_data: rd.SkillRuntimeData,
+) -> default_parameters.DefaultParametersMerger:
+  """Returns the (cached) default parameters merger of a skill.
 
-  Returns:
-    The unpacked proto message.
+  Caching the merger saves decoding the defaults for every request and provides
+  a consistent parameter message type to the skill.
 
   Raises:
-    proto_utils.ProtoMismatchTypeError: If the type of `proto_message` does not
-      match that of the specified Any proto.
+    status.StatusNotOk: If the defaults are of an unexpected type.
   """
-  # Cache the generated class to save time and provide a consistent type to the
-  # skill.
-  try:
-    proto_message_type = _message_type_cache[descriptor.full_name]
-  except KeyError:
-    proto_message_type = _message_type_cache[descriptor.full_name] = (
-        message_factory.GetMessageClass(descriptor)
-    )
+  parameter_data = skill_runtime_data.parameter_data
+  cached = _parameters_merger_cache.get(skill_runtime_data.skill_id)
+  if cached is not None and cached[0] is parameter_data:
+    return cached[1]
 
-  return proto_utils.unpack_any(any_message, proto_message_type())
+  merger = default_parameters.DefaultParametersMerger(
+      parameter_data.descriptor, parameter_data.default_value
+  )
+  _parameters_merger_cache[skill_runtime_data.skill_id] = (
+      parameter_data,
+      merger,
+  )
+  return merger
 
 
-# Cache used by _unpack_any_from_descriptor.
-_message_type_cache = {}
+# Cache used by _get_parameters_merger, by skill id.
+_parameters_merger_cache: Dict[
+    str, Tuple[rd.ParameterData, default_parameters.DefaultParametersMerger]
+] = {}
@@ -0,0 +1,222 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for the skill operations of skill_service_impl."""
+
+import datetime
+from typing import Callable
+from unittest import mock
+
+from absl.testing import absltest
+from google.protobuf import empty_pb2
+from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_service_impl
+
+_SkillOperations = skill_service_impl._SkillOperations  # pylint: disable=protected-access
+_SkillOperation = skill_service_impl._SkillOperation  # pylint: disable=protected-access
+
+_TTL = datetime.timedelta(seconds=10)
+
+
+class _SynchronousEngine:
+  """An execution engine which runs operations when they are submitted."""
+
+  def submit(self, skill_id: str, fn: Callable[[], None]) -> None:
+    del skill_id  # Unused.
+    fn()
+
+
+def _create_operation(name: str) -> _SkillOperation:
+  return _SkillOperation(
+      name,
+      rd.SkillRuntimeData(
+          parameter_data=rd.ParameterData(
+              descriptor=empty_pb2.Empty.DESCRIPTOR
+          ),
+          return_type_data=rd.ReturnTypeData(),
+          execution_options=rd.ExecutionOptions(),
+          resource_data=rd.ResourceData(required_resources={}),
+          skill_id='ai.intrinsic.test_skill',
+      ),
+      _SynchronousEngine(),
+  )
+
+
+def _finish(operation: _SkillOperation) -> None:
+  operation.start(empty_pb2.Empty, 'execute')
+
+
+class SkillOperationsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._time = mock.patch.object(
+        skill_service_impl, 'time', autospec=True
+    ).start()
+    self._time.monotonic.return_value = 100.0
+    self.addCleanup(mock.patch.stopall)
+
+  def test_add_and_get(self):
+    operations = _SkillOperations()
+    operation = _create_operation('a')
+
+    operations.add(operation)
+
+    self.assertIs(operations.get('a'), operation)
+
+  def test_get_unknown_operation(self):
+    operations = _SkillOperations()
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+  def test_add_existing_operation(self):
+    operations = _SkillOperations()
+    operations.add(_create_operation('a'))
+
+    with self.assertRaises(_SkillOperations.OperationAlreadyExistsError):
+      operations.add(_create_operation('a'))
+
+  def test_add_to_cache_full_of_unfinished_operations(self):
+    operations = _SkillOperations(max_num_operations=2)
+    operations.add(_create_operation('a'))
+    operations.add(_create_operation('b'))
+
+    with self.assertRaises(_SkillOperations.OperationCacheFullError):
+      operations.add(_create_operation('c'))
+
+    operations.get('a')
+    operations.get('b')
+
+  def test_evicts_operations_in_order_of_finishing(self):
+    operations = _SkillOperations(max_num_operations=3)
+    a, b, c = (_create_operation(name) for name in ('a', 'b', 'c'))
+    for operation in (a, b, c):
+      operations.add(operation)
+    _finish(c)
+    _finish(a)
+
+    operations.add(_create_operation('d'))
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('c')
+    self.assertIs(operations.get('a'), a)
+
+    operations.add(_create_operation('e'))
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    self.assertIs(operations.get('b'), b)
+
+    # Only unfinished operations are left.
+    with self.assertRaises(_SkillOperations.OperationCacheFullError):
+      operations.add(_create_operation('f'))
+
+  def test_add_finished_operation(self):
+    operations = _SkillOperations(max_num_operations=1)
+    operation = _create_operation('a')
+    _finish(operation)
+
+    operations.add(operation)
+    operations.add(_create_operation('b'))
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+  def test_remove(self):
+    operations = _SkillOperations(max_num_operations=1)
+    operations.add(_create_operation('a'))
+
+    operations.remove('a')
+    operations.remove('unknown')
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    operations.add(_create_operation('b'))
+
+  def test_finished_replaced_operation_is_not_indexed(self):
+    operations = _SkillOperations(max_num_operations=1)
+    replaced = _create_operation('a')
+    operations.add(replaced)
+    operations.remove('a')
+    operation = _create_operation('a')
+    operations.add(operation)
+
+    _finish(replaced)
+
+    # The unfinished operation with the same name must not be evicted.
+    with self.assertRaises(_SkillOperations.OperationCacheFullError):
+      operations.add(_create_operation('b'))
+    with self.assertRaises(_SkillOperations.OperationNotFinishedError):
+      operations.clear()
+    self.assertIs(operations.get('a'), operation)
+
+  def test_clear(self):
+    operations = _SkillOperations()
+    a = _create_operation('a')
+    operations.add(a)
+    operations.add(_create_operation('b'))
+    _finish(a)
+
+    with self.assertRaisesRegex(
+        _SkillOperations.OperationNotFinishedError, 'b'
+    ):
+      operations.clear()
+    self.assertIs(operations.get('a'), a)
+
+    _finish(operations.get('b'))
+    operations.clear()
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('b')
+
+  def test_finished_operations_expire(self):
+    operations = _SkillOperations(finished_operation_ttl=_TTL)
+    operation = _create_operation('a')
+    operations.add(operation)
+    _finish(operation)
+
+    self._time.monotonic.return_value += _TTL.total_seconds()
+    self.assertIs(operations.get('a'), operation)
+
+    self._time.monotonic.return_value += 1
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+  def test_unfinished_operations_do_not_expire(self):
+    operations = _SkillOperations(finished_operation_ttl=_TTL)
+    operation = _create_operation('a')
+    operations.add(operation)
+
+    self._time.monotonic.return_value += 2 * _TTL.total_seconds()
+
+    self.assertIs(operations.get('a'), operation)
+
+  def test_add_removes_expired_operations(self):
+    operations = _SkillOperations(
+        max_num_operations=2, finished_operation_ttl=_TTL
+    )
+    expired = _create_operation('a')
+    operations.add(expired)
+    _finish(expired)
+    self._time.monotonic.return_value += 1
+    finished = _create_operation('b')
+    operations.add(finished)
+    _finish(finished)
+    self._time.monotonic.return_value += _TTL.total_seconds()
+
+    operations.add(_create_operation('c'))
+    operations.add(_create_operation('d'))
+
+    # The expired operation made room for one new operation and the oldest
+    # finished operation was evicted for the other.
+    for name in ('a', 'b'):
+      with self.assertRaises(_SkillOperations.OperationNotFoundError):
+        operations.get(name)
+    operations.get('c')
+    operations.get('d')
+
+
+if __name__ == '__main__':
+  absltest.main()
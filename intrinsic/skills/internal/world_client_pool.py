@@ -0,0 +1,131 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Pool of world clients that are reused across skill requests."""
+
+import collections
+import dataclasses
+import threading
+from typing import Callable, Optional
+
+from intrinsic.geometry.service import geometry_service_pb2_grpc
+from intrinsic.motion_planning import motion_planner_client
+from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
+from intrinsic.world.proto import object_world_service_pb2_grpc
+from intrinsic.world.python import object_world_client
+
+# Default maximum number of worlds for which clients are kept.
+DEFAULT_MAX_WORLDS = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class WorldClients:
+  """The clients that skills use to access a world.
+
+  Attributes:
+    object_world: A client for the object world.
+    motion_planner: A client for the motion planner service.
+  """
+
+  object_world: object_world_client.ObjectWorldClient
+  motion_planner: motion_planner_client.MotionPlannerClient
+
+
+class WorldClientPool:
+  """Reuses world clients across skill requests, by world id.
+
+  By default, the pooled object world clients are plain clients, which only
+  save creating a client per request. With `sync_with_world=True`, they keep a
+  local copy of the world, which is shared by all requests for the same world
+  and is refreshed whenever the world service reports that the world has changed
+  (see WorldMirror). This saves listing the world in every request, but costs a
+  GetWorld request for every lookup. Clients of the least recently used worlds
+  are dropped once more than `max_worlds` worlds are in use.
+
+  If `wait_until_ready` is given, it is called before clients are created, so
+  that requests which arrive while the services are still being connected wait
+  for them instead of failing.
+  """
+
+  def __init__(
+      self,
+      object_world_service: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      motion_planner_service: motion_planner_service_pb2_grpc.MotionPlannerServiceStub,
+      geometry_service: Optional[
+          geometry_service_pb2_grpc.GeometryServiceStub
+      ] = None,
+      max_worlds: int = DEFAULT_MAX_WORLDS,
+      wait_until_ready: Optional[Callable[[], None]] = None,
+      sync_with_world: bool = False,
+  ):
+    """Initializes the instance.
+
+    Args:
+      object_world_service: The object world service stub.
+      motion_planner_service: The motion planner service stub.
+      geometry_service: The geometry service stub.
+      max_worlds: The maximum number of worlds for which clients are kept.
+      wait_until_ready: Blocks until the services are connected, or raises if
+        they cannot be connected.
+      sync_with_world: Whether the object world clients keep a local copy of
+        the world, see ObjectWorldClient.
+
+    Raises:
+      ValueError: If max_worlds is not positive.
+    """
+    if max_worlds < 1:
+      raise ValueError(f'max_worlds must be at least 1, got {max_worlds}.')
+    self._object_world_service = object_world_service
+    self._motion_planner_service = motion_planner_service
+    self._geometry_service = geometry_service
+    self._max_worlds = max_worlds
+    self._wait_until_ready = wait_until_ready
+    self._sync_with_world = sync_with_world
+
+    self._lock = threading.Lock()
+    self._clients: collections.OrderedDict[str, WorldClients] = (
+        collections.OrderedDict()
+    )
+
+  def get(self, world_id: str) -> WorldClients:
+    """Returns the clients for a world, creating them on first use.
+
+    Args:
+      world_id: The id of the world.
+
+    Returns:
+      The clients for the world.
+
+    Raises:
+      TimeoutError: If wait_until_ready times out.
+    """
+    if self._wait_until_ready is not None:
+      self._wait_until_ready()
+    with self._lock:
+      clients = self._clients.get(world_id)
+      if clients is not None:
+        self._clients.move_to_end(world_id)
+        return clients
+
+      clients = WorldClients(
+          object_world=object_world_client.ObjectWorldClient(
+              world_id,
+              self._object_world_service,
+              self._geometry_service,
+              sync_with_world=self._sync_with_world,
+          ),
+          motion_planner=motion_planner_client.MotionPlannerClient(
+              world_id, self._motion_planner_service
+          ),
+      )
+      self._clients[world_id] = clients
+      while len(self._clients) > self._max_worlds:
+        self._clients.popitem(last=False)
+      return clients
+
+  def invalidate(self, world_id: Optional[str] = None) -> None:
+    """Drops the clients of a world, or of all worlds if world_id is None."""
+    with self._lock:
+      if world_id is None:
+        self._clients.clear()
+      else:
+        self._clients.pop(world_id, None)
@@ -0,0 +1,116 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for world_client_pool."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.skills.internal import world_client_pool
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python.testing import fake_object_world_service
+
+
+def _create_object_proto(object_id: str) -> object_world_service_pb2.Object:
+  return object_world_service_pb2.Object(
+      id=object_id,
+      name=object_id,
+      name_is_global_alias=True,
+      type=object_world_service_pb2.ObjectType.PHYSICAL_OBJECT,
+      parent=object_world_service_pb2.IdAndName(id='root'),
+      parent_entity=object_world_refs_pb2.EntityReference(id='eid_root'),
+      root_entity_id=f'eid_{object_id}',
+      object_component=object_world_service_pb2.ObjectComponent(),
+  )
+
+
+class WorldClientPoolTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._service = fake_object_world_service.FakeObjectWorldService()
+    self._service.add_object(_create_object_proto('table'))
+
+  def _create_pool(self, **kwargs) -> world_client_pool.WorldClientPool:
+    return world_client_pool.WorldClientPool(
+        object_world_service=self._service,
+        motion_planner_service=mock.MagicMock(),
+        **kwargs,
+    )
+
+  def test_reuses_clients_of_a_world(self):
+    pool = self._create_pool()
+
+    clients = pool.get('world')
+
+    self.assertIs(pool.get('world'), clients)
+    self.assertEqual(clients.object_world.world_id, 'world')
+    self.assertIsNot(pool.get('other_world'), clients)
+
+  def test_drops_clients_of_least_recently_used_worlds(self):
+    pool = self._create_pool(max_worlds=2)
+    clients = pool.get('world')
+    other_clients = pool.get('other_world')
+    pool.get('world')
+
+    pool.get('third_world')
+
+    self.assertIs(pool.get('world'), clients)
+    self.assertIsNot(pool.get('other_world'), other_clients)
+
+  def test_invalid_max_worlds(self):
+    with self.assertRaises(ValueError):
+      self._create_pool(max_worlds=0)
+
+  def test_invalidate(self):
+    pool = self._create_pool()
+    clients = pool.get('world')
+    other_clients = pool.get('other_world')
+
+    pool.invalidate('world')
+
+    self.assertIsNot(pool.get('world'), clients)
+    self.assertIs(pool.get('other_world'), other_clients)
+
+    pool.invalidate()
+
+    self.assertIsNot(pool.get('other_world'), other_clients)
+
+  def test_waits_until_ready(self):
+    wait_until_ready = mock.Mock(side_effect=TimeoutError)
+    pool = self._create_pool(wait_until_ready=wait_until_ready)
+
+    with self.assertRaises(TimeoutError):
+      pool.get('world')
+
+  def test_synced_clients_see_changes_of_the_world_across_requests(self):
+    pool = self._create_pool(sync_with_world=True)
+
+    # First request.
+    self.assertCountEqual(
+        pool.get('world').object_world.list_object_full_paths(), ['table']
+    )
+    # The world is changed between the requests.
+    self._service.add_object(_create_object_proto('camera'))
+    # Second request.
+    self.assertCountEqual(
+        pool.get('world').object_world.list_object_full_paths(),
+        ['table', 'camera'],
+    )
+    # Third request, the world has not changed.
+    pool.get('world').object_world.list_object_full_paths()
+
+    self.assertEqual(self._service.call_counts['ListObjects'], 2)
+    self.assertEqual(self._service.call_counts['GetWorld'], 3)
+
+  def test_clients_without_sync_list_the_world_in_every_request(self):
+    pool = self._create_pool()
+
+    for _ in range(3):
+      pool.get('world').object_world.list_object_full_paths()
+
+    self.assertEqual(self._service.call_counts['ListObjects'], 3)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -17,13 +17,17 @@ executive.run() method.
 import abc
 import collections
 import enum
-from typing import Any as AnyType, Callable, Iterable, List, Mapping, Optional, Sequence as SequenceType, Tuple, Union
+import hashlib
+import operator
+import re
+from typing import Any as AnyType, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence as SequenceType, Tuple, Union
 import uuid
 
 from google.protobuf import descriptor
 from google.protobuf import descriptor_pb2
 from google.protobuf import message as protobuf_message
 import graphviz
+from graphviz import quoting
 from intrinsic.executive.proto import any_list_pb2
 from intrinsic.executive.proto import any_with_assignments_pb2
 from intrinsic.executive.proto import behavior_call_pb2
@@ -58,6 +62,19 @@ _NODE_TYPES_TO_DOT_SHAPES = {
     'debug': 'box',
 }
 
+# Fill colors of the nodes in dot graphs, by node state.
+_NODE_STATES_TO_DOT_COLORS = {
+    behavior_tree_pb2.BehaviorTree.Node.SELECTED: 'lightyellow',
+    behavior_tree_pb2.BehaviorTree.Node.EVALUATING_CONDITION: 'lightyellow',
+    behavior_tree_pb2.BehaviorTree.Node.READY: 'lightyellow',
+    behavior_tree_pb2.BehaviorTree.Node.RUNNING: 'lightblue',
+    behavior_tree_pb2.BehaviorTree.Node.SUSPENDED: 'khaki',
+    behavior_tree_pb2.BehaviorTree.Node.CANCELING: 'lightgray',
+    behavior_tree_pb2.BehaviorTree.Node.CANCELED: 'lightgray',
+    behavior_tree_pb2.BehaviorTree.Node.SUCCEEDED: 'palegreen',
+    behavior_tree_pb2.BehaviorTree.Node.FAILED: 'lightcoral',
+}
+
 NodeIdentifierType = collections.namedtuple(
     'NodeIdentifierType', ['tree_id', 'node_id']
 )
@@ -77,77 +94,339 @@ def _transform_to_optional_node(
   return _transform_to_node(node)
 
 
-def _dot_wrap_in_box(
-    child_graph: graphviz.Digraph, name: str, label: str
-) -> graphviz.Digraph:
-  box_dot_graph = graphviz.Digraph()
-  box_dot_graph.name = 'cluster_' + name
-  box_dot_graph.graph_attr = {'label': label}
-  box_dot_graph.graph_attr.update(_SUBTREE_DOT_ATTRIBUTES)
-  box_dot_graph.subgraph(child_graph)
-  return box_dot_graph
+class _DotWriter:
+  """Writes the dot source of behavior tree nodes in a single pass.
 
+  The source is written line by line into a single list, at the indentation of
+  the nesting level of each line, instead of creating a graphviz.Digraph for
+  every node and merging it into the graph of its parent.
 
-def _dot_append_child(
-    dot_graph: graphviz.Digraph,
-    parent_node_name: str,
-    child_node: 'Node',
-    child_node_id_suffix: str,
-    edge_label: str = '',
-):
-  """Inserts in place a subgraph of the given child into the given graph.
+  Nodes which are more than `max_depth` levels below the written node, or which
+  come after the first `max_nodes` nodes in breadth-first order, are elided.
+  The elided children of a node are replaced by a single placeholder node.
 
-  This function has side effects!
-  It changes the `dot_graph` and returns nothing.
-
-  Args:
-    dot_graph: The dot graph instance, which should be updated.
-    parent_node_name: The name of the node in the dot graph, which should get an
-      edge connecting it to the child node.
-    child_node: A behavior tree Node, which should get converted to dot and its
-      graph should be appended to the `dot_graph`.
-    child_node_id_suffix: A little string to make the child node name unique
-      within the dot graph.
-    edge_label: Typically, the edge from the parent to the child is not
-      annotated with a label. If a custom edge annotation is needed, this
-      argument value can be used for that.
+  Attributes:
+    lines: The lines of the source written so far.
+    fill_colors: The fill colors of the written nodes according to
+      `node_states`, by node name in the dot graph.
   """
-  child_dot_graph, child_node_name = child_node.dot_graph(child_node_id_suffix)
-  dot_graph.subgraph(child_dot_graph)
-  dot_graph.edge(parent_node_name, child_node_name, label=edge_label)
 
+  def __init__(
+      self,
+      max_depth: Optional[int] = None,
+      max_nodes: Optional[int] = None,
+      node_states: Optional[
+          Mapping[NodeIdentifierType, behavior_tree_pb2.BehaviorTree.Node.State]
+      ] = None,
+      fill_in_source: bool = True,
+  ):
+    """Creates a writer.
+
+    Args:
+      max_depth: Maximum number of levels below the written node to show.
+      max_nodes: Maximum number of nodes to show.
+      node_states: States of the nodes by tree id and node id, determines the
+        fill colors of the nodes.
+      fill_in_source: Whether to write the fill colors into the source. If
+        False, they are only recorded in `fill_colors`.
+
+    Raises:
+      solutions_errors.InvalidArgumentError: If a limit is negative or if
+        max_nodes is zero.
+    """
+    if max_depth is not None and max_depth < 0:
+      raise solutions_errors.InvalidArgumentError(
+          f'max_depth must not be negative, got {max_depth}.'
+      )
+    if max_nodes is not None and max_nodes < 1:
+      raise solutions_errors.InvalidArgumentError(
+          f'max_nodes must be at least 1, got {max_nodes}.'
+      )
+    self._max_depth = max_depth
+    self._max_nodes = max_nodes
+    self._node_states = node_states or {}
+    self._fill_in_source = fill_in_source
+    # Suffixes of the shown nodes, or None if all nodes are shown.
+    self._shown: Optional[set[str]] = None
+    # Number of elided nodes below a shown node, by suffix of the shown node.
+    self._elided: dict[str, int] = {}
+    self.lines: list[str] = []
+    self.fill_colors: dict[str, str] = {}
+
+  @staticmethod
+  def _subtree(node: 'Node') -> Optional['BehaviorTree']:
+    """Returns the tree of a SubTree node if it has a root node, else None."""
+    if (
+        isinstance(node, SubTree)
+        and node.behavior_tree is not None
+        and node.behavior_tree.root is not None
+    ):
+      return node.behavior_tree
+    return None
+
+  def _resolve(self, node: 'Node', node_id_suffix: str) -> Tuple['Node', str]:
+    """Returns the node which is drawn for a node in the dot graph.
+
+    A SubTree node with a tree is drawn as the root node of its tree.
+
+    Args:
+      node: The node.
+      node_id_suffix: The suffix of the node.
+
+    Returns:
+      A tuple of the drawn node and its suffix.
+    """
+    tree = self._subtree(node)
+    while tree is not None:
+      node = tree.root
+      node_id_suffix += '_0'
+      tree = self._subtree(node)
+    return node, node_id_suffix
+
+  def _select_shown_nodes(self, node: 'Node', node_id_suffix: str) -> None:
+    """Determines which nodes to show in breadth-first order."""
+    if self._max_depth is None and self._max_nodes is None:
+      return
+    self._shown = set()
+    node, node_id_suffix = self._resolve(node, node_id_suffix)
+    # Queue of (node, suffix, depth, whether the parent is shown, suffix of the
+    # closest shown ancestor).
+    queue = collections.deque([(node, node_id_suffix, 0, True, None)])
+    while queue:
+      node, node_id_suffix, depth, parent_shown, shown_ancestor = (
+          queue.popleft()
+      )
+      shown = shown_ancestor is None or (
+          parent_shown
+          and (self._max_depth is None or depth <= self._max_depth)
+          and (self._max_nodes is None or len(self._shown) < self._max_nodes)
+      )
+      if shown:
+        self._shown.add(node_id_suffix)
+        shown_ancestor = node_id_suffix
+      else:
+        self._elided[shown_ancestor] = self._elided.get(shown_ancestor, 0) + 1
+      for child_suffix, child, _ in node._dot_children():  # pylint: disable=protected-access
+        child, child_suffix = self._resolve(
+            child, node_id_suffix + child_suffix
+        )
+        queue.append((child, child_suffix, depth + 1, shown, shown_ancestor))
+
+  def head(
+      self, node: 'Node', node_id_suffix: str
+  ) -> Tuple[Optional[str], dict[str, str]]:
+    """Returns the name and the graph attributes of the graph of a node."""
+    tree = self._subtree(node)
+    if tree is not None:
+      graph_attr = {'label': tree.name}
+      graph_attr.update(_SUBTREE_DOT_ATTRIBUTES)
+      return 'cluster_' + (tree.name or ''), graph_attr
+    name = node._dot_name()  # pylint: disable=protected-access
+    if node._DOT_CLUSTER:  # pylint: disable=protected-access
+      graph_attr = {'label': name or ''}
+      graph_attr.update(_SUBTREE_DOT_ATTRIBUTES)
+      return 'cluster_' + (name or '') + node_id_suffix, graph_attr
+    return name or None, {'label': name} if name else {}
+
+  def subgraph_lines(
+      self,
+      name: Optional[str],
+      graph_attr: Mapping[str, str],
+      indent: str,
+  ) -> Tuple[list[str], str]:
+    """Returns the opening lines and the closing line of a subgraph."""
+    opening = [
+        f'{indent}subgraph {quoting.quote(name)} {{\n'
+        if name
+        else f'{indent}{{\n'
+    ]
+    if graph_attr:
+      opening.append(
+          f'{indent}\tgraph{quoting.attr_list(None, kwargs=graph_attr)}\n'
+      )
+    return opening, f'{indent}}}\n'
+
+  def write(
+      self,
+      node: 'Node',
+      node_id_suffix: str,
+      tree_id: Optional[str],
+      indent: str = '\t',
+  ) -> str:
+    """Writes the body of the graph of a node.
+
+    Args:
+      node: The node to write.
+      node_id_suffix: A suffix to make the node names unique in the dot graph.
+      tree_id: The id of the tree containing the node.
+      indent: The indentation of the lines of the body.
+
+    Returns:
+      The name of the root node in the dot graph.
+    """
+    self._select_shown_nodes(node, node_id_suffix)
+    root_node, root_suffix = self._resolve(node, node_id_suffix)
+    root_node_name = root_node.node_type.lower() + root_suffix
+
+    # Stack of lines to write and of (node, suffix, tree id, indent) of nodes
+    # whose graph body to write.
+    pending: list[Union[str, Tuple['Node', str, Optional[str], str]]] = [
+        (node, node_id_suffix, tree_id, indent)
+    ]
+    while pending:
+      item = pending.pop()
+      if isinstance(item, str):
+        self.lines.append(item)
+        continue
+      node, node_id_suffix, tree_id, indent = item
+
+      tree = self._subtree(node)
+      if tree is not None:
+        root_suffix = node_id_suffix + '_0'
+        opening, closing = self.subgraph_lines(
+            *self.head(tree.root, root_suffix), indent
+        )
+        self.lines.extend(opening)
+        pending.append(closing)
+        pending.append((tree.root, root_suffix, tree.tree_id, indent + '\t'))
+        continue
+
+      if node._DOT_CLUSTER:  # pylint: disable=protected-access
+        name = node._dot_name()  # pylint: disable=protected-access
+        opening, closing = self.subgraph_lines(
+            name or None, {'label': name} if name else {}, indent
+        )
+        self.lines.extend(opening)
+        pending.append(closing)
+        indent += '\t'
+
+      node_name = node.node_type.lower() + node_id_suffix
+      self._write_node(node, node_name, tree_id, indent)
+
+      # Children are pushed in reverse, each followed by its edge.
+      children = []
+      for child_suffix, child, edge_label in node._dot_children():  # pylint: disable=protected-access
+        child_suffix = node_id_suffix + child_suffix
+        drawn_child, drawn_suffix = self._resolve(child, child_suffix)
+        if self._shown is None or drawn_suffix in self._shown:
+          child_node_name = drawn_child.node_type.lower() + drawn_suffix
+          children.append((child, child_suffix, edge_label, child_node_name))
+      elided = (
+          self._elided.get(node_id_suffix) if self._shown is not None else None
+      )
+      if elided:
+        elided_name = node_name + '_elided'
+        label = '1 more node' if elided == 1 else f'{elided} more nodes'
+        pending.append(
+            f'{indent}{quoting.quote_edge(node_name)} ->'
+            f' {quoting.quote_edge(elided_name)}'
+            f'{quoting.attr_list(None, kwargs={"style": "dashed"})}\n'
+        )
+        pending.append(
+            f'{indent}{quoting.quote(elided_name)}'
+            f'{quoting.attr_list(label, kwargs={"shape": "plaintext"})}\n'
+        )
+      for child, child_suffix, edge_label, child_node_name in reversed(
+          children
+      ):
+        pending.append(
+            f'{indent}{quoting.quote_edge(node_name)} ->'
+            f' {quoting.quote_edge(child_node_name)}'
+            f'{quoting.attr_list(edge_label)}\n'
+        )
+        opening, closing = self.subgraph_lines(
+            *self.head(child, child_suffix), indent
+        )
+        pending.append(closing)
+        pending.append((child, child_suffix, tree_id, indent + '\t'))
+        pending.extend(reversed(opening))
+
+    return root_node_name
+
+  def _write_node(
+      self, node: 'Node', node_name: str, tree_id: Optional[str], indent: str
+  ) -> None:
+    """Writes the statement of a single node."""
+    attributes = {'shape': _NODE_TYPES_TO_DOT_SHAPES[node.node_type.lower()]}
+    if node.node_id is not None:
+      color = _NODE_STATES_TO_DOT_COLORS.get(
+          self._node_states.get(NodeIdentifierType(tree_id, node.node_id))
+      )
+      if color is not None:
+        self.fill_colors[node_name] = color
+        if self._fill_in_source:
+          attributes.update(style='filled', fillcolor=color)
+    label = node._dot_label()  # pylint: disable=protected-access
+    if label is None:
+      label = node.node_type.lower()
+    self.lines.append(
+        f'{indent}{quoting.quote(node_name)}'
+        f'{quoting.attr_list(label, kwargs=attributes)}\n'
+    )
+
+
+# Maximum number of rendered SVGs which are kept, see _render_svg.
+_MAX_CACHED_SVGS = 32
+_svg_cache: collections.OrderedDict[str, str] = collections.OrderedDict()
+
+# Matches the shape of a node in a rendered SVG which is not filled. The groups
+# are the part before the fill color, the name of the node and the rest.
+_SVG_NODE_FILL_PATTERN = re.compile(
+    r'(<g id="[^"]*" class="node">\s*<title>([^<]*)</title>\s*<\w+ fill=")'
+    r'none(")'
+)
 
-def _dot_append_children(
-    dot_graph: graphviz.Digraph,
-    parent_node_name: str,
-    child_nodes: Iterable['Node'],
-    parent_node_id_suffix: str,
-    node_id_suffix_offset: int,
-):
-  """Inserts in place subgraphs of the given children into the given graph.
 
-  This function has side effects!
-  It changes the `dot_graph` and returns nothing.
+def _render_svg(dot_graph: graphviz.Digraph) -> str:
+  """Renders a dot graph as SVG.
+
+  Renderings are cached by the hash of the dot source, so that showing a tree
+  or subtree again, which has not changed in the meantime, does not lay out
+  the graph again.
 
   Args:
-    dot_graph: The dot graph instance, which should be updated.
-    parent_node_name: The name of the node in the dot graph, which should get
-      edges connecting it to the child nodes.
-    child_nodes: A list of behavior tree Nodes, which should get converted to a
-      dot representation and be added to the `dot_graph` as subgraphs.
-    parent_node_id_suffix: The suffix that was used to make the parent node
-      unique in the dot graph.
-    node_id_suffix_offset: A number that is unique among the children of the
-      given parent node, which is appended as a suffix to the child node names
-      to make them unique in the dot graph.
+    dot_graph: The graph to render.
+
+  Returns:
+    The SVG of the graph.
   """
-  for i, child_node in enumerate(child_nodes):
-    _dot_append_child(
-        dot_graph,
-        parent_node_name,
-        child_node,
-        parent_node_id_suffix + '_' + str(i + node_id_suffix_offset),
-    )
+  key = hashlib.sha256(dot_graph.source.encode()).hexdigest()
+  svg = _svg_cache.get(key)
+  if svg is None:
+    svg = dot_graph.pipe(format='svg', encoding='utf-8')
+    _svg_cache[key] = svg
+    while len(_svg_cache) > _MAX_CACHED_SVGS:
+      _svg_cache.popitem(last=False)
+  else:
+    _svg_cache.move_to_end(key)
+  return svg
+
+
+class _DotGraphSvg:
+  """A dot graph which is displayed as SVG in IPython.
+
+  The fill colors of the nodes are applied to the rendered SVG instead of the
+  dot source, so that showing new node states reuses the cached rendering.
+  """
+
+  def __init__(
+      self, dot_graph: graphviz.Digraph, fill_colors: Mapping[str, str]
+  ):
+    self._dot_graph = dot_graph
+    self._fill_colors = fill_colors
+
+  def _repr_svg_(self) -> str:
+    svg = _render_svg(self._dot_graph)
+    if not self._fill_colors:
+      return svg
+
+    def fill(match: re.Match[str]) -> str:
+      color = self._fill_colors.get(match.group(2))
+      if color is None:
+        return match.group(0)
+      return match.group(1) + color + match.group(3)
+
+    return _SVG_NODE_FILL_PATTERN.sub(fill, svg)
 
 
 # The following is of type TypeAlias, but this is not available in Python 3.9
@@ -159,6 +438,503 @@ WorldQueryObject = Union[
 ]
 
 
+def _attach(parent: '_TreeObject', value: AnyType) -> None:
+  """Records parent as containing value, if value is a tree object.
+
+  The parent must track its modifications, value starts tracking its
+  modifications, too.
+  """
+  if isinstance(value, _TreeObject):
+    vars(value).setdefault('_parents', []).append(parent)
+    value._link()  # pylint: disable=protected-access
+
+
+def _detach(parent: '_TreeObject', value: AnyType) -> None:
+  """Reverts _attach(parent, value)."""
+  if isinstance(value, _TreeObject):
+    parents = vars(value).get('_parents', [])
+    for index, candidate in enumerate(parents):
+      if candidate is parent:
+        del parents[index]
+        break
+
+
+class _TrackedList(list):
+  """A list attribute of a tree object which reports its modifications.
+
+  Elements which are tree objects are attached to the owner of the list once
+  the owner tracks its modifications, see _TreeObject.
+  """
+
+  def __init__(self, owner: Optional['_TreeObject'], items: Iterable[AnyType]):
+    super().__init__(items)
+    self._owner = owner
+    if owner is not None and owner._linked:  # pylint: disable=protected-access
+      for item in self:
+        _attach(owner, item)
+
+  def __reduce_ex__(self, protocol):
+    return list, (list(self),)
+
+  def _tracking_owner(self) -> Optional['_TreeObject']:
+    """Returns the owner of the list, if it tracks its modifications."""
+    owner = self._owner
+    if owner is not None and owner._linked:  # pylint: disable=protected-access
+      return owner
+    return None
+
+  def _added(self, items: Iterable[AnyType]) -> None:
+    owner = self._tracking_owner()
+    if owner is not None:
+      for item in items:
+        _attach(owner, item)
+      owner.mark_modified()
+
+  def _removed(self, items: Iterable[AnyType]) -> None:
+    owner = self._tracking_owner()
+    if owner is not None:
+      for item in items:
+        _detach(owner, item)
+      owner.mark_modified()
+
+  def _release(self) -> None:
+    """Detaches the list and its elements from its owner."""
+    owner = self._tracking_owner()
+    if owner is not None:
+      for item in self:
+        _detach(owner, item)
+    self._owner = None
+
+  def append(self, item):
+    super().append(item)
+    self._added((item,))
+
+  def extend(self, items):
+    items = list(items)
+    super().extend(items)
+    self._added(items)
+
+  def __iadd__(self, items):
+    self.extend(items)
+    return self
+
+  def __imul__(self, count):
+    self[:] = list(self) * count
+    return self
+
+  def insert(self, index, item):
+    super().insert(index, item)
+    self._added((item,))
+
+  def remove(self, item):
+    super().remove(item)
+    self._removed((item,))
+
+  def pop(self, index=-1):
+    item = super().pop(index)
+    self._removed((item,))
+    return item
+
+  def clear(self):
+    items = list(self)
+    super().clear()
+    self._removed(items)
+
+  def __setitem__(self, key, value):
+    removed = self[key]
+    if isinstance(key, slice):
+      value = list(value)
+      super().__setitem__(key, value)
+      self._added(value)
+      self._removed(removed)
+    else:
+      super().__setitem__(key, value)
+      self._added((value,))
+      self._removed((removed,))
+
+  def __delitem__(self, key):
+    removed = self[key]
+    super().__delitem__(key)
+    self._removed(removed if isinstance(key, slice) else (removed,))
+
+  def sort(self, *args, **kwargs):
+    super().sort(*args, **kwargs)
+    self._added(())
+
+  def reverse(self):
+    super().reverse()
+    self._added(())
+
+
+class _TreeObject(abc.ABC):
+  """Base class for the objects a behavior tree is made of.
+
+  Tree objects are converted to protos in a single pass, in which every object
+  writes itself directly into the proto message of its parent (see
+  _write_proto).
+
+  Tree objects also keep track of whether they have been modified since they
+  were last converted: setting a property or changing a list attribute (e.g.,
+  the children of a node) marks the object, and all objects containing it, as
+  modified. Setters do so by calling _assign. The protos of behavior trees, and
+  of all objects whose proto has been requested, are cached and are reused by
+  later conversions as long as the object is not modified.
+
+  Tracking modifications has a cost, which is not worth paying for objects
+  which are only converted once, e.g., generated trees. Objects therefore only
+  start tracking their modifications when they are converted for the second
+  time, indexed or lazily created. Objects added to an object which tracks its
+  modifications start tracking them, too.
+
+  Some objects hold values which can be modified in place without the object
+  noticing, such as the world query or protos of a Data node (see
+  _has_mutable_content). The protos of such objects, and of all objects
+  containing them, are never cached, but written anew by every conversion.
+
+  Behavior trees keep an index of their nodes by name and id, which is
+  invalidated in the same way, but only by changes of names, ids or of the
+  structure of the tree.
+
+  Tree objects can also be created lazily from a proto (see the `lazy` argument
+  of create_from_proto). The content of a lazily created object is only loaded
+  from its proto when it is first accessed, and the contained objects are
+  created lazily in turn. Until it is modified, the proto of such an object is
+  the proto it has been created from.
+  """
+
+  # Attributes which hold the conversion and index state. All other attributes
+  # make up the content of the object.
+  _STATE_ATTRIBUTES = frozenset((
+      '_parents',
+      '_clean',
+      '_cached_proto',
+      '_lazy_source',
+      '_indexed',
+      '_index',
+      '_linked',
+      '_converted',
+  ))
+  # Attributes which are part of the index of a tree, in addition to all
+  # attributes which hold tree objects or lists.
+  _INDEXED_ATTRIBUTES = frozenset(('_name', '_node_id', '_tree_id'))
+  # Whether the proto of the object is also cached when it is converted as
+  # part of a containing object.
+  _CACHE_NESTED_PROTO = False
+  # The number of conversions of objects with mutable content so far. Objects
+  # whose conversion included such an object are not cached.
+  _num_uncacheable_writes = 0
+
+  # Whether the object has not been modified since its last conversion. All
+  # objects contained in a clean object are clean, too.
+  _clean: bool = False
+  # The proto of the object, can only be set while the object is clean.
+  _cached_proto: Optional[protobuf_message.Message] = None
+  # Whether the indexed content of the object has not been modified since the
+  # object was last indexed. All objects contained in an indexed object are
+  # indexed, too.
+  _indexed: bool = False
+  # The index of the nodes of the object, can only be set while the object is
+  # indexed.
+  _index: Optional['_NodeIndex'] = None
+  # Whether the object tracks its modifications, i.e., is attached to the
+  # objects it contains. All objects contained in a linked object are linked,
+  # too. Objects which are clean or indexed are linked.
+  _linked: bool = False
+  # Whether the proto of the object has been requested before.
+  _converted: bool = False
+  # The _write_proto method inherited by a class which overrides proto instead
+  # of _write_proto, see __init_subclass__.
+  _write_inherited_proto: Optional[Callable[..., None]] = None
+
+  def __init_subclass__(cls, **kwargs):
+    super().__init_subclass__(**kwargs)
+    for klass in cls.__mro__:
+      if '_write_proto' in vars(klass):
+        return
+      if 'proto' in vars(klass):
+        break
+    # The class implements the proto property instead of _write_proto, as
+    # subclasses defined outside of this module did before _write_proto was
+    # introduced. Convert it through its proto property. Such classes set
+    # their attributes directly, so every assignment is tracked.
+    cls._write_inherited_proto = cls._write_proto
+    cls._write_proto = _TreeObject._write_proto_property
+    cls.__setattr__ = _TreeObject._setattr_tracked
+
+  def __getattr__(self, name: str) -> AnyType:
+    # Only called for attributes which are not set, i.e., for all attributes of
+    # a lazily created object whose content has not been loaded yet.
+    if name.startswith('__') or '_lazy_source' not in vars(self):
+      raise AttributeError(
+          f"'{type(self).__name__}' object has no attribute '{name}'"
+      )
+    self._load()
+    return getattr(self, name)
+
+  def _assign(self, name: str, value: AnyType) -> None:
+    """Sets an attribute of the content and marks the object as modified.
+
+    Args:
+      name: The name of the attribute, usually the private attribute behind a
+        property.
+      value: The new value. Lists are replaced by lists which report their
+        modifications.
+    """
+    if not self._linked:
+      # Neither the object nor any object containing it is clean or indexed.
+      object.__setattr__(self, name, value)
+      return
+    self._load()
+    previous = vars(self).get(name)
+    affects_index = name in self._INDEXED_ATTRIBUTES or (
+        previous is not value
+        and (
+            isinstance(value, (_TreeObject, list))
+            or isinstance(previous, (_TreeObject, list))
+        )
+    )
+    if previous is not value:
+      if isinstance(value, list) and not self._owns(value):
+        value = _TrackedList(self, value)
+      else:
+        _attach(self, value)
+      if isinstance(previous, _TrackedList):
+        previous._release()  # pylint: disable=protected-access
+      else:
+        _detach(self, previous)
+    object.__setattr__(self, name, value)
+    self._mark_modified(affects_index)
+
+  def _setattr_tracked(self, name: str, value: AnyType) -> None:
+    """Implements __setattr__ for classes overriding proto, see above."""
+    if name in self._STATE_ATTRIBUTES:
+      object.__setattr__(self, name, value)
+    else:
+      self._assign(name, value)
+
+  def __getstate__(self):
+    self._load()
+    return {
+        name: list(value) if isinstance(value, _TrackedList) else value
+        for name, value in vars(self).items()
+        if name not in self._STATE_ATTRIBUTES
+    }
+
+  def __setstate__(self, state):
+    for name, value in state.items():
+      if type(value) is list:  # pylint: disable=unidiomatic-typecheck
+        value = _TrackedList(self, value)
+      object.__setattr__(self, name, value)
+
+  def mark_modified(self) -> None:
+    """Marks the object, and all objects containing it, as modified."""
+    self._mark_modified(affects_index=True)
+
+  def _has_mutable_content(self) -> bool:
+    """Returns whether the object holds values which may change in place."""
+    return False
+
+  def _owns(self, value: AnyType) -> bool:
+    return isinstance(value, _TrackedList) and value._owner is self  # pylint: disable=protected-access
+
+  def _link(self) -> None:
+    """Starts tracking the modifications of this object and its content.
+
+    Attaches the object, and all objects it contains, to the objects they
+    contain, unless they are linked already. Must be called before an object is
+    marked as clean or indexed.
+    """
+    # pylint: disable=protected-access
+    pending = [self]
+    while pending:
+      tree_object = pending.pop()
+      if tree_object._linked:
+        continue
+      for name, value in list(vars(tree_object).items()):
+        if name in self._STATE_ATTRIBUTES:
+          continue
+        if isinstance(value, list):
+          if not tree_object._owns(value):
+            value = _TrackedList(tree_object, value)
+            object.__setattr__(tree_object, name, value)
+          items = value
+        else:
+          items = (value,)
+        for item in items:
+          if isinstance(item, _TreeObject):
+            vars(item).setdefault('_parents', []).append(tree_object)
+            pending.append(item)
+      tree_object._linked = True
+    # pylint: enable=protected-access
+
+  def _mark_modified(self, affects_index: bool) -> None:
+    # pylint: disable=protected-access
+    pending = [self]
+    while pending:
+      tree_object = pending.pop()
+      propagate = False
+      if tree_object._clean:
+        tree_object._clean = False
+        tree_object._cached_proto = None
+        propagate = True
+      if affects_index and tree_object._indexed:
+        tree_object._indexed = False
+        tree_object._index = None
+        propagate = True
+      if propagate:
+        pending.extend(vars(tree_object).get('_parents', ()))
+    # pylint: enable=protected-access
+
+  @classmethod
+  def _class_for_proto(
+      cls, proto_message: protobuf_message.Message
+  ) -> type['_TreeObject']:
+    """Returns the class of the object represented by the given proto."""
+    del proto_message  # Unused.
+    return cls
+
+  @classmethod
+  @abc.abstractmethod
+  def _load_from_proto(
+      cls, proto_message: protobuf_message.Message, lazy: bool
+  ) -> '_TreeObject':
+    """Creates an object from a proto.
+
+    Args:
+      proto_message: The proto to create the object from. It is referenced by
+        the created objects if lazy is True.
+      lazy: Whether to create the objects contained in this object lazily.
+
+    Returns:
+      The created object.
+    """
+
+  @classmethod
+  def _from_proto(
+      cls, proto_message: protobuf_message.Message, lazy: bool
+  ) -> AnyType:
+    """Creates an object, lazily if requested, see _load_from_proto."""
+    if not lazy:
+      return cls._load_from_proto(proto_message, lazy=False)
+    object_class = cls._class_for_proto(proto_message)
+    tree_object = object_class.__new__(object_class)
+    vars(tree_object).update(
+        _lazy_source=proto_message,
+        _clean=True,
+        _cached_proto=proto_message,
+        _indexed=True,
+        _linked=True,
+    )
+    return tree_object
+
+  @classmethod
+  def _from_proto_copy(
+      cls, proto_message: protobuf_message.Message, lazy: bool
+  ) -> AnyType:
+    """Like _from_proto, but a lazily created object references a copy."""
+    if lazy:
+      proto_copy = type(proto_message)()
+      proto_copy.CopyFrom(proto_message)
+      proto_message = proto_copy
+    return cls._from_proto(proto_message, lazy)
+
+  def _load(self) -> None:
+    """Loads the content of a lazily created object, if not loaded yet."""
+    source = vars(self).pop('_lazy_source', None)
+    if source is None:
+      return
+    loaded = self._load_from_proto(source, lazy=True)
+    if loaded._linked:  # pylint: disable=protected-access
+      for value in vars(loaded).values():
+        if isinstance(value, _TrackedList):
+          value._release()  # pylint: disable=protected-access
+        else:
+          _detach(loaded, value)
+    # Loading the content is not a modification, take it over as it is. The
+    # contained objects are created lazily, i.e., they are linked already.
+    self._linked = False
+    for name, value in loaded.__getstate__().items():
+      object.__setattr__(self, name, value)
+    self._link()
+    if self._has_mutable_content():
+      # The loaded values may be modified in place from now on.
+      self._mark_modified(affects_index=False)
+
+  @abc.abstractmethod
+  def _write_proto(self, proto_message: protobuf_message.Message) -> None:
+    """Writes the content of this object into an empty proto message."""
+
+  def _write_proto_property(
+      self, proto_message: protobuf_message.Message
+  ) -> None:
+    """Implements _write_proto for classes overriding proto, see above."""
+    proto_message.CopyFrom(self.proto)
+
+  def _write_to(self, proto_message: protobuf_message.Message) -> None:
+    """Writes this object into an empty proto message.
+
+    Uses the cached proto of this object, if available.
+
+    Args:
+      proto_message: The message to write to, usually a field of the proto
+        message of the containing object.
+    """
+    if self._cached_proto is not None:
+      proto_message.CopyFrom(self._cached_proto)
+      return
+    num_uncacheable_writes = _TreeObject._num_uncacheable_writes
+    proto_message.SetInParent()
+    self._write_proto(proto_message)
+    if self._has_mutable_content():
+      _TreeObject._num_uncacheable_writes += 1
+    elif (
+        self._linked
+        and _TreeObject._num_uncacheable_writes == num_uncacheable_writes
+    ):
+      self._clean = True
+      if self._CACHE_NESTED_PROTO:
+        self._cache_proto(proto_message)
+
+  def _cache_proto(self, proto_message: protobuf_message.Message) -> None:
+    if self._cached_proto is None:
+      self._cached_proto = type(proto_message)()
+      self._cached_proto.CopyFrom(proto_message)
+
+  def _to_proto(self, message_type):
+    """Returns a new proto message of the given type for this object."""
+    proto_message = message_type()
+    if self._write_inherited_proto is not None:
+      # Called as super().proto by the proto property of a subclass, which
+      # extends the proto written by its base classes.
+      self._write_inherited_proto(proto_message)
+      return proto_message
+    if not self._linked:
+      if not self._converted:
+        self._converted = True
+        self._write_to(proto_message)
+        return proto_message
+      self._link()
+    self._write_to(proto_message)
+    if self._clean:
+      self._cache_proto(proto_message)
+    return proto_message
+
+
+def _tracked_property(name: str) -> property:
+  """Returns a property for the given attribute of a tree object.
+
+  Setting the property marks the object as modified, see _TreeObject._assign.
+
+  Args:
+    name: The name of the attribute behind the property.
+  """
+
+  def setter(tree_object: _TreeObject, value: AnyType) -> None:
+    tree_object._assign(name, value)  # pylint: disable=protected-access
+
+  return property(operator.attrgetter(name), setter)
+
+
 class WorldQuery:
   """Wrapper for WorldQuery proto for easier construction and conversion."""
 
@@ -373,7 +1149,7 @@ class DisabledResultState(enum.Enum):
   """Specifies the forced resulting state for a disabled node."""
 
 
-class Decorators:
+class Decorators(_TreeObject):
   """Collection of properties assigned to a node.
 
   Currently, we support a single condition decorator.
@@ -388,10 +1164,15 @@ class Decorators:
     proto: The proto representation of the decorators objects.
   """
 
-  condition: Optional['Condition']
-  breakpoint_type: Optional['BreakpointType']
-  execution_mode: Optional[NodeExecutionMode]
-  disabled_result_state: Optional[DisabledResultState]
+  _condition: Optional['Condition']
+  _breakpoint_type: Optional['BreakpointType']
+  _execution_mode: Optional[NodeExecutionMode]
+  _disabled_result_state: Optional[DisabledResultState]
+
+  condition = _tracked_property('_condition')
+  breakpoint_type = _tracked_property('_breakpoint_type')
+  execution_mode = _tracked_property('_execution_mode')
+  disabled_result_state = _tracked_property('_disabled_result_state')
 
   def __init__(
       self,
@@ -400,10 +1181,10 @@ class Decorators:
       execution_mode: Optional[NodeExecutionMode] = None,
       disabled_result_state: Optional[DisabledResultState] = None,
   ):
-    self.condition = condition
-    self.breakpoint_type = breakpoint_type
-    self.execution_mode = execution_mode
-    self.disabled_result_state = disabled_result_state
+    self._condition = condition
+    self._breakpoint_type = breakpoint_type
+    self._execution_mode = execution_mode
+    self._disabled_result_state = disabled_result_state
 
   @property
   def proto(self) -> behavior_tree_pb2.BehaviorTree.Node.Decorators:
@@ -412,9 +1193,13 @@ class Decorators:
     Returns:
       A proto representation of this object.
     """
-    proto_message = behavior_tree_pb2.BehaviorTree.Node.Decorators()
+    return self._to_proto(behavior_tree_pb2.BehaviorTree.Node.Decorators)
+
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node.Decorators
+  ) -> None:
     if self.condition is not None:
-      proto_message.condition.CopyFrom(self.condition.proto)
+      self.condition._write_to(proto_message.condition)  # pylint: disable=protected-access
     if self.breakpoint_type is not None:
       proto_message.breakpoint = self.breakpoint_type.value
     if self.execution_mode is not None:
@@ -424,23 +1209,32 @@ class Decorators:
             self.disabled_result_state.value
         )
 
-    return proto_message
-
   @classmethod
   def create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.Node.Decorators
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.Node.Decorators,
+      lazy: bool = False,
   ) -> 'Decorators':
     """Creates an instance from a Decorators proto.
 
     Args:
       proto_object: Proto to read data from.
+      lazy: Whether to create the instance lazily, see BehaviorTree.
 
     Returns:
       Instance of Decorators wrapper with data from proto.
     """
+    return cls._from_proto_copy(proto_object, lazy)
+
+  @classmethod
+  def _load_from_proto(
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.Node.Decorators,
+      lazy: bool,
+  ) -> 'Decorators':
     decorator = cls()
     if proto_object.HasField('condition'):
-      decorator.condition = Condition.create_from_proto(proto_object.condition)
+      decorator.condition = Condition._from_proto(proto_object.condition, lazy)
     if proto_object.HasField('breakpoint'):
       decorator.breakpoint_type = BreakpointType.from_proto(
           proto_object.breakpoint
@@ -457,7 +1251,7 @@ class Decorators:
     return decorator
 
 
-class Node(abc.ABC):
+class Node(_TreeObject):
   """Parent abstract base class for all the supported behavior tree nodes.
 
   Attributes:
@@ -470,6 +1264,10 @@ class Node(abc.ABC):
     node_id: A unique id for this node.
   """
 
+  # Whether the node is drawn in a box together with its children in dot
+  # graphs.
+  _DOT_CLUSTER = False
+
   def __repr__(self) -> str:
     """Returns a compact, human-readable string representation."""
     return f'{type(self).__name__}({self._name_repr()})'
@@ -489,74 +1287,99 @@ class Node(abc.ABC):
 
   @classmethod
   def create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.Node
+      cls, proto_object: behavior_tree_pb2.BehaviorTree.Node, lazy: bool = False
   ) -> 'Node':
-    """Instantiates a Node instance from a proto."""
+    """Instantiates a Node instance from a proto.
+
+    Args:
+      proto_object: Proto to read data from.
+      lazy: Whether to create the node lazily, see BehaviorTree.
+
+    Returns:
+      Instance of the Node subclass for the node type of the proto.
+    """
     if cls != Node:
       raise TypeError('create_from_proto can only be called on the Node class')
-    node_type = proto_object.WhichOneof('node_type')
-    # pylint:disable=protected-access
+    return cls._from_proto_copy(proto_object, lazy)
+
+  @classmethod
+  def _class_for_proto(
+      cls, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> type['Node']:
+    node_type = proto_message.WhichOneof('node_type')
     # Intentionally using knowledge of subclasses in this parent class, so that
     # it is possible to provide a generic function to create the appropriate
     # subclass from a Node proto.
-    if node_type == 'task':
-      created_node = Task._create_from_proto(proto_object.task)
-    elif node_type == 'sub_tree':
-      created_node = SubTree._create_from_proto(proto_object.sub_tree)
-    elif node_type == 'fail':
-      created_node = Fail._create_from_proto(proto_object.fail)
-    elif node_type == 'sequence':
-      created_node = Sequence._create_from_proto(proto_object.sequence)
-    elif node_type == 'parallel':
-      created_node = Parallel._create_from_proto(proto_object.parallel)
-    elif node_type == 'selector':
-      created_node = Selector._create_from_proto(proto_object.selector)
-    elif node_type == 'retry':
-      created_node = Retry._create_from_proto(proto_object.retry)
-    elif node_type == 'fallback':
-      created_node = Fallback._create_from_proto(proto_object.fallback)
-    elif node_type == 'loop':
-      created_node = Loop._create_from_proto(proto_object.loop)
-    elif node_type == 'branch':
-      created_node = Branch._create_from_proto(proto_object.branch)
-    elif node_type == 'data':
-      created_node = Data._create_from_proto(proto_object.data)
-    elif node_type == 'debug':
-      created_node = Debug._create_from_proto(proto_object.debug)
-    else:
+    if node_type not in _NODE_CLASSES:
       raise TypeError('Unsupported proto node type', node_type)
-    # pylint:enable=protected-access
+    return _NODE_CLASSES[node_type]
+
+  @classmethod
+  def _load_from_proto(
+      cls, proto_object: behavior_tree_pb2.BehaviorTree.Node, lazy: bool
+  ) -> 'Node':
+    node_type = proto_object.WhichOneof('node_type')
+    if node_type not in _NODE_CLASSES:
+      raise TypeError('Unsupported proto node type', node_type)
+    # The created node is new, i.e., it does not track its modifications yet
+    # and its attributes can be set directly.
+    # pylint:disable=protected-access
+    created_node = _NODE_CLASSES[node_type]._create_from_proto(
+        getattr(proto_object, node_type), lazy
+    )
     if proto_object.HasField('decorators'):
-      created_node.set_decorators(
-          Decorators.create_from_proto(proto_object.decorators)
+      created_node._decorators = Decorators._from_proto(
+          proto_object.decorators, lazy
       )
     if proto_object.HasField('name'):
-      created_node.name = proto_object.name
+      created_node._name = proto_object.name
     if proto_object.HasField('id') and proto_object.id != 0:
-      created_node.node_id = proto_object.id
+      created_node._node_id = proto_object.id
+    # pylint:enable=protected-access
     return created_node
 
   @property
-  @abc.abstractmethod
   def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
     """Return proto representation of a Node object."""
-    proto_message = behavior_tree_pb2.BehaviorTree.Node()
+    return self._to_proto(behavior_tree_pb2.BehaviorTree.Node)
+
+  @abc.abstractmethod
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    """Writes the node into an empty Node proto."""
     if self.name is not None:
       proto_message.name = self.name
     if self.node_id is not None:
       proto_message.id = self.node_id
     if self.decorators is not None:
-      proto_message.decorators.CopyFrom(self.decorators.proto)
+      self.decorators._write_to(proto_message.decorators)  # pylint: disable=protected-access
 
-    return proto_message
+  def generate_and_set_unique_id(
+      self, allocator: Optional['NodeIdAllocator'] = None
+  ) -> int:
+    """Generates a new id and sets it for this node.
+
+    Without an allocator, the id is random and may collide with the ids of
+    other nodes, which becomes likely for trees with many nodes. Use a
+    NodeIdAllocator, or BehaviorTree.generate_and_set_unique_node_ids, to get
+    ids which are guaranteed to be unique within a tree.
 
-  def generate_and_set_unique_id(self) -> int:
-    """Generates a new random id and sets it for this node."""
+    Args:
+      allocator: Allocator of the tree the node belongs to, or is going to be
+        added to.
+
+    Returns:
+      The new id of the node.
+    """
     if self.node_id is not None:
       print(
           'Warning: Creating a new unique id, but this node already had an id'
           f' ({self.node_id})'
       )
+    if allocator is not None:
+      self.node_id = allocator.allocate()
+      return self.node_id
     uid = uuid.uuid4()
     uid_128 = uid.int
     # The proto only specifies uint32, so a 128-bit UUID wouldn't fit. XOR
@@ -577,44 +1400,60 @@ class Node(abc.ABC):
   def node_type(self) -> str:
     ...
 
-  @abc.abstractmethod
+  def _dot_name(self) -> Optional[str]:
+    """Returns the name of the graph of the node in dot graphs."""
+    return self.name
+
+  def _dot_label(self) -> Optional[str]:
+    """Returns the label of the node in dot graphs, None for its type."""
+    return None
+
+  def _dot_children(self) -> list[Tuple[str, 'Node', str]]:
+    """Returns the children of the node in dot graphs.
+
+    Returns:
+      A list of tuples of a suffix which is unique among the children, the
+      child and the label of the edge to the child.
+    """
+    return []
+
   def dot_graph(
       self,
       node_id_suffix: str = '',
-      node_label: Optional[str] = None,
-      name: Optional[str] = None,
+      *,
+      max_depth: Optional[int] = None,
+      max_nodes: Optional[int] = None,
   ) -> Tuple[graphviz.Digraph, str]:
-    """Generates a graphviz subgraph with a single node for `self`.
+    """Generates a graphviz graph for `self` and its children.
 
     Args:
       node_id_suffix: A little string of form `_1_2`, which is just a suffix to
         make a unique node name in the graph. If the node names clash within the
         graph, they are merged into one, and we do not want to merge unrelated
         nodes.
-      node_label: The label is typically just the type of the node. To use a
-        different value, this argument can be used.
-      name: name of the node as set by the user.
+      max_depth: Maximum number of levels of children to show. The children of
+        deeper nodes are elided.
+      max_nodes: Maximum number of nodes to show, in breadth-first order.
+        Further nodes are elided.
 
     Returns:
       A tuple of the generated graphviz dot graph and
       the name of the graph's root node.
     """
-
-    dot_graph = graphviz.Digraph()
-    node_name = self.node_type.lower() + node_id_suffix
-    dot_graph.node(
-        node_name,
-        label=node_label if node_label is not None else self.node_type.lower(),
-        shape=_NODE_TYPES_TO_DOT_SHAPES[self.node_type.lower()],
+    writer = _DotWriter(max_depth, max_nodes)
+    node_name = writer.write(self, node_id_suffix, None)
+    name, graph_attr = writer.head(self, node_id_suffix)
+    dot_graph = graphviz.Digraph(
+        name=name, graph_attr=graph_attr, body=writer.lines
     )
-    if name:
-      dot_graph.name = name
-      dot_graph.graph_attr = {'label': name}
-
     return dot_graph, node_name
 
-  def show(self) -> None:
-    return ipython.display_if_ipython(self.dot_graph()[0])
+  def show(
+      self, *, max_depth: Optional[int] = None, max_nodes: Optional[int] = None
+  ) -> None:
+    """Shows the node and its children, see dot_graph."""
+    dot_graph, _ = self.dot_graph(max_depth=max_depth, max_nodes=max_nodes)
+    return ipython.display_if_ipython(_DotGraphSvg(dot_graph, {}))
 
   @property
   @abc.abstractmethod
@@ -721,7 +1560,7 @@ class Node(abc.ABC):
     return self
 
 
-class Condition(abc.ABC):
+class Condition(_TreeObject):
   """Parent abstract base class for supported behavior tree conditions.
 
   Attributes:
@@ -731,34 +1570,50 @@ class Condition(abc.ABC):
 
   @classmethod
   def create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.Condition
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.Condition,
+      lazy: bool = False,
   ) -> 'Condition':
-    """Instantiates a Condition instance from a proto."""
+    """Instantiates a Condition instance from a proto.
+
+    Args:
+      proto_object: Proto to read data from.
+      lazy: Whether to create the condition lazily, see BehaviorTree.
+
+    Returns:
+      Instance of the Condition subclass for the condition type of the proto.
+    """
     if cls != Condition:
       raise TypeError(
           'create_from_proto can only be called on the Condition class'
       )
-    condition_type = proto_object.WhichOneof('condition_type')
-    # pylint:disable=protected-access
+    return cls._from_proto_copy(proto_object, lazy)
+
+  @classmethod
+  def _class_for_proto(
+      cls, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> type['Condition']:
+    condition_type = proto_message.WhichOneof('condition_type')
     # Intentionally using knowledge of subclasses in this parent class, so that
     # it is possible to provide a generic function to create the appropriate
     # subclass from a Condition proto.
-    if condition_type == 'behavior_tree':
-      return SubTreeCondition._create_from_proto(proto_object.behavior_tree)
-    elif condition_type == 'blackboard':
-      return Blackboard._create_from_proto(proto_object.blackboard)
-    elif condition_type == 'domain_formula':
+    if condition_type == 'domain_formula':
       raise NotImplementedError(
           'DomainFormular conditions are not yet supported.'
       )
-    elif condition_type == 'all_of':
-      return AllOf._create_from_proto(proto_object.all_of)
-    elif condition_type == 'any_of':
-      return AnyOf._create_from_proto(proto_object.any_of)
-    elif condition_type == 'not':
-      return Not._create_from_proto(getattr(proto_object, 'not'))
-    else:
+    if condition_type not in _CONDITION_CLASSES:
       raise TypeError('Unsupported proto condition type', condition_type)
+    return _CONDITION_CLASSES[condition_type]
+
+  @classmethod
+  def _load_from_proto(
+      cls, proto_object: behavior_tree_pb2.BehaviorTree.Condition, lazy: bool
+  ) -> 'Condition':
+    condition_class = cls._class_for_proto(proto_object)
+    # pylint:disable=protected-access
+    return condition_class._create_from_proto(
+        getattr(proto_object, proto_object.WhichOneof('condition_type')), lazy
+    )
     # pylint:enable=protected-access
 
   def __repr__(self) -> str:
@@ -771,8 +1626,13 @@ class Condition(abc.ABC):
     ...
 
   @property
-  @abc.abstractmethod
   def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
+    return self._to_proto(behavior_tree_pb2.BehaviorTree.Condition)
+
+  @abc.abstractmethod
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
     ...
 
   def visit(
@@ -798,7 +1658,9 @@ class SubTreeCondition(Condition):
     tree: The subtree deciding the outcome of the condition.
   """
 
-  tree: 'BehaviorTree'
+  _tree: 'BehaviorTree'
+
+  tree = _tracked_property('_tree')
 
   def __init__(self, tree: Union['BehaviorTree', 'Node', actions.ActionBase]):
     if tree is None:
@@ -809,17 +1671,16 @@ class SubTreeCondition(Condition):
     if not isinstance(tree, BehaviorTree):
       node = _transform_to_optional_node(tree)
       tree = BehaviorTree(root=node)
-    self.tree = tree
+    self._tree = tree
 
   def __repr__(self) -> str:
     """Returns a compact, human-readable string representation."""
     return f'{type(self).__name__}({str(self.tree)})'
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
-    proto_object = behavior_tree_pb2.BehaviorTree.Condition()
-    proto_object.behavior_tree.CopyFrom(self.tree.proto)
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
+    self.tree._write_to(proto_message.behavior_tree)  # pylint: disable=protected-access
 
   @property
   def condition_type(self) -> str:
@@ -827,9 +1688,9 @@ class SubTreeCondition(Condition):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree
+      cls, proto_object: behavior_tree_pb2.BehaviorTree, lazy: bool = False
   ) -> 'SubTreeCondition':
-    return cls(BehaviorTree.create_from_proto(proto_object))
+    return cls(BehaviorTree._from_proto(proto_object, lazy))
 
   def visit(
       self,
@@ -855,18 +1716,19 @@ class Blackboard(Condition):
       blackboard.
   """
 
+  cel_expression = _tracked_property('_cel_expression')
+
   def __init__(self, cel_expression: str | cel.CelExpression):
-    self.cel_expression: str = str(cel_expression)
+    self._cel_expression: str = str(cel_expression)
 
   def __repr__(self) -> str:
     """Returns a compact, human-readable string representation."""
     return f'{type(self).__name__}({self.cel_expression})'
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
-    proto_object = behavior_tree_pb2.BehaviorTree.Condition()
-    proto_object.blackboard.cel_expression = self.cel_expression
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
+    proto_message.blackboard.cel_expression = self.cel_expression
 
   @property
   def condition_type(self) -> str:
@@ -876,7 +1738,9 @@ class Blackboard(Condition):
   def _create_from_proto(
       cls,
       proto_object: behavior_tree_pb2.BehaviorTree.Condition.BlackboardExpression,
+      lazy: bool = False,
   ) -> 'Blackboard':
+    del lazy  # Unused.
     return cls(proto_object.cel_expression)
 
 
@@ -891,8 +1755,10 @@ class CompoundCondition(Condition):
     proto: The proto representation of the node.
   """
 
+  conditions = _tracked_property('_conditions')
+
   def __init__(self, conditions: Optional[List['Condition']] = None):
-    self.conditions: List['Condition'] = conditions or []
+    self._conditions: List['Condition'] = conditions or []
 
   def set_conditions(self, conditions: List['Condition']) -> 'Condition':
     self.conditions = conditions
@@ -928,17 +1794,12 @@ class AllOf(CompoundCondition):
     condition_type: A string label of the condition type.
   """
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
-    proto_object = behavior_tree_pb2.BehaviorTree.Condition()
-    if self.conditions:
-      for condition in self.conditions:
-        proto_object.all_of.conditions.append(condition.proto)
-    else:
-      proto_object.all_of.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.Condition.LogicalCompound()
-      )
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
+    proto_message.all_of.SetInParent()
+    for condition in self.conditions:
+      condition._write_to(proto_message.all_of.conditions.add())  # pylint: disable=protected-access
 
   @property
   def condition_type(self) -> str:
@@ -948,10 +1809,11 @@ class AllOf(CompoundCondition):
   def _create_from_proto(
       cls,
       proto_object: behavior_tree_pb2.BehaviorTree.Condition.LogicalCompound,
+      lazy: bool = False,
   ) -> 'AllOf':
     condition = cls()
     for condition_proto in proto_object.conditions:
-      condition.conditions.append(Condition.create_from_proto(condition_proto))
+      condition.conditions.append(Condition._from_proto(condition_proto, lazy))
     return condition
 
 
@@ -965,17 +1827,12 @@ class AnyOf(CompoundCondition):
     condition_type: A string label of the condition type.
   """
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
-    proto_object = behavior_tree_pb2.BehaviorTree.Condition()
-    if self.conditions:
-      for condition in self.conditions:
-        proto_object.any_of.conditions.append(condition.proto)
-    else:
-      proto_object.any_of.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.Condition.LogicalCompound()
-      )
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
+    proto_message.any_of.SetInParent()
+    for condition in self.conditions:
+      condition._write_to(proto_message.any_of.conditions.add())  # pylint: disable=protected-access
 
   @property
   def condition_type(self) -> str:
@@ -985,10 +1842,11 @@ class AnyOf(CompoundCondition):
   def _create_from_proto(
       cls,
       proto_object: behavior_tree_pb2.BehaviorTree.Condition.LogicalCompound,
+      lazy: bool = False,
   ) -> 'AnyOf':
     condition = cls()
     for condition_proto in proto_object.conditions:
-      condition.conditions.append(Condition.create_from_proto(condition_proto))
+      condition.conditions.append(Condition._from_proto(condition_proto, lazy))
     return condition
 
 
@@ -1003,19 +1861,19 @@ class Not(Condition):
     condition: The condition to negate.
   """
 
+  condition = _tracked_property('_condition')
+
   def __init__(self, condition: 'Condition'):
-    self.condition: 'Condition' = condition
+    self._condition: 'Condition' = condition
 
   def __repr__(self) -> str:
     """Returns a compact, human-readable string representation."""
     return f'{type(self).__name__}({self.condition})'
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Condition:
-    proto_object = behavior_tree_pb2.BehaviorTree.Condition()
-    not_proto = getattr(proto_object, 'not')
-    not_proto.CopyFrom(self.condition.proto)
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Condition
+  ) -> None:
+    self.condition._write_to(getattr(proto_message, 'not'))  # pylint: disable=protected-access
 
   @property
   def condition_type(self) -> str:
@@ -1023,9 +1881,11 @@ class Not(Condition):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.Condition
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.Condition,
+      lazy: bool = False,
   ) -> 'Not':
-    return cls(Condition.create_from_proto(proto_object))
+    return cls(Condition._from_proto(proto_object, lazy))
 
   def visit(
       self,
@@ -1092,7 +1952,7 @@ class Task(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1100,14 +1960,14 @@ class Task(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
     if self._behavior_call_proto:
-      proto_object.task.call_behavior.CopyFrom(self._behavior_call_proto)
-    return proto_object
+      proto_message.task.call_behavior.CopyFrom(self._behavior_call_proto)
 
   @property
   def node_type(self) -> str:
@@ -1120,7 +1980,7 @@ class Task(Node):
     return None
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1129,20 +1989,25 @@ class Task(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.TaskNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.TaskNode,
+      lazy: bool = False,
   ) -> 'Task':
+    del lazy  # Unused.
     return cls(proto_object.call_behavior)
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    name = self._name or ''
+  def _dot_name(self) -> Optional[str]:
+    # The name is part of the label.
+    return None
+
+  def _dot_label(self) -> Optional[str]:
+    label = self._name or ''
     if self._behavior_call_proto:
-      if name:
-        name += f' ({self._behavior_call_proto.skill_id})'
+      if label:
+        label += f' ({self._behavior_call_proto.skill_id})'
       else:
-        name += f'Skill {self._behavior_call_proto.skill_id}'
-    return super().dot_graph(node_id_suffix, name)
+        label += f'Skill {self._behavior_call_proto.skill_id}'
+    return label
 
 
 class SubTree(Node):
@@ -1161,6 +2026,8 @@ class SubTree(Node):
   _name: Optional[str]
   _node_id: Optional[int]
 
+  behavior_tree = _tracked_property('_behavior_tree')
+
   def __init__(
       self,
       behavior_tree: Optional[Union['Node', 'BehaviorTree']] = None,
@@ -1174,7 +2041,7 @@ class SubTree(Node):
       name: name of the behavior tree, if behavior_tree is a node, i.e., a root
         node of a tree; otherwise, the name of this node.
     """
-    self.behavior_tree: Optional['BehaviorTree'] = None
+    self._behavior_tree: Optional['BehaviorTree'] = None
     self._decorators = None
     self._name = None
     self._node_id = None
@@ -1200,7 +2067,7 @@ class SubTree(Node):
     Returns:
       self for chaining.
     """
-    self._name = name
+    self._assign('_name', name)
     if isinstance(behavior_tree, BehaviorTree):
       self.behavior_tree = behavior_tree
     elif isinstance(behavior_tree, Node):
@@ -1226,7 +2093,7 @@ class SubTree(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1234,25 +2101,25 @@ class SubTree(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
     if self.behavior_tree is None:
       raise ValueError(
           'A SubTree node has not been set. Please call '
           'sub_tree_node_instance.set_behavior_tree(tree_instance).'
       )
-    proto_object.sub_tree.tree.CopyFrom(self.behavior_tree.proto)
-    return proto_object
+    self.behavior_tree._write_to(proto_message.sub_tree.tree)  # pylint: disable=protected-access
 
   @property
   def node_type(self) -> str:
     return 'sub_tree'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1261,40 +2128,15 @@ class SubTree(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.SubtreeNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.SubtreeNode,
+      lazy: bool = False,
   ) -> 'SubTree':
-    return cls(behavior_tree=BehaviorTree.create_from_proto(proto_object.tree))
-
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    """Converts the given subtree into a graphviz dot graph.
-
-    The edge goes from parent to the root node of the subtree.
-
-    Args:
-      node_id_suffix: A little string with the suffix to make the given node
-        unique in the dot graph.
-
-    Returns:
-      A tuple of graphviz dot graph representation of the full subtree and
-      the name of the subtree's root node.
-    """
-    child_dot_graph = None
-    child_node_name = ''
-    if self.behavior_tree is not None and self.behavior_tree.root is not None:
-      child_dot_graph, child_node_name = self.behavior_tree.root.dot_graph(
-          node_id_suffix + '_0'
-      )
-    else:
-      return super().dot_graph(node_id_suffix)
+    return cls(behavior_tree=BehaviorTree._from_proto(proto_object.tree, lazy))
 
-    box_dot_graph = _dot_wrap_in_box(
-        child_graph=child_dot_graph,
-        name=self.behavior_tree.name,
-        label=self.behavior_tree.name,
-    )
-    return box_dot_graph, child_node_name
+  def _dot_name(self) -> Optional[str]:
+    # A subtree is drawn as the root node of its tree in a box, see _DotWriter.
+    return None
 
   def visit(
       self,
@@ -1325,9 +2167,11 @@ class Fail(Node):
   _name: Optional[str]
   _node_id: Optional[int]
 
+  failure_message = _tracked_property('_failure_message')
+
   def __init__(self, failure_message: str = '', name: Optional[str] = None):
     self._decorators = None
-    self.failure_message: str = failure_message
+    self._failure_message: str = failure_message
     self._name = name
     self._node_id = None
     super().__init__()
@@ -1340,11 +2184,11 @@ class Fail(Node):
     rep += ')'
     return rep
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    proto_object.fail.failure_message = self.failure_message
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.fail.failure_message = self.failure_message
 
   @property
   def name(self) -> Optional[str]:
@@ -1352,7 +2196,7 @@ class Fail(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1360,14 +2204,14 @@ class Fail(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   @property
   def node_type(self) -> str:
     return 'fail'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1376,15 +2220,13 @@ class Fail(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.FailNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.FailNode,
+      lazy: bool = False,
   ) -> 'Fail':
+    del lazy  # Unused.
     return cls(proto_object.failure_message)
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    return super().dot_graph(node_id_suffix=node_id_suffix, name=self._name)
-
 
 class Debug(Node):
   """A BT node of type Debug for behavior_tree_pb2.BehaviorTree.DebugNode.
@@ -1403,11 +2245,13 @@ class Debug(Node):
   _name: Optional[str]
   _node_id: Optional[int]
 
+  fail_on_resume = _tracked_property('_fail_on_resume')
+
   def __init__(
       self, fail_on_resume: Optional[bool] = False, name: Optional[str] = None
   ):
     self._decorators = None
-    self.fail_on_resume: Optional[bool] = fail_on_resume
+    self._fail_on_resume: Optional[bool] = fail_on_resume
     self._name = name
     self._node_id = None
     super().__init__()
@@ -1420,11 +2264,11 @@ class Debug(Node):
     rep += ')'
     return rep
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    proto_object.debug.suspend.fail_on_resume = self.fail_on_resume
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.debug.suspend.fail_on_resume = self.fail_on_resume
 
   @property
   def name(self) -> Optional[str]:
@@ -1432,7 +2276,7 @@ class Debug(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1440,14 +2284,14 @@ class Debug(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   @property
   def node_type(self) -> str:
     return 'debug'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1456,15 +2300,13 @@ class Debug(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.DebugNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.DebugNode,
+      lazy: bool = False,
   ) -> 'Debug':
+    del lazy  # Unused.
     return cls(proto_object.suspend.fail_on_resume)
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    return super().dot_graph(node_id_suffix=node_id_suffix, name=self._name)
-
 
 class NodeWithChildren(Node):
   """A parent class for any behavior tree node that has self.children.
@@ -1474,14 +2316,18 @@ class NodeWithChildren(Node):
     proto: The proto representation of the node.
   """
 
+  _DOT_CLUSTER = True
+
+  children = _tracked_property('_children')
+
   def __init__(
       self,
       children: Optional[SequenceType[Union['Node', actions.ActionBase]]],
   ):
     if not children:
-      self.children = []
+      self._children = []
     else:
-      self.children: List['Node'] = [  # pytype: disable=annotation-type-mismatch  # always-use-return-annotations
+      self._children: List['Node'] = [  # pytype: disable=annotation-type-mismatch  # always-use-return-annotations
           _transform_to_optional_node(x) for x in children
       ]
     super().__init__()
@@ -1501,19 +2347,8 @@ class NodeWithChildren(Node):
     representation += '])'
     return representation
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    dot_graph, node_name = super().dot_graph(
-        node_id_suffix=node_id_suffix, name=self.name
-    )
-    _dot_append_children(dot_graph, node_name, self.children, node_id_suffix, 0)
-    box_dot_graph = _dot_wrap_in_box(
-        child_graph=dot_graph,
-        name=(self.name or '') + node_id_suffix,
-        label=self.name or '',
-    )
-    return box_dot_graph, node_name
+  def _dot_children(self) -> list[Tuple[str, 'Node', str]]:
+    return [(f'_{i}', child, '') for i, child in enumerate(self.children)]
 
   def visit(
       self,
@@ -1558,17 +2393,13 @@ class Sequence(NodeWithChildren):
     self._name = name
     self._node_id = None
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    if self.children:
-      for child in self.children:
-        proto_object.sequence.children.append(child.proto)
-    else:
-      proto_object.sequence.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.SequenceNode()
-      )
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.sequence.SetInParent()
+    for child in self.children:
+      child._write_to(proto_message.sequence.children.add())  # pylint: disable=protected-access
 
   @property
   def node_type(self) -> str:
@@ -1580,7 +2411,7 @@ class Sequence(NodeWithChildren):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1588,10 +2419,10 @@ class Sequence(NodeWithChildren):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1600,11 +2431,13 @@ class Sequence(NodeWithChildren):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.SequenceNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.SequenceNode,
+      lazy: bool = False,
   ) -> 'Sequence':
     node = cls()
     for child_node_proto in proto_object.children:
-      node.children.append(Node.create_from_proto(child_node_proto))
+      node.children.append(Node._from_proto(child_node_proto, lazy))
     return node
 
 
@@ -1639,7 +2472,9 @@ class Parallel(NodeWithChildren):
         behavior_tree_pb2.BehaviorTree.ParallelNode.WAIT_FOR_REMAINING_CHILDREN
     )
 
-  failure_behavior: FailureBehavior
+  _failure_behavior: FailureBehavior
+
+  failure_behavior = _tracked_property('_failure_behavior')
 
   def __init__(
       self,
@@ -1653,21 +2488,17 @@ class Parallel(NodeWithChildren):
     self._decorators = None
     self._name = name
     self._node_id = None
-    self.failure_behavior = failure_behavior
+    self._failure_behavior = failure_behavior
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    if self.children:
-      for child in self.children:
-        proto_object.parallel.children.append(child.proto)
-    else:
-      proto_object.parallel.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.ParallelNode()
-      )
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.parallel.SetInParent()
+    for child in self.children:
+      child._write_to(proto_message.parallel.children.add())  # pylint: disable=protected-access
 
-    proto_object.parallel.failure_behavior = self.failure_behavior.value
-    return proto_object
+    proto_message.parallel.failure_behavior = self.failure_behavior.value
 
   @property
   def node_type(self) -> str:
@@ -1679,7 +2510,7 @@ class Parallel(NodeWithChildren):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1687,10 +2518,10 @@ class Parallel(NodeWithChildren):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1699,13 +2530,15 @@ class Parallel(NodeWithChildren):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.ParallelNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.ParallelNode,
+      lazy: bool = False,
   ) -> 'Parallel':
     node = cls(
         failure_behavior=cls.FailureBehavior(proto_object.failure_behavior),
     )
     for child_node_proto in proto_object.children:
-      node.children.append(Node.create_from_proto(child_node_proto))
+      node.children.append(Node._from_proto(child_node_proto, lazy))
     return node
 
 
@@ -1740,17 +2573,13 @@ class Selector(NodeWithChildren):
     self._name = name
     self._node_id = None
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    if self.children:
-      for child in self.children:
-        proto_object.selector.children.append(child.proto)
-    else:
-      proto_object.selector.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.SelectorNode()
-      )
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.selector.SetInParent()
+    for child in self.children:
+      child._write_to(proto_message.selector.children.add())  # pylint: disable=protected-access
 
   @property
   def node_type(self) -> str:
@@ -1762,7 +2591,7 @@ class Selector(NodeWithChildren):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1770,10 +2599,10 @@ class Selector(NodeWithChildren):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1782,11 +2611,13 @@ class Selector(NodeWithChildren):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.SelectorNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.SelectorNode,
+      lazy: bool = False,
   ) -> 'Selector':
     node = cls()
     for child_node_proto in proto_object.children:
-      node.children.append(Node.create_from_proto(child_node_proto))
+      node.children.append(Node._from_proto(child_node_proto, lazy))
     return node
 
 
@@ -1809,12 +2640,18 @@ class Retry(Node):
       available while inside the retry node.
   """
 
+  _DOT_CLUSTER = True
+
   _decorators: Optional['Decorators']
   _name: Optional[str]
   _node_id: Optional[int]
-  child: Optional['Node']
-  recovery: Optional['Node']
-  max_tries: int
+  _child: Optional['Node']
+  _recovery: Optional['Node']
+  _max_tries: int
+
+  child = _tracked_property('_child')
+  recovery = _tracked_property('_recovery')
+  max_tries = _tracked_property('_max_tries')
 
   def __init__(
       self,
@@ -1825,9 +2662,9 @@ class Retry(Node):
       retry_counter_key: Optional[str] = None,
   ):
     self._decorators = None
-    self.child = _transform_to_optional_node(child)
-    self.recovery = _transform_to_optional_node(recovery)
-    self.max_tries = max_tries
+    self._child = _transform_to_optional_node(child)
+    self._recovery = _transform_to_optional_node(recovery)
+    self._max_tries = max_tries
     self._name = name
     self._node_id = None
     self._retry_counter_key = retry_counter_key or 'retry_counter_' + str(
@@ -1859,7 +2696,7 @@ class Retry(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -1867,23 +2704,23 @@ class Retry(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    proto_object.retry.max_tries = self.max_tries
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.retry.max_tries = self.max_tries
     if self.child is None:
       raise ValueError(
           'A Retry node has to have a child node but currently '
           'it is not set. Please call '
           'retry_node_instance.set_child(bt_node_instance).'
       )
-    proto_object.retry.child.CopyFrom(self.child.proto)
+    self.child._write_to(proto_message.retry.child)  # pylint: disable=protected-access
     if self.recovery is not None:
-      proto_object.retry.recovery.CopyFrom(self.recovery.proto)
-    proto_object.retry.retry_counter_blackboard_key = self._retry_counter_key
-    return proto_object
+      self.recovery._write_to(proto_message.retry.recovery)  # pylint: disable=protected-access
+    proto_message.retry.retry_counter_blackboard_key = self._retry_counter_key
 
   @property
   def retry_counter(self) -> str:
@@ -1894,7 +2731,7 @@ class Retry(Node):
     return 'retry'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -1903,41 +2740,29 @@ class Retry(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.RetryNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.RetryNode,
+      lazy: bool = False,
   ) -> 'Retry':
     retry = cls(
         max_tries=proto_object.max_tries,
-        child=Node.create_from_proto(proto_object.child),
+        child=Node._from_proto(proto_object.child, lazy),
     )
     if proto_object.HasField('recovery'):
-      retry.recovery = Node.create_from_proto(proto_object.recovery)
+      retry.recovery = Node._from_proto(proto_object.recovery, lazy)
     retry._retry_counter_key = proto_object.retry_counter_blackboard_key
     return retry
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    dot_graph, node_name = super().dot_graph(
-        node_id_suffix, 'retry ' + str(self.max_tries), self._name
-    )
+  def _dot_label(self) -> Optional[str]:
+    return 'retry ' + str(self.max_tries)
+
+  def _dot_children(self) -> list[Tuple[str, 'Node', str]]:
+    children = []
     if self.child is not None:
-      _dot_append_child(
-          dot_graph, node_name, self.child, node_id_suffix + '_child'
-      )
+      children.append(('_child', self.child, ''))
     if self.recovery is not None:
-      _dot_append_child(
-          dot_graph,
-          node_name,
-          self.recovery,
-          node_id_suffix + '_recovery',
-          edge_label='Recovery',
-      )
-    box_dot_graph = _dot_wrap_in_box(
-        child_graph=dot_graph,
-        name=(self._name or '') + node_id_suffix,
-        label=self._name or '',
-    )
-    return box_dot_graph, node_name
+      children.append(('_recovery', self.recovery, 'Recovery'))
+    return children
 
   def visit(
       self,
@@ -1982,17 +2807,13 @@ class Fallback(NodeWithChildren):
     self._name = name
     self._node_id = None
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
-    proto_object = super().proto
-    if self.children:
-      for child in self.children:
-        proto_object.fallback.children.append(child.proto)
-    else:
-      proto_object.fallback.CopyFrom(
-          behavior_tree_pb2.BehaviorTree.FallbackNode()
-      )
-    return proto_object
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
+    super()._write_proto(proto_message)
+    proto_message.fallback.SetInParent()
+    for child in self.children:
+      child._write_to(proto_message.fallback.children.add())  # pylint: disable=protected-access
 
   @property
   def node_type(self) -> str:
@@ -2004,7 +2825,7 @@ class Fallback(NodeWithChildren):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -2012,10 +2833,10 @@ class Fallback(NodeWithChildren):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -2024,11 +2845,13 @@ class Fallback(NodeWithChildren):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.FallbackNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.FallbackNode,
+      lazy: bool = False,
   ) -> 'Fallback':
     node = cls()
     for child_node_proto in proto_object.children:
-      node.children.append(Node.create_from_proto(child_node_proto))
+      node.children.append(Node._from_proto(child_node_proto, lazy))
     return node
 
 
@@ -2068,6 +2891,8 @@ class Loop(Node):
       protos. The loop iterates over the result of this list.
   """
 
+  _DOT_CLUSTER = True
+
   _decorators: Optional['Decorators']
   _name: Optional[str]
   _node_id: Optional[int]
@@ -2076,6 +2901,10 @@ class Loop(Node):
   _for_each_protos: Optional[List[protobuf_message.Message]]
   _for_each_generator_cel_expression: Optional[str]
 
+  do_child = _tracked_property('_do_child')
+  max_times = _tracked_property('_max_times')
+  while_condition = _tracked_property('_while_condition')
+
   def __init__(
       self,
       max_times: int = 0,
@@ -2092,9 +2921,9 @@ class Loop(Node):
   ):
     self._decorators = None
 
-    self.do_child: Optional['Node'] = _transform_to_optional_node(do_child)
-    self.max_times: int = max_times
-    self.while_condition: Optional['Condition'] = while_condition
+    self._do_child: Optional['Node'] = _transform_to_optional_node(do_child)
+    self._max_times: int = max_times
+    self._while_condition: Optional['Condition'] = while_condition
     self._loop_counter_key = loop_counter_key or 'loop_counter_' + str(
         uuid.uuid4()
     ).replace('-', '_')
@@ -2145,7 +2974,7 @@ class Loop(Node):
     Returns:
       The modified loop node.
     """
-    self._for_each_value_key = key
+    self._assign('_for_each_value_key', key)
     if self._for_each_value is not None:
       self._for_each_value.set_root_value_access_path(key)
     self._check_consistency()
@@ -2179,7 +3008,9 @@ class Loop(Node):
     Returns:
       The modified loop node.
     """
-    self._for_each_protos = Loop._for_each_proto_input_to_protos(protos)
+    self._assign(
+        '_for_each_protos', Loop._for_each_proto_input_to_protos(protos)
+    )
     self._check_consistency()
     self._ensure_for_each_value_key()
     return self
@@ -2208,7 +3039,7 @@ class Loop(Node):
     self.set_for_each_generator_cel_expression(
         generator_value.value_access_path()
     )
-    self._for_each_value = generator_value[0]
+    self._assign('_for_each_value', generator_value[0])
     self._for_each_value.set_root_value_access_path(self._for_each_value_key)
     return self
 
@@ -2229,7 +3060,7 @@ class Loop(Node):
     Returns:
       The modified loop node.
     """
-    self._for_each_generator_cel_expression = cel_expression
+    self._assign('_for_each_generator_cel_expression', cel_expression)
     self._check_consistency()
     self._ensure_for_each_value_key()
     return self
@@ -2298,8 +3129,9 @@ class Loop(Node):
     UUID is created.
     """
     if not self._for_each_value_key:
-      self._for_each_value_key = 'for_each_value_' + str(uuid.uuid4()).replace(
-          '-', '_'
+      self._assign(
+          '_for_each_value_key',
+          'for_each_value_' + str(uuid.uuid4()).replace('-', '_'),
       )
 
   def validate(self):
@@ -2377,7 +3209,7 @@ class Loop(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -2385,23 +3217,25 @@ class Loop(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
     self.validate()
-    proto_object = super().proto
+    super()._write_proto(proto_message)
     if self.while_condition is not None:
-      condition = getattr(proto_object.loop, 'while')
-      condition.CopyFrom(self.while_condition.proto)
+      self.while_condition._write_to(getattr(proto_message.loop, 'while'))  # pylint: disable=protected-access
     if self._for_each_value_key is not None:
-      proto_object.loop.for_each.value_blackboard_key = self._for_each_value_key
+      proto_message.loop.for_each.value_blackboard_key = (
+          self._for_each_value_key
+      )
     if self._for_each_generator_cel_expression is not None:
-      proto_object.loop.for_each.generator_cel_expression = (
+      proto_message.loop.for_each.generator_cel_expression = (
           self._for_each_generator_cel_expression
       )
     if self._for_each_protos:
-      any_list = getattr(proto_object.loop.for_each, 'protos')
+      any_list = getattr(proto_message.loop.for_each, 'protos')
       for proto in self._for_each_protos:
         if proto.DESCRIPTOR.full_name == 'google.protobuf.Any':
           any_proto = any_list.items.add()
@@ -2410,16 +3244,15 @@ class Loop(Node):
           any_proto = any_list.items.add()
           any_proto.Pack(proto)
 
-    proto_object.loop.max_times = self.max_times
+    proto_message.loop.max_times = self.max_times
     if self.do_child is None:
       raise ValueError(
           'A Loop node has to have a do child node but currently '
           'it is not set. Please call '
           'loop_node_instance.set_do_child(bt_node_instance).'
       )
-    proto_object.loop.do.CopyFrom(self.do_child.proto)
-    proto_object.loop.loop_counter_blackboard_key = self._loop_counter_key
-    return proto_object
+    self.do_child._write_to(proto_message.loop.do)  # pylint: disable=protected-access
+    proto_message.loop.loop_counter_blackboard_key = self._loop_counter_key
 
   @property
   def loop_counter(self) -> str:
@@ -2451,7 +3284,7 @@ class Loop(Node):
     return 'loop'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -2460,12 +3293,14 @@ class Loop(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.LoopNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.LoopNode,
+      lazy: bool = False,
   ) -> 'Loop':
     """Created a Loop node class from a LoopNode proto."""
     condition = None
     if proto_object.HasField('while'):
-      condition = Condition.create_from_proto(getattr(proto_object, 'while'))
+      condition = Condition._from_proto(getattr(proto_object, 'while'), lazy)
 
     for_each_value_key = None
     for_each_protos = None
@@ -2486,7 +3321,7 @@ class Loop(Node):
 
     loop = cls(
         max_times=proto_object.max_times,
-        do_child=Node.create_from_proto(proto_object.do),
+        do_child=Node._from_proto(proto_object.do, lazy),
         while_condition=condition,
         loop_counter_key=proto_object.loop_counter_blackboard_key,
         for_each_value_key=for_each_value_key,
@@ -2495,9 +3330,7 @@ class Loop(Node):
     )
     return loop
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
+  def _dot_label(self) -> Optional[str]:
     label = 'loop'
     if self.max_times:
       label += ' ' + str(self.max_times)
@@ -2508,19 +3341,12 @@ class Loop(Node):
         or self._for_each_protos is not None
     ):
       label += ' + for_each'
+    return label
 
-    dot_graph, node_name = super().dot_graph(node_id_suffix, label, self._name)
-    if self.do_child is not None:
-      _dot_append_child(
-          dot_graph, node_name, self.do_child, node_id_suffix + '_0'
-      )
-
-    box_dot_graph = _dot_wrap_in_box(
-        child_graph=dot_graph,
-        name=(self._name or '') + node_id_suffix,
-        label=self._name or '',
-    )
-    return box_dot_graph, node_name
+  def _dot_children(self) -> list[Tuple[str, 'Node', str]]:
+    if self.do_child is None:
+      return []
+    return [('_0', self.do_child, '')]
 
   def visit(
       self,
@@ -2551,10 +3377,16 @@ class Branch(Node):
     node_type: A string label of the node type.
   """
 
+  _DOT_CLUSTER = True
+
   _decorators: Optional['Decorators']
   _name: Optional[str]
   _node_id: Optional[int]
 
+  then_child = _tracked_property('_then_child')
+  else_child = _tracked_property('_else_child')
+  if_condition = _tracked_property('_if_condition')
+
   def __init__(
       self,
       if_condition: Optional['Condition'] = None,
@@ -2563,9 +3395,9 @@ class Branch(Node):
       name: Optional[str] = None,
   ):
     self._decorators = None
-    self.then_child: Optional['Node'] = _transform_to_optional_node(then_child)
-    self.else_child: Optional['Node'] = _transform_to_optional_node(else_child)
-    self.if_condition: Optional['Condition'] = if_condition
+    self._then_child: Optional['Node'] = _transform_to_optional_node(then_child)
+    self._else_child: Optional['Node'] = _transform_to_optional_node(else_child)
+    self._if_condition: Optional['Condition'] = if_condition
     self._name = name
     self._node_id = None
     super().__init__()
@@ -2604,7 +3436,7 @@ class Branch(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -2612,10 +3444,11 @@ class Branch(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
     if self.if_condition is None:
       raise ValueError(
           'A Branch node has to have a if condition but currently '
@@ -2628,23 +3461,21 @@ class Branch(Node):
           'at least one of them.'
       )
 
-    proto_message = super().proto
-    condition = getattr(proto_message.branch, 'if')
-    condition.CopyFrom(self.if_condition.proto)
-
+    super()._write_proto(proto_message)
+    # pylint: disable=protected-access
+    self.if_condition._write_to(getattr(proto_message.branch, 'if'))
     if self.then_child is not None:
-      proto_message.branch.then.CopyFrom(self.then_child.proto)
+      self.then_child._write_to(proto_message.branch.then)
     if self.else_child is not None:
-      else_proto = getattr(proto_message.branch, 'else')
-      else_proto.CopyFrom(self.else_child.proto)
-    return proto_message
+      self.else_child._write_to(getattr(proto_message.branch, 'else'))
+    # pylint: enable=protected-access
 
   @property
   def node_type(self) -> str:
     return 'branch'
 
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -2653,50 +3484,31 @@ class Branch(Node):
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.BranchNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.BranchNode,
+      lazy: bool = False,
   ) -> 'Branch':
     """Creates a Branch node class from a BranchNode proto."""
     then_child = None
     else_child = None
     if proto_object.HasField('then'):
-      then_child = Node.create_from_proto(proto_object.then)
+      then_child = Node._from_proto(proto_object.then, lazy)
     if proto_object.HasField('else'):
-      else_child = Node.create_from_proto(getattr(proto_object, 'else'))
+      else_child = Node._from_proto(getattr(proto_object, 'else'), lazy)
     branch = cls(
-        if_condition=Condition.create_from_proto(getattr(proto_object, 'if')),
+        if_condition=Condition._from_proto(getattr(proto_object, 'if'), lazy),
         then_child=then_child,
         else_child=else_child,
     )
     return branch
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    dot_graph, node_name = super().dot_graph(
-        node_id_suffix=node_id_suffix, name=self._name
-    )
+  def _dot_children(self) -> list[Tuple[str, 'Node', str]]:
+    children = []
     if self.then_child is not None:
-      _dot_append_child(
-          dot_graph,
-          node_name,
-          self.then_child,
-          node_id_suffix + '_1',
-          edge_label='then',
-      )
+      children.append(('_1', self.then_child, 'then'))
     if self.else_child is not None:
-      _dot_append_child(
-          dot_graph,
-          node_name,
-          self.else_child,
-          node_id_suffix + '_2',
-          edge_label='else',
-      )
-    box_dot_graph = _dot_wrap_in_box(
-        child_graph=dot_graph,
-        name=(self._name or '') + node_id_suffix,
-        label=self._name or '',
-    )
-    return box_dot_graph, node_name
+      children.append(('_2', self.else_child, 'else'))
+    return children
 
   def visit(
       self,
@@ -2785,7 +3597,7 @@ class Data(Node):
 
   @name.setter
   def name(self, value: str):
-    self._name = value
+    self._assign('_name', value)
 
   @property
   def node_id(self) -> Optional[int]:
@@ -2793,10 +3605,11 @@ class Data(Node):
 
   @node_id.setter
   def node_id(self, value: int):
-    self._node_id = value
+    self._assign('_node_id', value)
 
-  @property
-  def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
+  def _write_proto(
+      self, proto_message: behavior_tree_pb2.BehaviorTree.Node
+  ) -> None:
     self.validate()
 
     if self._blackboard_key is None or not self._blackboard_key:
@@ -2804,7 +3617,7 @@ class Data(Node):
           'Data node requires the blackboard_key argument as non-empty string'
       )
 
-    proto_message = super().proto
+    super()._write_proto(proto_message)
     if self._operation == Data.OperationType.CREATE_OR_UPDATE:
       proto_message.data.create_or_update.blackboard_key = self._blackboard_key
 
@@ -2837,15 +3650,21 @@ class Data(Node):
           'Data node has no operation type set'
       )
 
-    return proto_message
-
   @property
   def node_type(self) -> str:
     return 'data'
 
+  def _has_mutable_content(self) -> bool:
+    # World queries and protos can be modified in place after being passed in.
+    return (
+        self._world_query is not None
+        or self._proto is not None
+        or self._protos is not None
+    )
+
   def set_decorators(self, decorators: Optional['Decorators']) -> 'Node':
     """Sets decorators for this node."""
-    self._decorators = decorators
+    self._assign('_decorators', decorators)
     return self
 
   @property
@@ -2936,7 +3755,7 @@ class Data(Node):
     Returns:
       self (for builder pattern)
     """
-    self._blackboard_key = blackboard_key
+    self._assign('_blackboard_key', blackboard_key)
     return self
 
   @property
@@ -2952,12 +3771,12 @@ class Data(Node):
     Returns:
       self (for builder pattern)
     """
-    self._operation = operation
+    self._assign('_operation', operation)
     if operation == Data.OperationType.REMOVE:
-      self._cel_expression = None
-      self._world_query = None
-      self._proto = None
-      self._protos = None
+      self._assign('_cel_expression', None)
+      self._assign('_world_query', None)
+      self._assign('_proto', None)
+      self._assign('_protos', None)
     return self
 
   @property
@@ -2978,7 +3797,7 @@ class Data(Node):
           'Cannot set cel_expression on data node without operation'
           ' CREATE_OR_UPDATE'
       )
-    self._cel_expression = cel_expression
+    self._assign('_cel_expression', cel_expression)
     return self
 
   @property
@@ -2991,7 +3810,7 @@ class Data(Node):
           'Cannot set world_query on data node without operation'
           ' CREATE_OR_UPDATE'
       )
-    self._world_query = world_query
+    self._assign('_world_query', world_query)
     return self
 
   @property
@@ -3012,7 +3831,7 @@ class Data(Node):
           'Cannot set input proto on data node without operation'
           ' CREATE_OR_UPDATE'
       )
-    self._proto = proto
+    self._assign('_proto', proto)
     return self
 
   @property
@@ -3034,17 +3853,20 @@ class Data(Node):
           'Cannot set input protos on data node without operation'
           ' CREATE_OR_UPDATE'
       )
-    self._protos = protos
+    self._assign('_protos', protos)
     return self
 
   @classmethod
   def _create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree.DataNode
+      cls,
+      proto_object: behavior_tree_pb2.BehaviorTree.DataNode,
+      lazy: bool = False,
   ) -> 'Data':
     """Creates a new instances from data in a proto.
 
     Args:
       proto_object: Proto to import from.
+      lazy: Unused, a Data node does not contain other nodes.
 
     Returns:
       Instance of Data.
@@ -3053,6 +3875,7 @@ class Data(Node):
       InvalidArgumentError: if passed Node proto does not have the data field
         set to a valid configuration.
     """
+    del lazy  # Unused.
     operation = Data.OperationType.CREATE_OR_UPDATE
     cel_expression = None
     world_query = None
@@ -3095,25 +3918,139 @@ class Data(Node):
     data.validate()
     return data
 
-  def dot_graph(  # pytype: disable=signature-mismatch  # overriding-parameter-count-checks
-      self, node_id_suffix: str = ''
-  ) -> Tuple[graphviz.Digraph, str]:
-    """Converts this node suitable for inclusion in a dot graph.
 
-    Args:
-      node_id_suffix: A little string of form `_1_2`, which is just a suffix to
-        make a unique node name in the graph. If the node names clash within the
-        graph, they are merged into one, and we do not want to merge unrelated
-        nodes.
+_NODE_CLASSES = {
+    'task': Task,
+    'sub_tree': SubTree,
+    'fail': Fail,
+    'sequence': Sequence,
+    'parallel': Parallel,
+    'selector': Selector,
+    'retry': Retry,
+    'fallback': Fallback,
+    'loop': Loop,
+    'branch': Branch,
+    'data': Data,
+    'debug': Debug,
+}
 
-    Returns:
-      Dot graph representation for this node.
-    """
-    return super().dot_graph(node_id_suffix=node_id_suffix, name=self._name)
+_CONDITION_CLASSES = {
+    'behavior_tree': SubTreeCondition,
+    'blackboard': Blackboard,
+    'all_of': AllOf,
+    'any_of': AnyOf,
+    'not': Not,
+}
+
+
+# Fields of the node protos of the given types which hold nodes or conditions,
+# in the order in which they are visited.
+_NODE_PROTO_CONTENT_FIELDS = {
+    'retry': ('child', 'recovery'),
+    'loop': ('while', 'do'),
+    'branch': ('if', 'then', 'else'),
+}
+
+
+def _node_protos(
+    tree_proto: behavior_tree_pb2.BehaviorTree,
+) -> Iterator[
+    Tuple[behavior_tree_pb2.BehaviorTree, behavior_tree_pb2.BehaviorTree.Node]
+]:
+  """Yields all node protos of a tree proto in the order of BehaviorTree.visit.
+
+  Args:
+    tree_proto: The proto of the tree to traverse.
+
+  Yields:
+    Tuples of the proto of the tree containing a node and the node proto.
+  """
+  # Stack of (containing tree, message, whether to yield the message). Messages
+  # are trees, nodes or conditions. A node is pushed twice: once to push its
+  # contents and once to yield it, after its decorator condition was visited.
+  pending = [(tree_proto, tree_proto, False)]
+  while pending:
+    tree, message, yield_message = pending.pop()
+    if yield_message:
+      yield tree, message
+      continue
+
+    # Collect the contents in visiting order, then push them in reverse.
+    contents = []
+    if isinstance(message, behavior_tree_pb2.BehaviorTree):
+      tree = message
+      if message.HasField('root'):
+        contents.append(message.root)
+    elif isinstance(message, behavior_tree_pb2.BehaviorTree.Node):
+      if message.decorators.HasField('condition'):
+        contents.append(message.decorators.condition)
+      contents.append((message,))
+      node_type = message.WhichOneof('node_type')
+      if node_type in ('sequence', 'parallel', 'selector', 'fallback'):
+        contents.extend(getattr(message, node_type).children)
+      elif node_type == 'sub_tree' and message.sub_tree.HasField('tree'):
+        contents.append(message.sub_tree.tree)
+      elif node_type in ('retry', 'loop', 'branch'):
+        node = getattr(message, node_type)
+        for field in _NODE_PROTO_CONTENT_FIELDS[node_type]:
+          if node.HasField(field):
+            contents.append(getattr(node, field))
+    else:
+      condition_type = message.WhichOneof('condition_type')
+      if condition_type in ('behavior_tree', 'not'):
+        contents.append(getattr(message, condition_type))
+      elif condition_type in ('all_of', 'any_of'):
+        contents.extend(getattr(message, condition_type).conditions)
+
+    for content in reversed(contents):
+      if isinstance(content, tuple):
+        pending.append((tree, content[0], True))
+      else:
+        pending.append((tree, content, False))
+
+
+def node_states_from_proto(
+    tree_proto: behavior_tree_pb2.BehaviorTree,
+) -> dict[NodeIdentifierType, behavior_tree_pb2.BehaviorTree.Node.State]:
+  """Returns the states of all nodes in a tree proto, e.g., of an operation.
+
+  Args:
+    tree_proto: The proto of the tree, as returned by the executive.
+
+  Returns:
+    The states of all nodes with a state and an id, by tree id and node id.
+  """
+  return {
+      NodeIdentifierType(
+          tree_id=tree.tree_id if tree.HasField('tree_id') else None,
+          node_id=node.id,
+      ): node.state
+      for tree, node in _node_protos(tree_proto)
+      if node.HasField('state') and node.HasField('id')
+  }
+
+
+class _NodeIndex:
+  """Index of the nodes of a behavior tree.
+
+  Attributes:
+    identifiers_by_name: The identifiers of all nodes with a name, by name, in
+      the order in which BehaviorTree.visit visits the nodes.
+    id_recorder: An IdRecorder which has visited the tree, or None if the index
+      has been created from the proto of a lazily created tree.
+  """
+
+  def __init__(
+      self,
+      identifiers_by_name: Mapping[str, list[NodeIdentifierType]],
+      id_recorder: Optional['IdRecorder'] = None,
+  ):
+    self.identifiers_by_name = identifiers_by_name
+    self.id_recorder = id_recorder
 
 
 class IdRecorder:
-  """A visitor callable object that records tree ids and node ids."""
+  """A visitor callable object that records tree ids, node ids and names."""
 
   def __init__(self):
     self.tree_to_node_id_to_nodes: Mapping[
@@ -3122,6 +4059,12 @@ class IdRecorder:
     self.tree_id_to_trees: Mapping[str, list[BehaviorTree]] = (
         collections.defaultdict(list)
     )
+    self.node_name_to_identifiers: Mapping[str, list[NodeIdentifierType]] = (
+        collections.defaultdict(list)
+    )
+    self.tree_to_nodes_without_id: Mapping[BehaviorTree, list[Node]] = (
+        collections.defaultdict(list)
+    )
 
   def __call__(
       self,
@@ -3132,6 +4075,14 @@ class IdRecorder:
       self.tree_to_node_id_to_nodes[containing_tree][
           tree_object.node_id
       ].append(tree_object)
+    elif isinstance(tree_object, Node):
+      self.tree_to_nodes_without_id[containing_tree].append(tree_object)
+    if isinstance(tree_object, Node) and tree_object.name:
+      self.node_name_to_identifiers[tree_object.name].append(
+          NodeIdentifierType(
+              tree_id=containing_tree.tree_id, node_id=tree_object.node_id
+          )
+      )
     if (
         isinstance(tree_object, BehaviorTree)
         and tree_object.tree_id is not None
@@ -3139,7 +4090,140 @@ class IdRecorder:
       self.tree_id_to_trees[tree_object.tree_id].append(tree_object)
 
 
-class BehaviorTree:
+class NodeIdAllocator:
+  """Allocates node ids which are unique within a behavior tree.
+
+  Node ids only need to be unique among the nodes of the same tree, nodes of
+  nested trees (e.g., of SubTree nodes) have their own ids. The allocator
+  records the ids which are in use in the tree when it is created and hands
+  out the smallest ids which are not in use, in amortized constant time.
+
+  Nodes which are added to the tree later should be registered with graft,
+  which detects ids that conflict with ids already in use.
+
+  Example usage:
+    allocator = behavior_tree.NodeIdAllocator(tree)
+    branch = behavior_tree.Sequence(...)
+    allocator.graft(branch)
+    tree.root.children.append(branch)
+  """
+
+  _MAX_NODE_ID = 0xFFFFFFFF
+
+  def __init__(
+      self, tree: 'BehaviorTree', id_recorder: Optional[IdRecorder] = None
+  ):
+    """Creates an allocator for the given tree.
+
+    Args:
+      tree: The tree in which node ids are allocated.
+      id_recorder: An IdRecorder which has visited the tree, or a tree which
+        contains it. If None, the ids in use are recorded from the tree.
+    """
+    if id_recorder is None:
+      # pylint: disable-next=protected-access
+      id_recorder = tree._node_index(require_nodes=True).id_recorder
+    self._tree = tree
+    self._used_node_ids = set(
+        id_recorder.tree_to_node_id_to_nodes.get(tree, ())
+    )
+    # All ids below this one are in use.
+    self._next_node_id = 1
+
+  def _tree_repr(self) -> str:
+    return f'BehaviorTree({self._tree._name_repr()})'  # pylint: disable=protected-access
+
+  def reserve(self, node_id: int) -> None:
+    """Marks the given id as in use.
+
+    Args:
+      node_id: The id to reserve.
+
+    Raises:
+      solutions_errors.InvalidArgumentError: If the id is already in use.
+    """
+    if node_id in self._used_node_ids:
+      raise solutions_errors.InvalidArgumentError(
+          f'Node id {node_id} is already in use in the tree'
+          f' {self._tree_repr()}.'
+      )
+    self._used_node_ids.add(node_id)
+
+  def allocate(self) -> int:
+    """Returns a new id, which is not in use in the tree, and reserves it.
+
+    Raises:
+      solutions_errors.InvalidArgumentError: If all ids are in use.
+    """
+    node_id = self._next_node_id
+    while node_id in self._used_node_ids:
+      node_id += 1
+    if node_id > self._MAX_NODE_ID:
+      raise solutions_errors.InvalidArgumentError(
+          f'All node ids are in use in the tree {self._tree_repr()}.'
+      )
+    self._used_node_ids.add(node_id)
+    self._next_node_id = node_id + 1
+    return node_id
+
+  def graft(self, node: Node, reassign_conflicting_ids: bool = False) -> None:
+    """Registers the nodes of a subtree which is added to the tree.
+
+    Reserves the ids of all nodes in the subtree and sets new ids on the nodes
+    without an id. Nodes of trees nested in the subtree are not considered.
+    The subtree is only modified if no conflict is detected, or if conflicting
+    ids are reassigned.
+
+    Args:
+      node: The root node of the subtree.
+      reassign_conflicting_ids: If True, nodes with conflicting ids get new ids
+        instead of raising an error.
+
+    Raises:
+      solutions_errors.InvalidArgumentError: If ids of the subtree are already
+        in use in the tree, or are used by several nodes of the subtree, and
+        reassign_conflicting_ids is False.
+    """
+    nodes = []
+
+    def collect(
+        containing_tree: 'BehaviorTree',
+        tree_object: Union['BehaviorTree', Node, Condition],
+    ):
+      if containing_tree is self._tree and isinstance(tree_object, Node):
+        nodes.append(tree_object)
+
+    node.visit(self._tree, collect)
+
+    grafted_node_ids = set()
+    nodes_without_id = []
+    conflicting_nodes = []
+    for grafted_node in nodes:
+      node_id = grafted_node.node_id
+      if node_id is None:
+        nodes_without_id.append(grafted_node)
+      elif node_id in self._used_node_ids or node_id in grafted_node_ids:
+        conflicting_nodes.append(grafted_node)
+      else:
+        grafted_node_ids.add(node_id)
+
+    if conflicting_nodes and not reassign_conflicting_ids:
+      raise solutions_errors.InvalidArgumentError(
+          'The subtree contains node ids which are already in use in the tree'
+          f' {self._tree_repr()}: '
+          + ', '.join(
+              f'{n.__class__.__name__}({n._name_repr()})'  # pylint: disable=protected-access
+              f' [node_id="{n.node_id}"]'
+              for n in conflicting_nodes
+          )
+      )
+
+    self._used_node_ids.update(grafted_node_ids)
+    for grafted_node in conflicting_nodes + nodes_without_id:
+      grafted_node.node_id = self.allocate()
+
+
+class BehaviorTree(_TreeObject):
   # pyformat: disable
   """Python wrapper around behavior_tree_pb2.BehaviorTree proto.
 
@@ -3163,7 +4247,13 @@ class BehaviorTree:
   """
   # pyformat: enable
 
-  tree_id: Optional[str]
+  _CACHE_NESTED_PROTO = True
+
+  _tree_id: Optional[str]
+
+  name = _tracked_property('_name')
+  root = _tracked_property('_root')
+  tree_id = _tracked_property('_tree_id')
 
   def __init__(
       self,
@@ -3182,7 +4272,7 @@ class BehaviorTree:
         argument overwrites the value from the `bt` proto argument, if set.
     """
     root: Optional['Node'] = _transform_to_optional_node(root)
-    self.tree_id = None
+    self._tree_id = None
     if bt is not None:
       bt_copy = None
       if isinstance(bt, BehaviorTree):
@@ -3193,10 +4283,10 @@ class BehaviorTree:
         raise TypeError
       name = name or bt_copy.name
       root = root or bt_copy.root
-      self.tree_id = bt_copy.tree_id
+      self._tree_id = bt_copy.tree_id
 
-    self.name: str = name or ''
-    self.root: Optional[Node] = root
+    self._name: str = name or ''
+    self._root: Optional[Node] = root
     self._description = None
 
   def __repr__(self) -> str:
@@ -3222,34 +4312,56 @@ class BehaviorTree:
   @property
   def proto(self) -> behavior_tree_pb2.BehaviorTree:
     """Converts the given instance into the corresponding proto object."""
+    return self._to_proto(behavior_tree_pb2.BehaviorTree)
+
+  def _write_proto(self, proto_message: behavior_tree_pb2.BehaviorTree) -> None:
     if self.root is None:
       raise ValueError(
           'A behavior tree has to have a root node but currently '
           'it is not set. Please call `bt.root = bt_node` or '
           'bt.set_root(bt_node)`.'
       )
-    proto_object = behavior_tree_pb2.BehaviorTree(name=self.name)
-    proto_object.root.CopyFrom(self.root.proto)
+    proto_message.name = self.name
+    self.root._write_to(proto_message.root)  # pylint: disable=protected-access
     if self.tree_id:
-      proto_object.tree_id = self.tree_id
+      proto_message.tree_id = self.tree_id
     if self._description is not None:
-      proto_object.description.CopyFrom(self._description)
-    return proto_object
+      proto_message.description.CopyFrom(self._description)
 
   @classmethod
   def create_from_proto(
-      cls, proto_object: behavior_tree_pb2.BehaviorTree
+      cls, proto_object: behavior_tree_pb2.BehaviorTree, lazy: bool = False
   ) -> 'BehaviorTree':
-    """Instantiates a behavior tree from a proto."""
+    """Instantiates a behavior tree from a proto.
+
+    A lazily created tree only wraps a copy of the given proto. The nodes,
+    conditions and subtrees of the tree are created from the proto when they
+    are first accessed, which makes inspecting a few nodes of a large tree
+    cheap. As long as the tree is not modified, its proto is the given proto.
+    Errors in the proto are only raised when the affected part is accessed.
+
+    Args:
+      proto_object: Proto to read data from.
+      lazy: Whether to create the tree lazily.
+
+    Returns:
+      Instance of BehaviorTree with data from the proto.
+    """
     if cls != BehaviorTree:
       raise TypeError(
           'create_from_proto can only be called on the BehaviorTree class'
       )
+    return cls._from_proto_copy(proto_object, lazy)
+
+  @classmethod
+  def _load_from_proto(
+      cls, proto_object: behavior_tree_pb2.BehaviorTree, lazy: bool
+  ) -> 'BehaviorTree':
     bt = cls()
     bt.name = proto_object.name
     if proto_object.HasField('tree_id'):
       bt.tree_id = proto_object.tree_id
-    bt.root = Node.create_from_proto(proto_object.root)
+    bt.root = Node._from_proto(proto_object.root, lazy)
     return bt
 
   def generate_and_set_unique_id(self) -> str:
@@ -3262,6 +4374,21 @@ class BehaviorTree:
     self.tree_id = str(uuid.uuid4())
     return self.tree_id
 
+  def generate_and_set_unique_node_ids(self) -> None:
+    """Sets unique ids on all nodes which do not have an id yet.
+
+    Covers the nodes of this tree and of all trees nested in it, e.g., in
+    SubTree nodes or SubTreeConditions. Each node gets an id which is unique
+    within its tree (see NodeIdAllocator). Existing ids are not changed.
+    """
+    id_recorder = self._node_index(require_nodes=True).id_recorder
+    for tree, nodes in id_recorder.tree_to_nodes_without_id.items():
+      allocator = NodeIdAllocator(tree, id_recorder)
+      for node in nodes:
+        # Nodes which occur several times are only set once.
+        if node.node_id is None:
+          node.node_id = allocator.allocate()
+
   def visit(
       self,
       callback: Callable[
@@ -3348,25 +4475,82 @@ class BehaviorTree:
       node. The list contains information about all matching nodes, even if the
       nodes do not have a node or tree id. In that case the values are None.
     """
-    node_identifiers = []
+    return list(self._node_index().identifiers_by_name.get(node_name, ()))
 
-    def search_matching_name(
-        containing_tree: BehaviorTree,
-        tree_object: Union['BehaviorTree', Node, Condition],
+  def find_many(
+      self, node_names: Iterable[str]
+  ) -> dict[str, list[NodeIdentifierType]]:
+    """Searches the tree for all nodes with any of the given names.
+
+    Same as calling find_tree_and_node_ids for every name, but looks up all
+    names in the same index of the tree.
+
+    Args:
+      node_names: Names of the nodes to search for in the tree.
+
+    Returns:
+      A dict which maps each of the given names to the NodeIdentifierTypes of
+      all nodes with that name, see find_tree_and_node_ids.
+    """
+    identifiers_by_name = self._node_index().identifiers_by_name
+    return {
+        node_name: list(identifiers_by_name.get(node_name, ()))
+        for node_name in node_names
+    }
+
+  def _node_index(self, require_nodes: bool = False) -> _NodeIndex:
+    """Returns the index of the nodes of this tree.
+
+    The index is created on first use and kept until names, ids or the
+    structure of the tree change.
+
+    Args:
+      require_nodes: Whether the index must contain the node objects. If False,
+        the index of a lazily created tree is created from its proto, without
+        loading the tree.
+
+    Returns:
+      The index of the nodes of this tree.
+    """
+    index = self._index
+    if index is not None and (
+        index.id_recorder is not None or not require_nodes
     ):
-      if (
-          isinstance(tree_object, Node)
-          and tree_object.name
-          and tree_object.name == node_name
-      ):
-        node_identifiers.append(
-            NodeIdentifierType(
-                tree_id=containing_tree.tree_id, node_id=tree_object.node_id
-            )
-        )
+      return index
+
+    source = vars(self).get('_lazy_source')
+    if source is not None and not require_nodes:
+      identifiers_by_name = collections.defaultdict(list)
+      for tree, node in _node_protos(source):
+        if node.name:
+          identifiers_by_name[node.name].append(
+              NodeIdentifierType(
+                  tree_id=tree.tree_id if tree.HasField('tree_id') else None,
+                  node_id=node.id if node.HasField('id') and node.id else None,
+              )
+          )
+      index = _NodeIndex(identifiers_by_name)
+    else:
+      id_recorder = IdRecorder()
 
-    self.visit(search_matching_name)
-    return node_identifiers
+      def record(
+          containing_tree: BehaviorTree,
+          tree_object: Union['BehaviorTree', Node, Condition],
+      ):
+        # pylint: disable=protected-access
+        id_recorder(containing_tree, tree_object)
+        tree_object._indexed = True
+        if isinstance(tree_object, Node) and tree_object.decorators is not None:
+          tree_object.decorators._indexed = True
+        # pylint: enable=protected-access
+
+      self._link()
+      self.visit(record)
+      index = _NodeIndex(id_recorder.node_name_to_identifiers, id_recorder)
+    self._link()
+    self._index = index
+    self._indexed = True
+    return index
 
   def validate_id_uniqueness(self) -> None:
     """Validates if all ids in the tree are unique.
@@ -3400,8 +4584,7 @@ class BehaviorTree:
         tree_object_str += ' [<unknown-id>]'
       return tree_object_str
 
-    id_recorder = IdRecorder()
-    self.visit(id_recorder)
+    id_recorder = self._node_index(require_nodes=True).id_recorder
 
     violations = []
     for tree, node_id_to_nodes in id_recorder.tree_to_node_id_to_nodes.items():
@@ -3500,7 +4683,7 @@ class BehaviorTree:
         return_value_message_full_name=return_full_name
     )
     rd.descriptor_fileset.CopyFrom(return_descriptor_set)
-    self._description = skills_pb2.Skill(id=skill_id)
+    self._assign('_description', skills_pb2.Skill(id=skill_id))
     self._description.parameter_description.CopyFrom(pd)
     self._description.return_value_description.CopyFrom(rd)
     self._description.display_name = display_name
@@ -3556,7 +4739,7 @@ class BehaviorTree:
       )
       rd.descriptor_fileset.CopyFrom(return_value_file_descriptor_set)
 
-    self._description = skills_pb2.Skill(id=skill_id)
+    self._assign('_description', skills_pb2.Skill(id=skill_id))
     self._description.parameter_description.CopyFrom(pd)
     if rd:
       self._description.return_value_description.CopyFrom(rd)
@@ -3579,23 +4762,88 @@ class BehaviorTree:
         None,
     )
 
-  def dot_graph(self) -> graphviz.Digraph:
+  def dot_graph(
+      self,
+      *,
+      max_depth: Optional[int] = None,
+      max_nodes: Optional[int] = None,
+      node_states: Optional[
+          Mapping[NodeIdentifierType, behavior_tree_pb2.BehaviorTree.Node.State]
+      ] = None,
+  ) -> graphviz.Digraph:
     """Converts the given behavior tree into a graphviz dot representation.
 
+    Args:
+      max_depth: Maximum number of levels below the root node to show. The
+        children of deeper nodes are elided.
+      max_nodes: Maximum number of nodes to show, in breadth-first order.
+        Further nodes are elided.
+      node_states: States of the nodes by tree id and node id, e.g., from
+        node_states_from_proto. The nodes are filled with a color per state.
+
     Returns:
       An instance of graphviz.Digraph, which is a tree-shaped directed graph.
     """
-    dot_graph = graphviz.Digraph()
-    dot_graph.name = self.name
-    dot_graph.graph_attr = {'label': self.name if self.name else '<unnamed>'}
-    dot_graph.graph_attr.update(_SUBTREE_DOT_ATTRIBUTES)
-    if self.root is not None:
-      subtree_dot_graph, _ = self.root.dot_graph()
-      dot_graph.subgraph(subtree_dot_graph)
+    dot_graph, _ = self._dot_graph(
+        max_depth, max_nodes, node_states, fill_in_source=True
+    )
     return dot_graph
 
-  def show(self) -> None:
-    return ipython.display_if_ipython(self.dot_graph())
+  def _dot_graph(
+      self,
+      max_depth: Optional[int],
+      max_nodes: Optional[int],
+      node_states: Optional[
+          Mapping[NodeIdentifierType, behavior_tree_pb2.BehaviorTree.Node.State]
+      ],
+      fill_in_source: bool,
+  ) -> Tuple[graphviz.Digraph, Mapping[str, str]]:
+    """Returns the dot graph of the tree and the fill colors of its nodes."""
+    writer = _DotWriter(max_depth, max_nodes, node_states, fill_in_source)
+    graph_attr = {'label': self.name if self.name else '<unnamed>'}
+    graph_attr.update(_SUBTREE_DOT_ATTRIBUTES)
+    if self.root is not None:
+      opening, closing = writer.subgraph_lines(
+          *writer.head(self.root, ''), '\t'
+      )
+      writer.lines.extend(opening)
+      writer.write(self.root, '', self.tree_id, '\t\t')
+      writer.lines.append(closing)
+    dot_graph = graphviz.Digraph(
+        name=self.name, graph_attr=graph_attr, body=writer.lines
+    )
+    return dot_graph, writer.fill_colors
+
+  def show(
+      self,
+      *,
+      max_depth: Optional[int] = None,
+      max_nodes: Optional[int] = None,
+      node_states: Optional[
+          Mapping[NodeIdentifierType, behavior_tree_pb2.BehaviorTree.Node.State]
+      ] = None,
+      display_id: Optional[str] = None,
+  ) -> None:
+    """Shows the tree, see dot_graph.
+
+    The tree is rendered as SVG. Renderings are cached, so that showing an
+    unchanged tree again, also with different node states, does not lay out
+    the graph again.
+
+    Args:
+      max_depth: See dot_graph.
+      max_nodes: See dot_graph.
+      node_states: See dot_graph.
+      display_id: If given, replaces the output which has previously been shown
+        with the same display_id, e.g., to update the node states of a running
+        tree in place.
+    """
+    dot_graph, fill_colors = self._dot_graph(
+        max_depth, max_nodes, node_states, fill_in_source=False
+    )
+    return ipython.display_if_ipython(
+        _DotGraphSvg(dot_graph, fill_colors), display_id=display_id
+    )
 
 
 def _merge_file_descriptor_set(
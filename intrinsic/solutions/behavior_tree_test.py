@@ -16,6 +16,7 @@ from intrinsic.executive.proto import world_query_pb2
 from intrinsic.solutions import behavior_tree as bt
 from intrinsic.solutions import blackboard_value
 from intrinsic.solutions import errors as solutions_errors
+from intrinsic.solutions import ipython
 from intrinsic.solutions.internal import behavior_call
 from intrinsic.solutions.testing import compare
 from intrinsic.world.proto import object_world_refs_pb2
@@ -3660,5 +3661,798 @@ class DecoratorsTest(absltest.TestCase):
     )
 
 
+class ProtoCachingTest(absltest.TestCase):
+  """Tests the reuse of protos of unmodified parts of a tree."""
+
+  def _create_tree(self) -> bt.BehaviorTree:
+    return bt.BehaviorTree(
+        name='tree',
+        root=bt.Sequence(
+            name='root',
+            children=[
+                bt.Fail(name='fail'),
+                bt.SubTree(
+                    name='subtree',
+                    behavior_tree=bt.Selector(
+                        children=[bt.Debug(name='debug'), bt.Fail()]
+                    ),
+                ),
+                bt.Branch(
+                    if_condition=bt.Not(bt.Blackboard('foo')),
+                    then_child=bt.Fail(),
+                ),
+            ],
+        ),
+    )
+
+  def _create_converted_tree(self) -> bt.BehaviorTree:
+    tree = self._create_tree()
+    # Protos are only cached from the second conversion on.
+    tree.proto  # pylint: disable=pointless-statement
+    tree.proto  # pylint: disable=pointless-statement
+    return tree
+
+  def test_proto_of_unmodified_tree_is_reused(self):
+    tree = self._create_converted_tree()
+    expected_proto = tree.proto
+
+    with mock.patch.object(
+        bt.Fail, '_write_proto', autospec=True, side_effect=bt.Fail._write_proto
+    ) as write_fail:
+      compare.assertProto2Equal(self, tree.proto, expected_proto)
+      write_fail.assert_not_called()
+
+  def test_returned_proto_is_a_copy(self):
+    tree = self._create_tree()
+    expected_proto = tree.proto
+
+    tree.proto.root.name = 'changed'
+    modified_proto = tree.proto
+    modified_proto.root.sequence.children.add()
+
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+  def test_modifications_are_reflected(self):
+    tree = self._create_tree()
+    expected_proto = tree.proto
+    sequence = cast(bt.Sequence, tree.root)
+    subtree = cast(bt.SubTree, sequence.children[1])
+    branch = cast(bt.Branch, sequence.children[2])
+
+    subtree.behavior_tree.root.children[0].name = 'renamed'
+    expected_proto.root.sequence.children[
+        1
+    ].sub_tree.tree.root.selector.children[0].name = 'renamed'
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+    sequence.children.append(bt.Fail(failure_message='appended'))
+    expected_proto.root.sequence.children.add().fail.failure_message = (
+        'appended'
+    )
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+    del sequence.children[0]
+    del expected_proto.root.sequence.children[0]
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+    cast(bt.Not, branch.if_condition).condition.cel_expression = 'bar'
+    getattr(
+        getattr(expected_proto.root.sequence.children[1].branch, 'if'), 'not'
+    ).blackboard.cel_expression = 'bar'
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+    branch.set_decorators(_create_test_decorator('baz'))
+    branch.decorators.breakpoint_type = bt.BreakpointType.BEFORE
+    decorators = expected_proto.root.sequence.children[1].decorators
+    decorators.condition.blackboard.cel_expression = 'baz'
+    decorators.breakpoint = behavior_tree_pb2.BehaviorTree.Breakpoint.BEFORE
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+  def test_only_modified_parts_are_rewritten(self):
+    tree = self._create_converted_tree()
+    sequence = cast(bt.Sequence, tree.root)
+
+    with mock.patch.object(
+        bt.Debug,
+        '_write_proto',
+        autospec=True,
+        side_effect=bt.Debug._write_proto,
+    ) as write_debug:
+      sequence.children[0].name = 'renamed'
+      self.assertEqual(tree.proto.root.sequence.children[0].name, 'renamed')
+      write_debug.assert_not_called()
+
+      sequence.children[1].behavior_tree.root.children[1].name = 'renamed'
+      tree.proto  # pylint: disable=pointless-statement
+      write_debug.assert_called_once()
+
+  def test_modifications_after_first_conversion_are_reflected(self):
+    tree = self._create_tree()
+    tree.proto  # pylint: disable=pointless-statement
+
+    tree.root.children[0].name = 'renamed'
+    tree.root.children.append(bt.Fail(name='appended'))
+
+    children = tree.proto.root.sequence.children
+    self.assertEqual(children[0].name, 'renamed')
+    self.assertEqual(children[3].name, 'appended')
+
+  def test_in_place_modifications_of_data_inputs_are_reflected(self):
+    world_query = bt.WorldQuery().select(
+        children_of=object_world_refs_pb2.ObjectReference(id='root')
+    )
+    message = test_message_pb2.TestMessage(int32_value=1)
+    tree = bt.BehaviorTree(
+        root=bt.Sequence(
+            children=[
+                bt.Data(blackboard_key='query', world_query=world_query),
+                bt.Data(blackboard_key='message', proto=message),
+            ]
+        )
+    )
+    tree.proto  # pylint: disable=pointless-statement
+    tree.proto  # pylint: disable=pointless-statement
+
+    world_query.filter(name_regex='foo')
+    message.int32_value = 2
+
+    children = tree.proto.root.sequence.children
+    query_proto = world_query_pb2.WorldQuery()
+    children[0].data.create_or_update.from_world.proto.Unpack(query_proto)
+    self.assertEqual(query_proto.filter.name_regex, 'foo')
+    message_proto = test_message_pb2.TestMessage()
+    children[1].data.create_or_update.proto.Unpack(message_proto)
+    self.assertEqual(message_proto.int32_value, 2)
+
+  def test_subclass_overriding_proto(self):
+
+    class NamedFail(bt.Fail):
+
+      def __init__(self, suffix: str):
+        super().__init__(name='fail')
+        self.suffix = suffix
+
+      @property
+      def proto(self) -> behavior_tree_pb2.BehaviorTree.Node:
+        proto = super().proto
+        proto.name += self.suffix
+        return proto
+
+    node = NamedFail('_a')
+    tree = bt.BehaviorTree(root=bt.Sequence(children=[node]))
+    self.assertEqual(tree.proto.root.sequence.children[0].name, 'fail_a')
+    self.assertEqual(tree.proto.root.sequence.children[0].name, 'fail_a')
+
+    node.suffix = '_b'
+
+    self.assertEqual(tree.proto.root.sequence.children[0].name, 'fail_b')
+
+  def test_node_shared_by_trees(self):
+    fail = bt.Fail(name='shared')
+    tree_a = bt.BehaviorTree(name='a', root=bt.Sequence(children=[fail]))
+    tree_b = bt.BehaviorTree(name='b', root=bt.Selector(children=[fail]))
+    self.assertEqual(tree_a.proto.root.sequence.children[0].name, 'shared')
+    self.assertEqual(tree_b.proto.root.selector.children[0].name, 'shared')
+
+    fail.name = 'renamed'
+
+    self.assertEqual(tree_a.proto.root.sequence.children[0].name, 'renamed')
+    self.assertEqual(tree_b.proto.root.selector.children[0].name, 'renamed')
+
+  def test_removed_node_does_not_modify_tree(self):
+    fail = bt.Fail(name='removed')
+    sequence = bt.Sequence(children=[fail])
+    sequence.proto  # pylint: disable=pointless-statement
+
+    sequence.children = []
+    fail.name = 'renamed'
+
+    compare.assertProto2Equal(
+        self, sequence.proto, behavior_tree_pb2.BehaviorTree.Node(sequence={})
+    )
+    self.assertEqual(fail.proto.name, 'renamed')
+
+  def test_mark_modified(self):
+    proto = test_message_pb2.TestMessage(int32_value=1)
+    node = bt.Data(blackboard_key='foo', proto=proto)
+    self.assertTrue(node.proto.data.create_or_update.proto.Is(proto.DESCRIPTOR))
+
+    proto.int32_value = 2
+    node.mark_modified()
+
+    unpacked_proto = test_message_pb2.TestMessage()
+    node.proto.data.create_or_update.proto.Unpack(unpacked_proto)
+    self.assertEqual(unpacked_proto.int32_value, 2)
+
+  def test_deepcopy(self):
+    tree = self._create_tree()
+    expected_proto = tree.proto
+
+    tree_copy = copy.deepcopy(tree)
+    tree_copy.root.children[0].name = 'renamed'
+
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+    self.assertEqual(tree_copy.proto.root.sequence.children[0].name, 'renamed')
+
+  def test_deep_tree(self):
+    depth = 200
+    root = bt.Fail(name='leaf')
+    for _ in range(depth):
+      root = bt.Sequence(children=[root])
+    tree = bt.BehaviorTree(name='deep', root=root)
+
+    node_proto = tree.proto.root
+    for _ in range(depth):
+      self.assertLen(node_proto.sequence.children, 1)
+      node_proto = node_proto.sequence.children[0]
+    self.assertEqual(node_proto.name, 'leaf')
+
+
+class LazyLoadingTest(absltest.TestCase):
+  """Tests behavior trees which are created lazily from a proto."""
+
+  def _create_tree_proto(self) -> behavior_tree_pb2.BehaviorTree:
+    def fail(name: str, node_id: int) -> bt.Node:
+      node = bt.Fail(name=name)
+      node.node_id = node_id
+      return node
+
+    subtree = bt.BehaviorTree(name='subtree', root=fail('target', 3))
+    subtree.tree_id = 'subtree_id'
+    condition_tree = bt.BehaviorTree(name='condition', root=fail('target', 4))
+    condition_tree.tree_id = 'condition_id'
+    tree = bt.BehaviorTree(
+        name='tree',
+        root=bt.Sequence(
+            name='root',
+            children=[
+                fail('target', 1).set_decorators(
+                    bt.Decorators(
+                        condition=bt.AllOf(
+                            [bt.SubTreeCondition(condition_tree)]
+                        )
+                    )
+                ),
+                bt.SubTree(behavior_tree=subtree, name='subtree_node'),
+                bt.Retry(
+                    child=fail('retry_child', 5), recovery=fail('target', 6)
+                ),
+                bt.Loop(
+                    while_condition=bt.Not(bt.Blackboard('loop')),
+                    do_child=bt.Parallel(children=[fail('target', 7)]),
+                ),
+                bt.Branch(
+                    if_condition=bt.Blackboard('branch'),
+                    then_child=bt.Selector(children=[fail('target', 8)]),
+                    else_child=bt.Fallback(children=[bt.Fail(name='target')]),
+                ),
+                bt.Data(name='data', blackboard_key='key', cel_expression='1'),
+                bt.Debug(name='debug'),
+            ],
+        ),
+    )
+    tree.tree_id = 'tree_id'
+    return tree.proto
+
+  def test_proto_is_unchanged(self):
+    tree_proto = self._create_tree_proto()
+
+    with mock.patch.object(
+        bt.Node, '_load_from_proto', wraps=bt.Node._load_from_proto
+    ) as load_node:
+      tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+      compare.assertProto2Equal(self, tree.proto, tree_proto)
+      load_node.assert_not_called()
+
+  def test_lazy_tree_matches_eager_tree(self):
+    tree_proto = self._create_tree_proto()
+
+    lazy_tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+    eager_tree = bt.BehaviorTree.create_from_proto(tree_proto)
+
+    self.assertEqual(repr(lazy_tree), repr(eager_tree))
+    self.assertIsInstance(lazy_tree.root.children[1], bt.SubTree)
+    self.assertEqual(lazy_tree.root.children[1].behavior_tree.name, 'subtree')
+
+  def test_nodes_are_created_on_first_access(self):
+    tree_proto = self._create_tree_proto()
+    tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+
+    with mock.patch.object(
+        bt.Node, '_load_from_proto', wraps=bt.Node._load_from_proto
+    ) as load_node:
+      self.assertEqual(tree.root.children[6].name, 'debug')
+      # The root node and the accessed child.
+      self.assertEqual(load_node.call_count, 2)
+
+  def test_modifications_are_reflected(self):
+    tree_proto = self._create_tree_proto()
+    tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+
+    tree.root.children[2].child.name = 'renamed'
+    tree.root.children.append(bt.Fail(name='appended'))
+
+    expected_proto = behavior_tree_pb2.BehaviorTree()
+    expected_proto.CopyFrom(tree_proto)
+    expected_proto.root.sequence.children[2].retry.child.name = 'renamed'
+    expected_proto.root.sequence.children.add(name='appended', fail={})
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+  def test_in_place_modifications_of_data_inputs_are_reflected(self):
+    tree_proto = bt.BehaviorTree(
+        root=bt.Data(
+            blackboard_key='query',
+            world_query=bt.WorldQuery().select(
+                children_of=object_world_refs_pb2.ObjectReference(id='root')
+            ),
+        )
+    ).proto
+    tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+
+    tree.root.world_query.filter(name_regex='foo')
+
+    query_proto = world_query_pb2.WorldQuery()
+    tree.proto.root.data.create_or_update.from_world.proto.Unpack(query_proto)
+    self.assertEqual(query_proto.filter.name_regex, 'foo')
+
+  def test_lazy_tree_does_not_reference_given_proto(self):
+    tree_proto = self._create_tree_proto()
+    expected_proto = behavior_tree_pb2.BehaviorTree()
+    expected_proto.CopyFrom(tree_proto)
+
+    tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+    tree_proto.root.name = 'changed'
+
+    compare.assertProto2Equal(self, tree.proto, expected_proto)
+
+  def test_find_tree_and_node_ids_does_not_load_tree(self):
+    tree_proto = self._create_tree_proto()
+    eager_tree = bt.BehaviorTree.create_from_proto(tree_proto)
+    lazy_tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+
+    with mock.patch.object(
+        bt.Node, '_load_from_proto', wraps=bt.Node._load_from_proto
+    ) as load_node:
+      node_ids = lazy_tree.find_tree_and_node_ids('target')
+      load_node.assert_not_called()
+
+    self.assertEqual(node_ids, eager_tree.find_tree_and_node_ids('target'))
+    self.assertEqual(
+        node_ids,
+        [
+            bt.NodeIdentifierType('condition_id', 4),
+            bt.NodeIdentifierType('tree_id', 1),
+            bt.NodeIdentifierType('subtree_id', 3),
+            bt.NodeIdentifierType('tree_id', 6),
+            bt.NodeIdentifierType('tree_id', 7),
+            bt.NodeIdentifierType('tree_id', 8),
+            bt.NodeIdentifierType('tree_id', None),
+        ],
+    )
+    self.assertEqual(
+        lazy_tree.find_tree_and_node_id('retry_child'),
+        bt.NodeIdentifierType('tree_id', 5),
+    )
+
+  def test_deepcopy(self):
+    tree_proto = self._create_tree_proto()
+    tree = bt.BehaviorTree.create_from_proto(tree_proto, lazy=True)
+
+    tree_copy = copy.deepcopy(tree)
+    tree_copy.root.name = 'renamed'
+
+    compare.assertProto2Equal(self, tree.proto, tree_proto)
+    self.assertEqual(tree_copy.proto.root.name, 'renamed')
+
+  def test_invalid_node_type(self):
+    tree_proto = behavior_tree_pb2.BehaviorTree(
+        root=behavior_tree_pb2.BehaviorTree.Node()
+    )
+
+    with self.assertRaises(TypeError):
+      bt.BehaviorTree.create_from_proto(tree_proto, lazy=True).root  # pylint: disable=expression-not-assigned
+
+
+class NodeIndexTest(absltest.TestCase):
+  """Tests the index of the nodes of behavior trees."""
+
+  def _create_tree(self) -> bt.BehaviorTree:
+    first = bt.Fail(name='first')
+    first.node_id = 1
+    second = bt.Fail(name='second')
+    second.node_id = 2
+    tree = bt.BehaviorTree(
+        name='tree', root=bt.Sequence(children=[first, second])
+    )
+    tree.tree_id = 'tree_id'
+    return tree
+
+  def test_index_is_reused(self):
+    tree = self._create_tree()
+    self.assertEqual(
+        tree.find_tree_and_node_ids('first'),
+        [bt.NodeIdentifierType(tree_id='tree_id', node_id=1)],
+    )
+
+    with mock.patch.object(bt.BehaviorTree, 'visit', wraps=tree.visit) as visit:
+      tree.find_tree_and_node_ids('second')
+      tree.find_many(['first', 'second'])
+      tree.validate_id_uniqueness()
+      visit.assert_not_called()
+
+  def test_breakpoints_do_not_invalidate_index(self):
+    tree = self._create_tree()
+    tree.root.children[0].set_breakpoint(bt.BreakpointType.BEFORE)
+    tree.find_tree_and_node_ids('first')
+
+    with mock.patch.object(bt.BehaviorTree, 'visit', wraps=tree.visit) as visit:
+      tree.root.children[0].set_breakpoint(bt.BreakpointType.AFTER)
+      tree.root.children[0].set_breakpoint(None)
+      tree.find_tree_and_node_ids('first')
+      visit.assert_not_called()
+
+  def test_index_reflects_modifications(self):
+    tree = self._create_tree()
+    self.assertLen(tree.find_tree_and_node_ids('first'), 1)
+
+    tree.root.children[0].name = 'renamed'
+    self.assertEmpty(tree.find_tree_and_node_ids('first'))
+    self.assertLen(tree.find_tree_and_node_ids('renamed'), 1)
+
+    tree.root.children[1].node_id = 3
+    self.assertEqual(
+        tree.find_tree_and_node_ids('second'),
+        [bt.NodeIdentifierType(tree_id='tree_id', node_id=3)],
+    )
+
+    tree.root.children.append(bt.Fail(name='second'))
+    self.assertLen(tree.find_tree_and_node_ids('second'), 2)
+
+    tree.root.children.pop(0)
+    self.assertEmpty(tree.find_tree_and_node_ids('renamed'))
+
+    tree.tree_id = 'other_id'
+    self.assertEqual(
+        tree.find_tree_and_node_ids('second')[0],
+        bt.NodeIdentifierType(tree_id='other_id', node_id=3),
+    )
+
+  def test_index_reflects_modifications_of_nested_trees(self):
+    subtree = bt.BehaviorTree(name='subtree', root=bt.Fail(name='nested'))
+    tree = bt.BehaviorTree(
+        name='tree',
+        root=bt.Sequence(children=[bt.SubTree(behavior_tree=subtree)]),
+    )
+    self.assertLen(tree.find_tree_and_node_ids('nested'), 1)
+
+    subtree.root.name = 'renamed'
+    self.assertEmpty(tree.find_tree_and_node_ids('nested'))
+    self.assertLen(tree.find_tree_and_node_ids('renamed'), 1)
+
+  def test_find_many(self):
+    tree = self._create_tree()
+
+    self.assertEqual(
+        tree.find_many(['second', 'unknown', 'first']),
+        {
+            'second': [bt.NodeIdentifierType(tree_id='tree_id', node_id=2)],
+            'unknown': [],
+            'first': [bt.NodeIdentifierType(tree_id='tree_id', node_id=1)],
+        },
+    )
+
+  def test_find_many_on_lazy_tree(self):
+    tree = bt.BehaviorTree.create_from_proto(
+        self._create_tree().proto, lazy=True
+    )
+
+    with mock.patch.object(
+        bt.Node, '_load_from_proto', wraps=bt.Node._load_from_proto
+    ) as load_node:
+      self.assertEqual(
+          tree.find_many(['first', 'second']),
+          {
+              'first': [bt.NodeIdentifierType(tree_id='tree_id', node_id=1)],
+              'second': [bt.NodeIdentifierType(tree_id='tree_id', node_id=2)],
+          },
+      )
+      load_node.assert_not_called()
+
+    tree.root.children[0].name = 'renamed'
+    self.assertEmpty(tree.find_tree_and_node_ids('first'))
+    self.assertLen(tree.find_tree_and_node_ids('renamed'), 1)
+
+  def test_validate_id_uniqueness_reflects_modifications(self):
+    tree = self._create_tree()
+    tree.validate_id_uniqueness()
+
+    tree.root.children[1].node_id = 1
+    with self.assertRaises(solutions_errors.InvalidArgumentError):
+      tree.validate_id_uniqueness()
+
+
+class NodeIdAllocatorTest(absltest.TestCase):
+  """Tests allocation of unique node ids."""
+
+  def test_allocate_skips_ids_in_use(self):
+    node = bt.Fail(name='used')
+    node.node_id = 2
+    tree = bt.BehaviorTree(root=bt.Sequence(children=[node]))
+
+    allocator = bt.NodeIdAllocator(tree)
+
+    self.assertEqual(
+        [allocator.allocate() for _ in range(3)],
+        [1, 3, 4],
+    )
+
+  def test_reserve(self):
+    allocator = bt.NodeIdAllocator(bt.BehaviorTree(root=bt.Fail()))
+    allocator.reserve(1)
+
+    with self.assertRaises(solutions_errors.InvalidArgumentError):
+      allocator.reserve(1)
+    self.assertEqual(allocator.allocate(), 2)
+
+  def test_generate_and_set_unique_id_with_allocator(self):
+    tree = bt.BehaviorTree(root=bt.Sequence(children=[bt.Fail()]))
+    allocator = bt.NodeIdAllocator(tree)
+
+    self.assertEqual(tree.root.generate_and_set_unique_id(allocator), 1)
+    self.assertEqual(
+        tree.root.children[0].generate_and_set_unique_id(allocator), 2
+    )
+    self.assertEqual(tree.root.node_id, 1)
+    tree.validate_id_uniqueness()
+
+  def test_graft(self):
+    tree = bt.BehaviorTree(root=bt.Sequence())
+    tree.root.node_id = 1
+    allocator = bt.NodeIdAllocator(tree)
+    branch = bt.Sequence(children=[bt.Fail(name='a'), bt.Fail(name='b')])
+    branch.children[1].node_id = 2
+
+    allocator.graft(branch)
+    tree.root.children.append(branch)
+
+    self.assertEqual(branch.node_id, 3)
+    self.assertEqual(branch.children[0].node_id, 4)
+    self.assertEqual(branch.children[1].node_id, 2)
+    tree.validate_id_uniqueness()
+
+  def test_graft_detects_conflicts(self):
+    tree = bt.BehaviorTree(root=bt.Sequence())
+    tree.root.node_id = 1
+    allocator = bt.NodeIdAllocator(tree)
+    branch = bt.Sequence(children=[bt.Fail(name='a'), bt.Fail(name='b')])
+    branch.children[0].node_id = 1
+    branch.children[1].node_id = 2
+
+    with self.assertRaisesRegex(
+        solutions_errors.InvalidArgumentError, r'Fail\(name="a".*node_id="1"'
+    ):
+      allocator.graft(branch)
+    self.assertIsNone(branch.node_id)
+    self.assertEqual(branch.children[0].node_id, 1)
+
+    allocator.graft(branch, reassign_conflicting_ids=True)
+    self.assertEqual(branch.children[0].node_id, 3)
+    self.assertEqual(branch.children[1].node_id, 2)
+    self.assertEqual(branch.node_id, 4)
+
+  def test_graft_detects_conflicts_within_subtree(self):
+    allocator = bt.NodeIdAllocator(bt.BehaviorTree(root=bt.Fail()))
+    branch = bt.Sequence(children=[bt.Fail(name='a'), bt.Fail(name='b')])
+    branch.children[0].node_id = 5
+    branch.children[1].node_id = 5
+
+    with self.assertRaises(solutions_errors.InvalidArgumentError):
+      allocator.graft(branch)
+
+  def test_graft_ignores_nested_trees(self):
+    tree = bt.BehaviorTree(root=bt.Sequence())
+    tree.root.node_id = 1
+    allocator = bt.NodeIdAllocator(tree)
+    nested_root = bt.Fail()
+    nested_root.node_id = 1
+    subtree_node = bt.SubTree(
+        behavior_tree=bt.BehaviorTree(root=nested_root), name='subtree'
+    )
+
+    allocator.graft(subtree_node)
+
+    self.assertEqual(subtree_node.node_id, 2)
+    self.assertEqual(nested_root.node_id, 1)
+
+  def test_generate_and_set_unique_node_ids(self):
+    nested_tree = bt.BehaviorTree(
+        root=bt.Sequence(children=[bt.Fail(), bt.Fail()])
+    )
+    existing = bt.Fail()
+    existing.node_id = 2
+    shared = bt.Fail()
+    tree = bt.BehaviorTree(
+        root=bt.Sequence(
+            children=[
+                existing,
+                bt.SubTree(behavior_tree=nested_tree, name='subtree'),
+                shared,
+                shared,
+            ]
+        )
+    )
+
+    tree.generate_and_set_unique_node_ids()
+
+    self.assertEqual(tree.root.node_id, 1)
+    self.assertEqual(existing.node_id, 2)
+    self.assertEqual(tree.root.children[1].node_id, 3)
+    self.assertEqual(shared.node_id, 4)
+    self.assertEqual(
+        [nested_tree.root.node_id]
+        + [child.node_id for child in nested_tree.root.children],
+        [1, 2, 3],
+    )
+
+  def test_generate_and_set_unique_node_ids_for_large_tree(self):
+    tree = bt.BehaviorTree(
+        root=bt.Sequence(
+            children=[bt.Sequence(children=[bt.Fail()]) for _ in range(5000)]
+        )
+    )
+
+    tree.generate_and_set_unique_node_ids()
+
+    self.assertEqual(tree.root.children[-1].children[0].node_id, 10001)
+    tree.validate_id_uniqueness()
+
+
+class DotGraphTest(absltest.TestCase):
+  """Tests dot graphs of large behavior trees."""
+
+  _SVG = """<svg>
+<g id="graph0" class="graph">
+<g id="node1" class="node">
+<title>sequence</title>
+<polygon fill="none" stroke="black" points="0,0"/>
+</g>
+<g id="node2" class="node">
+<title>fail_0</title>
+<polygon fill="none" stroke="black" points="0,0"/>
+</g>
+</g>
+</svg>"""
+
+  def _create_tree(self) -> bt.BehaviorTree:
+    tree = bt.BehaviorTree(
+        name='tree',
+        root=bt.Sequence(
+            children=[bt.Sequence(children=[bt.Fail(), bt.Fail()]), bt.Fail()]
+        ),
+    )
+    tree.tree_id = 'tree_id'
+    tree.generate_and_set_unique_node_ids()
+    return tree
+
+  def test_max_depth_elides_children(self):
+    tree = self._create_tree()
+
+    source = tree.dot_graph(max_depth=1).source
+
+    self.assertIn('sequence_0 [label=sequence shape=cds]', source)
+    self.assertIn('fail_1 [label=fail shape=box]', source)
+    self.assertNotIn('fail_0_0', source)
+    self.assertIn(
+        'sequence_0_elided [label="2 more nodes" shape=plaintext]', source
+    )
+    self.assertIn('sequence_0 -> sequence_0_elided [style=dashed]', source)
+
+  def test_max_nodes_elides_nodes_in_breadth_first_order(self):
+    tree = self._create_tree()
+
+    source = tree.dot_graph(max_nodes=2).source
+
+    self.assertIn('sequence_0 [label=sequence shape=cds]', source)
+    self.assertNotIn('fail_1 [', source)
+    self.assertNotIn('fail_0_0 [', source)
+    self.assertIn(
+        'sequence_elided [label="1 more node" shape=plaintext]', source
+    )
+    self.assertIn(
+        'sequence_0_elided [label="2 more nodes" shape=plaintext]', source
+    )
+
+  def test_node_dot_graph_elides_children(self):
+    node, root_name = self._create_tree().root.dot_graph(max_depth=0)
+
+    self.assertEqual(root_name, 'sequence')
+    self.assertIn(
+        'sequence_elided [label="4 more nodes" shape=plaintext]', node.source
+    )
+
+  def test_invalid_limits(self):
+    tree = self._create_tree()
+
+    with self.assertRaises(solutions_errors.InvalidArgumentError):
+      tree.dot_graph(max_depth=-1)
+    with self.assertRaises(solutions_errors.InvalidArgumentError):
+      tree.dot_graph(max_nodes=0)
+
+  def test_node_states(self):
+    tree = self._create_tree()
+    tree_proto = tree.proto
+    tree_proto.root.state = behavior_tree_pb2.BehaviorTree.Node.RUNNING
+    tree_proto.root.sequence.children[1].state = (
+        behavior_tree_pb2.BehaviorTree.Node.FAILED
+    )
+
+    node_states = bt.node_states_from_proto(tree_proto)
+    source = tree.dot_graph(node_states=node_states).source
+
+    self.assertEqual(
+        node_states,
+        {
+            ('tree_id', 1): behavior_tree_pb2.BehaviorTree.Node.RUNNING,
+            ('tree_id', 5): behavior_tree_pb2.BehaviorTree.Node.FAILED,
+        },
+    )
+    self.assertIn(
+        'sequence [label=sequence fillcolor=lightblue shape=cds style=filled]',
+        source,
+    )
+    self.assertIn(
+        'fail_1 [label=fail fillcolor=lightcoral shape=box style=filled]',
+        source,
+    )
+    self.assertIn('fail_0_0 [label=fail shape=box]', source)
+
+  def test_dot_graph_of_deep_tree(self):
+    node = bt.Fail()
+    for _ in range(2000):
+      node = bt.Sequence(children=[node])
+
+    source = bt.BehaviorTree(root=node).dot_graph().source
+
+    self.assertEqual(source.count('[label=sequence shape=cds]'), 2000)
+
+  def test_show_reuses_rendering(self):
+    tree = bt.BehaviorTree(root=bt.Sequence(children=[bt.Fail()]))
+    tree.tree_id = 'tree_id'
+    tree.root.node_id = 1
+    tree.root.children[0].node_id = 2
+
+    with mock.patch.dict(bt._svg_cache, clear=True), mock.patch.object(
+        bt.graphviz.Digraph, 'pipe', return_value=self._SVG
+    ) as pipe, mock.patch.object(ipython, 'display_if_ipython') as display:
+      tree.show(
+          node_states={
+              ('tree_id', 1): behavior_tree_pb2.BehaviorTree.Node.RUNNING
+          },
+          display_id='tree',
+      )
+      tree.show(
+          node_states={
+              ('tree_id', 1): behavior_tree_pb2.BehaviorTree.Node.SUCCEEDED,
+              ('tree_id', 2): behavior_tree_pb2.BehaviorTree.Node.RUNNING,
+          },
+          display_id='tree',
+      )
+      running_svg = display.call_args_list[0].args[0]._repr_svg_()
+      succeeded_svg = display.call_args_list[1].args[0]._repr_svg_()
+
+    pipe.assert_called_once()
+    self.assertEqual(display.call_args_list[1].kwargs, {'display_id': 'tree'})
+    self.assertIn(
+        '<title>sequence</title>\n<polygon fill="lightblue"', running_svg
+    )
+    self.assertIn('<title>fail_0</title>\n<polygon fill="none"', running_svg)
+    self.assertIn(
+        '<title>sequence</title>\n<polygon fill="palegreen"', succeeded_svg
+    )
+    self.assertIn(
+        '<title>fail_0</title>\n<polygon fill="lightblue"', succeeded_svg
+    )
+
+
 if __name__ == '__main__':
   absltest.main()
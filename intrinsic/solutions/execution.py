@@ -18,12 +18,15 @@ my_executive.suspend()
 my_executive.reset()
 """
 
+import asyncio
 import datetime
 import enum
 import time
-from typing import Any, List, Optional, Union, cast
+from typing import Any, Container, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
 
 from google.longrunning import operations_pb2
+from google.protobuf import any_pb2
+from google.protobuf import duration_pb2
 import grpc
 from intrinsic.executive.proto import behavior_tree_pb2
 from intrinsic.executive.proto import blackboard_service_pb2
@@ -43,6 +46,10 @@ from intrinsic.solutions.internal import actions
 from intrinsic.util.grpc import error_handling
 
 _DEFAULT_POLLING_INTERVAL_IN_SECONDS = 0.5
+# Bounds of the time for which WaitOperation is not called after the executive
+# answered it with UNIMPLEMENTED. The time doubles with every such answer.
+_MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS = 1.0
+_MAX_WAIT_OPERATION_BACKOFF_IN_SECONDS = 60.0
 _CSS_SUCCESS_STYLE = (
     "color: #2c8b22; font-family: monospace; font-weight: bold; "
     "padding-left: var(--jp-code-padding);"
@@ -53,6 +60,45 @@ _CSS_INTERRUPTED_STYLE = (
 )
 _PROCESS_TREE_SCOPE = "PROCESS_TREE"
 
+# States that are entered upon processing an action to completion.
+_COMPLETED_STATES = frozenset({
+    behavior_tree_pb2.BehaviorTree.SUSPENDED,
+    behavior_tree_pb2.BehaviorTree.FAILED,
+    behavior_tree_pb2.BehaviorTree.SUCCEEDED,
+})
+
+# States in which an action has not yet been completed.
+_UNCOMPLETED_STATES = frozenset({
+    behavior_tree_pb2.BehaviorTree.ACCEPTED,
+    behavior_tree_pb2.BehaviorTree.RUNNING,
+    behavior_tree_pb2.BehaviorTree.SUSPENDING,
+    behavior_tree_pb2.BehaviorTree.CANCELING,
+})
+
+# States in which a cancellation has finished.
+_CANCELLATION_FINISHED_STATES = frozenset({
+    behavior_tree_pb2.BehaviorTree.CANCELED,
+    behavior_tree_pb2.BehaviorTree.FAILED,
+    behavior_tree_pb2.BehaviorTree.SUCCEEDED,
+})
+
+# States in which a cancellation has not yet finished.
+_CANCELLATION_UNFINISHED_STATES = frozenset({
+    behavior_tree_pb2.BehaviorTree.ACCEPTED,
+    behavior_tree_pb2.BehaviorTree.RUNNING,
+    behavior_tree_pb2.BehaviorTree.SUSPENDING,
+    behavior_tree_pb2.BehaviorTree.SUSPENDED,
+    behavior_tree_pb2.BehaviorTree.CANCELING,
+})
+
+# States in which a suspension has finished.
+_SUSPENSION_FINISHED_STATES = frozenset({
+    behavior_tree_pb2.BehaviorTree.SUSPENDED,
+    behavior_tree_pb2.BehaviorTree.FAILED,
+    behavior_tree_pb2.BehaviorTree.SUCCEEDED,
+    behavior_tree_pb2.BehaviorTree.CANCELED,
+})
+
 BehaviorTreeOrActionType = Union[
     bt.BehaviorTree,
     bt.Node,
@@ -104,6 +150,9 @@ class OperationNotFoundError(Error):
 class Operation:
   """Class representing an active operation in the executive.
 
+  Operations returned by AsyncExecutive are snapshots without a stub, which
+  cannot update themselves. Call AsyncExecutive.operation() to refresh them.
+
   Attributes:
     name: Name of the operation.
     done: Whether the operation has completed or not (independent of outcome).
@@ -112,19 +161,21 @@ class Operation:
       information.
   """
 
-  _stub: executive_service_pb2_grpc.ExecutiveServiceStub
+  _stub: Optional[executive_service_pb2_grpc.ExecutiveServiceStub]
   _operation_proto: operations_pb2.Operation
   _metadata: run_metadata_pb2.RunMetadata
+  _behavior_tree: Optional[bt.BehaviorTree]
 
   def __init__(
       self,
-      stub: executive_service_pb2_grpc.ExecutiveServiceStub,
+      stub: Optional[executive_service_pb2_grpc.ExecutiveServiceStub],
       operation_proto: operations_pb2.Operation,
   ):
     self._stub = stub
     self._operation_proto = operation_proto
     self._metadata = run_metadata_pb2.RunMetadata()
     self._operation_proto.metadata.Unpack(self._metadata)
+    self._behavior_tree = None
 
   @property
   def name(self) -> str:
@@ -144,7 +195,17 @@ class Operation:
 
   @error_handling.retry_on_grpc_unavailable
   def update(self) -> None:
-    """Update the operation by querying the executive."""
+    """Update the operation by querying the executive.
+
+    Raises:
+      solutions_errors.FailedPreconditionError: If the operation is a snapshot
+        returned by AsyncExecutive.
+    """
+    if self._stub is None:
+      raise solutions_errors.FailedPreconditionError(
+          "This operation is a snapshot returned by AsyncExecutive, call"
+          " AsyncExecutive.operation() to get an updated one."
+      )
     self.update_from_proto(
         self._stub.GetOperation(
             operations_pb2.GetOperationRequest(
@@ -169,10 +230,7 @@ class Operation:
       solution_errors.InvalidArgumentError if there is more than one matching
         node or if the node or its tree do not have an id defined.
     """
-    if not self.metadata.HasField("behavior_tree"):
-      raise solutions_errors.NotFoundError("No behavior tree in operation.")
-    tree = bt.BehaviorTree.create_from_proto(self.metadata.behavior_tree)
-    return tree.find_tree_and_node_id(node_name)
+    return self._get_behavior_tree().find_tree_and_node_id(node_name)
 
   def find_tree_and_node_ids(
       self, node_name: str
@@ -188,15 +246,67 @@ class Operation:
       node. The list contains information about all matching nodes, even if the
       nodes do not have a node or tree id. In that case the values are None.
     """
-    if not self.metadata.HasField("behavior_tree"):
-      raise solutions_errors.NotFoundError("No behavior tree in operation.")
-    tree = bt.BehaviorTree.create_from_proto(self.metadata.behavior_tree)
-    return tree.find_tree_and_node_ids(node_name)
+    return self._get_behavior_tree().find_tree_and_node_ids(node_name)
+
+  def find_many(
+      self, node_names: Iterable[str]
+  ) -> dict[str, list[bt.NodeIdentifierType]]:
+    """Searches the tree in this Operation for all nodes with the given names.
+
+    Args:
+      node_names: Names of the nodes to search for in the tree.
+
+    Returns:
+      A dict which maps each of the given names to the NodeIdentifierTypes of
+      all nodes with that name, see find_tree_and_node_ids.
+
+    Raises:
+      solution_errors.NotFoundError if there is not behavior_tree.
+    """
+    return self._get_behavior_tree().find_many(node_names)
+
+  def show(
+      self, *, max_depth: Optional[int] = None, max_nodes: Optional[int] = None
+  ) -> None:
+    """Shows the tree in this Operation with the states of its nodes.
+
+    Showing the Operation again, e.g., after it has been updated while it is
+    running, replaces the previous output. As long as the tree is unchanged,
+    the rendered graph is reused and only the colors of the nodes are updated.
+
+    Args:
+      max_depth: See BehaviorTree.dot_graph.
+      max_nodes: See BehaviorTree.dot_graph.
+
+    Raises:
+      solution_errors.NotFoundError if there is not behavior_tree.
+    """
+    self._get_behavior_tree().show(
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+        node_states=bt.node_states_from_proto(self.metadata.behavior_tree),
+        display_id=f"operation_{self.name}",
+    )
 
   def update_from_proto(self, proto: operations_pb2.Operation) -> None:
     """Update information from a proto."""
     self._operation_proto = proto
-    self._operation_proto.metadata.Unpack(self._metadata)
+    metadata = run_metadata_pb2.RunMetadata()
+    self._operation_proto.metadata.Unpack(metadata)
+    # Keep the tree, and thereby its index, as long as it is unchanged.
+    if metadata.behavior_tree != self._metadata.behavior_tree:
+      self._behavior_tree = None
+    self._metadata = metadata
+
+  def _get_behavior_tree(self) -> bt.BehaviorTree:
+    """Returns the tree of this operation, kept until the next update."""
+    if not self.metadata.HasField("behavior_tree"):
+      raise solutions_errors.NotFoundError("No behavior tree in operation.")
+    if self._behavior_tree is None:
+      self._behavior_tree = bt.BehaviorTree.create_from_proto(
+          self.metadata.behavior_tree, lazy=True
+      )
+    return self._behavior_tree
 
 
 class Executive:
@@ -231,6 +341,10 @@ class Executive:
   _simulation: Optional[simulation_mod.Simulation]
   _polling_interval_in_seconds: float
   _operation: Optional[Operation]
+  _wait_operation_backoff_in_seconds: float
+  _wait_operation_retry_time: float
+  _blackboard_cache_ttl_in_seconds: float
+  _blackboard_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, any_pb2.Any]]]
 
   def __init__(
       self,
@@ -239,6 +353,7 @@ class Executive:
       error_loader: error_processing.ErrorsLoader,
       simulation: Optional[simulation_mod.Simulation] = None,
       polling_interval_in_seconds: float = _DEFAULT_POLLING_INTERVAL_IN_SECONDS,
+      blackboard_cache_ttl_in_seconds: float = 0.0,
   ):
     """Constructs a new Executive object.
 
@@ -249,7 +364,13 @@ class Executive:
       error_loader: Can load ErrorReports about executions
       simulation: The workcell simulation module (optional).
       polling_interval_in_seconds: Number of seconds to wait while polling for
-        the operation state in blocking calls such as Executive.suspend().
+        the operation state in blocking calls such as Executive.suspend(). If
+        the executive supports WaitOperation, blocking calls return as soon as
+        the operation is done and only fall back to polling for other states.
+      blackboard_cache_ttl_in_seconds: Number of seconds for which the
+        blackboard values of a finished operation are cached, so that repeated
+        reads do not query the executive. The cache is cleared when this client
+        loads, starts, resumes or resets an operation. 0 disables the cache.
     """
     self._stub = stub
     self._blackboard_stub = blackboard_stub
@@ -257,6 +378,12 @@ class Executive:
     self._simulation = simulation
     self._polling_interval_in_seconds = polling_interval_in_seconds
     self._operation = None
+    self._wait_operation_backoff_in_seconds = (
+        _MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS
+    )
+    self._wait_operation_retry_time = 0.0
+    self._blackboard_cache_ttl_in_seconds = blackboard_cache_ttl_in_seconds
+    self._blackboard_cache = {}
 
   @classmethod
   def connect(
@@ -265,6 +392,7 @@ class Executive:
       error_loader: error_processing.ErrorsLoader,
       simulation: Optional[simulation_mod.Simulation] = None,
       polling_interval_in_seconds: float = _DEFAULT_POLLING_INTERVAL_IN_SECONDS,
+      blackboard_cache_ttl_in_seconds: float = 0.0,
   ) -> "Executive":
     """Connect to a running executive.
 
@@ -274,6 +402,8 @@ class Executive:
       simulation: The workcell simulation module (optional).
       polling_interval_in_seconds: Number of seconds to wait while polling for
         the operation state in blocking calls such as Executive.suspend().
+      blackboard_cache_ttl_in_seconds: Number of seconds for which the
+        blackboard values of a finished operation are cached, see __init__.
 
     Returns:
       A newly created instance of the Executive wrapper class.
@@ -288,6 +418,7 @@ class Executive:
         error_loader,
         simulation,
         polling_interval_in_seconds,
+        blackboard_cache_ttl_in_seconds,
     )
 
   @property
@@ -373,29 +504,12 @@ class Executive:
       solutions_errors.InvalidArgumentError: On executive not in RUNNING state.
       grpc.RpcError: On any other gRPC error.
     """
-    cancellation_finished_states = {
-        behavior_tree_pb2.BehaviorTree.CANCELED,
-        behavior_tree_pb2.BehaviorTree.FAILED,
-        behavior_tree_pb2.BehaviorTree.SUCCEEDED,
-    }
-    cancellation_unfinished_states = {
-        behavior_tree_pb2.BehaviorTree.ACCEPTED,
-        behavior_tree_pb2.BehaviorTree.RUNNING,
-        behavior_tree_pb2.BehaviorTree.SUSPENDING,
-        behavior_tree_pb2.BehaviorTree.SUSPENDED,
-        behavior_tree_pb2.BehaviorTree.CANCELING,
-    }
-
     self._cancel_with_retry()
 
-    state = self.operation.metadata.behavior_tree_state
     if blocking:
-      while state not in cancellation_finished_states:
-        assert (
-            state in cancellation_unfinished_states
-        ), f"Unexpected state: {state}."
-        time.sleep(self._polling_interval_in_seconds)
-        state = self.operation.metadata.behavior_tree_state
+      self._wait_for_state(
+          _CANCELLATION_FINISHED_STATES, _CANCELLATION_UNFINISHED_STATES
+      )
 
   def suspend(self) -> None:
     """Requests to suspend plan execution and blocks until SUSPENDED.
@@ -436,16 +550,7 @@ class Executive:
     if not blocking:
       return
 
-    while True:
-      if self.operation.metadata.behavior_tree_state in [
-          behavior_tree_pb2.BehaviorTree.SUSPENDED,
-          behavior_tree_pb2.BehaviorTree.FAILED,
-          behavior_tree_pb2.BehaviorTree.SUCCEEDED,
-          behavior_tree_pb2.BehaviorTree.CANCELED,
-      ]:
-        break
-
-      time.sleep(self._polling_interval_in_seconds)
+    self._wait_for_state(_SUSPENSION_FINISHED_STATES)
 
   def resume(
       self,
@@ -678,29 +783,7 @@ class Executive:
       solutions_errors.UnavailableError: On executive service not reachable.
       grpc.RpcError: On any other gRPC error.
     """
-    behavior_tree = None
-    if isinstance(behavior_tree_or_action, actions.ActionBase):
-      behavior_tree = bt.BehaviorTree(
-          root=bt.Task(cast(actions.ActionBase, behavior_tree_or_action))
-      )
-    elif isinstance(behavior_tree_or_action, list):
-      action_list = _flatten_list(behavior_tree_or_action)
-      behavior_tree = bt.BehaviorTree(
-          root=bt.Sequence(
-              children=[
-                  bt.Task(cast(actions.ActionBase, a)) for a in action_list
-              ]
-          )
-      )
-    elif isinstance(behavior_tree_or_action, bt.BehaviorTree):
-      behavior_tree = cast(bt.BehaviorTree, behavior_tree_or_action)
-    elif isinstance(behavior_tree_or_action, bt.Node):
-      behavior_tree = bt.BehaviorTree(root=behavior_tree_or_action)
-
-    request = executive_service_pb2.CreateOperationRequest()
-    if behavior_tree is not None:
-      behavior_tree.validate_id_uniqueness()
-      request.behavior_tree.CopyFrom(behavior_tree.proto)
+    request = _create_operation_request(behavior_tree_or_action)
 
     try:
       self._delete_with_retry()
@@ -775,7 +858,9 @@ class Executive:
   def block_until_completed(self, *, silence_outputs: bool = False) -> None:
     """Waits until plan execution has begun and then stops.
 
-    Polls executive state every self._polling_interval_in_seconds.
+    Waits for the operation with the executive's WaitOperation, which returns
+    as soon as the operation is done. Suspension is detected by polling the
+    executive state every self._polling_interval_in_seconds.
 
     Args:
       silence_outputs: If true, do not show success or error outputs of the
@@ -787,31 +872,10 @@ class Executive:
       solutions_errors.UnavailableError: On executive service not reachable.
       grpc.RpcError: On any other gRPC error.
     """
-
-    # States that are entered upon processing an action to completion.
-    completed_states = {
-        behavior_tree_pb2.BehaviorTree.SUSPENDED,
-        behavior_tree_pb2.BehaviorTree.FAILED,
-        behavior_tree_pb2.BehaviorTree.SUCCEEDED,
-    }
-
-    # States in which an action has not yet been completed.
-    uncompleted_states = {
-        behavior_tree_pb2.BehaviorTree.ACCEPTED,
-        behavior_tree_pb2.BehaviorTree.RUNNING,
-        behavior_tree_pb2.BehaviorTree.SUSPENDING,
-        behavior_tree_pb2.BehaviorTree.CANCELING,
-    }
-
-    while True:
-      state = self.operation.metadata.behavior_tree_state
-      if state in completed_states:
-        break
-      assert state in uncompleted_states, f"Unexpected state: {state}"
-      time.sleep(self._polling_interval_in_seconds)
+    operation = self._wait_for_state(_COMPLETED_STATES, _UNCOMPLETED_STATES)
 
     if (
-        self.operation.metadata.behavior_tree_state
+        operation.metadata.behavior_tree_state
         == behavior_tree_pb2.BehaviorTree.FAILED
     ):
       error_msg = (
@@ -825,6 +889,29 @@ class Executive:
         error_msg += f"\n{error_summary.summary}"
       raise ExecutionFailedError(error_msg)
 
+  async def block_until_completed_async(
+      self, *, silence_outputs: bool = False
+  ) -> None:
+    """Asynchronous variant of block_until_completed().
+
+    The blocking calls to the executive run in the event loop's default
+    executor, so other tasks keep running while the plan executes.
+
+    Args:
+      silence_outputs: If true, do not show success or error outputs of the
+        execution in Jupyter.
+
+    Raises:
+      ExecutionFailedError: On unexpected state of the executive during plan
+                execution.
+      solutions_errors.UnavailableError: On executive service not reachable.
+      grpc.RpcError: On any other gRPC error.
+    """
+    await asyncio.get_running_loop().run_in_executor(
+        None,
+        lambda: self.block_until_completed(silence_outputs=silence_outputs),
+    )
+
   def get_errors(
       self,
       print_level: error_processing.PrintLevel = (
@@ -855,15 +942,32 @@ class Executive:
       True if a value has been set
       False otherwise
     """
-    scope = value.scope() if value.scope() is not None else _PROCESS_TREE_SCOPE
-    available_entries = self._list_blackboard_values(scope=scope)
-    return any(
-        filter(
-            lambda x: x.key == value.value_access_path(),
-            available_entries.values,
-        )
+    return value.value_access_path() in self._blackboard_values(
+        _blackboard_scope(value)
     )
 
+  def are_values_available(
+      self, values: Sequence[blackboard_value.BlackboardValue]
+  ) -> List[bool]:
+    """Checks whether several values are available on the blackboard.
+
+    Lists each scope of the blackboard only once.
+
+    Args:
+      values: check availability for these values
+
+    Returns:
+      For each value, whether it has been set.
+    """
+    scopes = {}
+    available = []
+    for value in values:
+      scope = _blackboard_scope(value)
+      if scope not in scopes:
+        scopes[scope] = self._blackboard_values(scope)
+      available.append(value.value_access_path() in scopes[scope])
+    return available
+
   def get_value(self, value: blackboard_value.BlackboardValue) -> Any:
     """Gets the actual data written for the specified value on the blackboard.
 
@@ -878,13 +982,7 @@ class Executive:
       ValueError if the received value is not of the expected type based on the
         return value description of the skill
     """
-    if not value.is_toplevel_value:
-      raise solutions_errors.InvalidArgumentError(
-          f"BlackboardValue with path {value.value_access_path()} is not a"
-          " toplevel value. Requesting sub-fields of a blackboard value is not"
-          " supported. Use the toplevel blackboard value to request its"
-          " contents from the blackboard."
-      )
+    _check_toplevel_value(value)
 
     try:
       any_value = self._get_blackboard_value(
@@ -900,16 +998,46 @@ class Executive:
         ) from e
       raise
 
-    blackboard_message = value.value_type()
+    return _unpack_blackboard_value(any_value, value)
 
-    if blackboard_message.DESCRIPTOR.full_name != any_value.TypeName():
-      raise ValueError(
-          "Received value does not match expected type. Got"
-          f" {any_value.TypeName()} but expected"
-          f" {blackboard_message.DESCRIPTOR.full_name}."
-      )
-    any_value.Unpack(blackboard_message)
-    return blackboard_message
+  def get_values(
+      self, values: Sequence[blackboard_value.BlackboardValue]
+  ) -> List[Any]:
+    """Gets the data written for several values on the blackboard.
+
+    Lists each scope of the blackboard only once instead of requesting every
+    value separately, which makes reading many results of a run much faster
+    than calling get_value() for each of them.
+
+    Args:
+      values: the values to get actual data for
+
+    Returns:
+      The values as read from the blackboard, in the order of `values`.
+
+    Raises:
+      NotFoundError if any of the values has not yet been resolved
+      ValueError if a received value is not of the expected type based on the
+        return value description of the skill
+    """
+    for value in values:
+      _check_toplevel_value(value)
+
+    scopes = {}
+    results = []
+    for value in values:
+      scope = _blackboard_scope(value)
+      if scope not in scopes:
+        scopes[scope] = self._blackboard_values(scope)
+      any_value = scopes[scope].get(value.value_access_path())
+      if any_value is None:
+        raise solutions_errors.NotFoundError(
+            "Could not find blackboard value for key"
+            f" {value.value_access_path()} in scope {value.scope()} in the"
+            " blackboard."
+        )
+      results.append(_unpack_blackboard_value(any_value, value))
+    return results
 
   def await_value(self, value: blackboard_value.BlackboardValue) -> None:
     """Blocks until a key is available on the blackboard.
@@ -917,13 +1045,160 @@ class Executive:
     While the key is available await_value will always return immediately until
     the key is removed. Changes in value are not reflected.
 
+    Between checks of the blackboard, waits for the operation to change for at
+    most self._polling_interval_in_seconds.
+
     Args:
       value: wait for this value to be available on the blackboard
     """
     while not self.is_value_available(value):
-      time.sleep(self._polling_interval_in_seconds)
+      self._wait_for_operation(self._polling_interval_in_seconds)
     return
 
+  async def await_value_async(
+      self, value: blackboard_value.BlackboardValue
+  ) -> None:
+    """Asynchronous variant of await_value().
+
+    Args:
+      value: wait for this value to be available on the blackboard
+    """
+    await asyncio.get_running_loop().run_in_executor(
+        None, self.await_value, value
+    )
+
+  def _blackboard_values(self, scope: str) -> Dict[str, any_pb2.Any]:
+    """Returns the values in a scope of the blackboard, by key.
+
+    Uses the cache for finished operations if it is enabled. Cache hits are
+    answered without any request, since a finished operation does not change
+    until it is restarted, which clears the cache.
+
+    Args:
+      scope: The scope of the blackboard.
+
+    Returns:
+      The values of the scope, by key.
+    """
+    use_cache = self._blackboard_cache_ttl_in_seconds > 0
+    if use_cache and self._operation is not None and self._operation.done:
+      cached = self._blackboard_cache.get((self._operation.name, scope))
+      if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    operation = self.operation
+    response = self._list_blackboard_values(operation.name, scope)
+    values = {entry.key: entry.value for entry in response.values}
+    if use_cache and operation.done:
+      self._blackboard_cache[(operation.name, scope)] = (
+          time.monotonic() + self._blackboard_cache_ttl_in_seconds,
+          values,
+      )
+    return values
+
+  def _wait_for_state(
+      self,
+      states: Container[int],
+      expected_states: Optional[Container[int]] = None,
+  ) -> Operation:
+    """Waits until the behavior tree of the operation is in one of `states`.
+
+    Args:
+      states: The behavior tree states to wait for.
+      expected_states: If given, the states which the behavior tree may pass
+        through while waiting.
+
+    Returns:
+      The operation in one of `states`.
+    """
+    operation = self.operation
+    while True:
+      state = operation.metadata.behavior_tree_state
+      if state in states:
+        return operation
+      if expected_states is not None:
+        assert state in expected_states, f"Unexpected state: {state}"
+      operation = self._wait_for_operation(self._polling_interval_in_seconds)
+
+  def _wait_for_operation(self, timeout: float) -> Operation:
+    """Waits for the operation to be done, for at most `timeout` seconds.
+
+    Uses the executive's WaitOperation, which returns as soon as the operation
+    is done. Other changes, e.g., the operation becoming SUSPENDED, are not
+    pushed by the executive and are only seen after `timeout` seconds.
+
+    Falls back to sleeping for `timeout` seconds if the operation is already
+    done or the executive does not support WaitOperation. In the latter case,
+    WaitOperation is tried again after a backoff time which doubles with every
+    UNIMPLEMENTED answer, so that an executive which is updated (or restarted)
+    in the meantime is used again.
+
+    Args:
+      timeout: The maximum time to wait in seconds.
+
+    Returns:
+      The updated operation.
+    """
+    operation = self._operation
+    if (
+        operation is None
+        or operation.done
+        or time.monotonic() < self._wait_operation_retry_time
+    ):
+      time.sleep(timeout)
+      return self.operation
+
+    previous_state = operation.metadata.behavior_tree_state
+    start = time.monotonic()
+    try:
+      operation.update_from_proto(self._wait_operation(operation.name, timeout))
+    except grpc.RpcError as e:
+      rpc_call = cast(grpc.Call, e)
+      if rpc_call.code() == grpc.StatusCode.UNIMPLEMENTED:
+        self._back_off_wait_operation()
+        time.sleep(timeout)
+      elif rpc_call.code() == grpc.StatusCode.UNAVAILABLE:
+        time.sleep(timeout)
+      elif rpc_call.code() != grpc.StatusCode.NOT_FOUND:
+        raise
+      return self.operation
+    self._wait_operation_backoff_in_seconds = (
+        _MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS
+    )
+
+    # WaitOperation may return before the timeout without any change (it is
+    # best-effort). Wait for the rest of the timeout in that case, so that
+    # callers do not busy-poll the executive.
+    if (
+        not operation.done
+        and operation.metadata.behavior_tree_state == previous_state
+    ):
+      remaining = timeout - (time.monotonic() - start)
+      if remaining > 0:
+        time.sleep(remaining)
+    return operation
+
+  def _back_off_wait_operation(self) -> None:
+    """Skips WaitOperation for the current backoff time and doubles it."""
+    self._wait_operation_retry_time = (
+        time.monotonic() + self._wait_operation_backoff_in_seconds
+    )
+    self._wait_operation_backoff_in_seconds = min(
+        2 * self._wait_operation_backoff_in_seconds,
+        _MAX_WAIT_OPERATION_BACKOFF_IN_SECONDS,
+    )
+
+  def _wait_operation(
+      self, name: str, timeout: float
+  ) -> operations_pb2.Operation:
+    # Not retried: _wait_for_operation() falls back to polling (with retries)
+    # if the executive is unavailable or does not implement WaitOperation.
+    wait_timeout = duration_pb2.Duration()
+    wait_timeout.FromTimedelta(datetime.timedelta(seconds=timeout))
+    return self._stub.WaitOperation(
+        operations_pb2.WaitOperationRequest(name=name, timeout=wait_timeout)
+    )
+
   @error_handling.retry_on_grpc_unavailable
   def _delete_with_retry(self) -> None:
     operation_name = self.operation.name
@@ -931,6 +1206,7 @@ class Executive:
         operations_pb2.DeleteOperationRequest(name=operation_name)
     )
     self._operation = None
+    self._blackboard_cache.clear()
 
   @error_handling.retry_on_grpc_unavailable
   def _start_with_retry(
@@ -944,28 +1220,14 @@ class Executive:
     """Starts the executive and handles errors."""
     if self._operation is None:
       raise RuntimeError("Internal error: expected operation to be loaded.")
-    request = executive_service_pb2.StartOperationRequest(
-        name=self._operation.name
+    self._blackboard_cache.clear()
+    request = _start_operation_request(
+        self._operation.name,
+        step_wise=step_wise,
+        start_node=start_node,
+        simulation_mode=simulation_mode,
+        embed_skill_traces=embed_skill_traces,
     )
-    if simulation_mode is not None:
-      request.simulation_mode = simulation_mode.value
-      if simulation_mode == Executive.SimulationMode.DRAFT:
-        print("Starting in draft mode.")
-    if step_wise:
-      request.execution_mode = (
-          executive_execution_mode_pb2.EXECUTION_MODE_STEP_WISE
-      )
-    if embed_skill_traces:
-      request.skill_trace_handling = (
-          run_metadata_pb2.RunMetadata.TracingInfo.SKILL_TRACES_EMBED
-      )
-    else:
-      request.skill_trace_handling = (
-          run_metadata_pb2.RunMetadata.TracingInfo.SKILL_TRACES_LINK
-      )
-    if start_node is not None:
-      request.start_tree_id = start_node.tree_id
-      request.start_node_id = start_node.node_id
     self._operation.update_from_proto(self._stub.StartOperation(request))
 
   @error_handling.retry_on_grpc_unavailable
@@ -981,6 +1243,7 @@ class Executive:
       mode: Optional[ResumeMode] = None,
   ) -> None:
     operation = self.operation
+    self._blackboard_cache.clear()
     operation.update_from_proto(
         self._stub.ResumeOperation(
             executive_service_pb2.ResumeOperationRequest(
@@ -993,6 +1256,7 @@ class Executive:
   @error_handling.retry_on_grpc_unavailable
   def _reset_with_retry(self) -> None:
     operation_name = self.operation.name
+    self._blackboard_cache.clear()
     self._stub.ResetOperation(
         executive_service_pb2.ResetOperationRequest(name=operation_name)
     )
@@ -1006,15 +1270,16 @@ class Executive:
 
   @error_handling.retry_on_grpc_unavailable
   def _create_with_retry(self, request) -> None:
+    self._blackboard_cache.clear()
     self._operation = Operation(self._stub, self._stub.CreateOperation(request))
 
   @error_handling.retry_on_grpc_unavailable
   def _list_blackboard_values(
-      self, scope: Optional[str]
+      self, operation_name: str, scope: Optional[str]
   ) -> blackboard_service_pb2.ListBlackboardValuesResponse:
     return self._blackboard_stub.ListBlackboardValues(
         blackboard_service_pb2.ListBlackboardValuesRequest(
-            operation_name=self.operation.name, scope=scope
+            operation_name=operation_name, scope=scope
         )
     )
 
@@ -1027,3 +1292,719 @@ class Executive:
             operation_name=self.operation.name, scope=scope, key=key
         )
     )
+
+
+class AsyncExecutive:
+  """Asyncio wrapper for the Executive gRPC service, based on grpc.aio.
+
+  Offers the operations of Executive as coroutines. Waiting for an operation
+  does not block a thread, so a single event loop can drive many executives
+  (e.g., of different solutions) at the same time.
+
+  Like Executive, an AsyncExecutive manages the single active operation of its
+  executive. It does not reset the simulation or print to Jupyter.
+
+  Typical usage example:
+
+    channel = grpc.aio.insecure_channel(address)
+    executive = execution.AsyncExecutive.connect(channel, error_loader)
+    await executive.run(my_behavior_tree)
+
+  Several executives can run concurrently, e.g., with run_in_background():
+
+    completions = [
+        await executive.run_in_background(tree)
+        for executive, tree in zip(executives, trees)
+    ]
+    await asyncio.gather(*completions)
+  """
+
+  _stub: executive_service_pb2_grpc.ExecutiveServiceStub
+  _blackboard_stub: blackboard_service_pb2_grpc.ExecutiveBlackboardStub
+  _error_loader: error_processing.ErrorsLoader
+  _polling_interval_in_seconds: float
+  _operation: Optional[Operation]
+  _wait_operation_backoff_in_seconds: float
+  _wait_operation_retry_time: float
+
+  def __init__(
+      self,
+      stub: executive_service_pb2_grpc.ExecutiveServiceStub,
+      blackboard_stub: blackboard_service_pb2_grpc.ExecutiveBlackboardStub,
+      error_loader: error_processing.ErrorsLoader,
+      polling_interval_in_seconds: float = _DEFAULT_POLLING_INTERVAL_IN_SECONDS,
+  ):
+    """Constructs a new AsyncExecutive object.
+
+    Args:
+      stub: The gRPC stub to be used for communication with the executive
+        service. Must be created on a grpc.aio channel.
+      blackboard_stub: The gRPC stub to be used for blackboard related calls.
+        Must be created on a grpc.aio channel.
+      error_loader: Can load ErrorReports about executions
+      polling_interval_in_seconds: Number of seconds to wait while polling for
+        the operation state, see Executive.
+    """
+    self._stub = stub
+    self._blackboard_stub = blackboard_stub
+    self._error_loader = error_loader
+    self._polling_interval_in_seconds = polling_interval_in_seconds
+    self._operation = None
+    self._wait_operation_backoff_in_seconds = (
+        _MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS
+    )
+    self._wait_operation_retry_time = 0.0
+
+  @classmethod
+  def connect(
+      cls,
+      grpc_channel: grpc.aio.Channel,
+      error_loader: error_processing.ErrorsLoader,
+      polling_interval_in_seconds: float = _DEFAULT_POLLING_INTERVAL_IN_SECONDS,
+  ) -> "AsyncExecutive":
+    """Connect to a running executive.
+
+    Args:
+      grpc_channel: grpc.aio channel to the executive gRPC service.
+      error_loader: Loads error data for executive runs.
+      polling_interval_in_seconds: Number of seconds to wait while polling for
+        the operation state, see Executive.
+
+    Returns:
+      A newly created instance of the AsyncExecutive wrapper class.
+    """
+    stub = executive_service_pb2_grpc.ExecutiveServiceStub(grpc_channel)
+    blackboard_stub = blackboard_service_pb2_grpc.ExecutiveBlackboardStub(
+        grpc_channel
+    )
+    return cls(stub, blackboard_stub, error_loader, polling_interval_in_seconds)
+
+  async def operation(self) -> Operation:
+    """Returns up to date information about the active operation.
+
+    The result is a snapshot, which has no stub to update itself with. Call
+    operation() again to refresh it, Operation.update() raises an error.
+
+    Raises:
+      OperationNotFoundError: If there is no active operation.
+    """
+    await self._update_operation()
+    if self._operation is None:
+      raise OperationNotFoundError("No active operation")
+    return self._operation
+
+  async def load(
+      self, behavior_tree_or_action: Optional[BehaviorTreeOrActionType]
+  ) -> None:
+    """Loads an action or behavior tree into the executive.
+
+    Replaces the active operation, see Executive.load().
+
+    Args:
+      behavior_tree_or_action: A behavior tree, a list of actions (can be nested
+        one level) or a single action.
+
+    Raises:
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    request = _create_operation_request(behavior_tree_or_action)
+    try:
+      operation = await self.operation()
+    except OperationNotFoundError:
+      pass
+    else:
+      await self._delete_with_retry(operation.name)
+    await self._create_with_retry(request)
+
+  async def start(
+      self,
+      *,
+      step_wise: bool = False,
+      start_node: Optional[bt.NodeIdentifierType] = None,
+      simulation_mode: Optional["Executive.SimulationMode"] = None,
+      embed_skill_traces: bool = False,
+  ) -> None:
+    """Starts the loaded plan and returns without waiting for it to finish.
+
+    Args:
+      step_wise: Execute step-wise, i.e., suspend after each node of the tree.
+      start_node: Start only the specified node instead of the complete tree.
+      simulation_mode: Set the simulation mode on the start request. If None
+        will execute in whatever mode is currently set in the executive.
+      embed_skill_traces: If true, execution traces in Google Cloud will
+        incorporate all information from skill traces, otherwise execution
+        traces contain links to individual skill traces.
+
+    Raises:
+      OperationNotFoundError: If no plan has been loaded.
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    operation = await self.operation()
+    request = _start_operation_request(
+        operation.name,
+        step_wise=step_wise,
+        start_node=start_node,
+        simulation_mode=simulation_mode,
+        embed_skill_traces=embed_skill_traces,
+    )
+    operation.update_from_proto(await self._start_with_retry(request))
+
+  async def block_until_completed(self) -> Operation:
+    """Waits until plan execution has begun and then stops.
+
+    Returns:
+      The operation after execution stopped.
+
+    Raises:
+      ExecutionFailedError: If the execution failed.
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    operation = await self._wait_for_state(
+        _COMPLETED_STATES, _UNCOMPLETED_STATES
+    )
+    if (
+        operation.metadata.behavior_tree_state
+        == behavior_tree_pb2.BehaviorTree.FAILED
+    ):
+      raise ExecutionFailedError(
+          f"Execution of operation {operation.name} failed. Use get_errors()"
+          " for details."
+      )
+    return operation
+
+  async def run(
+      self,
+      plan_or_action: Optional[BehaviorTreeOrActionType],
+      *,
+      step_wise: bool = False,
+      start_node: Optional[bt.NodeIdentifierType] = None,
+      simulation_mode: Optional["Executive.SimulationMode"] = None,
+      embed_skill_traces: bool = False,
+  ) -> Operation:
+    """Executes an action or plan and waits until completion.
+
+    This corresponds to running load, start and block_until_completed after
+    one another. If plan_or_action is None, starts the loaded plan.
+
+    Args:
+      plan_or_action: A behavior tree, a list of actions (can be nested one
+        level), or a single action.
+      step_wise: Execute step-wise, i.e., suspend after each node of the tree.
+      start_node: Run the specified node as if it were the root node of a tree
+        instead of the complete tree.
+      simulation_mode: Set the simulation mode on the start request. If None
+        will execute in whatever mode is currently set in the executive.
+      embed_skill_traces: If true, execution traces in Google Cloud will
+        incorporate all information from skill traces, otherwise execution
+        traces contain links to individual skill traces.
+
+    Returns:
+      The operation after execution stopped.
+
+    Raises:
+      ExecutionFailedError: If the execution failed.
+      OperationNotFoundError: If plan_or_action is None and no plan is loaded.
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    completion = await self.run_in_background(
+        plan_or_action,
+        step_wise=step_wise,
+        start_node=start_node,
+        simulation_mode=simulation_mode,
+        embed_skill_traces=embed_skill_traces,
+    )
+    return await completion
+
+  async def run_in_background(
+      self,
+      plan_or_action: Optional[BehaviorTreeOrActionType] = None,
+      *,
+      step_wise: bool = False,
+      start_node: Optional[bt.NodeIdentifierType] = None,
+      simulation_mode: Optional["Executive.SimulationMode"] = None,
+      embed_skill_traces: bool = False,
+  ) -> "asyncio.Task[Operation]":
+    """Loads and starts an action or plan and returns a completion future.
+
+    Args:
+      plan_or_action: A behavior tree, a list of actions (can be nested one
+        level), or a single action. If None, starts the loaded plan.
+      step_wise: Execute step-wise, i.e., suspend after each node of the tree.
+      start_node: Run the specified node as if it were the root node of a tree
+        instead of the complete tree.
+      simulation_mode: Set the simulation mode on the start request. If None
+        will execute in whatever mode is currently set in the executive.
+      embed_skill_traces: If true, execution traces in Google Cloud will
+        incorporate all information from skill traces, otherwise execution
+        traces contain links to individual skill traces.
+
+    Returns:
+      A task which completes with the result of block_until_completed() once
+      execution stops.
+
+    Raises:
+      OperationNotFoundError: If plan_or_action is None and no plan is loaded.
+      grpc.aio.AioRpcError: On gRPC errors while loading or starting.
+    """
+    if plan_or_action is not None:
+      await self.load(plan_or_action)
+    await self.start(
+        step_wise=step_wise,
+        start_node=start_node,
+        simulation_mode=simulation_mode,
+        embed_skill_traces=embed_skill_traces,
+    )
+    return asyncio.create_task(self.block_until_completed())
+
+  async def suspend(self, blocking: bool = True) -> None:
+    """Requests to suspend plan execution.
+
+    Args:
+      blocking: If True, waits until execution is suspended (or finished).
+
+    Raises:
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    operation = await self.operation()
+    await self._suspend_with_retry(operation.name)
+    if blocking:
+      await self._wait_for_state(_SUSPENSION_FINISHED_STATES)
+
+  async def resume(self, mode: Optional["Executive.ResumeMode"] = None) -> None:
+    """Resumes plan execution (SUSPENDED --> RUNNING).
+
+    Args:
+     mode: The resume mode, see Executive.resume().
+
+    Raises:
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    operation = await self.operation()
+    operation.update_from_proto(
+        await self._resume_with_retry(
+            executive_service_pb2.ResumeOperationRequest(
+                name=operation.name,
+                mode=None if mode is None else mode.value,
+            )
+        )
+    )
+
+  async def cancel(self, blocking: bool = True) -> None:
+    """Cancels plan execution.
+
+    Args:
+      blocking: If True, waits until execution has finished.
+
+    Raises:
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    operation = await self.operation()
+    await self._cancel_with_retry(operation.name)
+    if blocking:
+      await self._wait_for_state(
+          _CANCELLATION_FINISHED_STATES, _CANCELLATION_UNFINISHED_STATES
+      )
+
+  async def reset(self) -> None:
+    """Resets the active operation to the state from when it was loaded.
+
+    Raises:
+      grpc.aio.AioRpcError: On gRPC errors.
+    """
+    try:
+      operation = await self.operation()
+    except OperationNotFoundError:
+      return
+    await self._reset_with_retry(operation.name)
+
+  async def get_errors(self) -> error_processing.ErrorGroup:
+    """Loads the errors of the active, failed operation.
+
+    The errors are loaded in the event loop's default executor.
+
+    Returns:
+      Error summaries.
+    """
+    operation = await self.operation()
+    return await asyncio.get_running_loop().run_in_executor(
+        None, self._error_loader.extract_error_data, operation.proto
+    )
+
+  async def is_value_available(
+      self, value: blackboard_value.BlackboardValue
+  ) -> bool:
+    """Checks whether a value is available on the blackboard.
+
+    Args:
+      value: check availability for this value
+
+    Returns:
+      True if a value has been set, False otherwise.
+    """
+    return (await self.are_values_available([value]))[0]
+
+  async def are_values_available(
+      self, values: Sequence[blackboard_value.BlackboardValue]
+  ) -> List[bool]:
+    """Checks whether several values are available on the blackboard.
+
+    Args:
+      values: check availability for these values
+
+    Returns:
+      For each value, whether it has been set.
+    """
+    scopes = await self._blackboard_values(values)
+    return [
+        value.value_access_path() in scopes[_blackboard_scope(value)]
+        for value in values
+    ]
+
+  async def get_value(self, value: blackboard_value.BlackboardValue) -> Any:
+    """Gets the actual data written for the specified value on the blackboard.
+
+    Args:
+      value: the value to get actual data for
+
+    Returns:
+      Value as read from the blackboard
+
+    Raises:
+      NotFoundError if the value has not yet been resolved
+      ValueError if the received value is not of the expected type
+    """
+    _check_toplevel_value(value)
+    operation = await self.operation()
+    try:
+      response = await self._get_blackboard_value_with_retry(
+          blackboard_service_pb2.GetBlackboardValueRequest(
+              operation_name=operation.name,
+              scope=value.scope(),
+              key=value.value_access_path(),
+          )
+      )
+    except grpc.aio.AioRpcError as e:
+      if e.code() == grpc.StatusCode.NOT_FOUND:
+        raise solutions_errors.NotFoundError(
+            "Could not find blackboard value for key"
+            f" {value.value_access_path()} in scope {value.scope()} in the"
+            " blackboard."
+        ) from e
+      raise
+    return _unpack_blackboard_value(response.value, value)
+
+  async def get_values(
+      self, values: Sequence[blackboard_value.BlackboardValue]
+  ) -> List[Any]:
+    """Gets the data written for several values on the blackboard.
+
+    Lists each scope of the blackboard only once, see Executive.get_values().
+
+    Args:
+      values: the values to get actual data for
+
+    Returns:
+      The values as read from the blackboard, in the order of `values`.
+
+    Raises:
+      NotFoundError if any of the values has not yet been resolved
+      ValueError if a received value is not of the expected type
+    """
+    for value in values:
+      _check_toplevel_value(value)
+    scopes = await self._blackboard_values(values)
+    results = []
+    for value in values:
+      any_value = scopes[_blackboard_scope(value)].get(
+          value.value_access_path()
+      )
+      if any_value is None:
+        raise solutions_errors.NotFoundError(
+            "Could not find blackboard value for key"
+            f" {value.value_access_path()} in scope {value.scope()} in the"
+            " blackboard."
+        )
+      results.append(_unpack_blackboard_value(any_value, value))
+    return results
+
+  async def await_value(self, value: blackboard_value.BlackboardValue) -> None:
+    """Waits until a value is available on the blackboard.
+
+    Args:
+      value: wait for this value to be available on the blackboard
+    """
+    while not await self.is_value_available(value):
+      await self._wait_for_operation(self._polling_interval_in_seconds)
+
+  async def _blackboard_values(
+      self, values: Sequence[blackboard_value.BlackboardValue]
+  ) -> Dict[str, Dict[str, any_pb2.Any]]:
+    """Lists the scopes of the given values concurrently.
+
+    Args:
+      values: The values whose scopes to list.
+
+    Returns:
+      The values of each scope, by scope and key.
+    """
+    operation = await self.operation()
+    scopes = list(dict.fromkeys(_blackboard_scope(value) for value in values))
+    responses = await asyncio.gather(*[
+        self._list_blackboard_values_with_retry(
+            blackboard_service_pb2.ListBlackboardValuesRequest(
+                operation_name=operation.name, scope=scope
+            )
+        )
+        for scope in scopes
+    ])
+    return {
+        scope: {entry.key: entry.value for entry in response.values}
+        for scope, response in zip(scopes, responses)
+    }
+
+  async def _wait_for_state(
+      self,
+      states: Container[int],
+      expected_states: Optional[Container[int]] = None,
+  ) -> Operation:
+    """Waits until the behavior tree of the operation is in one of `states`.
+
+    See Executive._wait_for_state().
+    """
+    operation = await self.operation()
+    while True:
+      state = operation.metadata.behavior_tree_state
+      if state in states:
+        return operation
+      if expected_states is not None:
+        assert state in expected_states, f"Unexpected state: {state}"
+      operation = await self._wait_for_operation(
+          self._polling_interval_in_seconds
+      )
+
+  async def _wait_for_operation(self, timeout: float) -> Operation:
+    """Waits for the operation to be done, for at most `timeout` seconds.
+
+    See Executive._wait_for_operation().
+    """
+    operation = self._operation
+    if (
+        operation is None
+        or operation.done
+        or time.monotonic() < self._wait_operation_retry_time
+    ):
+      await asyncio.sleep(timeout)
+      return await self.operation()
+
+    previous_state = operation.metadata.behavior_tree_state
+    start = time.monotonic()
+    wait_timeout = duration_pb2.Duration()
+    wait_timeout.FromTimedelta(datetime.timedelta(seconds=timeout))
+    try:
+      operation.update_from_proto(
+          await self._stub.WaitOperation(
+              operations_pb2.WaitOperationRequest(
+                  name=operation.name, timeout=wait_timeout
+              )
+          )
+      )
+    except grpc.aio.AioRpcError as e:
+      if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+        self._back_off_wait_operation()
+        await asyncio.sleep(timeout)
+      elif e.code() == grpc.StatusCode.UNAVAILABLE:
+        await asyncio.sleep(timeout)
+      elif e.code() != grpc.StatusCode.NOT_FOUND:
+        raise
+      return await self.operation()
+    self._wait_operation_backoff_in_seconds = (
+        _MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS
+    )
+
+    if (
+        not operation.done
+        and operation.metadata.behavior_tree_state == previous_state
+    ):
+      remaining = timeout - (time.monotonic() - start)
+      if remaining > 0:
+        await asyncio.sleep(remaining)
+    return operation
+
+  def _back_off_wait_operation(self) -> None:
+    """See Executive._back_off_wait_operation()."""
+    self._wait_operation_retry_time = (
+        time.monotonic() + self._wait_operation_backoff_in_seconds
+    )
+    self._wait_operation_backoff_in_seconds = min(
+        2 * self._wait_operation_backoff_in_seconds,
+        _MAX_WAIT_OPERATION_BACKOFF_IN_SECONDS,
+    )
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _update_operation(self) -> None:
+    """Gets up to date information about the active operation."""
+    if self._operation is not None:
+      try:
+        self._operation.update_from_proto(
+            await self._stub.GetOperation(
+                operations_pb2.GetOperationRequest(name=self._operation.name)
+            )
+        )
+      except grpc.aio.AioRpcError as e:
+        if e.code() != grpc.StatusCode.NOT_FOUND:
+          raise
+        self._operation = None
+
+    if self._operation is None:
+      response = await self._stub.ListOperations(
+          operations_pb2.ListOperationsRequest()
+      )
+      if response.operations:
+        self._operation = Operation(None, response.operations[0])
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _delete_with_retry(self, operation_name: str) -> None:
+    await self._stub.DeleteOperation(
+        operations_pb2.DeleteOperationRequest(name=operation_name)
+    )
+    self._operation = None
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _create_with_retry(
+      self, request: executive_service_pb2.CreateOperationRequest
+  ) -> None:
+    self._operation = Operation(None, await self._stub.CreateOperation(request))
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _start_with_retry(
+      self, request: executive_service_pb2.StartOperationRequest
+  ) -> operations_pb2.Operation:
+    return await self._stub.StartOperation(request)
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _suspend_with_retry(self, operation_name: str) -> None:
+    await self._stub.SuspendOperation(
+        executive_service_pb2.SuspendOperationRequest(name=operation_name)
+    )
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _resume_with_retry(
+      self, request: executive_service_pb2.ResumeOperationRequest
+  ) -> operations_pb2.Operation:
+    return await self._stub.ResumeOperation(request)
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _cancel_with_retry(self, operation_name: str) -> None:
+    await self._stub.CancelOperation(
+        operations_pb2.CancelOperationRequest(name=operation_name)
+    )
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _reset_with_retry(self, operation_name: str) -> None:
+    await self._stub.ResetOperation(
+        executive_service_pb2.ResetOperationRequest(name=operation_name)
+    )
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _get_blackboard_value_with_retry(
+      self, request: blackboard_service_pb2.GetBlackboardValueRequest
+  ) -> blackboard_service_pb2.BlackboardValue:
+    return await self._blackboard_stub.GetBlackboardValue(request)
+
+  @error_handling.retry_on_grpc_unavailable_async
+  async def _list_blackboard_values_with_retry(
+      self, request: blackboard_service_pb2.ListBlackboardValuesRequest
+  ) -> blackboard_service_pb2.ListBlackboardValuesResponse:
+    return await self._blackboard_stub.ListBlackboardValues(request)
+
+
+def _create_operation_request(
+    behavior_tree_or_action: Optional[BehaviorTreeOrActionType],
+) -> executive_service_pb2.CreateOperationRequest:
+  """Returns the request to create an operation for a tree or actions."""
+  behavior_tree = None
+  if isinstance(behavior_tree_or_action, actions.ActionBase):
+    behavior_tree = bt.BehaviorTree(
+        root=bt.Task(cast(actions.ActionBase, behavior_tree_or_action))
+    )
+  elif isinstance(behavior_tree_or_action, list):
+    action_list = _flatten_list(behavior_tree_or_action)
+    behavior_tree = bt.BehaviorTree(
+        root=bt.Sequence(
+            children=[bt.Task(cast(actions.ActionBase, a)) for a in action_list]
+        )
+    )
+  elif isinstance(behavior_tree_or_action, bt.BehaviorTree):
+    behavior_tree = cast(bt.BehaviorTree, behavior_tree_or_action)
+  elif isinstance(behavior_tree_or_action, bt.Node):
+    behavior_tree = bt.BehaviorTree(root=behavior_tree_or_action)
+
+  request = executive_service_pb2.CreateOperationRequest()
+  if behavior_tree is not None:
+    behavior_tree.validate_id_uniqueness()
+    request.behavior_tree.CopyFrom(behavior_tree.proto)
+  return request
+
+
+def _start_operation_request(
+    operation_name: str,
+    *,
+    step_wise: bool,
+    start_node: Optional[bt.NodeIdentifierType],
+    simulation_mode: Optional["Executive.SimulationMode"],
+    embed_skill_traces: bool,
+) -> executive_service_pb2.StartOperationRequest:
+  """Returns the request to start an operation."""
+  request = executive_service_pb2.StartOperationRequest(name=operation_name)
+  if simulation_mode is not None:
+    request.simulation_mode = simulation_mode.value
+    if simulation_mode == Executive.SimulationMode.DRAFT:
+      print("Starting in draft mode.")
+  if step_wise:
+    request.execution_mode = (
+        executive_execution_mode_pb2.EXECUTION_MODE_STEP_WISE
+    )
+  if embed_skill_traces:
+    request.skill_trace_handling = (
+        run_metadata_pb2.RunMetadata.TracingInfo.SKILL_TRACES_EMBED
+    )
+  else:
+    request.skill_trace_handling = (
+        run_metadata_pb2.RunMetadata.TracingInfo.SKILL_TRACES_LINK
+    )
+  if start_node is not None:
+    request.start_tree_id = start_node.tree_id
+    request.start_node_id = start_node.node_id
+  return request
+
+
+def _blackboard_scope(value: blackboard_value.BlackboardValue) -> str:
+  """Returns the scope of a value, defaulting to the process tree scope."""
+  scope = value.scope()
+  return scope if scope is not None else _PROCESS_TREE_SCOPE
+
+
+def _check_toplevel_value(value: blackboard_value.BlackboardValue) -> None:
+  """Raises an InvalidArgumentError if value is not a toplevel value."""
+  if not value.is_toplevel_value:
+    raise solutions_errors.InvalidArgumentError(
+        f"BlackboardValue with path {value.value_access_path()} is not a"
+        " toplevel value. Requesting sub-fields of a blackboard value is not"
+        " supported. Use the toplevel blackboard value to request its"
+        " contents from the blackboard."
+    )
+
+
+def _unpack_blackboard_value(
+    any_value: any_pb2.Any, value: blackboard_value.BlackboardValue
+) -> Any:
+  """Unpacks a value read from the blackboard into its expected type."""
+  blackboard_message = value.value_type()
+  if not any_value.Is(blackboard_message.DESCRIPTOR):
+    raise ValueError(
+        "Received value does not match expected type. Got"
+        f" {any_value.TypeName()} but expected"
+        f" {blackboard_message.DESCRIPTOR.full_name}."
+    )
+  any_value.Unpack(blackboard_message)
+  return blackboard_message
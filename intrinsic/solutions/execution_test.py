@@ -2,7 +2,10 @@
 
 """Tests for intrinsic.solutions.execution."""
 
+import asyncio
+import concurrent.futures
 import datetime
+import threading
 import time
 from unittest import mock
 
@@ -10,6 +13,7 @@ from absl.testing import absltest
 from absl.testing import parameterized
 from google.longrunning import operations_pb2
 from google.protobuf import any_pb2
+from google.protobuf import empty_pb2
 from google.protobuf import text_format
 import grpc
 from intrinsic.executive.proto import behavior_tree_pb2
@@ -27,9 +31,9 @@ from intrinsic.solutions import errors as solutions_errors
 from intrinsic.solutions import execution
 from intrinsic.solutions import simulation as simulation_mod
 from intrinsic.solutions.internal import behavior_call
+from intrinsic.solutions.testing import fake_executive
 from intrinsic.solutions.testing import test_skill_params_pb2
 
-
 # Make sure all log items are considered.
 _TIMESTAMP = 2147483647
 
@@ -69,6 +73,13 @@ class ExecutiveTest(parameterized.TestCase):
     self._executive_service_stub: (
         executive_service_pb2_grpc.ExecutiveServiceStub
     ) = mock.MagicMock()
+    # WaitOperation returns the same states as GetOperation, so that the tests
+    # can define the sequence of states through GetOperation.
+    self._executive_service_stub.WaitOperation.side_effect = (
+        lambda request: self._executive_service_stub.GetOperation(
+            operations_pb2.GetOperationRequest(name=request.name)
+        )
+    )
     self._blackboard_stub: (
         blackboard_service_pb2_grpc.ExecutiveBlackboardStub
     ) = mock.MagicMock()
@@ -213,6 +224,71 @@ class ExecutiveTest(parameterized.TestCase):
         self._executive.operation.find_tree_and_node_id('a_node'), ('tree', 2)
     )
 
+  def test_operation_find_many_reuses_tree(self):
+    """Tests if executive.operation reuses its tree until the tree changes."""
+    my_bt = bt.BehaviorTree(
+        root=bt.Sequence(children=[bt.Fail(name='a'), bt.Fail(name='b')])
+    )
+    my_bt.tree_id = 'tree'
+    my_bt.root.children[0].node_id = 2
+    my_bt.root.children[1].node_id = 3
+    self._create_operation(my_bt)
+    self._setup_get_operation(
+        behavior_tree_pb2.BehaviorTree.ACCEPTED, bt_proto=my_bt.proto
+    )
+
+    operation = self._executive.operation
+    self.assertEqual(
+        operation.find_many(['a', 'b']),
+        {
+            'a': [bt.NodeIdentifierType(tree_id='tree', node_id=2)],
+            'b': [bt.NodeIdentifierType(tree_id='tree', node_id=3)],
+        },
+    )
+    with mock.patch.object(
+        bt.BehaviorTree, 'create_from_proto'
+    ) as create_from_proto:
+      operation = self._executive.operation
+      self.assertEqual(operation.find_tree_and_node_id('b'), ('tree', 3))
+      create_from_proto.assert_not_called()
+
+    my_bt.root.children[1].node_id = 4
+    self._setup_get_operation(
+        behavior_tree_pb2.BehaviorTree.ACCEPTED, bt_proto=my_bt.proto
+    )
+    operation = self._executive.operation
+    self.assertEqual(operation.find_tree_and_node_id('b'), ('tree', 4))
+
+  def test_operation_show(self):
+    """Tests if executive.operation.show shows the tree with its node states."""
+    my_bt = bt.BehaviorTree(root=bt.Sequence(children=[bt.Fail(name='a_node')]))
+    my_bt.tree_id = 'tree'
+    my_bt.root.node_id = 1
+    my_bt.root.children[0].node_id = 2
+    bt_proto = my_bt.proto
+    bt_proto.root.state = behavior_tree_pb2.BehaviorTree.Node.RUNNING
+    bt_proto.root.sequence.children[0].state = (
+        behavior_tree_pb2.BehaviorTree.Node.SUCCEEDED
+    )
+    self._create_operation(my_bt)
+    self._setup_get_operation(
+        behavior_tree_pb2.BehaviorTree.RUNNING, bt_proto=bt_proto
+    )
+
+    with mock.patch.object(bt.BehaviorTree, 'show', autospec=True) as show:
+      self._executive.operation.show(max_depth=3)
+
+    show.assert_called_once_with(
+        mock.ANY,
+        max_depth=3,
+        max_nodes=None,
+        node_states={
+            ('tree', 1): behavior_tree_pb2.BehaviorTree.Node.RUNNING,
+            ('tree', 2): behavior_tree_pb2.BehaviorTree.Node.SUCCEEDED,
+        },
+        display_id=f'operation_{_OPERATION_NAME}',
+    )
+
   def test_run_async_fails_on_unavailable_error(self):
     """Tests if executive.run_async() translates UNAVAILABLE error correctly."""
     self._create_operation()
@@ -1125,6 +1201,125 @@ class ExecutiveTest(parameterized.TestCase):
         )
     )
 
+  def _setup_list_blackboard_values(self, values_by_key, scope=None):
+    response = blackboard_service_pb2.ListBlackboardValuesResponse()
+    for key, value in values_by_key.items():
+      response.values.add(
+          operation_name=_OPERATION_NAME,
+          key=key,
+          scope=scope or execution._PROCESS_TREE_SCOPE,
+          value=_to_any(value),
+      )
+    self._blackboard_stub.ListBlackboardValues.return_value = response
+
+  def test_get_values_works(self):
+    """Tests if executive.get_values() lists the blackboard once."""
+
+    self._create_operation()
+    self._setup_get_operation(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+    foo = test_skill_params_pb2.TestMessage(my_double=1.1)
+    bar = test_skill_params_pb2.TestMessage(my_double=2.2)
+    self._setup_list_blackboard_values({'foo': foo, 'bar': bar})
+
+    values = self._executive.get_values([
+        blackboard_value.BlackboardValue(
+            {}, 'bar', test_skill_params_pb2.TestMessage, None
+        ),
+        blackboard_value.BlackboardValue(
+            {}, 'foo', test_skill_params_pb2.TestMessage, None
+        ),
+    ])
+
+    self.assertEqual(values, [bar, foo])
+    self._blackboard_stub.ListBlackboardValues.assert_called_once_with(
+        blackboard_service_pb2.ListBlackboardValuesRequest(
+            operation_name=_OPERATION_NAME, scope=execution._PROCESS_TREE_SCOPE
+        )
+    )
+    self._blackboard_stub.GetBlackboardValue.assert_not_called()
+
+  def test_get_values_lists_each_scope_once(self):
+    """Tests if executive.get_values() lists each scope of the blackboard."""
+
+    self._create_operation()
+    self._setup_get_operation(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+    foo = test_skill_params_pb2.TestMessage(my_double=1.1)
+    self._setup_list_blackboard_values({'foo': foo}, scope='some_scope')
+
+    values = self._executive.get_values([
+        blackboard_value.BlackboardValue(
+            {},
+            'foo',
+            test_skill_params_pb2.TestMessage,
+            None,
+            scope='some_scope',
+        ),
+        blackboard_value.BlackboardValue(
+            {},
+            'foo',
+            test_skill_params_pb2.TestMessage,
+            None,
+            scope='some_scope',
+        ),
+    ])
+
+    self.assertEqual(values, [foo, foo])
+    self._blackboard_stub.ListBlackboardValues.assert_called_once_with(
+        blackboard_service_pb2.ListBlackboardValuesRequest(
+            operation_name=_OPERATION_NAME, scope='some_scope'
+        )
+    )
+
+  def test_get_values_fails_on_value_not_found(self):
+    """Tests if executive.get_values() raises if a value is missing."""
+
+    self._create_operation()
+    self._setup_get_operation(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+    self._setup_list_blackboard_values(
+        {'foo': test_skill_params_pb2.TestMessage()}
+    )
+
+    with self.assertRaises(solutions_errors.NotFoundError):
+      self._executive.get_values([
+          blackboard_value.BlackboardValue(
+              {}, 'foo', test_skill_params_pb2.TestMessage, None
+          ),
+          blackboard_value.BlackboardValue(
+              {}, 'bar', test_skill_params_pb2.TestMessage, None
+          ),
+      ])
+
+  def test_get_values_fails_on_wrong_type(self):
+    """Tests if executive.get_values() checks the types of the values."""
+
+    self._create_operation()
+    self._setup_get_operation(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+    self._setup_list_blackboard_values({'foo': empty_pb2.Empty()})
+
+    with self.assertRaisesRegex(ValueError, 'does not match expected type'):
+      self._executive.get_values([
+          blackboard_value.BlackboardValue(
+              {}, 'foo', test_skill_params_pb2.TestMessage, None
+          )
+      ])
+
+  def test_are_values_available_works(self):
+    """Tests if executive.are_values_available() lists the blackboard once."""
+
+    self._create_operation()
+    self._setup_get_operation(behavior_tree_pb2.BehaviorTree.RUNNING)
+    self._setup_list_blackboard_values(
+        {'foo': test_skill_params_pb2.TestMessage()}
+    )
+
+    available = self._executive.are_values_available([
+        blackboard_value.BlackboardValue({}, 'foo', None, None),
+        blackboard_value.BlackboardValue({}, 'bar', None, None),
+    ])
+
+    self.assertEqual(available, [True, False])
+    self._blackboard_stub.ListBlackboardValues.assert_called_once()
+
   def test_is_value_available_works(self):
     """Tests if executive.is_value_available() returns whether the value is available."""
 
@@ -1468,5 +1663,348 @@ class ExecutionModeTest(absltest.TestCase):
     )
 
 
+class ExecutiveWaitTest(absltest.TestCase):
+  """Tests the blocking calls of Executive against a fake executive."""
+
+  def setUp(self):
+    super().setUp()
+    self._fake = fake_executive.FakeExecutive()
+    self._server = grpc.server(concurrent.futures.ThreadPoolExecutor(8))
+    executive_service_pb2_grpc.add_ExecutiveServiceServicer_to_server(
+        self._fake, self._server
+    )
+    blackboard_service_pb2_grpc.add_ExecutiveBlackboardServicer_to_server(
+        self._fake, self._server
+    )
+    port = self._server.add_insecure_port('localhost:0')
+    self._server.start()
+    self.addCleanup(self._server.stop, None)
+    channel = grpc.insecure_channel(f'localhost:{port}')
+    self.addCleanup(channel.close)
+    self._channel = channel
+
+  def _connect(self, polling_interval_in_seconds):
+    executive = execution.Executive.connect(
+        self._channel,
+        error_processing.ErrorsLoader(mock.MagicMock()),
+        polling_interval_in_seconds=polling_interval_in_seconds,
+    )
+    executive.load(bt.BehaviorTree(root=bt.Sequence()))
+    return executive
+
+  def _set_state_later(self, state, delay=0.1):
+    timer = threading.Timer(delay, self._fake.set_state, args=(state,))
+    timer.start()
+    self.addCleanup(timer.cancel)
+
+  def test_block_until_completed_returns_when_done(self):
+    # A polling interval far longer than the test ensures that the executive
+    # does not rely on polling.
+    executive = self._connect(polling_interval_in_seconds=30)
+    executive.start(blocking=False)
+    self._set_state_later(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    start = time.monotonic()
+    executive.block_until_completed()
+
+    self.assertLess(time.monotonic() - start, 5)
+    self.assertEqual(self._fake.call_count('WaitOperation'), 1)
+
+  def test_block_until_completed_raises_when_failed(self):
+    executive = self._connect(polling_interval_in_seconds=30)
+    executive.start(blocking=False)
+    self._set_state_later(behavior_tree_pb2.BehaviorTree.FAILED)
+
+    with self.assertRaises(execution.ExecutionFailedError):
+      executive.block_until_completed(silence_outputs=True)
+
+  def test_block_until_completed_polls_for_suspension(self):
+    executive = self._connect(polling_interval_in_seconds=0.05)
+    executive.start(blocking=False)
+    self._set_state_later(behavior_tree_pb2.BehaviorTree.SUSPENDED)
+
+    executive.block_until_completed()
+
+    self.assertEqual(
+        executive.operation.metadata.behavior_tree_state,
+        behavior_tree_pb2.BehaviorTree.SUSPENDED,
+    )
+
+  def test_block_until_completed_falls_back_to_polling(self):
+    self._fake.wait_operation_supported = False
+    executive = self._connect(polling_interval_in_seconds=0.05)
+    executive.start(blocking=False)
+    self._set_state_later(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    executive.block_until_completed()
+
+    self.assertGreater(self._fake.call_count('GetOperation'), 1)
+
+  @mock.patch.object(execution, '_MIN_WAIT_OPERATION_BACKOFF_IN_SECONDS', 0.2)
+  def test_wait_operation_is_retried_after_unimplemented(self):
+    self._fake.wait_operation_supported = False
+    executive = self._connect(polling_interval_in_seconds=0.01)
+    executive.start(blocking=False)
+    # pylint: disable=protected-access
+    executive._wait_for_operation(0.01)
+    self._fake.wait_operation_supported = True
+
+    # WaitOperation is not called again during the backoff time.
+    executive._wait_for_operation(0.01)
+    self.assertEqual(self._fake.call_count('WaitOperation'), 0)
+
+    time.sleep(0.2)
+    executive._wait_for_operation(0.01)
+    self.assertEqual(self._fake.call_count('WaitOperation'), 1)
+    # pylint: enable=protected-access
+
+  def test_cancel_returns_when_canceled(self):
+    executive = self._connect(polling_interval_in_seconds=30)
+    executive.start(blocking=False)
+
+    executive.cancel()
+
+    self.assertTrue(executive.operation.done)
+
+  def test_block_until_completed_async(self):
+    executive = self._connect(polling_interval_in_seconds=30)
+    executive.start(blocking=False)
+    self._set_state_later(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    asyncio.run(executive.block_until_completed_async())
+
+    self.assertTrue(executive.operation.done)
+
+  def test_blackboard_cache_of_finished_operation(self):
+    executive = execution.Executive.connect(
+        self._channel,
+        error_processing.ErrorsLoader(mock.MagicMock()),
+        blackboard_cache_ttl_in_seconds=60,
+    )
+    executive.load(bt.BehaviorTree(root=bt.Sequence()))
+    executive.start(blocking=False)
+    self._fake.set_blackboard_value('foo', empty_pb2.Empty())
+    foo = blackboard_value.BlackboardValue({}, 'foo', empty_pb2.Empty, None)
+    bar = blackboard_value.BlackboardValue({}, 'bar', empty_pb2.Empty, None)
+
+    # Values of running operations are not cached.
+    self.assertEqual(executive.are_values_available([foo, bar]), [True, False])
+    self._fake.set_blackboard_value('bar', empty_pb2.Empty())
+    self.assertEqual(executive.are_values_available([foo, bar]), [True, True])
+    self.assertEqual(self._fake.call_count('ListBlackboardValues'), 2)
+
+    self._fake.set_state(behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+    executive.get_values([foo, bar])
+    get_operation_count = self._fake.call_count('GetOperation')
+    executive.get_values([foo, bar])
+    self.assertEqual(self._fake.call_count('ListBlackboardValues'), 3)
+    # Cache hits do not refresh the operation either.
+    self.assertEqual(self._fake.call_count('GetOperation'), get_operation_count)
+
+    # Restarting the operation clears the cache.
+    executive.start(blocking=False)
+    executive.get_values([foo, bar])
+    self.assertEqual(self._fake.call_count('ListBlackboardValues'), 4)
+
+  def test_await_value_async(self):
+    executive = self._connect(polling_interval_in_seconds=0.05)
+    executive.start(blocking=False)
+    timer = threading.Timer(
+        0.1, self._fake.set_blackboard_value, args=('foo', empty_pb2.Empty())
+    )
+    timer.start()
+    self.addCleanup(timer.cancel)
+
+    test_value = blackboard_value.BlackboardValue({}, 'foo', None, None)
+    asyncio.run(executive.await_value_async(test_value))
+
+    self.assertTrue(executive.is_value_available(test_value))
+
+
+class AsyncExecutiveTest(absltest.TestCase):
+  """Tests AsyncExecutive against fake executives."""
+
+  def _start_fake(self):
+    """Starts a fake executive and returns it with its address."""
+    fake = fake_executive.FakeExecutive()
+    server = grpc.server(concurrent.futures.ThreadPoolExecutor(8))
+    executive_service_pb2_grpc.add_ExecutiveServiceServicer_to_server(
+        fake, server
+    )
+    blackboard_service_pb2_grpc.add_ExecutiveBlackboardServicer_to_server(
+        fake, server
+    )
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    self.addCleanup(server.stop, None)
+    return fake, f'localhost:{port}'
+
+  def _run(self, address, test_fn, polling_interval_in_seconds=30):
+    """Runs test_fn(executive) on an AsyncExecutive connected to address."""
+
+    async def run():
+      async with grpc.aio.insecure_channel(address) as channel:
+        executive = execution.AsyncExecutive.connect(
+            channel,
+            error_processing.ErrorsLoader(mock.MagicMock()),
+            polling_interval_in_seconds=polling_interval_in_seconds,
+        )
+        return await test_fn(executive)
+
+    return asyncio.run(run())
+
+  def _set_state_later(self, fake, state, delay=0.1):
+    timer = threading.Timer(delay, fake.set_state, args=(state,))
+    timer.start()
+    self.addCleanup(timer.cancel)
+
+  def test_run_returns_when_done(self):
+    fake, address = self._start_fake()
+    self._set_state_later(fake, behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    async def test(executive):
+      return await executive.run(bt.BehaviorTree(root=bt.Sequence()))
+
+    start = time.monotonic()
+    operation = self._run(address, test)
+
+    self.assertLess(time.monotonic() - start, 5)
+    self.assertTrue(operation.done)
+    self.assertEqual(fake.call_count('StartOperation'), 1)
+
+  def test_run_raises_when_failed(self):
+    fake, address = self._start_fake()
+    self._set_state_later(fake, behavior_tree_pb2.BehaviorTree.FAILED)
+
+    async def test(executive):
+      await executive.run(bt.BehaviorTree(root=bt.Sequence()))
+
+    with self.assertRaises(execution.ExecutionFailedError):
+      self._run(address, test)
+
+  def test_run_concurrently(self):
+    fakes_and_addresses = [self._start_fake() for _ in range(3)]
+    for fake, _ in fakes_and_addresses:
+      self._set_state_later(fake, behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    async def run_all():
+      channels = [
+          grpc.aio.insecure_channel(address)
+          for _, address in fakes_and_addresses
+      ]
+      executives = [
+          execution.AsyncExecutive.connect(
+              channel, error_processing.ErrorsLoader(mock.MagicMock())
+          )
+          for channel in channels
+      ]
+      try:
+        completions = [
+            await executive.run_in_background(
+                bt.BehaviorTree(root=bt.Sequence())
+            )
+            for executive in executives
+        ]
+        return await asyncio.gather(*completions)
+      finally:
+        for channel in channels:
+          await channel.close()
+
+    start = time.monotonic()
+    operations = asyncio.run(run_all())
+
+    self.assertLess(time.monotonic() - start, 5)
+    self.assertTrue(all(operation.done for operation in operations))
+
+  def test_run_falls_back_to_polling(self):
+    fake, address = self._start_fake()
+    fake.wait_operation_supported = False
+    self._set_state_later(fake, behavior_tree_pb2.BehaviorTree.SUCCEEDED)
+
+    async def test(executive):
+      return await executive.run(bt.BehaviorTree(root=bt.Sequence()))
+
+    operation = self._run(address, test, polling_interval_in_seconds=0.05)
+
+    self.assertTrue(operation.done)
+    self.assertGreater(fake.call_count('GetOperation'), 1)
+
+  def test_cancel(self):
+    fake, address = self._start_fake()
+
+    async def test(executive):
+      await executive.load(bt.BehaviorTree(root=bt.Sequence()))
+      await executive.start()
+      await executive.cancel()
+      return await executive.operation()
+
+    operation = self._run(address, test)
+
+    self.assertTrue(operation.done)
+    self.assertEqual(fake.call_count('CancelOperation'), 1)
+
+  def test_operation_is_a_snapshot(self):
+    _, address = self._start_fake()
+
+    async def test(executive):
+      await executive.load(bt.BehaviorTree(root=bt.Sequence()))
+      return await executive.operation()
+
+    operation = self._run(address, test)
+
+    self.assertFalse(operation.done)
+    with self.assertRaises(solutions_errors.FailedPreconditionError):
+      operation.update()
+
+  def test_operation_raises_without_operation(self):
+    _, address = self._start_fake()
+
+    async def test(executive):
+      await executive.operation()
+
+    with self.assertRaises(execution.OperationNotFoundError):
+      self._run(address, test)
+
+  def test_get_values(self):
+    fake, address = self._start_fake()
+    foo = blackboard_value.BlackboardValue({}, 'foo', empty_pb2.Empty, None)
+    bar = blackboard_value.BlackboardValue({}, 'bar', empty_pb2.Empty, None)
+
+    async def test(executive):
+      await executive.load(bt.BehaviorTree(root=bt.Sequence()))
+      await executive.start()
+      fake.set_blackboard_value('foo', empty_pb2.Empty())
+      self.assertEqual(
+          await executive.are_values_available([foo, bar]), [True, False]
+      )
+      with self.assertRaises(solutions_errors.NotFoundError):
+        await executive.get_value(bar)
+      fake.set_blackboard_value('bar', empty_pb2.Empty())
+      return await executive.get_values([foo, bar])
+
+    values = self._run(address, test)
+
+    self.assertEqual(values, [empty_pb2.Empty(), empty_pb2.Empty()])
+
+  def test_await_value(self):
+    fake, address = self._start_fake()
+    timer = threading.Timer(
+        0.1, fake.set_blackboard_value, args=('foo', empty_pb2.Empty())
+    )
+    self.addCleanup(timer.cancel)
+    foo = blackboard_value.BlackboardValue({}, 'foo', empty_pb2.Empty, None)
+
+    async def test(executive):
+      await executive.load(bt.BehaviorTree(root=bt.Sequence()))
+      await executive.start()
+      timer.start()
+      await executive.await_value(foo)
+      return await executive.get_value(foo)
+
+    value = self._run(address, test, polling_interval_in_seconds=0.05)
+
+    self.assertEqual(value, empty_pb2.Empty())
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -12,7 +12,10 @@ when running in an IPython enabled runtime such as our Jupyter container.
 """
 
 import builtins
-from typing import Any
+from typing import Any, Optional
+
+# Display ids of the outputs which have been displayed, see display_if_ipython.
+_displayed_ids: set[str] = set()
 
 
 def _running_in_ipython() -> bool:
@@ -60,11 +63,15 @@ def display_html_if_ipython(
     print('Display only executed in IPython.')
 
 
-def display_if_ipython(python_object: Any) -> None:
+def display_if_ipython(
+    python_object: Any, display_id: Optional[str] = None
+) -> None:
   """Displays the given Python object if running in IPython.
 
   Args:
       python_object: Python object to display if running in IPython.
+      display_id: If given, the output which has previously been displayed with
+        the same display_id is replaced instead of displaying a new output.
   """
   if _running_in_ipython():
     try:
@@ -73,7 +80,13 @@ def display_if_ipython(python_object: Any) -> None:
       from IPython.core import display
       # pytype: enable=import-error
       # pylint: enable=g-import-not-at-top
-      display.display(python_object)
+      if display_id is None:
+        display.display(python_object)
+      elif display_id in _displayed_ids:
+        display.update_display(python_object, display_id=display_id)
+      else:
+        display.display(python_object, display_id=display_id)
+        _displayed_ids.add(display_id)
     except ImportError:
       pass
   else:
@@ -0,0 +1,273 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""In-process fake of the executive service for tests."""
+
+import collections
+import threading
+from typing import Dict, Optional, Tuple
+
+from google.longrunning import operations_pb2
+from google.protobuf import any_pb2
+from google.protobuf import empty_pb2
+from google.protobuf import message as proto_message
+import grpc
+from intrinsic.executive.proto import behavior_tree_pb2
+from intrinsic.executive.proto import blackboard_service_pb2
+from intrinsic.executive.proto import blackboard_service_pb2_grpc
+from intrinsic.executive.proto import executive_service_pb2
+from intrinsic.executive.proto import executive_service_pb2_grpc
+from intrinsic.executive.proto import run_metadata_pb2
+
+PROCESS_TREE_SCOPE = "PROCESS_TREE"
+
+_OPERATION_NAME = "fake_operation"
+
+# Default timeout of WaitOperation, see executive_service.proto.
+_DEFAULT_WAIT_TIMEOUT_SECONDS = 60 * 60
+
+_DONE_STATES = (
+    behavior_tree_pb2.BehaviorTree.SUCCEEDED,
+    behavior_tree_pb2.BehaviorTree.FAILED,
+    behavior_tree_pb2.BehaviorTree.CANCELED,
+)
+
+
+class FakeExecutive(
+    executive_service_pb2_grpc.ExecutiveServiceServicer,
+    blackboard_service_pb2_grpc.ExecutiveBlackboardServicer,
+):
+  """Fake executive with a single operation and a blackboard.
+
+  The behavior tree state only changes through the RPCs that change it (e.g.,
+  StartOperation) and through set_state(), which tests call to simulate the
+  progress of the behavior tree. WaitOperation returns as soon as the operation
+  is done.
+
+  Attributes:
+    wait_operation_supported: If False, WaitOperation fails with UNIMPLEMENTED.
+  """
+
+  def __init__(self):
+    self.wait_operation_supported = True
+    self._condition = threading.Condition()
+    self._operation: Optional[operations_pb2.Operation] = None
+    self._metadata = run_metadata_pb2.RunMetadata()
+    self._blackboard: Dict[Tuple[str, str], any_pb2.Any] = {}
+    self._call_counts = collections.Counter()
+
+  def call_count(self, method: str) -> int:
+    """Returns how often the RPC `method` has been called."""
+    with self._condition:
+      return self._call_counts[method]
+
+  def set_state(self, state: behavior_tree_pb2.BehaviorTree.State) -> None:
+    """Sets the behavior tree state of the operation."""
+    with self._condition:
+      self._set_state_locked(state)
+
+  def set_blackboard_value(
+      self,
+      key: str,
+      value: proto_message.Message,
+      scope: str = PROCESS_TREE_SCOPE,
+  ) -> None:
+    """Writes a value to the blackboard of the operation."""
+    value_any = any_pb2.Any()
+    value_any.Pack(value)
+    with self._condition:
+      self._blackboard[(scope, key)] = value_any
+      self._condition.notify_all()
+
+  def CreateOperation(
+      self,
+      request: executive_service_pb2.CreateOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.Operation:
+    with self._condition:
+      self._call_counts["CreateOperation"] += 1
+      if self._operation is not None:
+        context.abort(
+            grpc.StatusCode.FAILED_PRECONDITION, "An operation already exists."
+        )
+      self._operation = operations_pb2.Operation(name=_OPERATION_NAME)
+      self._metadata = run_metadata_pb2.RunMetadata()
+      if request.HasField("behavior_tree"):
+        self._metadata.behavior_tree.CopyFrom(request.behavior_tree)
+      self._blackboard.clear()
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.ACCEPTED)
+      return self._copy_operation_locked()
+
+  def ListOperations(
+      self,
+      request: operations_pb2.ListOperationsRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.ListOperationsResponse:
+    with self._condition:
+      self._call_counts["ListOperations"] += 1
+      response = operations_pb2.ListOperationsResponse()
+      if self._operation is not None:
+        response.operations.append(self._copy_operation_locked())
+      return response
+
+  def GetOperation(
+      self,
+      request: operations_pb2.GetOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.Operation:
+    with self._condition:
+      self._call_counts["GetOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      return self._copy_operation_locked()
+
+  def DeleteOperation(
+      self,
+      request: operations_pb2.DeleteOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> empty_pb2.Empty:
+    with self._condition:
+      self._call_counts["DeleteOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._operation = None
+      self._condition.notify_all()
+      return empty_pb2.Empty()
+
+  def StartOperation(
+      self,
+      request: executive_service_pb2.StartOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.Operation:
+    with self._condition:
+      self._call_counts["StartOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._metadata.execution_mode = request.execution_mode
+      self._metadata.simulation_mode = request.simulation_mode
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.RUNNING)
+      return self._copy_operation_locked()
+
+  def CancelOperation(
+      self,
+      request: operations_pb2.CancelOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> empty_pb2.Empty:
+    with self._condition:
+      self._call_counts["CancelOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.CANCELED)
+      return empty_pb2.Empty()
+
+  def WaitOperation(
+      self,
+      request: operations_pb2.WaitOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.Operation:
+    if not self.wait_operation_supported:
+      context.abort(grpc.StatusCode.UNIMPLEMENTED, "WaitOperation disabled.")
+    timeout = _DEFAULT_WAIT_TIMEOUT_SECONDS
+    if request.HasField("timeout"):
+      timeout = request.timeout.ToTimedelta().total_seconds()
+    with self._condition:
+      self._call_counts["WaitOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._condition.wait_for(
+          lambda: self._operation is None or self._operation.done,
+          timeout=timeout,
+      )
+      self._check_operation_locked(request.name, context)
+      return self._copy_operation_locked()
+
+  def SuspendOperation(
+      self,
+      request: executive_service_pb2.SuspendOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> empty_pb2.Empty:
+    with self._condition:
+      self._call_counts["SuspendOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.SUSPENDED)
+      return empty_pb2.Empty()
+
+  def ResumeOperation(
+      self,
+      request: executive_service_pb2.ResumeOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> operations_pb2.Operation:
+    with self._condition:
+      self._call_counts["ResumeOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.RUNNING)
+      return self._copy_operation_locked()
+
+  def ResetOperation(
+      self,
+      request: executive_service_pb2.ResetOperationRequest,
+      context: grpc.ServicerContext,
+  ) -> empty_pb2.Empty:
+    with self._condition:
+      self._call_counts["ResetOperation"] += 1
+      self._check_operation_locked(request.name, context)
+      self._blackboard.clear()
+      self._set_state_locked(behavior_tree_pb2.BehaviorTree.ACCEPTED)
+      return empty_pb2.Empty()
+
+  def GetBlackboardValue(
+      self,
+      request: blackboard_service_pb2.GetBlackboardValueRequest,
+      context: grpc.ServicerContext,
+  ) -> blackboard_service_pb2.BlackboardValue:
+    with self._condition:
+      self._call_counts["GetBlackboardValue"] += 1
+      self._check_operation_locked(request.operation_name, context)
+      scope = request.scope if request.HasField("scope") else PROCESS_TREE_SCOPE
+      value = self._blackboard.get((scope, request.key))
+      if value is None:
+        context.abort(
+            grpc.StatusCode.NOT_FOUND,
+            f"No value for key {request.key} in scope {scope}.",
+        )
+      return blackboard_service_pb2.BlackboardValue(
+          key=request.key,
+          scope=scope,
+          operation_name=request.operation_name,
+          value=value,
+      )
+
+  def ListBlackboardValues(
+      self,
+      request: blackboard_service_pb2.ListBlackboardValuesRequest,
+      context: grpc.ServicerContext,
+  ) -> blackboard_service_pb2.ListBlackboardValuesResponse:
+    with self._condition:
+      self._call_counts["ListBlackboardValues"] += 1
+      self._check_operation_locked(request.operation_name, context)
+      scope = request.scope if request.HasField("scope") else None
+      response = blackboard_service_pb2.ListBlackboardValuesResponse()
+      for (value_scope, key), value in self._blackboard.items():
+        if scope is None or value_scope == scope:
+          response.values.add(
+              key=key,
+              scope=value_scope,
+              operation_name=request.operation_name,
+              value=value,
+          )
+      return response
+
+  def _check_operation_locked(
+      self, name: str, context: grpc.ServicerContext
+  ) -> None:
+    if self._operation is None or self._operation.name != name:
+      context.abort(grpc.StatusCode.NOT_FOUND, f"No operation {name}.")
+
+  def _set_state_locked(
+      self, state: behavior_tree_pb2.BehaviorTree.State
+  ) -> None:
+    if self._operation is None:
+      raise ValueError("There is no operation.")
+    self._metadata.behavior_tree_state = state
+    self._operation.done = state in _DONE_STATES
+    self._operation.metadata.Pack(self._metadata)
+    self._condition.notify_all()
+
+  def _copy_operation_locked(self) -> operations_pb2.Operation:
+    operation = operations_pb2.Operation()
+    operation.CopyFrom(self._operation)
+    return operation
@@ -2,11 +2,15 @@
 
 """Shared handlers for grpc errors."""
 
-from typing import cast
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, TypeVar, cast
 
 import grpc
 import retrying
 
+_T = TypeVar("_T")
+
 
 # The Ingress will return UNIMPLEMENTED if the server it wants to forward to
 # is unavailable, so we check for both UNAVAILABLE and UNIMPLEMENTED.
@@ -15,6 +19,13 @@ _UNAVAILABLE_CODES = [
     grpc.StatusCode.UNIMPLEMENTED,
 ]
 
+# Retry policy of retry_on_grpc_unavailable(_async).
+_MAX_ATTEMPTS = 15
+_WAIT_EXPONENTIAL_MULTIPLIER_MS = 3
+_WAIT_EXPONENTIAL_MAX_MS = 10000
+_WAIT_INCREMENTING_START_MS = 500
+_WAIT_INCREMENTING_INCREMENT_MS = 100
+
 
 def is_unavailable_grpc_status(exception: Exception) -> bool:
   """Returns True if the given exception signals temporary unavailability.
@@ -30,6 +41,8 @@ def is_unavailable_grpc_status(exception: Exception) -> bool:
   """
   if isinstance(exception, grpc.Call):
     return cast(grpc.Call, exception).code() in _UNAVAILABLE_CODES
+  if isinstance(exception, grpc.aio.AioRpcError):
+    return exception.code() in _UNAVAILABLE_CODES
   return False
 
 
@@ -44,8 +57,51 @@ def _is_unavailable_grpc_status_with_logging(exception: Exception) -> bool:
 # Decorator that retries gRPC requests if the server is unavailable.
 retry_on_grpc_unavailable = retrying.retry(
     retry_on_exception=_is_unavailable_grpc_status_with_logging,
-    stop_max_attempt_number=15,
-    wait_exponential_multiplier=3,
-    wait_exponential_max=10000,  # in milliseconds
-    wait_incrementing_start=500,  # in milliseconds
+    stop_max_attempt_number=_MAX_ATTEMPTS,
+    wait_exponential_multiplier=_WAIT_EXPONENTIAL_MULTIPLIER_MS,
+    wait_exponential_max=_WAIT_EXPONENTIAL_MAX_MS,
+    wait_incrementing_start=_WAIT_INCREMENTING_START_MS,
 )
+
+
+def _retry_wait_ms(attempt: int) -> int:
+  """Returns the wait after `attempt` attempts, as in retry_on_grpc_unavailable."""
+  exponential = min(
+      _WAIT_EXPONENTIAL_MULTIPLIER_MS * 2**attempt, _WAIT_EXPONENTIAL_MAX_MS
+  )
+  incrementing = _WAIT_INCREMENTING_START_MS + (
+      _WAIT_INCREMENTING_INCREMENT_MS * (attempt - 1)
+  )
+  return max(exponential, incrementing)
+
+
+def retry_on_grpc_unavailable_async(
+    fn: Callable[..., Awaitable[_T]],
+) -> Callable[..., Awaitable[_T]]:
+  """Decorator that retries asyncio gRPC requests if the server is unavailable.
+
+  Same as retry_on_grpc_unavailable, but for coroutine functions. Waits between
+  attempts with asyncio.sleep(), so other tasks keep running.
+
+  Args:
+    fn: The coroutine function to retry.
+
+  Returns:
+    The decorated coroutine function.
+  """
+
+  @functools.wraps(fn)
+  async def wrapper(*args: Any, **kwargs: Any) -> _T:
+    attempt = 1
+    while True:
+      try:
+        return await fn(*args, **kwargs)
+      except Exception as e:  # pylint: disable=broad-except
+        if attempt >= _MAX_ATTEMPTS or not (
+            _is_unavailable_grpc_status_with_logging(e)
+        ):
+          raise
+      await asyncio.sleep(_retry_wait_ms(attempt) / 1000)
+      attempt += 1
+
+  return wrapper
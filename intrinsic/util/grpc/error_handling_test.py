@@ -2,6 +2,7 @@
 
 """Tests for intrinsic.util.grpc."""
 
+import asyncio
 import time
 from unittest import mock
 
@@ -28,6 +29,11 @@ def _call_with_retry(stub) -> str:
   return stub.call()
 
 
+@error_handling.retry_on_grpc_unavailable_async
+async def _call_with_retry_async(stub) -> str:
+  return await stub.call()
+
+
 class ErrorsTest(absltest.TestCase):
 
   @mock.patch.object(time, 'sleep')
@@ -71,6 +77,43 @@ class ErrorsTest(absltest.TestCase):
     self.assertEqual(str(context.exception), 'non-grpc error')
     self.assertEqual(stub.call.call_count, 1)
 
+  @mock.patch.object(asyncio, 'sleep')
+  def test_retry_on_grpc_unavailable_async_retries_on_certain_errors(
+      self, mock_sleep
+  ):
+    stub = mock.MagicMock()
+    stub.call = mock.AsyncMock(
+        side_effect=[
+            _GrpcError(grpc.StatusCode.UNAVAILABLE),
+            _GrpcError(grpc.StatusCode.UNIMPLEMENTED),
+            'some result',
+        ]
+    )
+    result = asyncio.run(_call_with_retry_async(stub))
+    self.assertEqual(result, 'some result')
+    self.assertEqual(mock_sleep.call_count, 2)
+
+  @mock.patch.object(asyncio, 'sleep')
+  def test_retry_on_grpc_unavailable_async_fails_after_max_retries(self, _):
+    stub = mock.MagicMock()
+    stub.call = mock.AsyncMock(
+        side_effect=_GrpcError(grpc.StatusCode.UNAVAILABLE)
+    )
+    with self.assertRaises(_GrpcError):
+      asyncio.run(_call_with_retry_async(stub))
+    self.assertEqual(stub.call.call_count, 15)
+
+  def test_retry_on_grpc_unavailable_async_does_not_retry_on_other_error(
+      self,
+  ):
+    stub = mock.MagicMock()
+    stub.call = mock.AsyncMock(
+        side_effect=_GrpcError(grpc.StatusCode.INVALID_ARGUMENT)
+    )
+    with self.assertRaises(_GrpcError):
+      asyncio.run(_call_with_retry_async(stub))
+    self.assertEqual(stub.call.call_count, 1)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -6,8 +6,9 @@ The ObjectWorldClient is used to access all elements in the object world in
 Python.
 """
 
+import functools
 import re
-from typing import Dict, List, Optional, Tuple, Union, cast
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union, cast
 
 import grpc
 from intrinsic.geometry.service import geometry_service_pb2
@@ -27,6 +28,9 @@ from intrinsic.world.proto import object_world_service_pb2_grpc
 from intrinsic.world.proto import object_world_updates_pb2
 from intrinsic.world.python import object_world_ids
 from intrinsic.world.python import object_world_resources
+from intrinsic.world.python import object_world_snapshot
+from intrinsic.world.python import transform_graph
+from intrinsic.world.python import world_mirror
 from intrinsic.world.robot_payload.python import robot_payload
 
 # Convenience constant for an ObjectEntityFilter that selects only the base
@@ -48,6 +52,8 @@ INCLUDE_ALL_ENTITIES = object_world_refs_pb2.ObjectEntityFilter(
 
 ICON2_POSITION_PART_KEY = 'Icon2PositionPart'
 
+_CallableT = TypeVar('_CallableT', bound=Callable[..., object])
+
 
 class ProductPartDoesNotExistError(ValueError):
   """A non-existent product part was specified."""
@@ -78,6 +84,29 @@ def _has_grpc_status(
   return cast(grpc.Call, grpc_error).code() == grpc_status
 
 
+def _invalidates_snapshot(method: _CallableT) -> _CallableT:
+  """Marks a method of ObjectWorldClient as mutating the world.
+
+  The cached world snapshot of the client is discarded after the method
+  returns, also if it raises, since the world might have been changed partially.
+
+  Args:
+    method: The method to wrap.
+
+  Returns:
+    The wrapped method.
+  """
+
+  @functools.wraps(method)
+  def wrapper(self: 'ObjectWorldClient', *args, **kwargs):
+    try:
+      return method(self, *args, **kwargs)
+    finally:
+      self.invalidate_snapshot()
+
+  return cast(_CallableT, wrapper)
+
+
 def _get_path_from_root(
     world_object: object_world_resources.WorldObject,
     id_to_object: Dict[
@@ -109,6 +138,566 @@ def _get_path_from_root(
   return '.'.join(reversed(names))
 
 
+def _update_transform_request(
+    world_id: str,
+    node_a: object_world_resources.TransformNode,
+    node_b: object_world_resources.TransformNode,
+    a_t_b: data_types.Pose3,
+    node_to_update: Optional[object_world_resources.TransformNode],
+) -> object_world_updates_pb2.UpdateTransformRequest:
+  """Returns a request for ObjectWorldClient.update_transform()."""
+  request = object_world_updates_pb2.UpdateTransformRequest(
+      world_id=world_id,
+      node_a=node_a.transform_node_reference,
+      node_b=node_b.transform_node_reference,
+      a_t_b=math_proto_conversion.pose_to_proto(a_t_b),
+      view=object_world_updates_pb2.ObjectView.BASIC,
+  )
+
+  if node_to_update is not None:
+    request.node_to_update.CopyFrom(node_to_update.transform_node_reference)
+  return request
+
+
+def _update_object_name_request(
+    world_id: str,
+    object_to_update: object_world_resources.WorldObject,
+    new_name: object_world_ids.WorldObjectName,
+    name_is_global_alias: bool,
+) -> object_world_updates_pb2.UpdateObjectNameRequest:
+  """Returns a request for ObjectWorldClient.update_object_name()."""
+  return object_world_updates_pb2.UpdateObjectNameRequest(
+      world_id=world_id,
+      object=object_world_refs_pb2.ObjectReference(id=object_to_update.id),
+      name=new_name,
+      view=object_world_updates_pb2.ObjectView.BASIC,
+      name_is_global_alias=name_is_global_alias,
+  )
+
+
+def _update_frame_name_request(
+    world_id: str,
+    frame_to_update: object_world_resources.Frame,
+    new_name: object_world_ids.FrameName,
+) -> object_world_updates_pb2.UpdateFrameNameRequest:
+  """Returns a request for ObjectWorldClient.update_frame_name()."""
+  return object_world_updates_pb2.UpdateFrameNameRequest(
+      world_id=world_id,
+      frame=object_world_refs_pb2.FrameReference(id=frame_to_update.id),
+      name=new_name,
+  )
+
+
+def _update_object_joints_request(
+    world_id: str,
+    kinematic_object: object_world_resources.KinematicObject,
+    **fields,
+) -> object_world_updates_pb2.UpdateObjectJointsRequest:
+  """Returns a request which updates the given fields of the joints."""
+  return object_world_updates_pb2.UpdateObjectJointsRequest(
+      world_id=world_id,
+      object=kinematic_object.reference,
+      view=object_world_updates_pb2.ObjectView.BASIC,
+      **fields,
+  )
+
+
+def _update_kinematic_object_properties_request(
+    world_id: str,
+    kinematic_object: object_world_resources.KinematicObject,
+    **fields,
+) -> object_world_updates_pb2.UpdateKinematicObjectPropertiesRequest:
+  """Returns a request which updates the given kinematic object properties."""
+  return object_world_updates_pb2.UpdateKinematicObjectPropertiesRequest(
+      world_id=world_id, object=kinematic_object.reference, **fields
+  )
+
+
+def _reparent_object_request(
+    world_id: str,
+    child_object: object_world_resources.WorldObject,
+    new_parent: object_world_resources.WorldObject,
+    entity_filter: object_world_refs_pb2.ObjectEntityFilter,
+) -> object_world_updates_pb2.ReparentObjectRequest:
+  """Returns a request for ObjectWorldClient.reparent_object_to()."""
+  return object_world_updates_pb2.ReparentObjectRequest(
+      world_id=world_id,
+      object=object_world_refs_pb2.ObjectReference(id=child_object.id),
+      new_parent=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
+          reference=object_world_refs_pb2.ObjectReference(id=new_parent.id),
+          entity_filter=entity_filter,
+      ),
+  )
+
+
+def _toggle_collisions_request(
+    world_id: str,
+    toggle_mode: object_world_updates_pb2.ToggleMode,
+    first_object: object_world_resources.WorldObject,
+    second_object: object_world_resources.WorldObject,
+    first_entity_filter: object_world_refs_pb2.ObjectEntityFilter,
+    second_entity_filter: object_world_refs_pb2.ObjectEntityFilter,
+) -> object_world_updates_pb2.ToggleCollisionsRequest:
+  """Returns a request which enables or disables collisions."""
+  return object_world_updates_pb2.ToggleCollisionsRequest(
+      world_id=world_id,
+      toggle_mode=toggle_mode,
+      object_a=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
+          reference=object_world_refs_pb2.ObjectReference(id=first_object.id),
+          entity_filter=first_entity_filter,
+      ),
+      object_b=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
+          reference=object_world_refs_pb2.ObjectReference(id=second_object.id),
+          entity_filter=second_entity_filter,
+      ),
+      view=object_world_updates_pb2.ObjectView.BASIC,
+  )
+
+
+def _create_frame_request(
+    world_id: str,
+    frame_name: object_world_ids.FrameName,
+    parent: Optional[object_world_resources.TransformNode],
+    parent_t_frame: data_types.Pose3,
+) -> object_world_updates_pb2.CreateFrameRequest:
+  """Returns a request for ObjectWorldClient.create_frame()."""
+  request = object_world_updates_pb2.CreateFrameRequest(
+      world_id=world_id,
+      new_frame_name=frame_name,
+      parent_t_new_frame=math_proto_conversion.pose_to_proto(parent_t_frame),
+  )
+  if isinstance(parent, object_world_resources.WorldObject):
+    request.parent_object.CopyFrom(parent.reference)
+  elif isinstance(parent, object_world_resources.Frame):
+    request.parent_frame.CopyFrom(parent.reference)
+  elif parent is None:
+    request.parent_object.id = object_world_ids.ROOT_OBJECT_ID
+  else:
+    raise TypeError(f'Cannot use {parent} as parent frame or object.')
+  return request
+
+
+def _reparent_frame_request(
+    world_id: str,
+    frame: object_world_resources.Frame,
+    parent: object_world_resources.TransformNode,
+) -> object_world_updates_pb2.ReparentFrameRequest:
+  """Returns a request for ObjectWorldClient.reparent_frame()."""
+  if not isinstance(frame, object_world_resources.Frame):
+    raise TypeError(f'Cannot use {frame} as Frame to reparent.')
+  request = object_world_updates_pb2.ReparentFrameRequest(
+      world_id=world_id,
+      frame=frame.reference,
+  )
+  if isinstance(parent, object_world_resources.WorldObject):
+    request.parent_object.CopyFrom(
+        object_world_refs_pb2.ObjectReferenceWithEntityFilter(
+            reference=object_world_refs_pb2.ObjectReference(id=parent.id),
+            entity_filter=object_world_refs_pb2.ObjectEntityFilter(
+                include_final_entity=True
+            ),
+        )
+    )
+  elif isinstance(parent, object_world_resources.Frame):
+    request.parent_frame.CopyFrom(parent.reference)
+  else:
+    raise TypeError(f'Cannot use {parent} as parent Frame or WorldObject.')
+  return request
+
+
+def _delete_object_request(
+    world_id: str,
+    world_object: object_world_resources.WorldObject,
+    force: bool,
+) -> object_world_updates_pb2.DeleteObjectRequest:
+  """Returns a request for ObjectWorldClient.delete_object()."""
+  return object_world_updates_pb2.DeleteObjectRequest(
+      world_id=world_id, force=force, object=world_object.reference
+  )
+
+
+def _delete_frame_request(
+    world_id: str,
+    frame: object_world_resources.Frame,
+    force: bool,
+) -> object_world_updates_pb2.DeleteFrameRequest:
+  """Returns a request for ObjectWorldClient.delete_frame()."""
+  return object_world_updates_pb2.DeleteFrameRequest(
+      world_id=world_id, force=force, frame=frame.reference
+  )
+
+
+def _copy_object_proto(
+    world_object: Optional[object_world_service_pb2.Object],
+) -> Optional[object_world_service_pb2.Object]:
+  """Returns a copy of the given object proto or None.
+
+  Objects handed out by the client may be modified by the caller, so protos
+  from the shared world snapshot are always copied.
+
+  Args:
+    world_object: The object proto to copy.
+  """
+  if world_object is None:
+    return None
+  copied_object = object_world_service_pb2.Object()
+  copied_object.CopyFrom(world_object)
+  return copied_object
+
+
+class WorldTransaction:
+  """Records world updates and applies them with a single batch update.
+
+  A WorldTransaction is created with ObjectWorldClient.transaction() and is
+  meant to be used as a context manager:
+
+    with world.transaction() as tx:
+      tx.update_transform(world.root, world.box, root_t_box)
+      tx.update_object_name(world.box, 'new_box')
+      tx.reparent_object(world.box, world.table)
+
+  The methods of a transaction mirror the mutating methods of the
+  ObjectWorldClient but do not contact the world service. Instead, every call
+  is recorded as an ObjectWorldUpdate. When the 'with' block exits normally, all
+  recorded updates are sent in one UpdateWorldResources request, which the
+  world service applies atomically: either all updates are applied or none. If
+  the 'with' block raises an exception, the recorded updates are discarded, the
+  world remains unchanged and the exception is propagated.
+
+  Note that the world is not modified before the transaction is committed, i.e.,
+  queries made through the client inside of the 'with' block still return the
+  state of the world before the transaction.
+
+  Attributes:
+    updates: A copy of the updates recorded so far.
+  """
+
+  def __init__(self, client: 'ObjectWorldClient'):
+    self._client: ObjectWorldClient = client
+    self._updates: object_world_updates_pb2.ObjectWorldUpdates = (
+        object_world_updates_pb2.ObjectWorldUpdates()
+    )
+    self._closed: bool = False
+
+  @property
+  def updates(self) -> object_world_updates_pb2.ObjectWorldUpdates:
+    updates = object_world_updates_pb2.ObjectWorldUpdates()
+    updates.CopyFrom(self._updates)
+    return updates
+
+  def __enter__(self) -> 'WorldTransaction':
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    if exc_type is None:
+      self.commit()
+    else:
+      self.rollback()
+
+  def _record(self, **update) -> None:
+    """Appends an ObjectWorldUpdate with the given oneof field."""
+    if self._closed:
+      raise RuntimeError(
+          'The transaction has already been committed or rolled back.'
+      )
+    self._updates.updates.append(
+        object_world_updates_pb2.ObjectWorldUpdate(**update)
+    )
+
+  def commit(self) -> None:
+    """Applies all recorded updates with a single UpdateWorldResources call.
+
+    Does not contact the world service if no updates were recorded.
+
+    Raises:
+      RuntimeError: The transaction has already been committed or rolled back.
+      RpcError: Error communicating with the world service. None of the updates
+        have been applied in this case.
+    """
+    if self._closed:
+      raise RuntimeError(
+          'The transaction has already been committed or rolled back.'
+      )
+    self._closed = True
+    if self._updates.updates:
+      self._client.batch_update(self._updates)
+
+  def rollback(self) -> None:
+    """Discards all recorded updates without contacting the world service."""
+    self._closed = True
+    self._updates.Clear()
+
+  def update_transform(
+      self,
+      node_a: object_world_resources.TransformNode,
+      node_b: object_world_resources.TransformNode,
+      a_t_b: data_types.Pose3,
+      node_to_update: Optional[object_world_resources.TransformNode] = None,
+  ) -> None:
+    """Records an update of the pose between two nodes.
+
+    See ObjectWorldClient.update_transform().
+    """
+    self._record(
+        update_transform=_update_transform_request(
+            '', node_a, node_b, a_t_b, node_to_update
+        )
+    )
+
+  def update_object_name(
+      self,
+      object_to_update: object_world_resources.WorldObject,
+      new_name: object_world_ids.WorldObjectName,
+      *,
+      name_is_global_alias: bool = True,
+  ) -> None:
+    """Records a name change of an object.
+
+    See ObjectWorldClient.update_object_name().
+    """
+    self._record(
+        update_object_name=_update_object_name_request(
+            '', object_to_update, new_name, name_is_global_alias
+        )
+    )
+
+  def update_frame_name(
+      self,
+      frame_to_update: object_world_resources.Frame,
+      new_name: object_world_ids.FrameName,
+  ) -> None:
+    """Records a name change of a frame.
+
+    See ObjectWorldClient.update_frame_name().
+    """
+    self._record(
+        update_frame_name=_update_frame_name_request(
+            '', frame_to_update, new_name
+        )
+    )
+
+  def update_joint_positions(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      joint_positions: List[float],
+      joint_names: Optional[List[str]] = None,
+  ) -> None:
+    """Records an update of the joint positions of a kinematic object.
+
+    See ObjectWorldClient.update_joint_positions().
+    """
+    self._record(
+        update_object_joints=_update_object_joints_request(
+            '',
+            kinematic_object,
+            joint_positions=joint_positions,
+            joint_names=[] if joint_names is None else joint_names,
+        )
+    )
+
+  def update_joint_application_limits(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      joint_limits: joint_limits_pb2.JointLimitsUpdate,
+  ) -> None:
+    """Records an update of the joint application limits of an object.
+
+    See ObjectWorldClient.update_joint_application_limits().
+    """
+    self._record(
+        update_object_joints=_update_object_joints_request(
+            '', kinematic_object, joint_application_limits=joint_limits
+        )
+    )
+
+  def update_joint_system_limits(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      joint_limits: joint_limits_pb2.JointLimitsUpdate,
+  ) -> None:
+    """Records an update of the joint system limits of an object.
+
+    See ObjectWorldClient.update_joint_system_limits().
+    """
+    self._record(
+        update_object_joints=_update_object_joints_request(
+            '', kinematic_object, joint_system_limits=joint_limits
+        )
+    )
+
+  def update_kinematic_object_cartesian_limits(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      limits: cart_space_pb2.CartesianLimits,
+  ) -> None:
+    """Records an update of the cartesian limits of a kinematic object.
+
+    See ObjectWorldClient.update_kinematic_object_cartesian_limits().
+    """
+    self._record(
+        update_kinematic_object_properties=(
+            _update_kinematic_object_properties_request(
+                '', kinematic_object, cartesian_limits=limits
+            )
+        )
+    )
+
+  def update_kinematic_object_payload(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      payload: robot_payload.RobotPayload,
+  ) -> None:
+    """Records an update of the mounted payload of a kinematic object.
+
+    See ObjectWorldClient.update_kinematic_object_payload().
+    """
+    self._record(
+        update_kinematic_object_properties=(
+            _update_kinematic_object_properties_request(
+                '',
+                kinematic_object,
+                mounted_payload=robot_payload.payload_to_proto(payload),
+            )
+        )
+    )
+
+  def reparent_object(
+      self,
+      child_object: object_world_resources.WorldObject,
+      new_parent: object_world_resources.WorldObject,
+  ) -> None:
+    """Records reparenting an object to the base entity of a new parent.
+
+    See ObjectWorldClient.reparent_object().
+    """
+    self.reparent_object_to(child_object, new_parent, INCLUDE_BASE_ENTITY)
+
+  def reparent_object_to(
+      self,
+      child_object: object_world_resources.WorldObject,
+      new_parent: object_world_resources.WorldObject,
+      entity_filter: object_world_refs_pb2.ObjectEntityFilter,
+  ) -> None:
+    """Records reparenting an object to the matching entity of a new parent.
+
+    See ObjectWorldClient.reparent_object_to().
+    """
+    self._record(
+        reparent_object=_reparent_object_request(
+            '', child_object, new_parent, entity_filter
+        )
+    )
+
+  def reparent_object_to_final_entity(
+      self,
+      child_object: object_world_resources.WorldObject,
+      new_parent: object_world_resources.KinematicObject,
+  ) -> None:
+    """Records reparenting an object to the final entity of a new parent.
+
+    See ObjectWorldClient.reparent_object_to_final_entity().
+    """
+    self.reparent_object_to(child_object, new_parent, INCLUDE_FINAL_ENTITY)
+
+  def disable_collisions(
+      self,
+      first_object: object_world_resources.WorldObject,
+      second_object: object_world_resources.WorldObject,
+      *,
+      first_entity_filter: object_world_refs_pb2.ObjectEntityFilter = INCLUDE_ALL_ENTITIES,
+      second_entity_filter: object_world_refs_pb2.ObjectEntityFilter = INCLUDE_ALL_ENTITIES,
+  ) -> None:
+    """Records disabling collisions between two objects.
+
+    See ObjectWorldClient.disable_collisions().
+    """
+    self._record(
+        toggle_collisions=_toggle_collisions_request(
+            '',
+            object_world_updates_pb2.TOGGLE_MODE_DISABLE,
+            first_object,
+            second_object,
+            first_entity_filter,
+            second_entity_filter,
+        )
+    )
+
+  def enable_collisions(
+      self,
+      first_object: object_world_resources.WorldObject,
+      second_object: object_world_resources.WorldObject,
+      *,
+      first_entity_filter: object_world_refs_pb2.ObjectEntityFilter = INCLUDE_ALL_ENTITIES,
+      second_entity_filter: object_world_refs_pb2.ObjectEntityFilter = INCLUDE_ALL_ENTITIES,
+  ) -> None:
+    """Records enabling collisions between two objects.
+
+    See ObjectWorldClient.enable_collisions().
+    """
+    self._record(
+        toggle_collisions=_toggle_collisions_request(
+            '',
+            object_world_updates_pb2.TOGGLE_MODE_ENABLE,
+            first_object,
+            second_object,
+            first_entity_filter,
+            second_entity_filter,
+        )
+    )
+
+  def delete_object(
+      self,
+      world_object: object_world_resources.WorldObject,
+      *,
+      force: bool = False,
+  ) -> None:
+    """Records deleting an object.
+
+    See ObjectWorldClient.delete_object().
+    """
+    self._record(delete_object=_delete_object_request('', world_object, force))
+
+  def delete_frame(
+      self, frame: object_world_resources.Frame, *, force: bool = False
+  ) -> None:
+    """Records deleting a frame.
+
+    See ObjectWorldClient.delete_frame().
+    """
+    self._record(delete_frame=_delete_frame_request('', frame, force))
+
+  def create_frame(
+      self,
+      frame_name: object_world_ids.FrameName,
+      parent: Optional[object_world_resources.TransformNode] = None,
+      parent_t_frame: Optional[data_types.Pose3] = data_types.Pose3(),
+  ) -> None:
+    """Records creating a new frame.
+
+    Unlike ObjectWorldClient.create_frame() this does not return the new frame,
+    since it does not exist before the transaction is committed. Later updates
+    in the same transaction can only refer to the new frame by name.
+
+    See ObjectWorldClient.create_frame().
+    """
+    self._record(
+        create_frame=_create_frame_request(
+            '', frame_name, parent, parent_t_frame
+        )
+    )
+
+  def reparent_frame(
+      self,
+      frame: object_world_resources.Frame,
+      parent: object_world_resources.TransformNode,
+  ) -> None:
+    """Records reparenting a frame to another frame or object.
+
+    See ObjectWorldClient.reparent_frame().
+    """
+    self._record(reparent_frame=_reparent_frame_request('', frame, parent))
+
+
 class ObjectWorldClient:
   """Provides access to a remote world in the world service.
 
@@ -116,8 +705,28 @@ class ObjectWorldClient:
   gives access to objects and frames in the world and returns Python objects for
   frames and objects.
 
+  If created with 'cache_snapshot=True', the client keeps a versioned local
+  snapshot of all objects and frames of the world, which is fetched with a
+  single request on first use. Attribute access (e.g.,
+  'world.robot.gripper.tool_frame'), 'list_objects()', 'get_object()',
+  'get_frame()' and 'get_transform()' are then answered from the snapshot
+  whenever possible. The snapshot is discarded on every mutating call made
+  through this client. Changes made to the world by other clients are not
+  detected; call 'invalidate_snapshot()' to force a refresh.
+
+  If created with 'sync_with_world=True', the client keeps the snapshot in sync
+  with the world service instead (see WorldMirror): queries first check with a
+  single cheap GetWorld request whether the world has changed and only list the
+  world again if it has. This also detects changes made by other clients and
+  makes repeated calls to 'list_objects()', 'list_object_full_paths()' or
+  'str(world)' cost one small request while the world does not change. Chained
+  attribute access (e.g., 'world.robot.gripper.tool_frame') only checks the
+  world once for the first object and resolves the rest from the same snapshot.
+
   Attributes:
     world_id: The world's ID.
+    snapshot_version: The version of the current world snapshot. Increases with
+      every invalidation of the snapshot.
   """
 
   @property
@@ -131,8 +740,17 @@ class ObjectWorldClient:
       geometry_service_stub: Optional[
           geometry_service_pb2_grpc.GeometryServiceStub
       ] = None,
+      *,
+      cache_snapshot: bool = False,
+      sync_with_world: bool = False,
   ):
     self._stub: object_world_service_pb2_grpc.ObjectWorldServiceStub = stub
+    self._cache_snapshot: bool = cache_snapshot
+    self._mirror: Optional[world_mirror.WorldMirror] = (
+        world_mirror.WorldMirror(world_id, stub) if sync_with_world else None
+    )
+    self._snapshot: Optional[object_world_snapshot.WorldSnapshot] = None
+    self._snapshot_version: int = 0
 
     if geometry_service_stub is not None:
       self._geometry_service_stub: (
@@ -143,6 +761,89 @@ class ObjectWorldClient:
 
     self._world_id: str = world_id
 
+  @property
+  def snapshot_version(self) -> int:
+    return self._snapshot_version
+
+  def invalidate_snapshot(self) -> None:
+    """Discards the cached world snapshot.
+
+    The next query that can be answered from a snapshot fetches a new one. Has
+    no effect if the client was created without 'cache_snapshot=True' or
+    'sync_with_world=True'.
+    """
+    self._snapshot = None
+    self._snapshot_version += 1
+    if self._mirror is not None:
+      self._mirror.invalidate()
+
+  @error_handling.retry_on_grpc_unavailable
+  def _list_object_protos(
+      self, view: object_world_updates_pb2.ObjectView
+  ) -> List[object_world_service_pb2.Object]:
+    """Returns the protos of all objects in the world with a single Rpc."""
+    return list(
+        self._stub.ListObjects(
+            object_world_service_pb2.ListObjectsRequest(
+                world_id=self._world_id, view=view
+            )
+        ).objects
+    )
+
+  def _get_snapshot(self) -> Optional[object_world_snapshot.WorldSnapshot]:
+    """Returns the cached world snapshot or None if caching is disabled."""
+    if self._mirror is not None:
+      self._mirror.sync()
+      return self._mirror.snapshot
+    if not self._cache_snapshot:
+      return None
+    if self._snapshot is None:
+      self._snapshot = object_world_snapshot.WorldSnapshot(
+          self._snapshot_version,
+          self._list_object_protos(object_world_updates_pb2.ObjectView.FULL),
+      )
+    return self._snapshot
+
+  def _resolve_cached_object_proto(
+      self, reference: object_world_refs_pb2.ObjectReference
+  ) -> Optional[object_world_service_pb2.Object]:
+    """Returns a copy of an object proto from the snapshot or None."""
+    snapshot = self._get_snapshot()
+    if snapshot is None:
+      return None
+    return _copy_object_proto(snapshot.get_object(reference))
+
+  def _resolve_mirrored_object_proto(
+      self, reference: object_world_refs_pb2.ObjectReference
+  ) -> Optional[object_world_service_pb2.Object]:
+    """Returns a copy of an object proto from the mirror or None.
+
+    Does not sync the mirror: objects handed out by the client were created
+    from its current snapshot, so their parents and children are resolved
+    against the same state of the world without further requests.
+
+    Args:
+      reference: The object to look up.
+
+    Returns:
+      A copy of the object proto or None if the mirror has no snapshot yet or
+      does not contain the object.
+    """
+    snapshot = self._mirror.snapshot
+    if snapshot is None:
+      return None
+    return _copy_object_proto(snapshot.get_object(reference))
+
+  def _object_proto_resolver(
+      self,
+  ) -> Optional[object_world_resources.ObjectProtoResolver]:
+    """Returns the resolver handed to objects created by this client."""
+    if self._mirror is not None:
+      return self._resolve_mirrored_object_proto
+    if not self._cache_snapshot:
+      return None
+    return self._resolve_cached_object_proto
+
   def list_object_names(self) -> List[object_world_ids.WorldObjectName]:
     """Lists the names of all objects in the world service.
 
@@ -173,7 +874,9 @@ class ObjectWorldClient:
   ) -> object_world_resources.WorldObject:
     """Creates an object from a object proto."""
     return object_world_resources.create_object_with_auto_type(
-        world_object, self._stub
+        world_object,
+        self._stub,
+        object_proto_resolver=self._object_proto_resolver(),
     )
 
   def list_objects(self) -> List[object_world_resources.WorldObject]:
@@ -182,16 +885,22 @@ class ObjectWorldClient:
     Returns:
       A list with all objects in the world.
     """
-    response = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.FULL,
-        )
-    )
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      object_protos = [
+          _copy_object_proto(world_object) for world_object in snapshot.objects
+      ]
+    else:
+      object_protos = self._stub.ListObjects(
+          object_world_service_pb2.ListObjectsRequest(
+              world_id=self._world_id,
+              view=object_world_updates_pb2.ObjectView.FULL,
+          )
+      ).objects
 
     return [
         self._create_object_with_auto_type(world_object)
-        for world_object in response.objects
+        for world_object in object_protos
     ]
 
   @error_handling.retry_on_grpc_unavailable
@@ -221,6 +930,10 @@ class ObjectWorldClient:
           'Only ObjectReference,  WorldObjectName or ResourceHandle are '
           'valid input types.'
       )
+    if request.HasField('object'):
+      cached_proto = self._resolve_cached_object_proto(request.object)
+      if cached_proto is not None:
+        return cached_proto
     request.view = object_world_updates_pb2.ObjectView.FULL
     return self._stub.GetObject(request)
 
@@ -364,7 +1077,9 @@ class ObjectWorldClient:
             )
         )
     return object_world_resources.KinematicObject(
-        self._get_object_proto(object_reference), self._stub
+        self._get_object_proto(object_reference),
+        self._stub,
+        object_proto_resolver=self._object_proto_resolver(),
     )
 
   @error_handling.retry_on_grpc_unavailable
@@ -425,6 +1140,15 @@ class ObjectWorldClient:
       return self.get_object(object_name).get_frame(frame_reference)
     else:
       raise TypeError('get_frame is called with the wrong arguments.')
+
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      cached_frame = snapshot.get_frame(request.frame)
+      if cached_frame is not None:
+        frame_proto = object_world_service_pb2.Frame()
+        frame_proto.CopyFrom(cached_frame)
+        return object_world_resources.Frame(frame_proto, self._stub)
+
     return object_world_resources.Frame(
         self._stub.GetFrame(request), self._stub
     )
@@ -446,6 +1170,12 @@ class ObjectWorldClient:
       'node_a'. 'node_a' and 'node_b' can be arbitrary nodes in the transform
       tree of the world and don't have to be parent and child.
     """
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      a_t_b = snapshot.get_transform(node_a.id, node_b.id)
+      if a_t_b is not None:
+        return a_t_b
+
     response = self._stub.GetTransform(
         object_world_service_pb2.GetTransformRequest(
             world_id=self._world_id,
@@ -455,6 +1185,58 @@ class ObjectWorldClient:
     )
     return math_proto_conversion.pose_from_proto(response.a_t_b)
 
+  def get_transform_graph(self) -> transform_graph.TransformGraph:
+    """Returns a local transform graph of the world.
+
+    If the client caches a world snapshot, the graph of the snapshot is
+    returned. Otherwise a new graph is built from a single ListObjects request.
+    The graph does not reflect later changes of the world.
+
+    Returns:
+      A transform graph that answers pose queries between objects and frames
+      without contacting the world service.
+    """
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      return snapshot.transform_graph
+    return transform_graph.TransformGraph(
+        self._list_object_protos(object_world_updates_pb2.ObjectView.FULL)
+    )
+
+  def get_transforms(
+      self,
+      node_pairs: Sequence[
+          Tuple[
+              object_world_resources.TransformNode,
+              object_world_resources.TransformNode,
+          ]
+      ],
+  ) -> List[data_types.Pose3]:
+    """Get the transforms between many pairs of nodes in the world.
+
+    All transforms are computed locally from a single snapshot of the world
+    (see get_transform_graph()). Only pairs which cannot be resolved locally,
+    e.g., because they involve objects attached to the moving parts of a robot,
+    are sent to the world service one by one.
+
+    Args:
+      node_pairs: A sequence of (node_a, node_b) tuples.
+
+    Returns:
+      The transforms 'a_t_b' for all pairs, in the order of 'node_pairs'.
+    """
+    if not node_pairs:
+      return []
+    graph = self.get_transform_graph()
+    local_transforms = graph.get_transforms(
+        [(node_a.id, node_b.id) for node_a, node_b in node_pairs]
+    )
+    return [
+        a_t_b if a_t_b is not None else self.get_transform(node_a, node_b)
+        for a_t_b, (node_a, node_b) in zip(local_transforms, node_pairs)
+    ]
+
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_transform(
       self,
@@ -490,24 +1272,18 @@ class ObjectWorldClient:
     Raises:
       RpcError: Error communicating with the world service.
     """
-    request = object_world_updates_pb2.UpdateTransformRequest(
-        world_id=self._world_id,
-        node_a=node_a.transform_node_reference,
-        node_b=node_b.transform_node_reference,
-        a_t_b=math_proto_conversion.pose_to_proto(a_t_b),
-        view=object_world_updates_pb2.ObjectView.BASIC,
+    self._stub.UpdateTransform(
+        _update_transform_request(
+            self._world_id, node_a, node_b, a_t_b, node_to_update
+        )
     )
 
-    if node_to_update is not None:
-      request.node_to_update.CopyFrom(node_to_update.transform_node_reference)
-
-    self._stub.UpdateTransform(request)
-
   @property
   def stub(self) -> object_world_service_pb2_grpc.ObjectWorldServiceStub:
     """Returns the gRPC stub."""
     return self._stub
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_object_name(
       self,
@@ -528,17 +1304,12 @@ class ObjectWorldClient:
       InvalidArgumentError: The new name is already used for another object.
     """
     self._stub.UpdateObjectName(
-        object_world_updates_pb2.UpdateObjectNameRequest(
-            world_id=self._world_id,
-            object=object_world_refs_pb2.ObjectReference(
-                id=object_to_update.id
-            ),
-            name=new_name,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-            name_is_global_alias=name_is_global_alias,
+        _update_object_name_request(
+            self._world_id, object_to_update, new_name, name_is_global_alias
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_frame_name(
       self,
@@ -557,13 +1328,10 @@ class ObjectWorldClient:
     """
 
     self._stub.UpdateFrameName(
-        object_world_updates_pb2.UpdateFrameNameRequest(
-            world_id=self._world_id,
-            frame=object_world_refs_pb2.FrameReference(id=frame_to_update.id),
-            name=new_name,
-        )
+        _update_frame_name_request(self._world_id, frame_to_update, new_name)
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_joint_positions(
       self,
@@ -582,15 +1350,15 @@ class ObjectWorldClient:
         joint_positions list.
     """
     self._stub.UpdateObjectJoints(
-        object_world_updates_pb2.UpdateObjectJointsRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
+        _update_object_joints_request(
+            self._world_id,
+            kinematic_object,
             joint_positions=joint_positions,
             joint_names=[] if joint_names is None else joint_names,
-            view=object_world_updates_pb2.ObjectView.BASIC,
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_joint_application_limits(
       self,
@@ -605,14 +1373,14 @@ class ObjectWorldClient:
         currently not supported and will be ignored.
     """
     self._stub.UpdateObjectJoints(
-        object_world_updates_pb2.UpdateObjectJointsRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
+        _update_object_joints_request(
+            self._world_id,
+            kinematic_object,
             joint_application_limits=joint_limits,
-            view=object_world_updates_pb2.ObjectView.BASIC,
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_kinematic_object_cartesian_limits(
       self,
@@ -626,13 +1394,12 @@ class ObjectWorldClient:
       limits: The new cartesian limits.
     """
     self._stub.UpdateKinematicObjectProperties(
-        object_world_updates_pb2.UpdateKinematicObjectPropertiesRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
-            cartesian_limits=limits,
+        _update_kinematic_object_properties_request(
+            self._world_id, kinematic_object, cartesian_limits=limits
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_kinematic_object_payload(
       self,
@@ -641,13 +1408,14 @@ class ObjectWorldClient:
   ) -> None:
 
     self._stub.UpdateKinematicObjectProperties(
-        object_world_updates_pb2.UpdateKinematicObjectPropertiesRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
+        _update_kinematic_object_properties_request(
+            self._world_id,
+            kinematic_object,
             mounted_payload=robot_payload.payload_to_proto(payload),
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def update_joint_system_limits(
       self,
@@ -662,14 +1430,12 @@ class ObjectWorldClient:
         JointLimits.max_effort is currently not supported and will be ignored.
     """
     self._stub.UpdateObjectJoints(
-        object_world_updates_pb2.UpdateObjectJointsRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
-            joint_system_limits=joint_limits,
-            view=object_world_updates_pb2.ObjectView.BASIC,
+        _update_object_joints_request(
+            self._world_id, kinematic_object, joint_system_limits=joint_limits
         )
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def _call_reparent_object(
       self,
@@ -678,15 +1444,8 @@ class ObjectWorldClient:
       entity_filter: object_world_refs_pb2.ObjectEntityFilter,
   ) -> None:
     self._stub.ReparentObject(
-        object_world_updates_pb2.ReparentObjectRequest(
-            world_id=self._world_id,
-            object=object_world_refs_pb2.ObjectReference(id=child_object.id),
-            new_parent=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
-                reference=object_world_refs_pb2.ObjectReference(
-                    id=new_parent.id
-                ),
-                entity_filter=entity_filter,
-            ),
+        _reparent_object_request(
+            self._world_id, child_object, new_parent, entity_filter
         )
     )
 
@@ -758,6 +1517,7 @@ class ObjectWorldClient:
         object_world_refs_pb2.ObjectEntityFilter(include_final_entity=True),
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def _call_toggle_collisions(
       self,
@@ -768,22 +1528,13 @@ class ObjectWorldClient:
       second_entity_filter: object_world_refs_pb2.ObjectEntityFilter,
   ) -> None:
     return self._stub.ToggleCollisions(
-        object_world_updates_pb2.ToggleCollisionsRequest(
-            world_id=self._world_id,
-            toggle_mode=toggle_mode,
-            object_a=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
-                reference=object_world_refs_pb2.ObjectReference(
-                    id=first_object.id
-                ),
-                entity_filter=first_entity_filter,
-            ),
-            object_b=object_world_refs_pb2.ObjectReferenceWithEntityFilter(
-                reference=object_world_refs_pb2.ObjectReference(
-                    id=second_object.id
-                ),
-                entity_filter=second_entity_filter,
-            ),
-            view=object_world_updates_pb2.ObjectView.BASIC,
+        _toggle_collisions_request(
+            self._world_id,
+            toggle_mode,
+            first_object,
+            second_object,
+            first_entity_filter,
+            second_entity_filter,
         )
     )
 
@@ -864,12 +1615,16 @@ class ObjectWorldClient:
     """Returns name to reference dicts for both objects and frames under the root object namespace."""
     # This is a special helper method to enable __dir__ and __get_attr__ with
     # only one Rpc.
-    world_objects_proto = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-        )
-    ).objects
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      world_objects_proto = snapshot.objects
+    else:
+      world_objects_proto = self._stub.ListObjects(
+          object_world_service_pb2.ListObjectsRequest(
+              world_id=self._world_id,
+              view=object_world_updates_pb2.ObjectView.BASIC,
+          )
+      ).objects
 
     object_name_to_ref: Dict[
         object_world_ids.WorldObjectName, object_world_refs_pb2.ObjectReference
@@ -901,12 +1656,16 @@ class ObjectWorldClient:
   @error_handling.retry_on_grpc_unavailable
   def _get_object_names(self) -> List[object_world_ids.WorldObjectName]:
     """Returns the object names and the root object with a single Rpc."""
-    world_objects_proto = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-        )
-    ).objects
+    snapshot = self._get_snapshot()
+    if snapshot is not None:
+      world_objects_proto = snapshot.objects
+    else:
+      world_objects_proto = self._stub.ListObjects(
+          object_world_service_pb2.ListObjectsRequest(
+              world_id=self._world_id,
+              view=object_world_updates_pb2.ObjectView.BASIC,
+          )
+      ).objects
 
     object_names: List[object_world_ids.WorldObjectName] = list()
 
@@ -1037,6 +1796,7 @@ class ObjectWorldClient:
     )
     return '\n'.join(lines)
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def delete_object(
       self,
@@ -1051,11 +1811,10 @@ class ObjectWorldClient:
       force: Enables force deletion to remove objects including their children.
     """
     self._stub.DeleteObject(
-        object_world_updates_pb2.DeleteObjectRequest(
-            world_id=self._world_id, force=force, object=world_object.reference
-        )
+        _delete_object_request(self._world_id, world_object, force)
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def delete_frame(
       self, frame: object_world_resources.Frame, *, force: bool = False
@@ -1066,12 +1825,9 @@ class ObjectWorldClient:
       frame: The frame to delete.
       force: Enables force deletion to remove frames including their children.
     """
-    self._stub.DeleteFrame(
-        object_world_updates_pb2.DeleteFrameRequest(
-            world_id=self._world_id, force=force, frame=frame.reference
-        )
-    )
+    self._stub.DeleteFrame(_delete_frame_request(self._world_id, frame, force))
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def _call_create_frame(
       self, request: object_world_updates_pb2.CreateFrameRequest
@@ -1097,24 +1853,14 @@ class ObjectWorldClient:
     Returns:
       The created frame.
     """
-
-    request = object_world_updates_pb2.CreateFrameRequest(
-        world_id=self._world_id,
-        new_frame_name=frame_name,
-        parent_t_new_frame=math_proto_conversion.pose_to_proto(parent_t_frame),
+    request = _create_frame_request(
+        self._world_id, frame_name, parent, parent_t_frame
     )
-    if isinstance(parent, object_world_resources.WorldObject):
-      request.parent_object.CopyFrom(parent.reference)
-    elif isinstance(parent, object_world_resources.Frame):
-      request.parent_frame.CopyFrom(parent.reference)
-    elif parent is None:
-      request.parent_object.id = object_world_ids.ROOT_OBJECT_ID
-    else:
-      raise TypeError(f'Cannot use {parent} as parent frame or object.')
     return object_world_resources.Frame(
         world_frame=self._call_create_frame(request), stub=self._stub
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def _call_reparent_frame(
       self, request: object_world_updates_pb2.ReparentFrameRequest
@@ -1133,29 +1879,12 @@ class ObjectWorldClient:
       parent: The object or frame under which the new frame shall be moved. If
         parent type is WorldObject, the frame will attach to the final entity.
     """
-    if not isinstance(frame, object_world_resources.Frame):
-      raise TypeError(f'Cannot use {frame} as Frame to reparent.')
-    request = object_world_updates_pb2.ReparentFrameRequest(
-        world_id=self._world_id,
-        frame=frame.reference,
-    )
-    if isinstance(parent, object_world_resources.WorldObject):
-      request.parent_object.CopyFrom(
-          object_world_refs_pb2.ObjectReferenceWithEntityFilter(
-              reference=object_world_refs_pb2.ObjectReference(id=parent.id),
-              entity_filter=object_world_refs_pb2.ObjectEntityFilter(
-                  include_final_entity=True
-              ),
-          )
-      )
-    elif isinstance(parent, object_world_resources.Frame):
-      request.parent_frame.CopyFrom(parent.reference)
-    else:
-      raise TypeError(f'Cannot use {parent} as parent Frame or WorldObject.')
+    request = _reparent_frame_request(self._world_id, frame, parent)
     object_world_resources.Frame(
         world_frame=self._call_reparent_frame(request), stub=self._stub
     )
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def _call_create_object(
       self, request: object_world_updates_pb2.CreateObjectRequest
@@ -1280,6 +2009,7 @@ class ObjectWorldClient:
 
     self._call_create_object(request=req)
 
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def batch_update(
       self, updates: object_world_updates_pb2.ObjectWorldUpdates
@@ -1297,6 +2027,21 @@ class ObjectWorldClient:
         )
     )
 
+  def transaction(self) -> WorldTransaction:
+    """Returns a transaction which applies updates with a single request.
+
+    Usage:
+
+      with world.transaction() as tx:
+        tx.update_transform(world.root, world.box, root_t_box)
+        tx.delete_frame(world.table.old_frame)
+
+    All updates recorded in the 'with' block are applied atomically when the
+    block exits and are discarded if it raises. See WorldTransaction.
+    """
+    return WorldTransaction(self)
+
+  @_invalidates_snapshot
   @error_handling.retry_on_grpc_unavailable
   def reset(self) -> None:
     """Restores the initial world from the world service.
@@ -5,6 +5,8 @@
 from unittest import mock
 
 from absl.testing import absltest
+from intrinsic.math.python import data_types
+from intrinsic.math.python import proto_conversion as math_proto_conversion
 from intrinsic.world.proto import geometry_component_pb2
 from intrinsic.world.proto import object_world_service_pb2
 from intrinsic.world.python import object_world_client
@@ -77,6 +79,177 @@ class ObjectWorldClientTest(absltest.TestCase):
         geometry_component=geometry_component_pb2.GeometryComponent(),
     )
 
+  def _create_cached_world_client(
+      self,
+  ) -> object_world_client.ObjectWorldClient:
+    root = object_world_service_pb2.Object(
+        world_id='world',
+        name='root',
+        id='root',
+        type=object_world_service_pb2.ObjectType.ROOT,
+        children=[
+            object_world_service_pb2.IdAndName(id='15', name='my_object')
+        ],
+    )
+    my_object = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    my_object.parent.id = 'root'
+    my_object.object_component.parent_t_this.CopyFrom(
+        math_proto_conversion.pose_to_proto(
+            data_types.Pose3(translation=[1, 2, 3])
+        )
+    )
+    my_object.frames.append(
+        object_world_service_pb2.Frame(
+            world_id='world',
+            name='my_frame',
+            id='16',
+            object=object_world_service_pb2.IdAndName(
+                id='15', name='my_object'
+            ),
+        )
+    )
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(objects=[root, my_object])
+    )
+    return object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub, cache_snapshot=True
+    )
+
+  def test_cached_snapshot_answers_attribute_access_with_one_request(self):
+    world_client = self._create_cached_world_client()
+
+    self.assertEqual(world_client.my_object.my_frame.id, '16')
+    self.assertEqual(
+        world_client.get_object('root').my_object.name, 'my_object'
+    )
+    self.assertIn('my_object', dir(world_client))
+    self.assertLen(world_client.list_objects(), 2)
+
+    self._stub.ListObjects.assert_called_once()
+    self._stub.GetObject.assert_not_called()
+    self._stub.GetFrame.assert_not_called()
+
+  def test_cached_snapshot_answers_get_transform(self):
+    world_client = self._create_cached_world_client()
+
+    a_t_b = world_client.get_transform(
+        world_client.get_object('root'), world_client.my_object.my_frame
+    )
+
+    self.assertTrue(a_t_b.almost_equal(data_types.Pose3(translation=[1, 2, 3])))
+    self._stub.GetTransform.assert_not_called()
+
+  def test_get_transforms_uses_single_request(self):
+    world_client = self._create_cached_world_client()
+    root = world_client.get_object('root')
+    my_object = world_client.my_object
+
+    transforms = world_client.get_transforms(
+        [(root, my_object), (my_object, root), (my_object, my_object.my_frame)]
+    )
+
+    self.assertTrue(
+        transforms[0].almost_equal(data_types.Pose3(translation=[1, 2, 3]))
+    )
+    self.assertTrue(
+        transforms[1].almost_equal(data_types.Pose3(translation=[-1, -2, -3]))
+    )
+    self.assertTrue(transforms[2].almost_equal(data_types.Pose3()))
+    self._stub.ListObjects.assert_called_once()
+    self._stub.GetTransform.assert_not_called()
+
+  def test_cached_snapshot_is_invalidated_by_updates(self):
+    world_client = self._create_cached_world_client()
+    my_object = world_client.my_object
+
+    world_client.update_transform(
+        world_client.get_object('root'), my_object, data_types.Pose3()
+    )
+    world_client.list_objects()
+
+    self.assertEqual(world_client.snapshot_version, 1)
+    self.assertEqual(self._stub.ListObjects.call_count, 2)
+    self._stub.UpdateTransform.assert_called_once()
+
+  def test_returned_objects_do_not_share_cached_protos(self):
+    world_client = self._create_cached_world_client()
+
+    world_client.my_object.proto.name = 'changed'
+
+    self.assertEqual(world_client.my_object.name, 'my_object')
+
+  def test_transaction_applies_updates_with_single_request(self):
+    world_client = self._create_cached_world_client()
+    root = world_client.get_object('root')
+    my_object = world_client.my_object
+
+    with world_client.transaction() as tx:
+      tx.update_transform(root, my_object, data_types.Pose3())
+      tx.update_object_name(my_object, 'new_name')
+      tx.delete_frame(my_object.my_frame)
+      tx.create_frame('new_frame', parent=my_object)
+
+    self._stub.UpdateTransform.assert_not_called()
+    self._stub.UpdateObjectName.assert_not_called()
+    self._stub.UpdateWorldResources.assert_called_once()
+    request = self._stub.UpdateWorldResources.call_args[0][0]
+    self.assertEqual(request.world_id, 'world')
+    self.assertEqual(
+        [
+            update.WhichOneof('update')
+            for update in request.world_updates.updates
+        ],
+        [
+            'update_transform',
+            'update_object_name',
+            'delete_frame',
+            'create_frame',
+        ],
+    )
+    self.assertEqual(
+        request.world_updates.updates[0].update_transform.world_id, ''
+    )
+    self.assertEqual(
+        request.world_updates.updates[1].update_object_name.name, 'new_name'
+    )
+    self.assertEqual(world_client.snapshot_version, 1)
+
+  def test_transaction_is_rolled_back_on_error(self):
+    world_client = self._create_cached_world_client()
+    my_object = world_client.my_object
+
+    with self.assertRaises(ValueError):
+      with world_client.transaction() as tx:
+        tx.update_object_name(my_object, 'new_name')
+        raise ValueError('Something went wrong.')
+
+    self._stub.UpdateWorldResources.assert_not_called()
+    self.assertEmpty(tx.updates.updates)
+    self.assertEqual(world_client.snapshot_version, 0)
+
+  def test_empty_transaction_does_not_contact_world_service(self):
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    with world_client.transaction():
+      pass
+
+    self._stub.UpdateWorldResources.assert_not_called()
+
+  def test_transaction_cannot_be_reused(self):
+    world_client = self._create_cached_world_client()
+    my_object = world_client.my_object
+
+    with world_client.transaction() as tx:
+      tx.update_object_name(my_object, 'new_name')
+
+    with self.assertRaises(RuntimeError):
+      tx.update_object_name(my_object, 'other_name')
+    self._stub.UpdateWorldResources.assert_called_once()
+
 
 if __name__ == '__main__':
   absltest.main()
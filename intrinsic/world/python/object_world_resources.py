@@ -3,7 +3,7 @@
 """Defines the resources used for the object world python api."""
 
 import abc
-from typing import Dict, List, Optional, Protocol
+from typing import Callable, Dict, List, Optional, Protocol
 
 from intrinsic.icon.proto import cart_space_pb2
 from intrinsic.kinematics.types import joint_limits_pb2
@@ -18,6 +18,15 @@ from intrinsic.world.python import object_world_ids
 from intrinsic.world.robot_payload.python import robot_payload
 
 
+# Callable that resolves an object reference to a local copy of the object
+# proto, e.g., from a cached world snapshot. Returns None if the object cannot
+# be resolved locally, in which case it is fetched from the world service.
+ObjectProtoResolver = Callable[
+    [object_world_refs_pb2.ObjectReference],
+    Optional[object_world_service_pb2.Object],
+]
+
+
 def _list_public_methods(instance: object) -> List[str]:
   """Returns all public methods of the given instance.
 
@@ -280,8 +289,15 @@ class WorldObject(TransformNode):
       self,
       world_object: object_world_service_pb2.Object,
       stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      *,
+      object_proto_resolver: Optional[ObjectProtoResolver] = None,
   ):
     super().__init__(stub)
+    # Optional local lookup for parent and child objects which avoids a
+    # GetObject request when accessing them via chained . operators.
+    self._object_proto_resolver: Optional[ObjectProtoResolver] = (
+        object_proto_resolver
+    )
     if world_object.type == object_world_service_pb2.ObjectType.ROOT:
       world_object.object_component.CopyFrom(
           object_world_service_pb2.ObjectComponent()
@@ -365,9 +381,18 @@ class WorldObject(TransformNode):
       self, child_name: object_world_ids.WorldObjectName
   ) -> TransformNode:
     return create_object_with_auto_type(
-        self._get_child_proto(child_name), self._stub
+        self._get_child_proto(child_name),
+        self._stub,
+        object_proto_resolver=self._object_proto_resolver,
     )
 
+  def _resolve_object_proto(
+      self, reference: object_world_refs_pb2.ObjectReference
+  ) -> Optional[object_world_service_pb2.Object]:
+    if self._object_proto_resolver is None:
+      return None
+    return self._object_proto_resolver(reference)
+
   @error_handling.retry_on_grpc_unavailable
   def _get_child_proto(
       self, child_name: object_world_ids.WorldObjectName
@@ -383,9 +408,13 @@ class WorldObject(TransformNode):
     child_id = next(
         child.id for child in self._proto.children if child.name == child_name
     )
+    child_reference = object_world_refs_pb2.ObjectReference(id=child_id)
+    child_proto = self._resolve_object_proto(child_reference)
+    if child_proto is not None:
+      return child_proto
     request = object_world_service_pb2.GetObjectRequest(
         world_id=self._proto.world_id,
-        object=object_world_refs_pb2.ObjectReference(id=child_id),
+        object=child_reference,
         view=object_world_updates_pb2.ObjectView.FULL,
     )
     return self._stub.GetObject(request)
@@ -452,13 +481,20 @@ class WorldObject(TransformNode):
     if self._proto.type == object_world_service_pb2.ObjectType.ROOT:
       return None
 
-    request = object_world_service_pb2.GetObjectRequest(
-        world_id=self._proto.world_id,
-        object=object_world_refs_pb2.ObjectReference(id=self.parent_id),
-        view=object_world_updates_pb2.ObjectView.FULL,
+    parent_reference = object_world_refs_pb2.ObjectReference(id=self.parent_id)
+    object_proto = self._resolve_object_proto(parent_reference)
+    if object_proto is None:
+      request = object_world_service_pb2.GetObjectRequest(
+          world_id=self._proto.world_id,
+          object=parent_reference,
+          view=object_world_updates_pb2.ObjectView.FULL,
+      )
+      object_proto = self._stub.GetObject(request)
+    return WorldObject(
+        object_proto,
+        self._stub,
+        object_proto_resolver=self._object_proto_resolver,
     )
-    object_proto = self._stub.GetObject(request)
-    return WorldObject(object_proto, self._stub)
 
   @property
   def parent_t_this(self) -> data_types.Pose3:
@@ -568,6 +604,8 @@ class KinematicObject(WorldObject):
       self,
       world_object: object_world_service_pb2.Object,
       stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      *,
+      object_proto_resolver: Optional[ObjectProtoResolver] = None,
   ):
     if not world_object.HasField('kinematic_object_component'):
       raise ValueError(
@@ -575,7 +613,9 @@ class KinematicObject(WorldObject):
           '"kinematic_object_component". Cannot create a '
           f'{self.__class__.__name__} without this field.'
       )
-    super().__init__(world_object, stub)
+    super().__init__(
+        world_object, stub, object_proto_resolver=object_proto_resolver
+    )
 
   @property
   def joint_positions(self) -> List[float]:
@@ -678,6 +718,8 @@ class KinematicObject(WorldObject):
 def create_object_with_auto_type(
     object_proto: object_world_service_pb2.Object,
     stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+    *,
+    object_proto_resolver: Optional[ObjectProtoResolver] = None,
 ) -> WorldObject:
   """Creates an object from a object proto.
 
@@ -687,11 +729,16 @@ def create_object_with_auto_type(
   Args:
     object_proto: The object proto.
     stub:  The object world service stub.
+    object_proto_resolver: Optional local lookup for parent and child objects.
 
   Returns:
     An object in the world.
   """
   if object_proto.type == object_world_service_pb2.ObjectType.KINEMATIC_OBJECT:
-    return KinematicObject(object_proto, stub)
+    return KinematicObject(
+        object_proto, stub, object_proto_resolver=object_proto_resolver
+    )
   else:
-    return WorldObject(object_proto, stub)
+    return WorldObject(
+        object_proto, stub, object_proto_resolver=object_proto_resolver
+    )
@@ -0,0 +1,199 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Defines the WorldSnapshot class.
+
+A WorldSnapshot is a versioned, read-only local copy of the object and frame
+tree of a world. It is built from a single ListObjects call and allows the
+ObjectWorldClient to answer name lookups, listings and transform queries
+without further round-trips to the world service.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from intrinsic.math.python import data_types
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import transform_graph
+
+
+class WorldSnapshot:
+  """A versioned local copy of all objects and frames of a world.
+
+  The snapshot does not track changes in the world service. It is up to the
+  owner (usually an ObjectWorldClient) to discard it and create a new one when
+  the world changes.
+
+  Attributes:
+    version: The version of the snapshot. Increases monotonically for the
+      snapshots created by the same owner.
+    objects: The protos of all objects in the world.
+    transform_graph: The transform tree of the world, built on first access.
+  """
+
+  def __init__(
+      self,
+      version: int,
+      objects: Iterable[object_world_service_pb2.Object],
+  ):
+    """Creates a snapshot from object protos.
+
+    Args:
+      version: The version of the snapshot.
+      objects: All objects of the world, ideally in the ObjectView.FULL view.
+        The snapshot takes ownership of the given protos.
+    """
+    self._version: int = version
+    self._objects: List[object_world_service_pb2.Object] = list(objects)
+
+    self._object_by_id: Dict[
+        object_world_ids.ObjectWorldResourceId,
+        object_world_service_pb2.Object,
+    ] = {}
+    self._object_by_global_name: Dict[
+        object_world_ids.WorldObjectName, object_world_service_pb2.Object
+    ] = {}
+    self._object_by_root_name: Dict[
+        object_world_ids.WorldObjectName, object_world_service_pb2.Object
+    ] = {}
+    self._frame_by_id: Dict[
+        object_world_ids.ObjectWorldResourceId, object_world_service_pb2.Frame
+    ] = {}
+    self._frame_by_name: Dict[
+        Tuple[object_world_ids.WorldObjectName, object_world_ids.FrameName],
+        object_world_service_pb2.Frame,
+    ] = {}
+    self._transform_graph: Optional[transform_graph.TransformGraph] = None
+
+    for world_object in self._objects:
+      object_id = object_world_ids.ObjectWorldResourceId(world_object.id)
+      object_name = object_world_ids.WorldObjectName(world_object.name)
+      self._object_by_id[object_id] = world_object
+      if (
+          world_object.name_is_global_alias
+          or object_id == object_world_ids.ROOT_OBJECT_ID
+      ):
+        self._object_by_global_name[object_name] = world_object
+      if (
+          world_object.name_is_global_alias
+          or world_object.parent.id == object_world_ids.ROOT_OBJECT_ID
+      ):
+        self._object_by_root_name[object_name] = world_object
+      for frame in world_object.frames:
+        self._frame_by_id[object_world_ids.ObjectWorldResourceId(frame.id)] = (
+            frame
+        )
+        self._frame_by_name[
+            (object_name, object_world_ids.FrameName(frame.name))
+        ] = frame
+
+  @property
+  def version(self) -> int:
+    return self._version
+
+  @property
+  def objects(self) -> List[object_world_service_pb2.Object]:
+    return self._objects
+
+  @property
+  def transform_graph(self) -> transform_graph.TransformGraph:
+    if self._transform_graph is None:
+      self._transform_graph = transform_graph.TransformGraph(self._objects)
+    return self._transform_graph
+
+  def root_object_names(self) -> List[object_world_ids.WorldObjectName]:
+    """Returns the names of all objects addressable from the world namespace.
+
+    These are the objects directly below the root object and all objects which
+    have the "name_is_global_alias" option enabled.
+    """
+    return list(self._object_by_root_name.keys())
+
+  def root_frame_names(self) -> List[object_world_ids.FrameName]:
+    """Returns the names of all frames under the root object."""
+    root = self._object_by_id.get(object_world_ids.ROOT_OBJECT_ID)
+    if root is None:
+      return []
+    return [object_world_ids.FrameName(frame.name) for frame in root.frames]
+
+  def get_object_by_root_name(
+      self, name: object_world_ids.WorldObjectName
+  ) -> Optional[object_world_service_pb2.Object]:
+    """Returns an object addressable from the world namespace or None."""
+    return self._object_by_root_name.get(name)
+
+  def get_object_by_id(
+      self, object_id: object_world_ids.ObjectWorldResourceId
+  ) -> Optional[object_world_service_pb2.Object]:
+    """Returns the object with the given id or None."""
+    return self._object_by_id.get(object_id)
+
+  def get_object(
+      self, reference: object_world_refs_pb2.ObjectReference
+  ) -> Optional[object_world_service_pb2.Object]:
+    """Returns the object matching the given reference or None.
+
+    Args:
+      reference: A reference to the object by id or by its global name.
+
+    Returns:
+      The object proto or None if the reference cannot be resolved from the
+      snapshot.
+    """
+    if reference.HasField('id'):
+      return self._object_by_id.get(
+          object_world_ids.ObjectWorldResourceId(reference.id)
+      )
+    if reference.HasField('by_name'):
+      return self._object_by_global_name.get(
+          object_world_ids.WorldObjectName(reference.by_name.object_name)
+      )
+    return None
+
+  def get_frame(
+      self, reference: object_world_refs_pb2.FrameReference
+  ) -> Optional[object_world_service_pb2.Frame]:
+    """Returns the frame matching the given reference or None.
+
+    Args:
+      reference: A reference to the frame by id or by name.
+
+    Returns:
+      The frame proto or None if the reference cannot be resolved from the
+      snapshot.
+    """
+    if reference.HasField('id'):
+      return self._frame_by_id.get(
+          object_world_ids.ObjectWorldResourceId(reference.id)
+      )
+    if reference.HasField('by_name'):
+      world_object = self._object_by_global_name.get(
+          object_world_ids.WorldObjectName(reference.by_name.object_name)
+      )
+      if world_object is None:
+        return None
+      return self._frame_by_name.get((
+          object_world_ids.WorldObjectName(world_object.name),
+          object_world_ids.FrameName(reference.by_name.frame_name),
+      ))
+    return None
+
+  def get_transform(
+      self,
+      node_a_id: object_world_ids.ObjectWorldResourceId,
+      node_b_id: object_world_ids.ObjectWorldResourceId,
+  ) -> Optional[data_types.Pose3]:
+    """Returns the transform 'a_t_b' between two nodes or None.
+
+    Args:
+      node_a_id: The id of the first transform node (object or frame).
+      node_b_id: The id of the second transform node (object or frame).
+
+    Returns:
+      The pose of 'node_b' in the space of 'node_a' or None if the transform
+      cannot be computed from the snapshot. This is the case for unknown nodes
+      and for nodes below an object which is attached to a non-root entity of
+      its parent (e.g., to the flange of a robot), since the pose of such an
+      entity depends on the kinematics of the parent.
+    """
+    return self.transform_graph.get_transform(node_a_id, node_b_id)
@@ -0,0 +1,205 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for object_world_snapshot."""
+
+from absl.testing import absltest
+from intrinsic.math.python import data_types
+from intrinsic.math.python import proto_conversion as math_proto_conversion
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_snapshot
+import numpy as np
+
+
+def _pose(x: float, y: float = 0.0, z: float = 0.0) -> data_types.Pose3:
+  return data_types.Pose3(translation=[x, y, z])
+
+
+def _create_object_proto(
+    *,
+    name: str,
+    object_id: str,
+    parent_id: str = 'root',
+    parent_t_this: data_types.Pose3 = data_types.Pose3(),
+    name_is_global_alias: bool = True,
+    parent_entity_id: str = 'eid_root',
+) -> object_world_service_pb2.Object:
+  return object_world_service_pb2.Object(
+      name=name,
+      id=object_id,
+      name_is_global_alias=name_is_global_alias,
+      type=object_world_service_pb2.ObjectType.PHYSICAL_OBJECT,
+      parent=object_world_service_pb2.IdAndName(id=parent_id),
+      parent_entity=object_world_refs_pb2.EntityReference(id=parent_entity_id),
+      root_entity_id=f'eid_{object_id}',
+      object_component=object_world_service_pb2.ObjectComponent(
+          parent_t_this=math_proto_conversion.pose_to_proto(parent_t_this)
+      ),
+  )
+
+
+def _create_frame_proto(
+    *,
+    name: str,
+    frame_id: str,
+    object_id: str,
+    object_name: str,
+    parent_t_this: data_types.Pose3 = data_types.Pose3(),
+    parent_frame_id: str = '',
+) -> object_world_service_pb2.Frame:
+  frame = object_world_service_pb2.Frame(
+      name=name,
+      id=frame_id,
+      object=object_world_service_pb2.IdAndName(id=object_id, name=object_name),
+      parent_t_this=math_proto_conversion.pose_to_proto(parent_t_this),
+  )
+  if parent_frame_id:
+    frame.parent_frame.id = parent_frame_id
+  return frame
+
+
+class WorldSnapshotTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    root = object_world_service_pb2.Object(
+        name='root',
+        id='root',
+        type=object_world_service_pb2.ObjectType.ROOT,
+        root_entity_id='eid_root',
+    )
+    root.frames.append(
+        _create_frame_proto(
+            name='global_frame',
+            frame_id='f1',
+            object_id='root',
+            object_name='root',
+            parent_t_this=_pose(0.0, 5.0),
+        )
+    )
+    table = _create_object_proto(
+        name='table', object_id='o1', parent_t_this=_pose(1.0)
+    )
+    box = _create_object_proto(
+        name='box',
+        object_id='o2',
+        parent_id='o1',
+        parent_entity_id='eid_o1',
+        parent_t_this=_pose(2.0),
+        name_is_global_alias=False,
+    )
+    box.frames.append(
+        _create_frame_proto(
+            name='grasp',
+            frame_id='f2',
+            object_id='o2',
+            object_name='box',
+            parent_t_this=_pose(0.0, 0.0, 3.0),
+        )
+    )
+    box.frames.append(
+        _create_frame_proto(
+            name='pregrasp',
+            frame_id='f3',
+            object_id='o2',
+            object_name='box',
+            parent_t_this=_pose(0.0, 0.0, 4.0),
+            parent_frame_id='f2',
+        )
+    )
+    tool = _create_object_proto(
+        name='tool',
+        object_id='o3',
+        parent_id='o1',
+        parent_entity_id='eid_flange',
+        parent_t_this=_pose(1.0),
+    )
+    self._snapshot = object_world_snapshot.WorldSnapshot(
+        7, [root, table, box, tool]
+    )
+
+  def test_version(self):
+    self.assertEqual(self._snapshot.version, 7)
+
+  def test_root_names(self):
+    self.assertCountEqual(self._snapshot.root_object_names(), ['table', 'tool'])
+    self.assertEqual(self._snapshot.root_frame_names(), ['global_frame'])
+
+  def test_get_object(self):
+    self.assertEqual(
+        self._snapshot.get_object(
+            object_world_refs_pb2.ObjectReference(id='o2')
+        ).name,
+        'box',
+    )
+    self.assertEqual(
+        self._snapshot.get_object(
+            object_world_refs_pb2.ObjectReference(
+                by_name=object_world_refs_pb2.ObjectReferenceByName(
+                    object_name='table'
+                )
+            )
+        ).id,
+        'o1',
+    )
+    self.assertIsNone(
+        self._snapshot.get_object(
+            object_world_refs_pb2.ObjectReference(
+                by_name=object_world_refs_pb2.ObjectReferenceByName(
+                    object_name='box'
+                )
+            )
+        )
+    )
+    self.assertIsNone(
+        self._snapshot.get_object(
+            object_world_refs_pb2.ObjectReference(id='unknown')
+        )
+    )
+
+  def test_get_frame(self):
+    self.assertEqual(
+        self._snapshot.get_frame(
+            object_world_refs_pb2.FrameReference(id='f2')
+        ).name,
+        'grasp',
+    )
+    self.assertEqual(
+        self._snapshot.get_frame(
+            object_world_refs_pb2.FrameReference(
+                by_name=object_world_refs_pb2.FrameReferenceByName(
+                    object_name='root', frame_name='global_frame'
+                )
+            )
+        ).id,
+        'f1',
+    )
+
+  def test_get_transform(self):
+    a_t_b = self._snapshot.get_transform(
+        object_world_ids.ObjectWorldResourceId('f1'),
+        object_world_ids.ObjectWorldResourceId('f3'),
+    )
+
+    np.testing.assert_allclose(a_t_b.translation, [3.0, -5.0, 7.0])
+
+  def test_get_transform_of_object_attached_to_non_root_entity(self):
+    self.assertIsNone(
+        self._snapshot.get_transform(
+            object_world_ids.ROOT_OBJECT_ID,
+            object_world_ids.ObjectWorldResourceId('o3'),
+        )
+    )
+
+  def test_get_transform_of_unknown_node(self):
+    self.assertIsNone(
+        self._snapshot.get_transform(
+            object_world_ids.ROOT_OBJECT_ID,
+            object_world_ids.ObjectWorldResourceId('unknown'),
+        )
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,264 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""An in-memory fake of the object world service for tests.
+
+The fake can be used in place of an ObjectWorldServiceStub. It stores a single
+world in memory and implements the subset of the service which is needed to
+test clients that read the world and apply simple updates to it. Like the real
+service, it reports the time of the last update and a structure hash in the
+metadata of the world, which allows testing incremental synchronization.
+"""
+
+import collections
+from typing import Callable, Dict, List, Optional
+
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.proto import object_world_updates_pb2
+from intrinsic.world.python import object_world_ids
+
+
+def _copy_object(
+    world_object: object_world_service_pb2.Object,
+) -> object_world_service_pb2.Object:
+  result = object_world_service_pb2.Object()
+  result.CopyFrom(world_object)
+  return result
+
+
+class FakeObjectWorldService:
+  """In-memory fake of the object world service.
+
+  Supported RPCs are GetWorld, ListObjects, GetObject, UpdateTransform (between
+  a node and its direct child), UpdateObjectName, DeleteObject and
+  UpdateWorldResources with the corresponding updates. All objects are stored
+  and returned in the FULL view.
+
+  Attributes:
+    world_id: The id of the world.
+    call_counts: Number of calls per RPC name.
+  """
+
+  def __init__(self, world_id: str = 'world'):
+    self._world_id: str = world_id
+    self._objects: Dict[str, object_world_service_pb2.Object] = {}
+    self._update_count: int = 0
+    self._structure_version: int = 0
+    self.call_counts = collections.Counter()
+    self.add_object(
+        object_world_service_pb2.Object(
+            id=object_world_ids.ROOT_OBJECT_ID,
+            name=object_world_ids.ROOT_OBJECT_NAME,
+            type=object_world_service_pb2.ObjectType.ROOT,
+            name_is_global_alias=True,
+            root_entity_id='eid_root',
+        )
+    )
+
+  @property
+  def world_id(self) -> str:
+    return self._world_id
+
+  def _touch(self, *, structural: bool) -> None:
+    self._update_count += 1
+    if structural:
+      self._structure_version += 1
+
+  def add_object(self, world_object: object_world_service_pb2.Object) -> None:
+    """Adds a copy of the given object proto to the world.
+
+    The ids and names of the parent and children of all objects are kept
+    consistent with the new object.
+
+    Args:
+      world_object: The object to add. Must have a unique id.
+    """
+    if world_object.id in self._objects:
+      raise ValueError(f'Object with id "{world_object.id}" already exists.')
+    stored = _copy_object(world_object)
+    stored.world_id = self._world_id
+    parent = self._objects.get(stored.parent.id)
+    if parent is not None:
+      stored.parent.name = parent.name
+      parent.children.add(id=stored.id, name=stored.name)
+    self._objects[stored.id] = stored
+    self._touch(structural=True)
+
+  def _find_object(
+      self, reference: object_world_refs_pb2.ObjectReference
+  ) -> object_world_service_pb2.Object:
+    if reference.HasField('id'):
+      world_object = self._objects.get(reference.id)
+    else:
+      world_object = next(
+          (
+              world_object
+              for world_object in self._objects.values()
+              if world_object.name == reference.by_name.object_name
+              and world_object.name_is_global_alias
+          ),
+          None,
+      )
+    if world_object is None:
+      raise ValueError(f'Object "{reference}" does not exist.')
+    return world_object
+
+  def _find_node_id(
+      self, reference: object_world_refs_pb2.TransformNodeReference
+  ) -> str:
+    if not reference.HasField('id'):
+      raise NotImplementedError('Only references by id are supported.')
+    return reference.id
+
+  # pylint: disable=invalid-name
+  # Method names match the RPCs of the object world service.
+
+  def GetWorld(
+      self, request: object_world_service_pb2.GetWorldRequest
+  ) -> object_world_service_pb2.WorldMetadata:
+    self.call_counts['GetWorld'] += 1
+    if request.world_id != self._world_id:
+      raise ValueError(f'Unknown world "{request.world_id}".')
+    metadata = object_world_service_pb2.WorldMetadata(
+        id=self._world_id,
+        world_structure_hash=str(self._structure_version),
+    )
+    metadata.last_update.seconds = self._update_count
+    return metadata
+
+  def ListObjects(
+      self, request: object_world_service_pb2.ListObjectsRequest
+  ) -> object_world_service_pb2.ListObjectsResponse:
+    del request  # Objects are always returned in the FULL view.
+    self.call_counts['ListObjects'] += 1
+    return object_world_service_pb2.ListObjectsResponse(
+        objects=list(self._objects.values())
+    )
+
+  def GetObject(
+      self, request: object_world_service_pb2.GetObjectRequest
+  ) -> object_world_service_pb2.Object:
+    self.call_counts['GetObject'] += 1
+    return _copy_object(self._find_object(request.object))
+
+  def UpdateTransform(
+      self, request: object_world_updates_pb2.UpdateTransformRequest
+  ) -> object_world_service_pb2.UpdateTransformResponse:
+    self.call_counts['UpdateTransform'] += 1
+    self._update_transform(request)
+    return object_world_service_pb2.UpdateTransformResponse()
+
+  def UpdateObjectName(
+      self, request: object_world_updates_pb2.UpdateObjectNameRequest
+  ) -> object_world_service_pb2.Object:
+    self.call_counts['UpdateObjectName'] += 1
+    return self._update_object_name(request)
+
+  def DeleteObject(
+      self, request: object_world_updates_pb2.DeleteObjectRequest
+  ) -> None:
+    self.call_counts['DeleteObject'] += 1
+    self._delete_object(request)
+
+  def UpdateWorldResources(
+      self, request: object_world_service_pb2.UpdateWorldResourcesRequest
+  ) -> object_world_service_pb2.UpdateWorldResourcesResponse:
+    """Applies all updates or none of them."""
+    self.call_counts['UpdateWorldResources'] += 1
+    handlers: Dict[str, Callable[..., object]] = {
+        'update_transform': self._update_transform,
+        'update_object_name': self._update_object_name,
+        'delete_object': self._delete_object,
+    }
+    backup = {
+        object_id: _copy_object(world_object)
+        for object_id, world_object in self._objects.items()
+    }
+    backup_counts = (self._update_count, self._structure_version)
+    try:
+      for update in request.world_updates.updates:
+        update_type = update.WhichOneof('update')
+        if update_type not in handlers:
+          raise NotImplementedError(f'Unsupported update "{update_type}".')
+        handlers[update_type](getattr(update, update_type))
+    except Exception:
+      self._objects = backup
+      self._update_count, self._structure_version = backup_counts
+      raise
+    return object_world_service_pb2.UpdateWorldResourcesResponse(
+        objects=list(self._objects.values())
+    )
+
+  # pylint: enable=invalid-name
+
+  def _update_transform(
+      self, request: object_world_updates_pb2.UpdateTransformRequest
+  ) -> None:
+    node_a_id = self._find_node_id(request.node_a)
+    node_b_id = self._find_node_id(request.node_b)
+    child = self._objects.get(node_b_id)
+    if child is not None and child.parent.id == node_a_id:
+      child.object_component.parent_t_this.CopyFrom(request.a_t_b)
+      self._touch(structural=False)
+      return
+    for world_object in self._objects.values():
+      for frame in world_object.frames:
+        if frame.id != node_b_id:
+          continue
+        parent_id = (
+            frame.parent_frame.id
+            if frame.HasField('parent_frame')
+            else frame.object.id
+        )
+        if parent_id == node_a_id:
+          frame.parent_t_this.CopyFrom(request.a_t_b)
+          self._touch(structural=False)
+          return
+    raise NotImplementedError(
+        'Only updates between a node and its direct child are supported.'
+    )
+
+  def _update_object_name(
+      self, request: object_world_updates_pb2.UpdateObjectNameRequest
+  ) -> object_world_service_pb2.Object:
+    world_object = self._find_object(request.object)
+    world_object.name = request.name
+    world_object.name_is_global_alias = request.name_is_global_alias
+    for frame in world_object.frames:
+      frame.object.name = request.name
+    for other in self._objects.values():
+      if other.parent.id == world_object.id:
+        other.parent.name = request.name
+      for child in other.children:
+        if child.id == world_object.id:
+          child.name = request.name
+    self._touch(structural=True)
+    return _copy_object(world_object)
+
+  def _delete_object(
+      self, request: object_world_updates_pb2.DeleteObjectRequest
+  ) -> None:
+    world_object = self._find_object(request.object)
+    if world_object.id == object_world_ids.ROOT_OBJECT_ID:
+      raise ValueError('The root object cannot be deleted.')
+    to_delete: List[str] = [world_object.id]
+    if world_object.children and not request.force:
+      raise ValueError(f'Object "{world_object.name}" has children.')
+    index = 0
+    while index < len(to_delete):
+      to_delete.extend(
+          child.id for child in self._objects[to_delete[index]].children
+      )
+      index += 1
+    parent: Optional[object_world_service_pb2.Object] = self._objects.get(
+        world_object.parent.id
+    )
+    if parent is not None:
+      remaining = [
+          child for child in parent.children if child.id != world_object.id
+      ]
+      del parent.children[:]
+      parent.children.extend(remaining)
+    for object_id in to_delete:
+      del self._objects[object_id]
+    self._touch(structural=True)
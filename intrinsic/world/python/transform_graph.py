@@ -0,0 +1,251 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Defines the TransformGraph class.
+
+The TransformGraph is a client-side model of the transform tree of a world
+(objects and frames). It is built from the object protos returned by a single
+ListObjects(view=FULL) request and answers pose queries between arbitrary
+nodes without contacting the world service.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from intrinsic.math.proto import pose_pb2
+from intrinsic.math.python import data_types
+from intrinsic.math.python import pose3_array
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import object_world_ids
+import numpy as np
+
+# Seven-value representation of the identity pose [tx, ty, tz, qx, qy, qz, qw].
+_IDENTITY_VEC7 = np.array([0, 0, 0, 0, 0, 0, 1], dtype=np.float64)
+
+# Index used in the parent array for nodes without a parent.
+_NO_PARENT = -1
+
+
+def _vec7_from_proto_pose(pose: pose_pb2.Pose, has_pose: bool) -> np.ndarray:
+  """Returns the vec7 of a pose proto; unset poses are the identity."""
+  if not has_pose:
+    return _IDENTITY_VEC7
+  return np.array(
+      [
+          pose.position.x,
+          pose.position.y,
+          pose.position.z,
+          pose.orientation.x,
+          pose.orientation.y,
+          pose.orientation.z,
+          pose.orientation.w,
+      ],
+      dtype=np.float64,
+  )
+
+
+class TransformGraph:
+  """A local, read-only transform tree of all objects and frames of a world.
+
+  The graph stores the 'parent_t_this' pose of every node as a row of an (N, 7)
+  NumPy array ([tx, ty, tz, qx, qy, qz, qw]) together with the index of its
+  parent. The pose of every node relative to the top of its subtree (see below)
+  is computed once, level by level, on the first query and cached. A query
+  'a_t_b' then reduces to one inversion and one composition of cached poses,
+  which is equivalent to walking both nodes up to their lowest common ancestor.
+
+  Poses of entities inside of kinematic objects are not part of the object
+  protos. Objects attached to a non-root entity of their parent (e.g., a
+  gripper attached to the flange of a robot) therefore start a new subtree
+  whose pose relative to its parent is unknown. Transforms between nodes within
+  the same subtree can be computed locally, all other queries return None and
+  must be answered by the world service.
+
+  Attributes:
+    node_ids: The ids of all nodes (objects and frames) in the graph.
+  """
+
+  def __init__(self, objects: Iterable[object_world_service_pb2.Object]):
+    """Creates a transform graph from object protos.
+
+    Args:
+      objects: All objects of the world in the ObjectView.FULL view.
+    """
+    node_ids: List[object_world_ids.ObjectWorldResourceId] = []
+    parent_ids: List[Optional[str]] = []
+    parent_t_node: List[np.ndarray] = []
+    objects = list(objects)
+    object_by_id: Dict[str, object_world_service_pb2.Object] = {
+        world_object.id: world_object for world_object in objects
+    }
+
+    for world_object in objects:
+      node_ids.append(object_world_ids.ObjectWorldResourceId(world_object.id))
+      parent = object_by_id.get(world_object.parent.id)
+      if world_object.type == object_world_service_pb2.ObjectType.ROOT:
+        parent_ids.append(None)
+      elif parent is None or (
+          parent.type != object_world_service_pb2.ObjectType.ROOT
+          and world_object.parent_entity.id != parent.root_entity_id
+      ):
+        # The pose of the parent entity is unknown, start a new subtree.
+        parent_ids.append(None)
+      else:
+        parent_ids.append(parent.id)
+      parent_t_node.append(
+          _vec7_from_proto_pose(
+              world_object.object_component.parent_t_this,
+              world_object.object_component.HasField('parent_t_this'),
+          )
+      )
+
+      for frame in world_object.frames:
+        node_ids.append(object_world_ids.ObjectWorldResourceId(frame.id))
+        if frame.HasField('parent_frame'):
+          parent_ids.append(frame.parent_frame.id)
+        else:
+          parent_ids.append(frame.object.id)
+        parent_t_node.append(
+            _vec7_from_proto_pose(
+                frame.parent_t_this, frame.HasField('parent_t_this')
+            )
+        )
+
+    self._node_ids: List[object_world_ids.ObjectWorldResourceId] = node_ids
+    self._index: Dict[str, int] = {
+        node_id: index for index, node_id in enumerate(node_ids)
+    }
+    self._parent: np.ndarray = np.array(
+        [
+            self._index.get(parent_id, _NO_PARENT)
+            if parent_id is not None
+            else _NO_PARENT
+            for parent_id in parent_ids
+        ],
+        dtype=np.int64,
+    )
+    self._parent_t_node: np.ndarray = np.array(
+        parent_t_node, dtype=np.float64
+    ).reshape(-1, 7)
+    # Filled lazily by _update_cache().
+    self._subtree_root: Optional[np.ndarray] = None
+    self._subtree_root_t_node: Optional[np.ndarray] = None
+
+  @property
+  def node_ids(self) -> List[object_world_ids.ObjectWorldResourceId]:
+    return list(self._node_ids)
+
+  def __len__(self) -> int:
+    return len(self._node_ids)
+
+  def __contains__(self, node_id: str) -> bool:
+    return node_id in self._index
+
+  def _compute_depths(self) -> np.ndarray:
+    """Returns the depth of every node below the top of its subtree."""
+    depth = np.full(len(self._node_ids), -1, dtype=np.int64)
+    for start in range(len(self._node_ids)):
+      path = []
+      node = start
+      while node != _NO_PARENT and depth[node] < 0:
+        path.append(node)
+        node = self._parent[node]
+        if len(path) > len(self._node_ids):
+          raise ValueError('The transform tree of the world contains a cycle.')
+      base = depth[node] if node != _NO_PARENT else -1
+      for offset, path_node in enumerate(reversed(path)):
+        depth[path_node] = base + 1 + offset
+    return depth
+
+  def _update_cache(self) -> None:
+    """Computes the pose of every node relative to the top of its subtree."""
+    if self._subtree_root_t_node is not None:
+      return
+    num_nodes = len(self._node_ids)
+    depth = self._compute_depths()
+    subtree_root = np.arange(num_nodes, dtype=np.int64)
+    subtree_root_t_node = np.tile(_IDENTITY_VEC7, (num_nodes, 1))
+    for level in range(1, int(depth.max(initial=0)) + 1):
+      nodes = np.flatnonzero(depth == level)
+      parents = self._parent[nodes]
+      subtree_root[nodes] = subtree_root[parents]
+      subtree_root_t_node[nodes] = pose3_array.compose_vec7(
+          subtree_root_t_node[parents], self._parent_t_node[nodes]
+      )
+    self._subtree_root = subtree_root
+    self._subtree_root_t_node = subtree_root_t_node
+
+  def _indices(self, node_ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns node indices and a mask of the ids present in the graph."""
+    indices = np.fromiter(
+        (self._index.get(node_id, _NO_PARENT) for node_id in node_ids),
+        dtype=np.int64,
+        count=len(node_ids),
+    )
+    return indices, indices != _NO_PARENT
+
+  def get_transforms_vec7(
+      self,
+      node_id_pairs: Sequence[Tuple[str, str]],
+  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the transforms 'a_t_b' for many node pairs at once.
+
+    Args:
+      node_id_pairs: A sequence of (node_a_id, node_b_id) tuples.
+
+    Returns:
+      A tuple of an (N, 7) array with the poses 'a_t_b' in the form [tx, ty,
+      tz, qx, qy, qz, qw] and a boolean array of length N which is False for
+      pairs which cannot be computed locally (unknown nodes or nodes in
+      different subtrees). Rows of such pairs are undefined.
+    """
+    self._update_cache()
+    if not node_id_pairs:
+      return np.zeros((0, 7), dtype=np.float64), np.zeros(0, dtype=bool)
+    a_ids, b_ids = zip(*node_id_pairs)
+    a_indices, a_known = self._indices(a_ids)
+    b_indices, b_known = self._indices(b_ids)
+    valid = (
+        a_known
+        & b_known
+        & (self._subtree_root[a_indices] == self._subtree_root[b_indices])
+    )
+    a_t_b = pose3_array.compose_vec7(
+        pose3_array.invert_vec7(self._subtree_root_t_node[a_indices]),
+        self._subtree_root_t_node[b_indices],
+    )
+    return a_t_b, valid
+
+  def get_transforms(
+      self,
+      node_id_pairs: Sequence[Tuple[str, str]],
+  ) -> List[Optional[data_types.Pose3]]:
+    """Returns the transforms 'a_t_b' for many node pairs at once.
+
+    Args:
+      node_id_pairs: A sequence of (node_a_id, node_b_id) tuples.
+
+    Returns:
+      A list with the pose of 'node_b' in the space of 'node_a' for every pair
+      or None for pairs which cannot be computed locally.
+    """
+    a_t_b, valid = self.get_transforms_vec7(node_id_pairs)
+    return [
+        data_types.Pose3.from_vec7(vec7, normalize=True) if is_valid else None
+        for vec7, is_valid in zip(a_t_b, valid)
+    ]
+
+  def get_transform(
+      self,
+      node_a_id: str,
+      node_b_id: str,
+  ) -> Optional[data_types.Pose3]:
+    """Returns the transform 'a_t_b' between two nodes or None.
+
+    Args:
+      node_a_id: The id of the first transform node (object or frame).
+      node_b_id: The id of the second transform node (object or frame).
+
+    Returns:
+      The pose of 'node_b' in the space of 'node_a' or None if the transform
+      cannot be computed locally.
+    """
+    return self.get_transforms([(node_a_id, node_b_id)])[0]
@@ -0,0 +1,236 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for transform_graph."""
+
+from absl.testing import absltest
+from intrinsic.math.python import data_types
+from intrinsic.math.python import proto_conversion as math_proto_conversion
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import transform_graph
+import numpy as np
+
+
+def _random_pose(rng: np.random.Generator) -> data_types.Pose3:
+  return data_types.Pose3(
+      rotation=data_types.Rotation3.random(rng),
+      translation=rng.uniform(-1.0, 1.0, size=3),
+  )
+
+
+def _create_object_proto(
+    *,
+    object_id: str,
+    parent_id: str,
+    parent_t_this: data_types.Pose3,
+    parent_entity_id: str = 'eid_root',
+) -> object_world_service_pb2.Object:
+  return object_world_service_pb2.Object(
+      name=object_id,
+      id=object_id,
+      type=object_world_service_pb2.ObjectType.PHYSICAL_OBJECT,
+      parent=object_world_service_pb2.IdAndName(id=parent_id),
+      parent_entity=object_world_refs_pb2.EntityReference(id=parent_entity_id),
+      root_entity_id=f'eid_{object_id}',
+      object_component=object_world_service_pb2.ObjectComponent(
+          parent_t_this=math_proto_conversion.pose_to_proto(parent_t_this)
+      ),
+  )
+
+
+def _create_frame_proto(
+    *,
+    frame_id: str,
+    object_id: str,
+    parent_t_this: data_types.Pose3,
+    parent_frame_id: str = '',
+) -> object_world_service_pb2.Frame:
+  frame = object_world_service_pb2.Frame(
+      name=frame_id,
+      id=frame_id,
+      object=object_world_service_pb2.IdAndName(id=object_id),
+      parent_t_this=math_proto_conversion.pose_to_proto(parent_t_this),
+  )
+  if parent_frame_id:
+    frame.parent_frame.id = parent_frame_id
+  return frame
+
+
+class TransformGraphTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(seed=0)
+    self._root_t_table = _random_pose(rng)
+    self._table_t_box = _random_pose(rng)
+    self._box_t_grasp = _random_pose(rng)
+    self._grasp_t_pregrasp = _random_pose(rng)
+    self._robot_t_gripper = _random_pose(rng)
+    self._gripper_t_tcp = _random_pose(rng)
+
+    root = object_world_service_pb2.Object(
+        id='root',
+        name='root',
+        type=object_world_service_pb2.ObjectType.ROOT,
+        root_entity_id='eid_root',
+    )
+    table = _create_object_proto(
+        object_id='table', parent_id='root', parent_t_this=self._root_t_table
+    )
+    box = _create_object_proto(
+        object_id='box',
+        parent_id='table',
+        parent_entity_id='eid_table',
+        parent_t_this=self._table_t_box,
+    )
+    box.frames.extend([
+        _create_frame_proto(
+            frame_id='grasp', object_id='box', parent_t_this=self._box_t_grasp
+        ),
+        _create_frame_proto(
+            frame_id='pregrasp',
+            object_id='box',
+            parent_frame_id='grasp',
+            parent_t_this=self._grasp_t_pregrasp,
+        ),
+    ])
+    robot = _create_object_proto(
+        object_id='robot', parent_id='root', parent_t_this=_random_pose(rng)
+    )
+    gripper = _create_object_proto(
+        object_id='gripper',
+        parent_id='robot',
+        parent_entity_id='eid_flange',
+        parent_t_this=self._robot_t_gripper,
+    )
+    gripper.frames.append(
+        _create_frame_proto(
+            frame_id='tcp',
+            object_id='gripper',
+            parent_t_this=self._gripper_t_tcp,
+        )
+    )
+    # Objects are deliberately not sorted by depth.
+    self._graph = transform_graph.TransformGraph(
+        [gripper, box, robot, root, table]
+    )
+
+  def test_node_ids(self):
+    self.assertCountEqual(
+        self._graph.node_ids,
+        [
+            'root',
+            'table',
+            'box',
+            'grasp',
+            'pregrasp',
+            'robot',
+            'gripper',
+            'tcp',
+        ],
+    )
+    self.assertLen(self._graph, 8)
+    self.assertIn('grasp', self._graph)
+    self.assertNotIn('unknown', self._graph)
+
+  def test_get_transform_to_root(self):
+    expected = (
+        self._root_t_table
+        * self._table_t_box
+        * self._box_t_grasp
+        * self._grasp_t_pregrasp
+    )
+
+    self.assertTrue(
+        self._graph.get_transform('root', 'pregrasp').almost_equal(expected)
+    )
+
+  def test_get_transform_between_siblings(self):
+    expected = (self._table_t_box * self._box_t_grasp).inverse()
+
+    self.assertTrue(
+        self._graph.get_transform('grasp', 'table').almost_equal(expected)
+    )
+
+  def test_get_transform_within_subtree_with_unknown_parent_pose(self):
+    self.assertTrue(
+        self._graph.get_transform('gripper', 'tcp').almost_equal(
+            self._gripper_t_tcp
+        )
+    )
+
+  def test_get_transform_across_unknown_parent_pose(self):
+    self.assertIsNone(self._graph.get_transform('root', 'tcp'))
+    self.assertIsNone(self._graph.get_transform('robot', 'gripper'))
+
+  def test_get_transform_of_unknown_node(self):
+    self.assertIsNone(self._graph.get_transform('root', 'unknown'))
+    self.assertIsNone(self._graph.get_transform('unknown', 'root'))
+
+  def test_get_transforms(self):
+    transforms = self._graph.get_transforms([
+        ('root', 'table'),
+        ('table', 'root'),
+        ('root', 'tcp'),
+        ('box', 'box'),
+    ])
+
+    self.assertTrue(transforms[0].almost_equal(self._root_t_table))
+    self.assertTrue(transforms[1].almost_equal(self._root_t_table.inverse()))
+    self.assertIsNone(transforms[2])
+    self.assertTrue(transforms[3].almost_equal(data_types.Pose3()))
+
+  def test_get_transforms_vec7(self):
+    a_t_b, valid = self._graph.get_transforms_vec7(
+        [('root', 'table'), ('root', 'tcp')] * 100
+    )
+
+    self.assertEqual(a_t_b.shape, (200, 7))
+    np.testing.assert_array_equal(valid, [True, False] * 100)
+    self.assertTrue(
+        data_types.Pose3.from_vec7(a_t_b[100]).almost_equal(self._root_t_table)
+    )
+
+  def test_get_transforms_of_empty_sequence(self):
+    self.assertEqual(self._graph.get_transforms([]), [])
+
+  def test_large_chain(self):
+    rng = np.random.default_rng(seed=1)
+    objects = [
+        object_world_service_pb2.Object(
+            id='root',
+            type=object_world_service_pb2.ObjectType.ROOT,
+            root_entity_id='eid_root',
+        )
+    ]
+    expected = data_types.Pose3()
+    parent_id = 'root'
+    for index in range(500):
+      parent_t_this = _random_pose(rng)
+      parent_t_this = data_types.Pose3(
+          rotation=parent_t_this.rotation,
+          translation=parent_t_this.translation * 0.01,
+      )
+      object_id = f'object_{index}'
+      objects.append(
+          _create_object_proto(
+              object_id=object_id,
+              parent_id=parent_id,
+              parent_entity_id=f'eid_{parent_id}',
+              parent_t_this=parent_t_this,
+          )
+      )
+      expected = expected * parent_t_this
+      parent_id = object_id
+
+    graph = transform_graph.TransformGraph(objects)
+
+    self.assertTrue(
+        graph.get_transform('root', 'object_499').almost_equal(
+            expected, atol=1e-6
+        )
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,215 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Defines the WorldMirror class.
+
+A WorldMirror keeps a local copy of the objects and frames of a world up to
+date. The world service does not offer a change feed, so the mirror uses the
+metadata of the world (structure hash and time of the last update) as a cheap
+cursor: as long as the cursor does not change, the local copy is reused without
+listing the world again. When the world has changed, the mirror fetches it once
+and reports which objects were added, removed or modified since the last sync.
+"""
+
+import dataclasses
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from intrinsic.util.grpc import error_handling
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.proto import object_world_service_pb2_grpc
+from intrinsic.world.proto import object_world_updates_pb2
+from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_snapshot
+
+# Identifies a state of a world: (world_structure_hash, last_update as
+# (seconds, nanos)).
+WorldCursor = Tuple[str, Tuple[int, int]]
+
+
+@dataclasses.dataclass(frozen=True)
+class WorldChanges:
+  """The changes of a world between two syncs of a WorldMirror.
+
+  Attributes:
+    added_object_ids: Ids of the objects which have been created.
+    removed_object_ids: Ids of the objects which have been deleted.
+    modified_object_ids: Ids of the objects which have been changed in any way,
+      including changes of their frames, poses and joint positions.
+  """
+
+  added_object_ids: List[object_world_ids.ObjectWorldResourceId] = (
+      dataclasses.field(default_factory=list)
+  )
+  removed_object_ids: List[object_world_ids.ObjectWorldResourceId] = (
+      dataclasses.field(default_factory=list)
+  )
+  modified_object_ids: List[object_world_ids.ObjectWorldResourceId] = (
+      dataclasses.field(default_factory=list)
+  )
+
+  def __bool__(self) -> bool:
+    return bool(
+        self.added_object_ids
+        or self.removed_object_ids
+        or self.modified_object_ids
+    )
+
+
+def _cursor_from_metadata(
+    metadata: object_world_service_pb2.WorldMetadata,
+) -> Optional[WorldCursor]:
+  """Returns the cursor of a world or None if the service does not set one.
+
+  The structure hash alone does not change when poses or joint positions change,
+  so metadata without the time of the last update does not form a cursor.
+  """
+  if not metadata.HasField('last_update'):
+    return None
+  return (
+      metadata.world_structure_hash,
+      (metadata.last_update.seconds, metadata.last_update.nanos),
+  )
+
+
+class WorldMirror:
+  """A local copy of a world that is kept up to date incrementally.
+
+  Every call to sync() costs a single GetWorld request if the world has not
+  changed since the previous sync and one additional ListObjects request
+  otherwise. The returned WorldChanges allow consumers (e.g., a UI which shows
+  the world tree) to only process what has changed.
+
+  If the world service does not report the time of the last update, every
+  sync() lists the world again.
+
+  A mirror can be shared between threads. The lock of the mirror is not held
+  while requests are in flight, so concurrent syncs do not wait for each other.
+  A sync whose result is older than the local copy, i.e., a sync which has
+  been overtaken by a later sync or by invalidate(), keeps the local copy.
+
+  Attributes:
+    world_id: The id of the mirrored world.
+    snapshot: The local copy of the world as of the last sync or None if the
+      mirror has not been synced yet.
+    cursor: The cursor of the world at the last sync or None.
+    version: The number of times the local copy has been replaced.
+  """
+
+  def __init__(
+      self,
+      world_id: str,
+      stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+  ):
+    self._world_id: str = world_id
+    self._stub: object_world_service_pb2_grpc.ObjectWorldServiceStub = stub
+    self._snapshot: Optional[object_world_snapshot.WorldSnapshot] = None
+    self._cursor: Optional[WorldCursor] = None
+    self._serialized_objects: Dict[str, bytes] = {}
+    self._version: int = 0
+    # Numbers the syncs and invalidations in the order in which they started.
+    self._sequence_numbers = itertools.count(1)
+    # The number of the latest sync or invalidation applied to the local copy.
+    self._applied_sequence_number: int = 0
+    self._lock = threading.Lock()
+
+  @property
+  def world_id(self) -> str:
+    return self._world_id
+
+  @property
+  def snapshot(self) -> Optional[object_world_snapshot.WorldSnapshot]:
+    return self._snapshot
+
+  @property
+  def cursor(self) -> Optional[WorldCursor]:
+    return self._cursor
+
+  @property
+  def version(self) -> int:
+    return self._version
+
+  def invalidate(self) -> None:
+    """Forces the next sync() to list the world again."""
+    with self._lock:
+      self._cursor = None
+      self._applied_sequence_number = next(self._sequence_numbers)
+
+  @error_handling.retry_on_grpc_unavailable
+  def _get_cursor(self) -> Optional[WorldCursor]:
+    return _cursor_from_metadata(
+        self._stub.GetWorld(
+            object_world_service_pb2.GetWorldRequest(world_id=self._world_id)
+        )
+    )
+
+  @error_handling.retry_on_grpc_unavailable
+  def _list_objects(self) -> List[object_world_service_pb2.Object]:
+    return list(
+        self._stub.ListObjects(
+            object_world_service_pb2.ListObjectsRequest(
+                world_id=self._world_id,
+                view=object_world_updates_pb2.ObjectView.FULL,
+            )
+        ).objects
+    )
+
+  def sync(self) -> WorldChanges:
+    """Brings the local copy up to date with the world service.
+
+    Returns:
+      The changes since the previous sync. On the first sync all objects are
+      reported as added.
+    """
+    with self._lock:
+      sequence_number = next(self._sequence_numbers)
+    cursor = self._get_cursor()
+    with self._lock:
+      if (
+          self._snapshot is not None
+          and cursor is not None
+          and cursor == self._cursor
+      ):
+        return WorldChanges()
+
+    objects = self._list_objects()
+    serialized_objects = {
+        world_object.id: world_object.SerializeToString(deterministic=True)
+        for world_object in objects
+    }
+
+    with self._lock:
+      if (
+          self._snapshot is not None
+          and sequence_number < self._applied_sequence_number
+      ):
+        return WorldChanges()
+
+      changes = WorldChanges(
+          added_object_ids=[
+              object_world_ids.ObjectWorldResourceId(object_id)
+              for object_id in serialized_objects
+              if object_id not in self._serialized_objects
+          ],
+          removed_object_ids=[
+              object_world_ids.ObjectWorldResourceId(object_id)
+              for object_id in self._serialized_objects
+              if object_id not in serialized_objects
+          ],
+          modified_object_ids=[
+              object_world_ids.ObjectWorldResourceId(object_id)
+              for object_id, serialized in serialized_objects.items()
+              if object_id in self._serialized_objects
+              and self._serialized_objects[object_id] != serialized
+          ],
+      )
+
+      self._cursor = cursor
+      self._serialized_objects = serialized_objects
+      self._applied_sequence_number = sequence_number
+      if self._snapshot is None or changes:
+        self._version += 1
+        self._snapshot = object_world_snapshot.WorldSnapshot(
+            self._version, objects
+        )
+      return changes
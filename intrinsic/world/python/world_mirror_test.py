@@ -0,0 +1,232 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for world_mirror."""
+
+import threading
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.math.python import data_types
+from intrinsic.math.python import proto_conversion as math_proto_conversion
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.proto import object_world_updates_pb2
+from intrinsic.world.python import object_world_client
+from intrinsic.world.python import world_mirror
+from intrinsic.world.python.testing import fake_object_world_service
+
+
+def _create_object_proto(
+    object_id: str, parent_id: str = 'root'
+) -> object_world_service_pb2.Object:
+  return object_world_service_pb2.Object(
+      id=object_id,
+      name=object_id,
+      name_is_global_alias=True,
+      type=object_world_service_pb2.ObjectType.PHYSICAL_OBJECT,
+      parent=object_world_service_pb2.IdAndName(id=parent_id),
+      parent_entity=object_world_refs_pb2.EntityReference(id='eid_root'),
+      root_entity_id=f'eid_{object_id}',
+      object_component=object_world_service_pb2.ObjectComponent(),
+  )
+
+
+class WorldMirrorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._service = fake_object_world_service.FakeObjectWorldService()
+    self._service.add_object(_create_object_proto('table'))
+    self._service.add_object(_create_object_proto('box', parent_id='table'))
+    self._mirror = world_mirror.WorldMirror('world', self._service)
+
+  def test_first_sync_reports_all_objects_as_added(self):
+    changes = self._mirror.sync()
+
+    self.assertCountEqual(changes.added_object_ids, ['root', 'table', 'box'])
+    self.assertEmpty(changes.removed_object_ids)
+    self.assertEmpty(changes.modified_object_ids)
+    self.assertEqual(self._mirror.version, 1)
+    self.assertLen(self._mirror.snapshot.objects, 3)
+
+  def test_sync_without_changes_does_not_list_objects(self):
+    self._mirror.sync()
+    snapshot = self._mirror.snapshot
+
+    for _ in range(10):
+      self.assertFalse(self._mirror.sync())
+
+    self.assertIs(self._mirror.snapshot, snapshot)
+    self.assertEqual(self._service.call_counts['ListObjects'], 1)
+    self.assertEqual(self._service.call_counts['GetWorld'], 11)
+
+  def test_sync_reports_changes(self):
+    self._mirror.sync()
+    self._service.add_object(_create_object_proto('camera'))
+    self._service.UpdateTransform(
+        object_world_updates_pb2.UpdateTransformRequest(
+            world_id='world',
+            node_a=object_world_refs_pb2.TransformNodeReference(id='table'),
+            node_b=object_world_refs_pb2.TransformNodeReference(id='box'),
+            a_t_b=math_proto_conversion.pose_to_proto(
+                data_types.Pose3(translation=[1, 0, 0])
+            ),
+        )
+    )
+
+    changes = self._mirror.sync()
+
+    self.assertEqual(changes.added_object_ids, ['camera'])
+    self.assertEmpty(changes.removed_object_ids)
+    # Adding the camera also adds a child to the root object.
+    self.assertCountEqual(changes.modified_object_ids, ['root', 'box'])
+    self.assertEqual(self._mirror.version, 2)
+    self.assertAlmostEqual(
+        self._mirror.snapshot.get_object_by_id(
+            'box'
+        ).object_component.parent_t_this.position.x,
+        1.0,
+    )
+
+  def test_sync_reports_removed_objects(self):
+    self._mirror.sync()
+    self._service.DeleteObject(
+        object_world_updates_pb2.DeleteObjectRequest(
+            world_id='world',
+            object=object_world_refs_pb2.ObjectReference(id='table'),
+            force=True,
+        )
+    )
+
+    changes = self._mirror.sync()
+
+    self.assertCountEqual(changes.removed_object_ids, ['table', 'box'])
+    self.assertEqual(changes.modified_object_ids, ['root'])
+
+  def test_invalidate_lists_objects_again(self):
+    self._mirror.sync()
+    self._mirror.invalidate()
+
+    self.assertFalse(self._mirror.sync())
+    self.assertEqual(self._service.call_counts['ListObjects'], 2)
+    self.assertEqual(self._mirror.version, 1)
+
+  def test_sync_without_last_update_lists_objects(self):
+    get_world = self._service.GetWorld
+
+    def get_world_without_last_update(request):
+      metadata = get_world(request)
+      metadata.ClearField('last_update')
+      return metadata
+
+    self.enter_context(
+        mock.patch.object(
+            self._service, 'GetWorld', side_effect=get_world_without_last_update
+        )
+    )
+    self._mirror.sync()
+    self._service.UpdateTransform(
+        object_world_updates_pb2.UpdateTransformRequest(
+            world_id='world',
+            node_a=object_world_refs_pb2.TransformNodeReference(id='table'),
+            node_b=object_world_refs_pb2.TransformNodeReference(id='box'),
+            a_t_b=math_proto_conversion.pose_to_proto(
+                data_types.Pose3(translation=[1, 0, 0])
+            ),
+        )
+    )
+
+    changes = self._mirror.sync()
+
+    self.assertIsNone(self._mirror.cursor)
+    self.assertEqual(changes.modified_object_ids, ['box'])
+    self.assertEqual(self._service.call_counts['ListObjects'], 2)
+
+  def test_requests_do_not_block_the_mirror(self):
+    self._mirror.sync()
+    self._service.add_object(_create_object_proto('camera'))
+    listing = threading.Event()
+    release = threading.Event()
+    list_objects = self._service.ListObjects
+
+    def blocking_list_objects(request, *args, **kwargs):
+      listing.set()
+      release.wait()
+      return list_objects(request, *args, **kwargs)
+
+    with mock.patch.object(
+        self._service, 'ListObjects', side_effect=blocking_list_objects
+    ):
+      sync = threading.Thread(target=self._mirror.sync)
+      sync.start()
+      self.assertTrue(listing.wait(timeout=10))
+      invalidate = threading.Thread(target=self._mirror.invalidate)
+      invalidate.start()
+      invalidate.join(timeout=10)
+      self.assertFalse(invalidate.is_alive())
+      release.set()
+      sync.join()
+
+    # The sync has been overtaken by invalidate() and is not applied.
+    self.assertEqual(self._mirror.version, 1)
+    changes = self._mirror.sync()
+    self.assertEqual(changes.added_object_ids, ['camera'])
+    self.assertEqual(self._mirror.version, 2)
+
+  def test_client_with_sync_with_world(self):
+    world = object_world_client.ObjectWorldClient(
+        'world', self._service, sync_with_world=True
+    )
+
+    for _ in range(5):
+      self.assertCountEqual(
+          world.list_object_full_paths(), ['table', 'table.box']
+      )
+      str(world)
+    self.assertEqual(self._service.call_counts['ListObjects'], 1)
+
+    # Changes by other clients are detected.
+    self._service.add_object(_create_object_proto('camera'))
+    self.assertCountEqual(
+        world.list_object_full_paths(), ['table', 'table.box', 'camera']
+    )
+    self.assertEqual(self._service.call_counts['ListObjects'], 2)
+
+    # Changes by the client itself are visible immediately.
+    world.update_object_name(world.camera, 'new_camera')
+    self.assertIn('new_camera', world.list_object_full_paths())
+
+  def test_client_with_sync_with_world_resolves_chained_lookups(self):
+    self._service.add_object(
+        object_world_service_pb2.Object(
+            id='gripper',
+            name='gripper',
+            type=object_world_service_pb2.ObjectType.PHYSICAL_OBJECT,
+            parent=object_world_service_pb2.IdAndName(id='box'),
+            parent_entity=object_world_refs_pb2.EntityReference(id='eid_box'),
+            root_entity_id='eid_gripper',
+            object_component=object_world_service_pb2.ObjectComponent(),
+            frames=[
+                object_world_service_pb2.Frame(
+                    id='tool_frame_id',
+                    name='tool_frame',
+                    object=object_world_service_pb2.IdAndName(id='gripper'),
+                )
+            ],
+        )
+    )
+    world = object_world_client.ObjectWorldClient(
+        'world', self._service, sync_with_world=True
+    )
+    table = world.table
+    call_counts = self._service.call_counts.copy()
+
+    self.assertEqual(table.box.gripper.tool_frame.id, 'tool_frame_id')
+    self.assertEqual(table.box.gripper.parent.name, 'box')
+    self.assertEqual(table.box.parent.name, 'table')
+
+    self.assertEqual(self._service.call_counts, call_counts)
+
+
+if __name__ == '__main__':
+  absltest.main()